@@ -26,6 +26,10 @@ from adapters.base_adapter import (
     Position,
     Balance,
     Order,
+    OrderReplace,
+    OrderRequest,
+    OrderResult,
+    new_client_order_id,
 )
 from adapters.factory import (
     create_adapter,
@@ -42,6 +46,10 @@ __all__ = [
     "Position",
     "Balance",
     "Order",
+    "OrderReplace",
+    "OrderRequest",
+    "OrderResult",
+    "new_client_order_id",
     
     # 枚举
     "OrderSide",
@@ -5,11 +5,36 @@ This module provides a base adapter interface for integrating different
 perpetual futures exchanges. All exchange-specific adapters should inherit
 from BasePerpAdapter and implement the required methods.
 """
+import itertools
+import logging
+import random
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 from decimal import Decimal
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
+# 订单的终态（Order.status）
+FINAL_ORDER_STATUSES = ("filled", "cancelled", "rejected")
+# 流水成交对账时跟踪的未结束订单数量上限（超出时丢弃最久未更新的）
+MAX_TRACKED_FILLS = 10000
+
+# 客户端订单ID序号：随机起点，进程内单调递增
+_client_order_ids = itertools.count(random.getrandbits(62))
+
+
+def new_client_order_id() -> str:
+    """
+    生成客户端订单ID
+
+    GRVT 和 Nado 只接受整数 client_order_id，所以所有交易所统一使用十进制数字字符串；
+    取值在 [2^63, 2^64) 内，与 GRVT 网页端生成的 ID（[0, 2^63)）不冲突。
+    """
+    return str(2 ** 63 + next(_client_order_ids) % 2 ** 63)
+
 
 class OrderSide(Enum):
     """订单方向"""
@@ -125,6 +150,7 @@ class Order:
         client_order_id: Optional[str] = None,
         created_at: Optional[int] = None,
         updated_at: Optional[int] = None,
+        avg_fill_price: Optional[Decimal] = None,
     ):
         self.order_id = order_id
         self.symbol = symbol
@@ -139,6 +165,7 @@ class Order:
         self.client_order_id = client_order_id
         self.created_at = created_at
         self.updated_at = updated_at
+        self.avg_fill_price = avg_fill_price
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -156,7 +183,121 @@ class Order:
             "client_order_id": self.client_order_id,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
+            "avg_fill_price": str(self.avg_fill_price) if self.avg_fill_price is not None else None,
+        }
+
+
+class OrderReplace:
+    """改单请求：撤销旧订单（order_id 或 client_order_id），并按新的价格/数量下单"""
+    def __init__(
+        self,
+        symbol: str,
+        side: str,
+        quantity: Decimal,
+        price: Optional[Decimal] = None,
+        order_id: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+        new_client_order_id: Optional[str] = None,
+        order_type: str = "limit",
+        time_in_force: str = "gtc",
+        reduce_only: bool = False,
+    ):
+        if not order_id and not client_order_id:
+            raise ValueError("改单必须提供 order_id 或 client_order_id")
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.price = price
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.new_client_order_id = new_client_order_id
+        self.order_type = order_type
+        self.time_in_force = time_in_force
+        self.reduce_only = reduce_only
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "symbol": self.symbol,
+            "side": self.side,
+            "quantity": str(self.quantity),
+            "price": str(self.price) if self.price else None,
+            "order_id": self.order_id,
+            "client_order_id": self.client_order_id,
+            "new_client_order_id": self.new_client_order_id,
+            "order_type": self.order_type,
+            "time_in_force": self.time_in_force,
+            "reduce_only": self.reduce_only,
+        }
+
+
+class OrderRequest:
+    """批量下单请求"""
+    def __init__(
+        self,
+        symbol: str,
+        side: str,
+        quantity: Decimal,
+        price: Optional[Decimal] = None,
+        order_type: str = "limit",
+        time_in_force: str = "gtc",
+        reduce_only: bool = False,
+        client_order_id: Optional[str] = None,
+    ):
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.price = price
+        self.order_type = order_type
+        self.time_in_force = time_in_force
+        self.reduce_only = reduce_only
+        self.client_order_id = client_order_id
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "symbol": self.symbol,
+            "side": self.side,
+            "quantity": str(self.quantity),
+            "price": str(self.price) if self.price else None,
+            "order_type": self.order_type,
+            "time_in_force": self.time_in_force,
+            "reduce_only": self.reduce_only,
+            "client_order_id": self.client_order_id,
+        }
+
+
+class OrderResult:
+    """批量下单/撤单中单个订单的结果"""
+    def __init__(
+        self,
+        success: bool,
+        order: Optional[Order] = None,
+        order_id: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+        error: Optional[str] = None,
+    ):
+        self.success = success
+        self.order = order
+        self.order_id = order_id if order_id is not None else (order.order_id if order else None)
+        self.client_order_id = client_order_id if client_order_id is not None else (
+            order.client_order_id if order else None
+        )
+        self.error = error
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "success": self.success,
+            "order": self.order.to_dict() if self.order else None,
+            "order_id": self.order_id,
+            "client_order_id": self.client_order_id,
+            "error": self.error,
         }
+    
+    def __repr__(self) -> str:
+        status = "ok" if self.success else f"failed: {self.error}"
+        return f"OrderResult({self.order_id or self.client_order_id}, {status})"
 
 
 class BasePerpAdapter(ABC):
@@ -167,6 +308,10 @@ class BasePerpAdapter(ABC):
     这样可以确保不同交易所的接口统一，方便策略编写。
     """
     
+    # get_order 是否能查到已结束（成交/撤销）的订单并返回 filled_quantity 和最终状态；
+    # 为 False 时，执行调度器等按挂单消失和持仓变化推断成交
+    reports_order_fills = False
+    
     def __init__(self, config: Dict[str, Any]):
         """
         初始化适配器
@@ -176,6 +321,154 @@ class BasePerpAdapter(ABC):
         """
         self.config = config
         self.exchange_name = config.get("exchange_name", "unknown")
+        # 订单流水（可选），见 attach_journal()
+        self.journal = None
+        # 限频器（可选），见 attach_rate_limiter()
+        self.rate_limiter = None
+        # 批量/改单默认实现使用的线程池（按需创建）
+        self.max_concurrency = int(config.get("max_concurrency", 8))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 流水成交对账：order_id -> (symbol, 已记录的成交量, 已记录的成交额)
+        self._journaled_fills: Dict[str, Tuple[str, Decimal, Decimal]] = {}
+        # 已记录最终成交的订单（再次查询到时不重复记录）
+        self._closed_fills: Dict[str, None] = {}
+        self._fills_lock = threading.Lock()
+    
+    def attach_journal(self, journal) -> None:
+        """
+        挂载订单流水，挂载后下单/撤单事件和成交会被记录
+        
+        成交来自订单查询：get_order / get_open_orders 看到的成交量增量记为 "fill" 事件；
+        上次还在挂单中（或刚下单）、本次 get_open_orders 已不在挂单中的订单，会再查询一次
+        最终成交量（默认每个订单一次 get_order）。
+        
+        Args:
+            journal: utils.order_journal.OrderJournal 实例，传 None 取消记录
+        """
+        self.journal = journal
+        with self._fills_lock:
+            self._journaled_fills.clear()
+            self._closed_fills.clear()
+    
+    def _record_event(self, event: str, **fields) -> None:
+        """记录订单事件到流水（只入内存缓冲区，不做 IO；未挂载流水时什么都不做）"""
+        if self.journal is not None:
+            fields.setdefault("exchange", self.exchange_name)
+            self.journal.record(event, **fields)
+            if event == "place" and fields.get("order_id"):
+                # 新订单：之后挂单对账时如果已不在挂单中，查询它的最终成交
+                self._track_fill(str(fields["order_id"]), fields.get("symbol"))
+    
+    def _track_fill(self, order_id: str, symbol: Optional[str]) -> None:
+        with self._fills_lock:
+            self._journaled_fills.setdefault(order_id, (symbol or "", Decimal("0"), Decimal("0")))
+            while len(self._journaled_fills) > MAX_TRACKED_FILLS:
+                self._journaled_fills.pop(next(iter(self._journaled_fills)))
+    
+    def _record_fills(self, orders: List[Optional[Order]]) -> None:
+        """
+        按订单累计成交量的增量记录成交（同一订单已记录过的成交量不会重复记录）
+        
+        成交价按 avg_fill_price 推算增量部分的均价，没有时使用订单价格。未挂载流水时什么都不做
+        """
+        if self.journal is None:
+            return
+        for order in orders:
+            if order is None:
+                continue
+            filled = order.filled_quantity or Decimal("0")
+            avg_price = order.avg_fill_price or order.price
+            with self._fills_lock:
+                if order.order_id in self._closed_fills:
+                    continue
+                _, previous, previous_notional = self._journaled_fills.pop(
+                    order.order_id, ("", Decimal("0"), Decimal("0"))
+                )
+                notional = filled * avg_price if avg_price else previous_notional
+                if filled > previous:
+                    increment = filled - previous
+                    price = (notional - previous_notional) / increment if avg_price else None
+                    self.journal.record_fill(
+                        order.symbol, order.side, price, increment, order.order_id,
+                        client_order_id=order.client_order_id, status=order.status,
+                        exchange=self.exchange_name,
+                    )
+                if order.status in FINAL_ORDER_STATUSES:
+                    self._closed_fills[order.order_id] = None
+                    while len(self._closed_fills) > MAX_TRACKED_FILLS:
+                        self._closed_fills.pop(next(iter(self._closed_fills)))
+                else:
+                    self._journaled_fills[order.order_id] = (
+                        order.symbol, max(filled, previous), max(notional, previous_notional)
+                    )
+    
+    def _reconcile_fills(self, open_orders: List[Order], symbol: Optional[str] = None) -> None:
+        """
+        挂单对账：记录挂单的成交增量；跟踪中的订单已不在挂单中（成交或撤销）时查询最终成交
+        
+        Args:
+            open_orders: 本次 get_open_orders 的结果
+            symbol: 本次查询的交易对（None 为所有交易对）
+        """
+        if self.journal is None:
+            return
+        self._record_fills(open_orders)
+        open_ids = {o.order_id for o in open_orders}
+        with self._fills_lock:
+            closed = [
+                (order_id, tracked_symbol)
+                for order_id, (tracked_symbol, _, _) in self._journaled_fills.items()
+                if order_id not in open_ids and (symbol is None or tracked_symbol == symbol)
+            ]
+        if not closed:
+            return
+        try:
+            self._journal_closed_orders(closed)
+        except Exception as e:
+            logger.warning("查询已结束订单的成交失败: %s", e)
+        with self._fills_lock:
+            # 查不到的订单不再跟踪，避免每次对账重复查询
+            for order_id, _ in closed:
+                self._journaled_fills.pop(order_id, None)
+    
+    def _journal_closed_orders(self, orders: List[Tuple[str, str]]) -> None:
+        """
+        查询已不在挂单中的订单并记录最终成交（默认逐个 get_order，get_order 中会调用 _record_fills）
+        
+        Args:
+            orders: (order_id, symbol) 列表
+        """
+        for order_id, symbol in orders:
+            try:
+                self.get_order(order_id=order_id, symbol=symbol or None)
+            except Exception as e:
+                logger.debug("查询订单 %s 失败: %s", order_id, e)
+    
+    def attach_rate_limiter(self, rate_limiter) -> None:
+        """
+        挂载限频器，挂载后下单/撤单/查询请求发送前会先获取对应类别的令牌
+        
+        Args:
+            rate_limiter: utils.rate_limiter.RateLimiter 实例（多个适配器/进程可共享），传 None 取消限频
+        """
+        self.rate_limiter = rate_limiter
+    
+    def _get_credential_cache(self):
+        """
+        按配置创建登录凭证缓存（config.credential_cache 默认开启，credential_cache_dir 指定目录）
+        
+        Returns:
+            utils.credential_cache.CredentialCache 实例，关闭时返回 None
+        """
+        if not self.config.get("credential_cache", True):
+            return None
+        from utils.credential_cache import CredentialCache
+        return CredentialCache(self.config.get("credential_cache_dir"))
+    
+    def _throttle(self, category: str, weight: float = 1.0) -> None:
+        """按类别（"order"/"cancel"/"query"）等待令牌；未挂载限频器时什么都不做"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(category, weight)
     
     @abstractmethod
     def connect(self) -> bool:
@@ -446,6 +739,206 @@ class BasePerpAdapter(ABC):
             **kwargs
         )
     
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """获取（按需创建）并发请求使用的线程池"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix=f"{self.exchange_name}-adapter",
+            )
+        return self._executor
+    
+    def replace_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: Decimal,
+        price: Optional[Decimal] = None,
+        order_id: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+        new_client_order_id: Optional[str] = None,
+        order_type: str = "limit",
+        time_in_force: str = "gtc",
+        reduce_only: bool = False,
+    ) -> Order:
+        """
+        改单：撤销旧订单并下新单
+        
+        默认实现并发发送撤单和下单两个请求（两者之间没有原子性保证）；
+        支持原生原子改单的交易所（如 Nado cancel_and_place）应重写 replace_orders。
+        
+        Args:
+            symbol: 交易对符号
+            side: 新订单方向
+            quantity: 新订单数量
+            price: 新订单价格
+            order_id: 被撤订单ID
+            client_order_id: 被撤订单的客户端订单ID
+            new_client_order_id: 新订单的客户端订单ID
+            order_type: 新订单类型
+            time_in_force: 新订单有效期
+            reduce_only: 新订单是否只减仓
+            
+        Returns:
+            Order: 新订单信息
+            
+        Raises:
+            Exception: 下单失败时抛出异常（撤单失败只记录警告）
+        """
+        replace = OrderReplace(
+            symbol=symbol,
+            side=side,
+            quantity=quantity,
+            price=price,
+            order_id=order_id,
+            client_order_id=client_order_id,
+            new_client_order_id=new_client_order_id,
+            order_type=order_type,
+            time_in_force=time_in_force,
+            reduce_only=reduce_only,
+        )
+        order = self.replace_orders([replace])[0]
+        if order is None:
+            raise Exception(f"改单失败: {replace.to_dict()}")
+        return order
+    
+    def replace_orders(self, replaces: List[OrderReplace]) -> List[Optional[Order]]:
+        """
+        批量改单
+        
+        默认实现把所有撤单和下单请求同时提交到线程池（并发数受 max_concurrency 限制）。
+        
+        Args:
+            replaces: 改单请求列表
+            
+        Returns:
+            List[Optional[Order]]: 与 replaces 一一对应的新订单，下单失败的位置为 None
+        """
+        if not replaces:
+            return []
+        executor = self._get_executor()
+        cancel_futures = [
+            executor.submit(
+                self.cancel_order,
+                order_id=r.order_id,
+                symbol=r.symbol,
+                client_order_id=r.client_order_id,
+            )
+            for r in replaces
+        ]
+        place_futures = [
+            executor.submit(
+                self.place_order,
+                symbol=r.symbol,
+                side=r.side,
+                order_type=r.order_type,
+                quantity=r.quantity,
+                price=r.price,
+                time_in_force=r.time_in_force,
+                reduce_only=r.reduce_only,
+                client_order_id=r.new_client_order_id,
+            )
+            for r in replaces
+        ]
+        results: List[Optional[Order]] = []
+        for r, cancel_future, place_future in zip(replaces, cancel_futures, place_futures):
+            try:
+                cancel_future.result()
+            except Exception as e:
+                logger.warning("改单撤单失败: order_id=%s, 错误=%s", r.order_id or r.client_order_id, e)
+            try:
+                results.append(place_future.result())
+            except Exception as e:
+                logger.warning("改单下单失败: 价格=%s, 错误=%s", r.price, e)
+                results.append(None)
+        return results
+    
+    def place_orders(self, requests: List[OrderRequest]) -> List[OrderResult]:
+        """
+        批量下单
+        
+        默认实现把所有下单请求同时提交到线程池（并发数受 max_concurrency 限制）；
+        交易所有原生批量接口时，适配器应重写此方法。单个订单失败不会影响其他订单。
+        
+        Args:
+            requests: 下单请求列表
+            
+        Returns:
+            List[OrderResult]: 与 requests 一一对应的结果
+        """
+        if not requests:
+            return []
+        executor = self._get_executor()
+        futures = [
+            executor.submit(
+                self.place_order,
+                symbol=r.symbol,
+                side=r.side,
+                order_type=r.order_type,
+                quantity=r.quantity,
+                price=r.price,
+                time_in_force=r.time_in_force,
+                reduce_only=r.reduce_only,
+                client_order_id=r.client_order_id,
+            )
+            for r in requests
+        ]
+        results: List[OrderResult] = []
+        for r, future in zip(requests, futures):
+            try:
+                results.append(OrderResult(success=True, order=future.result()))
+            except Exception as e:
+                results.append(OrderResult(success=False, client_order_id=r.client_order_id, error=str(e)))
+        return results
+    
+    def cancel_orders(
+        self,
+        order_ids: Optional[List[str]] = None,
+        symbol: Optional[str] = None,
+        client_order_ids: Optional[List[str]] = None,
+    ) -> List[OrderResult]:
+        """
+        批量撤单
+        
+        默认实现把所有撤单请求同时提交到线程池（并发数受 max_concurrency 限制）；
+        交易所有原生批量撤单接口时，适配器应重写此方法。
+        
+        Args:
+            order_ids: 订单ID列表
+            symbol: 交易对符号（可选）
+            client_order_ids: 客户端订单ID列表
+            
+        Returns:
+            List[OrderResult]: 先 order_ids 后 client_order_ids 顺序对应的结果
+        """
+        targets = [(str(i), None) for i in order_ids or []]
+        targets += [(None, str(i)) for i in client_order_ids or []]
+        if not targets:
+            return []
+        executor = self._get_executor()
+        futures = [
+            executor.submit(
+                self.cancel_order,
+                order_id=order_id,
+                symbol=symbol,
+                client_order_id=client_order_id,
+            )
+            for order_id, client_order_id in targets
+        ]
+        results: List[OrderResult] = []
+        for (order_id, client_order_id), future in zip(targets, futures):
+            try:
+                ok = bool(future.result())
+                results.append(OrderResult(
+                    success=ok, order_id=order_id, client_order_id=client_order_id,
+                    error=None if ok else "撤单失败",
+                ))
+            except Exception as e:
+                results.append(OrderResult(
+                    success=False, order_id=order_id, client_order_id=client_order_id, error=str(e),
+                ))
+        return results
+    
     def get_position(self, symbol: str) -> Optional[Position]:
         """
         获取单个交易对的持仓（便捷方法）
@@ -2,21 +2,50 @@
 Adapter Factory
 
 This module provides a factory function to create exchange adapters based on configuration.
+
+适配器按 "模块路径:类名" 注册，只有被选中时才导入对应模块，
+避免启动时加载所有交易所 SDK（web3、eth_account、aiohttp、grvt_raw_types 等）。
 """
-from typing import Dict, Any, Type
+import importlib
+from typing import Dict, Any, Type, Union
 from adapters.base_adapter import BasePerpAdapter
-from adapters.standx_adapter import StandXAdapter
-from adapters.grvt_adapter import GrvtAdapter
 
-# 注册所有可用的适配器
-_ADAPTER_REGISTRY: Dict[str, Type[BasePerpAdapter]] = {
-    "standx": StandXAdapter,
-    "grvt": GrvtAdapter,
+# 注册所有可用的适配器（值为 "模块路径:类名" 或已导入的适配器类）
+_ADAPTER_REGISTRY: Dict[str, Union[str, Type[BasePerpAdapter]]] = {
+    "standx": "adapters.standx_adapter:StandXAdapter",
+    "grvt": "adapters.grvt_adapter:GrvtAdapter",
+    "nado": "adapters.nado_adapter:NadoAdapter",
     # 未来可以添加更多交易所适配器
-    # "nado": NadoAdapter,
 }
 
 
+def _resolve_adapter(exchange_name: str) -> Type[BasePerpAdapter]:
+    """
+    导入并返回适配器类，导入结果写回注册表，之后不再重复解析
+
+    Args:
+        exchange_name: 交易所名称（小写）
+
+    Returns:
+        适配器类
+
+    Raises:
+        ValueError: 模块或类不存在，或不是 BasePerpAdapter 子类
+    """
+    entry = _ADAPTER_REGISTRY[exchange_name]
+    if not isinstance(entry, str):
+        return entry
+    module_path, _, class_name = entry.partition(":")
+    try:
+        adapter_class = getattr(importlib.import_module(module_path), class_name)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"加载适配器 {exchange_name} ({entry}) 失败: {e}")
+    if not (isinstance(adapter_class, type) and issubclass(adapter_class, BasePerpAdapter)):
+        raise ValueError(f"适配器类必须继承自 BasePerpAdapter: {entry}")
+    _ADAPTER_REGISTRY[exchange_name] = adapter_class
+    return adapter_class
+
+
 def create_adapter(config: Dict[str, Any]) -> BasePerpAdapter:
     """
     根据配置创建适配器实例
@@ -53,7 +82,7 @@ def create_adapter(config: Dict[str, Any]) -> BasePerpAdapter:
             f"支持的交易所: {available}"
         )
     
-    adapter_class = _ADAPTER_REGISTRY[exchange_name]
+    adapter_class = _resolve_adapter(exchange_name)
     
     try:
         return adapter_class(config)
@@ -61,21 +90,26 @@ def create_adapter(config: Dict[str, Any]) -> BasePerpAdapter:
         raise ValueError(f"创建适配器失败: {e}")
 
 
-def register_adapter(exchange_name: str, adapter_class: Type[BasePerpAdapter]):
+def register_adapter(exchange_name: str, adapter_class: Union[str, Type[BasePerpAdapter]]):
     """
     注册新的适配器类
     
     Args:
         exchange_name: 交易所名称（小写）
-        adapter_class: 适配器类，必须继承自 BasePerpAdapter
+        adapter_class: 适配器类（必须继承自 BasePerpAdapter），
+            或 "模块路径:类名" 字符串（首次创建适配器时才导入）
         
     Example:
         >>> from adapters.base_adapter import BasePerpAdapter
         >>> class MyExchangeAdapter(BasePerpAdapter):
         ...     pass
         >>> register_adapter("myexchange", MyExchangeAdapter)
+        >>> register_adapter("other", "my_package.other_adapter:OtherAdapter")
     """
-    if not issubclass(adapter_class, BasePerpAdapter):
+    if isinstance(adapter_class, str):
+        if ":" not in adapter_class:
+            raise ValueError(f"适配器路径格式应为 '模块路径:类名': {adapter_class}")
+    elif not (isinstance(adapter_class, type) and issubclass(adapter_class, BasePerpAdapter)):
         raise ValueError(f"适配器类必须继承自 BasePerpAdapter")
     
     _ADAPTER_REGISTRY[exchange_name.lower()] = adapter_class
@@ -6,6 +6,7 @@ This module implements BasePerpAdapter for GRVT exchange.
 import sys
 import os
 import time
+import logging
 from typing import Dict, Any, Optional, List
 from decimal import Decimal
 
@@ -21,13 +22,31 @@ grvt_sdk_path = os.path.join(project_root, 'exchange', 'exchange_grvt', 'src')
 if grvt_sdk_path not in sys.path:
     sys.path.insert(0, grvt_sdk_path)
 
+from pysdk.grvt_auth_manager import DEFAULT_REFRESH_BEFORE_SECS, GrvtAuthManager
 from pysdk.grvt_ccxt import GrvtCcxt
-from pysdk.grvt_ccxt_env import GrvtEnv
+from pysdk.grvt_ccxt_env import GrvtEnv, get_grvt_endpoint
+from pysdk.grvt_ccxt_utils import get_cookie_with_expiration
+
+logger = logging.getLogger(__name__)
+
+# 缓存的 cookie 剩余有效期少于该值时重新登录（必须大于后台提前刷新的时间，否则刷新会拿回同一个 cookie）
+COOKIE_MIN_TTL_SECONDS = 2 * DEFAULT_REFRESH_BEFORE_SECS
+
+# GRVT 订单状态（state.status）-> OrderStatus 取值
+ORDER_STATUS_MAP = {
+    "PENDING": "pending",
+    "OPEN": "open",
+    "FILLED": "filled",
+    "REJECTED": "rejected",
+    "CANCELLED": "cancelled",
+}
 
 
 class GrvtAdapter(BasePerpAdapter):
     """GRVT 交易所适配器实现"""
     
+    reports_order_fills = True
+    
     def __init__(self, config: Dict[str, Any]):
         """
         初始化 GRVT 适配器
@@ -39,6 +58,8 @@ class GrvtAdapter(BasePerpAdapter):
                 - api_key: API Key（下单需要）
                 - trading_account_id: 交易账户ID（下单需要）
                 - private_key: 私钥（下单需要）
+                - credential_cache: 是否缓存登录 cookie（可选，默认 True）
+                - credential_cache_dir: cookie 缓存目录（可选）
         """
         super().__init__(config)
         env_str = config.get("env", "prod").lower()
@@ -57,9 +78,51 @@ class GrvtAdapter(BasePerpAdapter):
             "private_key": config.get("private_key", ""),
         }
         
+        # 登录 cookie 缓存：重启时跳过 API Key 登录，多个进程共用同一次登录
+        credential_cache = self._get_credential_cache()
+        if parameters["api_key"] and credential_cache is not None:
+            parameters["auth_manager"] = self._create_auth_manager(parameters["api_key"], credential_cache)
+        
         # 初始化 GRVT 客户端
         self.grvt_client = GrvtCcxt(env=self.env, parameters=parameters)
     
+    def _create_auth_manager(self, api_key: str, credential_cache) -> GrvtAuthManager:
+        """
+        创建从本地缓存读取 cookie 的 GRVT 登录管理器（缓存无效时才真正登录）
+        
+        同一进程中每个 API Key 只有一个登录管理器：已有适配器注册过缓存登录时直接复用
+        """
+        auth_path = get_grvt_endpoint(self.env, "AUTH")
+        existing = GrvtAuthManager.registered(auth_path, api_key)
+        if existing is not None and existing.has_login_fn:
+            return existing
+        
+        def login_and_expiry():
+            cookie = get_cookie_with_expiration(auth_path, api_key)
+            if not cookie:
+                raise Exception("GRVT 登录失败：未获取到 cookie")
+            return cookie, cookie.get("expires")
+        
+        account = f"{self.env.value}:{api_key}"
+        handed_out: Dict[str, Any] = {}
+        
+        def login():
+            cookie = credential_cache.get_or_create(
+                "grvt", account, secret=api_key, create=login_and_expiry, min_ttl=COOKIE_MIN_TTL_SECONDS,
+            )
+            if handed_out and cookie.get("gravity") == handed_out.get("gravity"):
+                # 登录管理器已经用过这个 cookie 还要重新登录（交易所拒绝了它或即将过期）：删除缓存，真正登录一次
+                logger.warning("[GRVT] 缓存的 cookie 已失效，重新登录")
+                credential_cache.invalidate("grvt", account)
+                cookie = credential_cache.get_or_create(
+                    "grvt", account, secret=api_key, create=login_and_expiry, min_ttl=COOKIE_MIN_TTL_SECONDS,
+                )
+            handed_out.clear()
+            handed_out.update(cookie)
+            return cookie
+        
+        return GrvtAuthManager.shared(auth_path, api_key, logger, login_fn=login)
+    
     def connect(self) -> bool:
         """
         连接到 GRVT（获取价格不需要认证，直接返回成功）
@@ -77,11 +140,12 @@ class GrvtAdapter(BasePerpAdapter):
         """查询持仓信息"""
         try:
             symbols = [symbol] if symbol else []
+            self._throttle("query")
             positions_data = self.grvt_client.fetch_positions(symbols=symbols)
             
-            print(f"[GRVT] 查询持仓: symbol={symbol}, 返回数据条数={len(positions_data)}")
+            logger.debug("[GRVT] 查询持仓: symbol=%s, 返回数据条数=%s", symbol, len(positions_data))
             if positions_data:
-                print(f"[GRVT] 持仓数据示例: {positions_data[0]}")
+                logger.debug("[GRVT] 持仓数据示例: %s", positions_data[0])
             
             positions = []
             for idx, pos_data in enumerate(positions_data):
@@ -95,12 +159,12 @@ class GrvtAdapter(BasePerpAdapter):
                 
                 # 如果数量为 0，跳过
                 if qty == Decimal("0"):
-                    print(f"[GRVT] 持仓数量为 0，跳过")
+                    logger.debug("[GRVT] 持仓数量为 0，跳过")
                     continue
                 
                 # 根据数量正负判断方向
                 side = "long" if qty > 0 else "short"
-                print(f"[GRVT] 持仓方向: {side}, 数量: {abs(qty)}")
+                logger.debug("[GRVT] 持仓方向: %s, 数量: %s", side, abs(qty))
                 
                 # 处理 leverage 字段（可能是字符串 "50.0"）
                 leverage_value = None
@@ -121,34 +185,49 @@ class GrvtAdapter(BasePerpAdapter):
                     margin_mode=pos_data.get("margin_mode"),
                 )
                 positions.append(position)
-                print(f"[GRVT] 成功创建 Position 对象: {position.symbol}, {position.size}, {position.side}")
+                logger.debug(
+                    "[GRVT] 成功创建 Position 对象: %s, %s, %s",
+                    position.symbol, position.size, position.side
+                )
             
-            print(f"[GRVT] 最终返回持仓数量: {len(positions)}")
+            logger.debug("[GRVT] 最终返回持仓数量: %s", len(positions))
             return positions
         except Exception as e:
-            print(f"[GRVT] 查询持仓异常: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[GRVT] 查询持仓异常: %s", e)
             raise Exception(f"GRVT 查询持仓失败: {e}")
     
     def _grvt_order_to_order(self, grvt_order: dict, symbol: str) -> Order:
-        """将 GRVT 订单格式转换为 Order 对象"""
+        """将 GRVT 订单格式转换为 Order 对象（order_id 为 client_order_id，状态和成交量取自 state）"""
         legs = grvt_order.get("legs", [])
         if not legs:
             raise ValueError("GRVT 订单格式错误：缺少 legs")
         
         leg = legs[0]
         metadata = grvt_order.get("metadata", {})
+        state = grvt_order.get("state") or {}
+        traded = state.get("traded_size") or []
+        filled = Decimal(str(traded[0])) if traded else Decimal("0")
+        status = ORDER_STATUS_MAP.get(str(state.get("status", "")).upper(), "pending")
+        if status == "open" and filled > 0:
+            status = "partially_filled"
+        update_time = state.get("update_time")
+        avg_fill_price = state.get("avg_fill_price") or []
+        client_order_id = str(metadata.get("client_order_id", ""))
         
         return Order(
-            order_id=str(metadata.get("client_order_id", "")),
+            order_id=client_order_id,
             symbol=leg.get("instrument", symbol),
             side="buy" if leg.get("is_buying_asset") else "sell",
             order_type="market" if grvt_order.get("is_market") else "limit",
             quantity=Decimal(str(leg.get("size", 0))),
             price=Decimal(str(leg.get("limit_price", 0))) if leg.get("limit_price") else None,
-            status="pending",  # GRVT 订单状态需要进一步查询
+            filled_quantity=filled,
+            status=status,
+            reduce_only=bool(grvt_order.get("reduce_only", False)),
+            client_order_id=client_order_id or None,
             created_at=int(time.time() * 1000),
+            updated_at=int(update_time) // 1_000_000 if update_time else None,
+            avg_fill_price=Decimal(str(avg_fill_price[0])) if filled and avg_fill_price else None,
         )
     
     def place_order(
@@ -178,16 +257,27 @@ class GrvtAdapter(BasePerpAdapter):
         if order_type.lower() == "limit":
             if price is None:
                 raise ValueError("限价单必须提供价格")
+            self._throttle("order")
             result = self.grvt_client.create_limit_order(symbol, grvt_side, str(quantity), str(price), params)
         elif order_type.lower() == "market":
+            self._throttle("order")
             result = self.grvt_client.create_order(symbol, "market", grvt_side, str(quantity), None, params)
         else:
             raise ValueError(f"不支持的订单类型: {order_type}")
         
         if not result:
+            self._record_event(
+                "place_failed", symbol=symbol, side=grvt_side, price=price, quantity=quantity,
+                client_order_id=client_order_id, status="failed", error="返回结果为空",
+            )
             raise Exception("下单失败：返回结果为空")
         
-        return self._grvt_order_to_order(result, symbol)
+        order = self._grvt_order_to_order(result, symbol)
+        self._record_event(
+            "place", symbol=symbol, side=grvt_side, price=price, quantity=quantity,
+            order_id=order.order_id, client_order_id=client_order_id, status="pending",
+        )
+        return order
     
     def cancel_order(
         self,
@@ -206,28 +296,27 @@ class GrvtAdapter(BasePerpAdapter):
         elif order_id:
             params["client_order_id"] = order_id
         
-        return self.grvt_client.cancel_order(id=None, symbol=symbol, params=params)
+        self._throttle("cancel")
+        ok = self.grvt_client.cancel_order(id=None, symbol=symbol, params=params)
+        self._record_event(
+            "cancel", symbol=symbol, order_id=order_id, client_order_id=params.get("client_order_id"),
+            status="success" if ok else "failed",
+        )
+        return ok
     
     def cancel_orders_by_ids(
         self,
         order_id_list: List[int],
         symbol: Optional[str] = None,
     ) -> bool:
-        """批量撤单
+        """批量撤单（兼容旧接口，新代码请使用 cancel_orders）
         
         Args:
             order_id_list: 订单ID列表（在 GRVT 中，这些是 client_order_id）
             symbol: 交易对符号（可选）
         """
-        success_count = 0
-        for order_id in order_id_list:
-            try:
-                if self.cancel_order(client_order_id=str(order_id), symbol=symbol):
-                    success_count += 1
-            except Exception:
-                continue  # 跳过失败的订单
-        
-        return success_count > 0
+        results = self.cancel_orders(client_order_ids=[str(i) for i in order_id_list], symbol=symbol)
+        return any(r.success for r in results)
     
     def cancel_all_orders(
         self,
@@ -243,7 +332,10 @@ class GrvtAdapter(BasePerpAdapter):
                 params["quote"] = parts[1]
             params["kind"] = "PERPETUAL"
         
-        return self.grvt_client.cancel_all_orders(params=params)
+        self._throttle("cancel")
+        ok = self.grvt_client.cancel_all_orders(params=params)
+        self._record_event("cancel_all", symbol=symbol, status="success" if ok else "failed")
+        return ok
     
     def get_order(
         self,
@@ -251,33 +343,28 @@ class GrvtAdapter(BasePerpAdapter):
         symbol: Optional[str] = None,
         client_order_id: Optional[str] = None,
     ) -> Optional[Order]:
-        """查询订单状态"""
-        params = {}
-        if client_order_id:
-            params["client_order_id"] = client_order_id
+        """查询订单状态（包括已成交/已撤销的订单）
+        
+        注意：本适配器返回的 order_id 就是 client_order_id，按 client_order_id 查询；
+        GRVT 自己的订单 ID（0x 开头）按 order_id 查询
+        """
+        if order_id and str(order_id).lower().startswith("0x") and not client_order_id:
+            grvt_order_id, params = str(order_id), {}
+        elif client_order_id or order_id:
+            grvt_order_id, params = None, {"client_order_id": client_order_id or order_id}
+        else:
+            raise ValueError("查询订单必须提供 order_id 或 client_order_id")
         
-        result = self.grvt_client.fetch_order(id=order_id, params=params)
+        self._throttle("query")
+        result = self.grvt_client.fetch_order(id=grvt_order_id, params=params)
         if not result or not result.get("result"):
             return None
-        
-        order_data = result.get("result", {})
-        legs = order_data.get("legs", [])
-        if not legs:
+        try:
+            order = self._grvt_order_to_order(result["result"], symbol or "")
+        except ValueError:
             return None
-        
-        leg = legs[0]
-        metadata = order_data.get("metadata", {})
-        
-        return Order(
-            order_id=str(metadata.get("client_order_id", order_id or "")),
-            symbol=leg.get("instrument", symbol or ""),
-            side="buy" if leg.get("is_buying_asset") else "sell",
-            order_type="market" if order_data.get("is_market") else "limit",
-            quantity=Decimal(str(leg.get("size", 0))),
-            price=Decimal(str(leg.get("limit_price", 0))) if leg.get("limit_price") else None,
-            status="pending",  # 可以根据订单状态进一步判断
-            created_at=int(time.time() * 1000),
-        )
+        self._record_fills([order])
+        return order
     
     def get_open_orders(
         self,
@@ -288,6 +375,7 @@ class GrvtAdapter(BasePerpAdapter):
         if symbol:
             params["kind"] = "PERPETUAL"
         
+        self._throttle("query")
         orders_data = self.grvt_client.fetch_open_orders(symbol=symbol, params=params)
         orders = []
         
@@ -297,6 +385,7 @@ class GrvtAdapter(BasePerpAdapter):
             except Exception:
                 continue  # 跳过格式错误的订单
         
+        self._reconcile_fills(orders, symbol)
         return orders
     
     def get_ticker(self, symbol: str) -> Dict[str, Any]:
@@ -310,6 +399,7 @@ class GrvtAdapter(BasePerpAdapter):
             Dict[str, Any]: 包含最新价、买一价、卖一价等信息
         """
         try:
+            self._throttle("query")
             ticker_data = self.grvt_client.fetch_ticker(symbol)
             
             # 处理返回的数据结构（可能是列表或字典）
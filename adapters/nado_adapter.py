@@ -0,0 +1,841 @@
+"""
+Nado Exchange Adapter Implementation
+
+This module implements BasePerpAdapter for Nado exchange.
+
+直接使用 Nado 引擎的批量原语：
+- 挂单查询使用 multi-product open orders（一次请求覆盖所有交易对）
+- 批量撤单使用 cancel_orders（一次请求按 digest 撤销整个列表）
+- 改单使用 cancel_and_place（撤单和下单在同一个请求中原子执行）
+- 撤销全部订单使用 cancel_product_orders
+- 订单 digest 在本地计算（EIP-712），撤单不需要先查询订单
+"""
+import sys
+import os
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
+
+# 添加项目路径
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from adapters.base_adapter import BasePerpAdapter, Balance, Position, Order, OrderReplace, OrderResult
+
+# 导入 Nado 相关模块
+nado_sdk_path = os.path.join(project_root, 'exchange', 'exchange_nado')
+if nado_sdk_path not in sys.path:
+    sys.path.insert(0, nado_sdk_path)
+
+from nado_protocol.client import NadoClientMode, create_nado_client
+from nado_protocol.engine_client.types.execute import (
+    CancelAndPlaceParams,
+    CancelOrdersParams,
+    CancelProductOrdersParams,
+    OrderParams,
+    PlaceOrderParams,
+)
+from nado_protocol.utils.bytes32 import subaccount_to_hex
+from nado_protocol.utils.exceptions import QueryFailedException
+from nado_protocol.utils.expiration import OrderType as NadoOrderType, get_expiration_timestamp
+from nado_protocol.utils.nonce import gen_order_nonce
+from nado_protocol.utils.order import build_appendix
+
+logger = logging.getLogger(__name__)
+
+X18 = Decimal(10 ** 18)
+
+# 订单有效期（秒），GTC 订单也需要一个过期时间
+DEFAULT_ORDER_TTL_SECONDS = 30 * 24 * 3600
+# 市价单（IOC 限价单）相对买一/卖一的滑点
+DEFAULT_MARKET_SLIPPAGE = Decimal("0.005")
+
+TIME_IN_FORCE_MAP = {
+    "gtc": NadoOrderType.DEFAULT,
+    "ioc": NadoOrderType.IOC,
+    "fok": NadoOrderType.FOK,
+    "post_only": NadoOrderType.POST_ONLY,
+}
+
+
+def _from_x18(value) -> Decimal:
+    """x18 整数（或字符串）转换为 Decimal"""
+    return Decimal(int(value)) / X18
+
+
+def _to_x18(value) -> int:
+    """数值转换为 x18 整数（按十进制精确转换，不经过 float）"""
+    return int(Decimal(str(value)) * X18)
+
+
+def _round_to_increment(value_x18: int, increment_x18: int, rounding: str) -> int:
+    """按最小变动单位取整（x18 整数）"""
+    if increment_x18 <= 0:
+        return value_x18
+    steps = (Decimal(value_x18) / Decimal(increment_x18)).to_integral_value(rounding=rounding)
+    return int(steps) * increment_x18
+
+
+def digest_to_order_id(digest: str) -> str:
+    """
+    订单 digest 转换为 order_id
+
+    策略代码按整数解析 order_id（int(order.order_id)），所以使用 digest 的十进制表示。
+    """
+    return str(int(digest, 16))
+
+
+def order_id_to_digest(order_id: str) -> str:
+    """order_id（十进制或 0x 开头的十六进制 digest）转换为 digest"""
+    order_id = str(order_id).strip()
+    if order_id.lower().startswith("0x"):
+        return "0x" + order_id[2:].lower().rjust(64, "0")
+    return "0x%064x" % int(order_id)
+
+
+class NadoAdapter(BasePerpAdapter):
+    """Nado 交易所适配器实现"""
+
+    reports_order_fills = True
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        初始化 Nado 适配器
+
+        Args:
+            config: 配置字典，必须包含：
+                - exchange_name: "nado"
+                - private_key: 钱包私钥（签名下单/撤单）
+                - network: 网络，"mainnet" 或 "testnet"（可选，默认 "mainnet"）
+                - subaccount_name: 子账户名（可选，默认 "default"）
+                - order_ttl_seconds: 订单过期时间（可选，默认 30 天）
+                - market_slippage: 市价单滑点（可选，默认 0.005）
+                - fast_decode: 热点查询是否使用快速解码（可选，默认 True）
+                - linked_signer_window: linked signer 限额的统计窗口（秒，可选）；设置后挂载限频器时
+                  按 indexer 查询到的限额初始化令牌桶，见 sync_rate_limits()
+        """
+        super().__init__(config)
+        private_key = config.get("private_key", "").strip()
+        if not private_key:
+            raise ValueError("配置中必须包含 private_key")
+
+        network = config.get("network", "mainnet").lower()
+        try:
+            mode = NadoClientMode(network)
+        except ValueError:
+            raise ValueError(f"不支持的 Nado 网络: {network}")
+
+        self.client = create_nado_client(mode, private_key)
+        self.engine = self.client.context.engine_client
+        self.engine.fast_decode = bool(config.get("fast_decode", True))
+
+        self.subaccount_name = config.get("subaccount_name", "default")
+        self.sender = subaccount_to_hex(self.client.context.signer.address, self.subaccount_name)
+        self.order_ttl_seconds = int(config.get("order_ttl_seconds", DEFAULT_ORDER_TTL_SECONDS))
+        self.market_slippage = Decimal(str(config.get("market_slippage", DEFAULT_MARKET_SLIPPAGE)))
+        window = config.get("linked_signer_window")
+        self.linked_signer_window = float(window) if window else None
+
+        # 交易对信息：symbol -> SymbolData，product_id -> symbol（connect() 或首次使用时加载）
+        self._markets: Dict[str, Any] = {}
+        self._symbols_by_product: Dict[int, str] = {}
+        # 本地订单索引：digest -> product_id / client_order_id，撤单时不需要先查询订单
+        self._order_products: Dict[str, int] = {}
+        self._order_client_ids: Dict[str, str] = {}
+        self._client_digests: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    # ==================== 限频 ====================
+
+    def attach_rate_limiter(self, rate_limiter) -> None:
+        """挂载限频器；配置了 linked_signer_window 时按 Nado 返回的 linked signer 限额初始化令牌桶"""
+        super().attach_rate_limiter(rate_limiter)
+        if rate_limiter is not None and self.linked_signer_window:
+            try:
+                self.sync_rate_limits()
+            except Exception as e:
+                logger.warning("[Nado] 查询 linked signer 限额失败，使用配置的限额: %s", e)
+
+    def sync_rate_limits(self) -> Dict[str, float]:
+        """
+        查询 linked signer 限额并更新限频器
+
+        Nado 按 linked signer 统计交易次数（下单、撤单共用），所以更新 "total" 桶；
+        限频器没有 "total" 桶时更新下单桶。
+
+        Returns:
+            Dict[str, float]: 传给 RateLimiter.update_bucket() 的参数
+        """
+        from utils.rate_limiter import ORDER, TOTAL, limits_from_nado_linked_signer
+
+        if self.rate_limiter is None:
+            raise ValueError("未挂载限频器")
+        if not self.linked_signer_window:
+            raise ValueError("配置中缺少 linked_signer_window")
+        data = self.client.context.indexer_client.get_linked_signer_rate_limits(self.sender)
+        limits = limits_from_nado_linked_signer(data, self.linked_signer_window)
+        bucket = TOTAL if TOTAL in self.rate_limiter.rates else ORDER
+        self.rate_limiter.update_bucket(bucket, **limits)
+        logger.info("[Nado] linked signer 限额: %s 桶 %s", bucket, limits)
+        return limits
+
+    # ==================== 交易对 ====================
+
+    def _load_markets(self) -> None:
+        """加载所有永续合约的交易对信息（product_id、价格/数量最小变动单位）"""
+        self._throttle("query")
+        symbols = self.engine.get_symbols(product_type="perp").symbols
+        self._markets = {name.upper(): data for name, data in symbols.items()}
+        self._symbols_by_product = {int(data.product_id): data.symbol for data in symbols.values()}
+
+    def _get_market(self, symbol: str):
+        """
+        获取交易对信息，支持 "BTC-PERP" 以及 "BTC-USDT"、"BTC_USDT_Perp" 等写法
+
+        Raises:
+            ValueError: 交易对不存在
+        """
+        if not self._markets:
+            self._load_markets()
+        key = symbol.upper()
+        market = self._markets.get(key)
+        if market is None:
+            base = key.replace("_", "-").split("-")[0]
+            market = self._markets.get(f"{base}-PERP")
+        if market is None:
+            raise ValueError(f"Nado 不存在交易对: {symbol}")
+        return market
+
+    def _product_id(self, symbol: str) -> int:
+        return int(self._get_market(symbol).product_id)
+
+    def _symbol(self, product_id: int) -> str:
+        if not self._symbols_by_product:
+            self._load_markets()
+        return self._symbols_by_product.get(product_id, str(product_id))
+
+    # ==================== 本地订单索引 ====================
+
+    def _remember_order(self, digest: str, product_id: int, client_order_id: Optional[str] = None) -> None:
+        with self._lock:
+            self._order_products[digest] = product_id
+            if client_order_id:
+                self._order_client_ids[digest] = client_order_id
+                self._client_digests[client_order_id] = digest
+
+    def _forget_order(self, digest: str) -> None:
+        with self._lock:
+            self._order_products.pop(digest, None)
+            client_order_id = self._order_client_ids.pop(digest, None)
+            if client_order_id is not None:
+                self._client_digests.pop(client_order_id, None)
+
+    def _resolve_order(
+        self,
+        order_id: Optional[str],
+        client_order_id: Optional[str],
+        symbol: Optional[str],
+    ) -> Tuple[str, int]:
+        """
+        按本地索引解析订单的 digest 和 product_id
+
+        Raises:
+            ValueError: 订单ID无效，或本地没有该订单且未提供 symbol
+        """
+        if order_id:
+            try:
+                digest = order_id_to_digest(order_id)
+            except ValueError:
+                raise ValueError(f"无效的订单ID: {order_id}")
+        else:
+            digest = self._client_digests.get(str(client_order_id))
+            if digest is None:
+                raise ValueError(f"未知的客户端订单ID: {client_order_id}")
+        product_id = self._order_products.get(digest)
+        if product_id is None:
+            if not symbol:
+                raise ValueError(f"未知订单 {order_id or client_order_id}，撤单需要提供 symbol")
+            product_id = self._product_id(symbol)
+        return digest, product_id
+
+    # ==================== 订单构造 ====================
+
+    def _build_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: Decimal,
+        price: Optional[Decimal],
+        time_in_force: str,
+        reduce_only: bool,
+        post_only: bool = False,
+    ) -> Tuple[int, OrderParams, str]:
+        """
+        构造并在本地计算 digest 的订单参数
+
+        Returns:
+            (product_id, order, digest)
+        """
+        market = self._get_market(symbol)
+        product_id = int(market.product_id)
+        is_buy = side.lower() in ["buy", "long"]
+
+        if order_type.lower() == "market":
+            # 市价单：以买一/卖一加滑点的价格下 IOC 限价单
+            self._throttle("query")
+            market_price = self.engine.get_market_price(product_id)
+            reference = _from_x18(market_price.ask_x18 if is_buy else market_price.bid_x18)
+            if reference <= 0:
+                raise Exception(f"{symbol} 盘口为空，无法下市价单")
+            price = reference * (1 + self.market_slippage) if is_buy else reference * (1 - self.market_slippage)
+            time_in_force = "ioc"
+        elif order_type.lower() != "limit":
+            raise ValueError(f"不支持的订单类型: {order_type}")
+        if price is None:
+            raise ValueError("限价单必须提供价格")
+
+        # 价格取整时不比请求价格更激进：买单向下、卖单向上
+        price_x18 = _round_to_increment(
+            _to_x18(price), int(market.price_increment_x18), ROUND_FLOOR if is_buy else ROUND_CEILING
+        )
+        amount_x18 = _round_to_increment(_to_x18(quantity), int(market.size_increment), ROUND_FLOOR)
+        if amount_x18 <= 0 or amount_x18 < int(market.min_size):
+            raise ValueError(f"订单数量 {quantity} 小于 {symbol} 的最小下单量 {_from_x18(market.min_size)}")
+
+        execution_type = NadoOrderType.POST_ONLY if post_only else TIME_IN_FORCE_MAP.get(time_in_force.lower())
+        if execution_type is None:
+            raise ValueError(f"不支持的订单有效期: {time_in_force}")
+
+        order = OrderParams(
+            sender=self.sender,
+            priceX18=price_x18,
+            amount=amount_x18 if is_buy else -amount_x18,
+            expiration=get_expiration_timestamp(self.order_ttl_seconds),
+            nonce=gen_order_nonce(),
+            appendix=build_appendix(execution_type, reduce_only=reduce_only),
+        )
+        digest = self.engine.get_order_digest(order, product_id)
+        return product_id, order, digest
+
+    @staticmethod
+    def _client_id(client_order_id: Optional[str]) -> Optional[int]:
+        """Nado 的自定义订单 id 必须是整数，其他格式只在本地记录"""
+        if client_order_id and str(client_order_id).isdigit():
+            return int(client_order_id)
+        return None
+
+    def _order_from_params(
+        self,
+        symbol: str,
+        order_type: str,
+        order: OrderParams,
+        digest: str,
+        time_in_force: str,
+        reduce_only: bool,
+        client_order_id: Optional[str],
+    ) -> Order:
+        amount = int(order.amount)
+        return Order(
+            order_id=digest_to_order_id(digest),
+            symbol=symbol,
+            side="buy" if amount > 0 else "sell",
+            order_type=order_type.lower(),
+            quantity=_from_x18(abs(amount)),
+            price=_from_x18(order.priceX18),
+            status="pending",
+            time_in_force=time_in_force,
+            reduce_only=reduce_only,
+            client_order_id=client_order_id,
+            created_at=int(time.time() * 1000),
+        )
+
+    def _nado_order_to_order(self, order_data, product_id: int) -> Order:
+        """将 Nado 挂单（OrderData 或 FastOrderData）转换为 Order 对象"""
+        amount = int(order_data.amount)
+        unfilled = int(order_data.unfilled_amount)
+        filled = _from_x18(abs(amount - unfilled))
+        digest = order_data.digest.lower()
+        return Order(
+            order_id=digest_to_order_id(digest),
+            symbol=self._symbol(product_id),
+            side="buy" if amount > 0 else "sell",
+            order_type="limit",
+            quantity=_from_x18(abs(amount)),
+            price=_from_x18(order_data.price_x18),
+            filled_quantity=filled,
+            status="partially_filled" if filled > 0 else "open",
+            client_order_id=self._order_client_ids.get(digest),
+            created_at=int(order_data.placed_at) * 1000,
+        )
+
+    def _historical_order_to_order(self, order_data) -> Order:
+        """将 indexer 历史订单（已不在挂单中）转换为 Order 对象"""
+        amount = int(order_data.amount)
+        filled = abs(int(order_data.base_filled))
+        digest = order_data.digest.lower()
+        avg_fill_price = None
+        if filled:
+            avg_fill_price = abs(Decimal(int(order_data.quote_filled))) / filled
+        return Order(
+            order_id=digest_to_order_id(digest),
+            symbol=self._symbol(int(order_data.product_id)),
+            side="buy" if amount > 0 else "sell",
+            order_type="limit",
+            quantity=_from_x18(abs(amount)),
+            price=_from_x18(order_data.price_x18),
+            filled_quantity=_from_x18(filled),
+            status="filled" if filled >= abs(amount) else "cancelled",
+            client_order_id=self._order_client_ids.get(digest),
+            avg_fill_price=avg_fill_price,
+        )
+
+    # ==================== BasePerpAdapter ====================
+
+    def connect(self) -> bool:
+        """
+        连接到 Nado：加载交易对信息
+
+        Returns:
+            bool: 连接是否成功
+        """
+        try:
+            self._load_markets()
+            return True
+        except Exception as e:
+            logger.error("[Nado] 加载交易对失败: %s", e)
+            return False
+
+    def get_balance(self) -> Balance:
+        """
+        查询账户余额
+
+        healths 依次为初始保证金、维持保证金和未加权的健康度；
+        未加权健康度即账户权益，初始保证金健康度即可用于开仓的保证金。
+        """
+        self._throttle("query")
+        info = self.engine.get_subaccount_info(self.sender)
+        initial = _from_x18(info.healths[0].health)
+        equity = _from_x18(info.healths[-1].health)
+        quote_balance = Decimal("0")
+        for balance in info.spot_balances:
+            if balance.product_id == 0:
+                quote_balance = _from_x18(balance.balance.amount)
+        unrealized_pnl = sum((pnl for _, _, pnl in self._perp_balances(info)), Decimal("0"))
+        return Balance(
+            total_balance=quote_balance,
+            available_balance=initial,
+            equity=equity,
+            unrealized_pnl=unrealized_pnl,
+            margin_used=equity - initial,
+            margin_available=initial,
+        )
+
+    @staticmethod
+    def _perp_balances(info) -> List[Tuple[Any, Decimal, Decimal]]:
+        """返回 (持仓, 标记价格, 未实现盈亏) 列表，只包含数量不为 0 的持仓"""
+        oracle_prices = {p.product_id: _from_x18(p.oracle_price_x18) for p in info.perp_products}
+        result = []
+        for balance in info.perp_balances:
+            amount = _from_x18(balance.balance.amount)
+            if amount == 0:
+                continue
+            mark_price = oracle_prices.get(balance.product_id, Decimal("0"))
+            v_quote = _from_x18(balance.balance.v_quote_balance)
+            result.append((balance, mark_price, amount * mark_price + v_quote))
+        return result
+
+    def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        """查询持仓信息"""
+        try:
+            product_filter = self._product_id(symbol) if symbol else None
+            self._throttle("query")
+            info = self.engine.get_subaccount_info(self.sender)
+            positions = []
+            for balance, mark_price, pnl in self._perp_balances(info):
+                if product_filter is not None and balance.product_id != product_filter:
+                    continue
+                amount = _from_x18(balance.balance.amount)
+                v_quote = _from_x18(balance.balance.v_quote_balance)
+                positions.append(Position(
+                    symbol=self._symbol(balance.product_id),
+                    size=abs(amount),
+                    side="long" if amount > 0 else "short",
+                    # 开仓均价由 v_quote_balance 推算（包含已结算的资金费）
+                    entry_price=abs(v_quote / amount),
+                    mark_price=mark_price,
+                    unrealized_pnl=pnl,
+                ))
+            return positions
+        except Exception as e:
+            logger.exception("[Nado] 查询持仓异常: %s", e)
+            raise Exception(f"Nado 查询持仓失败: {e}")
+
+    def place_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: Decimal,
+        price: Optional[Decimal] = None,
+        time_in_force: str = "gtc",
+        reduce_only: bool = False,
+        client_order_id: Optional[str] = None,
+        **kwargs
+    ) -> Order:
+        """
+        下单
+
+        Args:
+            **kwargs: post_only=True 时下只做 Maker 的订单
+        """
+        product_id, order, digest = self._build_order(
+            symbol, side, order_type, quantity, price, time_in_force, reduce_only,
+            post_only=bool(kwargs.get("post_only")),
+        )
+        self._throttle("order")
+        try:
+            self.engine.place_order(PlaceOrderParams(
+                id=self._client_id(client_order_id),
+                product_id=product_id,
+                order=order,
+                digest=digest,
+            ))
+        except Exception as e:
+            self._record_event(
+                "place_failed", symbol=symbol, side=side, price=price, quantity=quantity,
+                client_order_id=client_order_id, status="failed", error=str(e),
+            )
+            raise Exception(f"Nado 下单失败: {e}")
+
+        self._remember_order(digest, product_id, client_order_id)
+        result = self._order_from_params(
+            symbol, order_type, order, digest, time_in_force, reduce_only, client_order_id
+        )
+        self._record_event(
+            "place", symbol=self._symbol(product_id), side=result.side, price=result.price, quantity=result.quantity,
+            order_id=result.order_id, client_order_id=client_order_id, status="pending",
+        )
+        return result
+
+    def cancel_order(
+        self,
+        order_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+    ) -> bool:
+        """撤单（按本地计算的 digest 撤单，不需要先查询订单）"""
+        results = self.cancel_orders(
+            order_ids=[order_id] if order_id else None,
+            symbol=symbol,
+            client_order_ids=[client_order_id] if not order_id and client_order_id else None,
+        )
+        if not results:
+            raise ValueError("撤单必须提供 order_id 或 client_order_id")
+        if not results[0].success:
+            raise Exception(f"Nado 撤单失败: {results[0].error}")
+        return True
+
+    def cancel_orders(
+        self,
+        order_ids: Optional[List[str]] = None,
+        symbol: Optional[str] = None,
+        client_order_ids: Optional[List[str]] = None,
+    ) -> List[OrderResult]:
+        """
+        批量撤单（一次 cancel_orders 请求按 digest 撤销整个列表）
+
+        Args:
+            order_ids: 订单ID列表
+            symbol: 交易对符号（本地没有记录的订单需要）
+            client_order_ids: 客户端订单ID列表
+
+        Returns:
+            List[OrderResult]: 先 order_ids 后 client_order_ids 顺序对应的结果
+        """
+        targets = [(str(i), None) for i in order_ids or []]
+        targets += [(None, str(i)) for i in client_order_ids or []]
+
+        # 无法解析的订单不发送，对应位置直接返回失败
+        resolved: List[Optional[Tuple[str, int]]] = []
+        errors: List[Optional[str]] = []
+        for order_id, client_order_id in targets:
+            try:
+                resolved.append(self._resolve_order(order_id, client_order_id, symbol))
+                errors.append(None)
+            except ValueError as e:
+                resolved.append(None)
+                errors.append(str(e))
+
+        to_cancel = list(dict.fromkeys(r for r in resolved if r is not None))
+        cancelled: Optional[set] = None
+        request_error = None
+        if to_cancel:
+            try:
+                self._throttle("cancel")
+                response = self.engine.cancel_orders(CancelOrdersParams(
+                    sender=self.sender,
+                    productIds=[product_id for _, product_id in to_cancel],
+                    digests=[digest for digest, _ in to_cancel],
+                ))
+                data = getattr(response, "data", None)
+                if data is not None and hasattr(data, "cancelled_orders"):
+                    cancelled = {o.digest.lower() for o in data.cancelled_orders}
+            except Exception as e:
+                request_error = str(e)
+
+        results: List[OrderResult] = []
+        for (order_id, client_order_id), target, error in zip(targets, resolved, errors):
+            if target is not None:
+                digest = target[0]
+                if request_error is not None:
+                    error = request_error
+                elif cancelled is not None and digest not in cancelled:
+                    error = "订单不存在或已成交"
+                if error is None or cancelled is not None:
+                    # 撤单成功或订单已不在挂单中，都不再需要本地索引
+                    self._forget_order(digest)
+                order_id = order_id if order_id is not None else digest_to_order_id(digest)
+            results.append(OrderResult(
+                success=error is None, order_id=order_id, client_order_id=client_order_id, error=error,
+            ))
+            self._record_event(
+                "cancel", symbol=symbol, order_id=order_id, client_order_id=client_order_id,
+                status="success" if error is None else "failed", error=error,
+            )
+        return results
+
+    def cancel_all_orders(
+        self,
+        symbol: Optional[str] = None,
+    ) -> bool:
+        """撤销所有订单（cancel_product_orders，productIds 为空时撤销所有交易对）"""
+        product_ids = [self._product_id(symbol)] if symbol else []
+        self._throttle("cancel")
+        try:
+            self.engine.cancel_product_orders(CancelProductOrdersParams(
+                sender=self.sender,
+                productIds=product_ids,
+            ))
+        except Exception as e:
+            self._record_event("cancel_all", symbol=symbol, status="failed", error=str(e))
+            raise Exception(f"Nado 撤销所有订单失败: {e}")
+
+        with self._lock:
+            for digest, product_id in list(self._order_products.items()):
+                if not product_ids or product_id in product_ids:
+                    self._order_products.pop(digest, None)
+                    client_order_id = self._order_client_ids.pop(digest, None)
+                    if client_order_id is not None:
+                        self._client_digests.pop(client_order_id, None)
+        self._record_event("cancel_all", symbol=symbol, status="success")
+        return True
+
+    def replace_orders(self, replaces: List[OrderReplace]) -> List[Optional[Order]]:
+        """
+        批量改单：每个改单使用一个 cancel_and_place 请求，撤单和下单原子执行
+
+        旧订单已成交或已撤销时整个请求失败、不会下新单，对应位置返回 None；
+        本地没有记录且未提供 symbol 的旧订单只下新单。
+
+        Args:
+            replaces: 改单请求列表
+
+        Returns:
+            List[Optional[Order]]: 与 replaces 一一对应的新订单，失败的位置为 None
+        """
+        if not replaces:
+            return []
+        executor = self._get_executor()
+        futures = [executor.submit(self._replace_one, r) for r in replaces]
+        results: List[Optional[Order]] = []
+        for r, future in zip(replaces, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.warning("改单失败: order_id=%s, 价格=%s, 错误=%s", r.order_id or r.client_order_id, r.price, e)
+                results.append(None)
+        return results
+
+    def _replace_one(self, r: OrderReplace) -> Order:
+        try:
+            old_digest, old_product_id = self._resolve_order(r.order_id, r.client_order_id, r.symbol)
+        except ValueError as e:
+            logger.warning("改单撤单失败: order_id=%s, 错误=%s", r.order_id or r.client_order_id, e)
+            return self.place_order(
+                symbol=r.symbol, side=r.side, order_type=r.order_type, quantity=r.quantity,
+                price=r.price, time_in_force=r.time_in_force, reduce_only=r.reduce_only,
+                client_order_id=r.new_client_order_id,
+            )
+
+        product_id, order, digest = self._build_order(
+            r.symbol, r.side, r.order_type, r.quantity, r.price, r.time_in_force, r.reduce_only,
+        )
+        self._throttle("order")
+        old_order_id = digest_to_order_id(old_digest)
+        try:
+            self.engine.cancel_and_place(CancelAndPlaceParams(
+                cancel_orders=CancelOrdersParams(
+                    sender=self.sender,
+                    productIds=[old_product_id],
+                    digests=[old_digest],
+                ),
+                place_order=PlaceOrderParams(
+                    id=self._client_id(r.new_client_order_id),
+                    product_id=product_id,
+                    order=order,
+                    digest=digest,
+                ),
+            ))
+        except Exception as e:
+            self._record_event(
+                "place_failed", symbol=r.symbol, side=r.side, price=r.price, quantity=r.quantity,
+                client_order_id=r.new_client_order_id, status="failed", error=str(e),
+            )
+            raise
+
+        self._forget_order(old_digest)
+        self._remember_order(digest, product_id, r.new_client_order_id)
+        result = self._order_from_params(
+            r.symbol, r.order_type, order, digest, r.time_in_force, r.reduce_only, r.new_client_order_id
+        )
+        self._record_event(
+            "cancel", symbol=r.symbol, order_id=old_order_id, client_order_id=r.client_order_id, status="success",
+        )
+        self._record_event(
+            "place", symbol=self._symbol(product_id), side=result.side, price=result.price, quantity=result.quantity,
+            order_id=result.order_id, client_order_id=r.new_client_order_id, status="pending",
+        )
+        return result
+
+    def get_order(
+        self,
+        order_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+    ) -> Optional[Order]:
+        """
+        查询订单状态
+
+        仍在挂单中的订单从引擎查询；引擎中已不存在的订单（已成交/已撤销/已过期）从 indexer
+        查询最终成交量，完全成交返回 "filled"，否则返回 "cancelled"（filled_quantity 为部分成交量）。
+        indexer 尚未收录的订单返回 None。
+
+        Raises:
+            Exception: 查询失败时抛出异常
+        """
+        try:
+            digest, product_id = self._resolve_order(order_id, client_order_id, symbol)
+        except ValueError:
+            return None
+        self._throttle("query")
+        try:
+            order_data = self.engine.get_order(product_id, digest)
+            order = self._nado_order_to_order(order_data, product_id)
+            self._record_fills([order])
+            return order
+        except QueryFailedException as e:
+            logger.debug("[Nado] 订单 %s 不在挂单中: %s", digest, e)
+        except Exception as e:
+            raise Exception(f"Nado 查询订单失败: {e}")
+
+        self._throttle("query")
+        try:
+            data = self.client.context.indexer_client.get_historical_orders_by_digest([digest])
+        except Exception as e:
+            raise Exception(f"Nado 查询历史订单失败: {e}")
+        for order_data in data.orders:
+            if order_data.digest.lower() == digest:
+                order = self._historical_order_to_order(order_data)
+                self._record_fills([order])
+                return order
+        return None
+
+    def get_open_orders(
+        self,
+        symbol: Optional[str] = None,
+    ) -> List[Order]:
+        """查询所有未成交订单（一次 multi-product 请求覆盖所有交易对）"""
+        if symbol:
+            product_ids = [self._product_id(symbol)]
+        else:
+            if not self._symbols_by_product:
+                self._load_markets()
+            product_ids = sorted(self._symbols_by_product)
+        if not product_ids:
+            return []
+
+        self._throttle("query")
+        data = self.engine.get_subaccount_multi_products_open_orders(product_ids, self.sender)
+        orders = []
+        open_digests = set()
+        for product_orders in data.product_orders:
+            for order_data in product_orders.orders:
+                order = self._nado_order_to_order(order_data, product_orders.product_id)
+                open_digests.add(order_data.digest.lower())
+                with self._lock:
+                    self._order_products[order_data.digest.lower()] = product_orders.product_id
+                orders.append(order)
+
+        self._reconcile_fills(orders, self._symbol(product_ids[0]) if symbol else None)
+
+        # 已成交/已撤销的订单不再保留在本地索引中
+        queried = set(product_ids)
+        for digest, product_id in list(self._order_products.items()):
+            if product_id in queried and digest not in open_digests:
+                self._forget_order(digest)
+        return orders
+
+    def _journal_closed_orders(self, orders: List[Tuple[str, str]]) -> None:
+        """已不在挂单中的订单：一次 indexer 请求查询所有订单的最终成交"""
+        digests = [order_id_to_digest(order_id) for order_id, _ in orders]
+        self._throttle("query")
+        data = self.client.context.indexer_client.get_historical_orders_by_digest(digests)
+        self._record_fills([self._historical_order_to_order(o) for o in data.orders])
+
+    def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        """
+        获取交易对的最新价格信息
+
+        Args:
+            symbol: 交易对符号，如 "BTC-PERP"
+
+        Returns:
+            Dict[str, Any]: 包含买一价、卖一价、中间价
+        """
+        try:
+            product_id = self._product_id(symbol)
+            self._throttle("query")
+            market_price = self.engine.get_market_price(product_id)
+            bid = float(_from_x18(market_price.bid_x18)) or None
+            ask = float(_from_x18(market_price.ask_x18)) or None
+            return {
+                "symbol": self._symbol(product_id),
+                "bid_price": bid,
+                "ask_price": ask,
+                "mid_price": (bid + ask) / 2 if bid and ask else None,
+                "last_price": None,
+                "mark_price": None,
+                "index_price": None,
+                "timestamp": int(time.time() * 1000),
+            }
+        except Exception as e:
+            raise Exception(f"获取价格失败: {e}")
+
+    def get_orderbook(
+        self,
+        symbol: str,
+        depth: int = 20,
+    ) -> Dict[str, Any]:
+        """获取订单簿，bids/asks 为 [价格, 数量] 列表"""
+        product_id = self._product_id(symbol)
+        self._throttle("query")
+        liquidity = self.engine.get_market_liquidity(product_id, depth)
+        return {
+            "symbol": self._symbol(product_id),
+            "bids": [[float(_from_x18(p)), float(_from_x18(q))] for p, q in liquidity.bids],
+            "asks": [[float(_from_x18(p)), float(_from_x18(q))] for p, q in liquidity.asks],
+            "timestamp": int(time.time() * 1000),
+        }
@@ -6,16 +6,18 @@ This module implements BasePerpAdapter for StandX exchange.
 import sys
 import os
 import time
+import logging
 import base64
 import base58
-from typing import Dict, Any, Optional, List
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
 from decimal import Decimal
 
 # 添加项目路径
 project_root = os.path.join(os.path.dirname(__file__), '..')
 sys.path.insert(0, project_root)
 
-from adapters.base_adapter import BasePerpAdapter, Balance, Position, Order
+from adapters.base_adapter import BasePerpAdapter, Balance, Position, Order, OrderResult, new_client_order_id
 
 # 导入 StandX 相关模块
 import sys
@@ -29,10 +31,33 @@ from eth_account.messages import encode_defunct
 from eth_account import Account
 from web3 import Web3
 
+logger = logging.getLogger(__name__)
+
+# StandXAuth.login 默认的 token 有效期（秒）
+TOKEN_EXPIRES_SECONDS = 604800
+# 缓存的 token 剩余有效期少于该值时重新登录
+TOKEN_MIN_TTL_SECONDS = 3600
+# 本地保留的 request_id -> cl_ord_id 映射数量上限（超出时丢弃最早的）
+MAX_TRACKED_REQUESTS = 10000
+
+# StandX 订单状态 -> OrderStatus 取值
+ORDER_STATUS_MAP = {
+    "new": "open",
+    "open": "open",
+    "pending": "pending",
+    "partially_filled": "partially_filled",
+    "filled": "filled",
+    "cancelled": "cancelled",
+    "canceled": "cancelled",
+    "rejected": "rejected",
+}
+
 
 class StandXAdapter(BasePerpAdapter):
     """StandX 交易所适配器实现"""
     
+    reports_order_fills = True
+    
     def __init__(self, config: Dict[str, Any]):
         """
         初始化 StandX 适配器
@@ -46,6 +71,8 @@ class StandXAdapter(BasePerpAdapter):
                     - private_key: 钱包私钥
                     - chain: 链名称，如 "bsc" 或 "solana"
                 - base_url: API 基础 URL（可选，默认 https://perps.standx.com）
+                - credential_cache: 是否缓存登录 token（可选，默认 True，仅钱包私钥方式）
+                - credential_cache_dir: token 缓存目录（可选）
         """
         super().__init__(config)
         
@@ -95,6 +122,13 @@ class StandXAdapter(BasePerpAdapter):
             account = Web3().eth.account.from_key(private_key)
             self.wallet_address = account.address
             self.token: Optional[str] = None
+        
+        # 登录 token 缓存：重启时跳过钱包登录
+        self.credential_cache = self._get_credential_cache()
+        # 本次 connect() 是否真正登录过（否则使用的是缓存的 token）
+        self._logged_in = False
+        # 下单返回的是 request_id 而不是订单ID：request_id -> cl_ord_id，查询/撤单时按 cl_ord_id
+        self._request_client_ids: Dict[str, str] = {}
     
     def _parse_signing_key(self, signing_key: str) -> bytes:
         """
@@ -172,27 +206,86 @@ class StandXAdapter(BasePerpAdapter):
                 # token 已经在 __init__ 中设置为 api_key
                 return True
             else:
-                # 钱包私钥方式：需要先登录获取 token
-                def sign_message(msg: str) -> str:
-                    return self._sign_message(msg)
+                # 钱包私钥方式：优先使用缓存的 token（token 与请求签名密钥绑定，一起缓存）
+                if self.credential_cache is None:
+                    credential, _ = self._wallet_login()
+                    self._use_credential(credential)
+                    return True
                 
-                login_response = self.auth.authenticate(
-                    chain=self.chain,
-                    wallet_address=self.wallet_address,
-                    sign_message=sign_message
-                )
-                
-                self.token = login_response.token
+                account = f"{self.chain}:{self.wallet_address}"
+                self._logged_in = False
+                self._use_credential(self._cached_credential(account))
+                if not self._logged_in and not self._token_accepted():
+                    # 交易所拒绝了缓存的 token（撤销、服务端登出）：删除缓存，重新登录一次
+                    logger.warning("[StandX] 缓存的 token 已失效，重新登录")
+                    self.credential_cache.invalidate("standx", account)
+                    self.auth = StandXAuth()
+                    self._use_credential(self._cached_credential(account))
                 return True
         except Exception as e:
             raise Exception(f"StandX 认证失败: {e}")
     
+    def _cached_credential(self, account: str) -> Dict[str, str]:
+        return self.credential_cache.get_or_create(
+            "standx",
+            account,
+            secret=self.private_key,
+            create=self._wallet_login,
+            min_ttl=TOKEN_MIN_TTL_SECONDS,
+        )
+    
+    def _use_credential(self, credential: Dict[str, str]) -> None:
+        self.auth = StandXAuth(private_key=base64.b64decode(credential["signing_key"]))
+        self.token = credential["token"]
+    
+    def _token_accepted(self) -> bool:
+        """用一次余额查询检查 token 是否仍然有效（只有 401/403 才视为无效，网络错误不算）"""
+        try:
+            self._throttle("query")
+            self.http_client.query_balance(self.token)
+        except Exception as e:
+            return not any(code in str(e) for code in ("HTTP 401", "HTTP 403"))
+        return True
+    
+    def _wallet_login(self):
+        """
+        钱包签名登录
+        
+        Returns:
+            (凭证, 过期时间戳)：凭证包含 token 和对应的 Ed25519 签名私钥（base64）
+        """
+        def sign_message(msg: str) -> str:
+            return self._sign_message(msg)
+        
+        self._logged_in = True
+        login_response = self.auth.authenticate(
+            chain=self.chain,
+            wallet_address=self.wallet_address,
+            sign_message=sign_message
+        )
+        
+        # token 是 JWT 时使用其中的 exp，否则按登录有效期（7 天）计算
+        expires_at = time.time() + TOKEN_EXPIRES_SECONDS
+        try:
+            exp = self.auth._parse_jwt(login_response.token).get("exp")
+            if exp:
+                expires_at = float(exp)
+        except Exception:
+            pass
+        
+        credential = {
+            "token": login_response.token,
+            "signing_key": base64.b64encode(self.auth.export_private_key()).decode("utf-8"),
+        }
+        return credential, expires_at
+    
     def get_balance(self) -> Balance:
         """查询账户余额"""
         if not self.token:
             raise Exception("未认证，请先调用 connect()")
         
         try:
+            self._throttle("query")
             balance_data = self.http_client.query_balance(self.token)
             
             return Balance(
@@ -220,6 +313,7 @@ class StandXAdapter(BasePerpAdapter):
             raise Exception("未认证，请先调用 connect()")
         
         try:
+            self._throttle("query")
             positions_data = self.http_client.query_positions(
                 token=self.token,
                 symbol=symbol
@@ -283,6 +377,11 @@ class StandXAdapter(BasePerpAdapter):
             else:
                 side_str = side
             
+            # 下单响应中没有订单ID，总是带上 cl_ord_id 以便之后查询和撤单
+            if not client_order_id:
+                client_order_id = new_client_order_id()
+            
+            self._throttle("order")
             response = self.http_client.place_order(
                 token=self.token,
                 symbol=symbol,
@@ -301,7 +400,14 @@ class StandXAdapter(BasePerpAdapter):
                 raise Exception(f"下单失败: {response.get('message', '未知错误')}")
             
             # 构造订单对象
-            order_id = response.get("request_id", "")
+            order_id = str(response.get("request_id", ""))
+            self._request_client_ids[order_id] = client_order_id
+            if len(self._request_client_ids) > MAX_TRACKED_REQUESTS:
+                self._request_client_ids.pop(next(iter(self._request_client_ids)))
+            self._record_event(
+                "place", symbol=symbol, side=side_str, price=price, quantity=quantity,
+                order_id=order_id, client_order_id=client_order_id, status="pending",
+            )
             
             return Order(
                 order_id=order_id,
@@ -316,6 +422,10 @@ class StandXAdapter(BasePerpAdapter):
                 client_order_id=client_order_id,
             )
         except Exception as e:
+            self._record_event(
+                "place_failed", symbol=symbol, side=side, price=price, quantity=quantity,
+                client_order_id=client_order_id, status="failed", error=e,
+            )
             raise Exception(f"下单失败: {e}")
     
     def cancel_order(
@@ -341,6 +451,10 @@ class StandXAdapter(BasePerpAdapter):
         if not order_id and not client_order_id:
             raise ValueError("必须提供 order_id 或 client_order_id")
         
+        if order_id and str(order_id) in self._request_client_ids:
+            # place_order 返回的 request_id：按 cl_ord_id 撤单
+            order_id, client_order_id = None, client_order_id or self._request_client_ids[str(order_id)]
+        
         try:
             order_id_list = None
             cl_ord_id_list = None
@@ -355,12 +469,16 @@ class StandXAdapter(BasePerpAdapter):
             if client_order_id:
                 cl_ord_id_list = [client_order_id]
             
+            self._throttle("cancel")
             result = self.http_client.cancel_orders(
                 token=self.token,
                 order_id_list=order_id_list,
                 cl_ord_id_list=cl_ord_id_list,
                 auth=self.auth
             )
+            self._record_event(
+                "cancel", symbol=symbol, order_id=order_id, client_order_id=client_order_id
+            )
             
             # API 返回空数组表示成功
             return True
@@ -405,23 +523,91 @@ class StandXAdapter(BasePerpAdapter):
                 return True  # 没有有效的订单ID
             
             # 批量撤单
+            self._throttle("cancel")
             result = self.http_client.cancel_orders(
                 token=self.token,
                 order_id_list=order_id_list,
                 auth=self.auth
             )
+            self._record_event("cancel_all", symbol=symbol, notes=f"count={len(order_id_list)}")
             
             return True
         except Exception as e:
             raise Exception(f"批量撤单失败: {e}")
     
+    def cancel_orders(
+        self,
+        order_ids: Optional[List[str]] = None,
+        symbol: Optional[str] = None,
+        client_order_ids: Optional[List[str]] = None,
+    ) -> List[OrderResult]:
+        """
+        批量撤单（一次 cancel_orders 请求撤销整个列表）
+        
+        Args:
+            order_ids: 订单ID列表
+            symbol: 交易对符号（可选，仅用于记录）
+            client_order_ids: 客户端订单ID列表
+        
+        Returns:
+            List[OrderResult]: 先 order_ids 后 client_order_ids 顺序对应的结果
+        """
+        if not self.token:
+            raise Exception("未认证，请先调用 connect()")
+        
+        # place_order 返回的 request_id 按 cl_ord_id 撤单；无效的订单ID不发送，对应位置直接返回失败
+        parsed: List[Tuple[Optional[int], Optional[str]]] = []
+        for order_id in order_ids or []:
+            mapped = self._request_client_ids.get(str(order_id))
+            if mapped:
+                parsed.append((None, mapped))
+                continue
+            try:
+                parsed.append((int(order_id), None))
+            except (ValueError, TypeError):
+                parsed.append((None, None))
+        order_id_list = [i for i, _ in parsed if i is not None]
+        cl_ord_id_list = [c for _, c in parsed if c is not None]
+        cl_ord_id_list += [str(i) for i in client_order_ids or []]
+        
+        error = None
+        if order_id_list or cl_ord_id_list:
+            try:
+                self._throttle("cancel")
+                self.http_client.cancel_orders(
+                    token=self.token,
+                    order_id_list=order_id_list or None,
+                    cl_ord_id_list=cl_ord_id_list or None,
+                    auth=self.auth
+                )
+            except Exception as e:
+                error = str(e)
+        
+        results: List[OrderResult] = []
+        for raw_id, (order_id, cl_ord_id) in zip(order_ids or [], parsed):
+            if order_id is None and cl_ord_id is None:
+                results.append(OrderResult(success=False, order_id=str(raw_id), error=f"无效的订单ID: {raw_id}"))
+                continue
+            if cl_ord_id is not None:
+                results.append(OrderResult(
+                    success=error is None, order_id=str(raw_id), client_order_id=cl_ord_id, error=error,
+                ))
+                self._record_event("cancel", symbol=symbol, order_id=raw_id, client_order_id=cl_ord_id, error=error)
+                continue
+            results.append(OrderResult(success=error is None, order_id=str(order_id), error=error))
+            self._record_event("cancel", symbol=symbol, order_id=order_id, error=error)
+        for cl_ord_id in client_order_ids or []:
+            results.append(OrderResult(success=error is None, client_order_id=str(cl_ord_id), error=error))
+            self._record_event("cancel", symbol=symbol, client_order_id=str(cl_ord_id), error=error)
+        return results
+    
     def cancel_orders_by_ids(
         self,
         order_id_list: Optional[List[int]] = None,
         cl_ord_id_list: Optional[List[str]] = None,
     ) -> bool:
         """
-        批量撤单（根据订单ID列表）
+        批量撤单（根据订单ID列表，兼容旧接口，新代码请使用 cancel_orders）
         
         Args:
             order_id_list: 订单ID列表
@@ -430,22 +616,55 @@ class StandXAdapter(BasePerpAdapter):
         Returns:
             bool: 撤单是否成功
         """
-        if not self.token:
-            raise Exception("未认证，请先调用 connect()")
-        
         if not order_id_list and not cl_ord_id_list:
             raise ValueError("必须提供 order_id_list 或 cl_ord_id_list")
         
-        try:
-            result = self.http_client.cancel_orders(
-                token=self.token,
-                order_id_list=order_id_list,
-                cl_ord_id_list=cl_ord_id_list,
-                auth=self.auth
-            )
-            return True
-        except Exception as e:
-            raise Exception(f"批量撤单失败: {e}")
+        results = self.cancel_orders(order_ids=order_id_list, client_order_ids=cl_ord_id_list)
+        failed = [r for r in results if not r.success]
+        if failed:
+            raise Exception(f"批量撤单失败: {failed[0].error}")
+        return True
+    
+    def _standx_order_to_order(self, order_data: Dict[str, Any]) -> Order:
+        """将 StandX 订单格式转换为 Order 对象"""
+        status = ORDER_STATUS_MAP.get(str(order_data.get("status", "")).lower(), "pending")
+        filled = Decimal(str(order_data.get("fill_qty") or "0"))
+        avg_fill_price = order_data.get("fill_avg_price")
+        if status == "open" and filled > 0:
+            status = "partially_filled"
+        
+        # 解析时间戳
+        created_at = None
+        updated_at = None
+        if order_data.get("created_at"):
+            try:
+                dt = datetime.fromisoformat(order_data["created_at"].replace("Z", "+00:00"))
+                created_at = int(dt.timestamp() * 1000)
+            except:
+                pass
+        if order_data.get("updated_at"):
+            try:
+                dt = datetime.fromisoformat(order_data["updated_at"].replace("Z", "+00:00"))
+                updated_at = int(dt.timestamp() * 1000)
+            except:
+                pass
+        
+        return Order(
+            order_id=str(order_data.get("id", "")),
+            symbol=order_data.get("symbol", ""),
+            side=order_data.get("side", "").lower(),
+            order_type=order_data.get("order_type", "").lower(),
+            quantity=Decimal(str(order_data.get("qty", "0"))),
+            price=Decimal(str(order_data.get("price", "0"))) if order_data.get("price") else None,
+            filled_quantity=filled,
+            status=status,
+            time_in_force=order_data.get("time_in_force", "gtc").lower(),
+            reduce_only=order_data.get("reduce_only", False),
+            client_order_id=order_data.get("cl_ord_id"),
+            created_at=created_at,
+            updated_at=updated_at,
+            avg_fill_price=Decimal(str(avg_fill_price)) if filled and avg_fill_price else None,
+        )
     
     def get_order(
         self,
@@ -454,12 +673,47 @@ class StandXAdapter(BasePerpAdapter):
         client_order_id: Optional[str] = None,
     ) -> Optional[Order]:
         """
-        查询订单状态
+        查询订单状态（包括已成交/已撤销的订单）
+        
+        Args:
+            order_id: 订单ID，或 place_order 返回的 request_id
+            symbol: 交易对符号（可选）
+            client_order_id: 客户端订单ID（可选）
         
-        注意: 需要根据 StandX API 文档实现
+        Returns:
+            Optional[Order]: 订单信息，订单不存在时返回 None
         """
-        # TODO: 实现订单查询
-        raise NotImplementedError("StandX 订单查询功能待实现")
+        if not self.token:
+            raise Exception("未认证，请先调用 connect()")
+        
+        if not client_order_id and order_id:
+            client_order_id = self._request_client_ids.get(str(order_id))
+        if client_order_id:
+            query = {"cl_ord_id": str(client_order_id)}
+        elif order_id:
+            try:
+                query = {"order_id": int(order_id)}
+            except ValueError:
+                raise ValueError(f"无效的订单ID: {order_id}")
+        else:
+            raise ValueError("必须提供 order_id 或 client_order_id")
+        
+        try:
+            self._throttle("query")
+            order_data = self.http_client.query_order(token=self.token, **query)
+        except Exception as e:
+            raise Exception(f"查询订单失败: {e}")
+        # 兼容 {"result": {...}} 包装的响应
+        if isinstance(order_data, dict) and isinstance(order_data.get("result"), dict):
+            order_data = order_data["result"]
+        if not order_data or not order_data.get("id"):
+            return None
+        
+        order = self._standx_order_to_order(order_data)
+        if order.status in ("filled", "cancelled", "rejected"):
+            self._request_client_ids.pop(str(order_id), None)
+        self._record_fills([order])
+        return order
     
     def get_open_orders(
         self,
@@ -478,6 +732,7 @@ class StandXAdapter(BasePerpAdapter):
             raise Exception("未认证，请先调用 connect()")
         
         try:
+            self._throttle("query")
             orders_data = self.http_client.query_open_orders(
                 token=self.token,
                 symbol=symbol,
@@ -486,59 +741,15 @@ class StandXAdapter(BasePerpAdapter):
             
             orders = []
             for order_data in orders_data.get("result", []):
-                # 映射订单状态
-                status_map = {
-                    "new": "open",
-                    "pending": "pending",
-                    "partially_filled": "partially_filled",
-                    "filled": "filled",
-                    "cancelled": "cancelled",
-                    "rejected": "rejected"
-                }
-                status = status_map.get(order_data.get("status", "").lower(), "pending")
-                
+                order = self._standx_order_to_order(order_data)
                 # 只返回未成交的订单
-                if status not in ["open", "pending", "partially_filled"]:
-                    continue
-                
-                # 解析时间戳
-                created_at = None
-                updated_at = None
-                if order_data.get("created_at"):
-                    try:
-                        from datetime import datetime
-                        dt = datetime.fromisoformat(order_data["created_at"].replace("Z", "+00:00"))
-                        created_at = int(dt.timestamp() * 1000)
-                    except:
-                        pass
-                if order_data.get("updated_at"):
-                    try:
-                        from datetime import datetime
-                        dt = datetime.fromisoformat(order_data["updated_at"].replace("Z", "+00:00"))
-                        updated_at = int(dt.timestamp() * 1000)
-                    except:
-                        pass
-                
-                order = Order(
-                    order_id=str(order_data.get("id", "")),
-                    symbol=order_data.get("symbol", ""),
-                    side=order_data.get("side", "").lower(),
-                    order_type=order_data.get("order_type", "").lower(),
-                    quantity=Decimal(str(order_data.get("qty", "0"))),
-                    price=Decimal(str(order_data.get("price", "0"))) if order_data.get("price") else None,
-                    filled_quantity=Decimal(str(order_data.get("fill_qty", "0"))),
-                    status=status,
-                    time_in_force=order_data.get("time_in_force", "gtc").lower(),
-                    reduce_only=order_data.get("reduce_only", False),
-                    client_order_id=order_data.get("cl_ord_id"),
-                    created_at=created_at,
-                    updated_at=updated_at,
-                )
-                orders.append(order)
-            
-            return orders
+                if order.status in ["open", "pending", "partially_filled"]:
+                    orders.append(order)
         except Exception as e:
             raise Exception(f"查询未成交订单失败: {e}")
+        
+        self._reconcile_fills(orders, symbol)
+        return orders
     
     def get_ticker(self, symbol: str) -> Dict[str, Any]:
         """
@@ -551,6 +762,7 @@ class StandXAdapter(BasePerpAdapter):
             Dict[str, Any]: 包含最新价、买一价、卖一价等信息
         """
         try:
+            self._throttle("query")
             price_data = self.http_client.query_symbol_price(symbol)
             
             return {
@@ -0,0 +1,32 @@
+"""
+Fill Analytics
+成交分析模块：GRVT / Nado / StandX 成交统一加载，已实现盈亏、手续费、maker 比例、成交量和持仓统计
+
+依赖 pandas，首次访问时才导入
+"""
+
+__all__ = [
+    "FILL_COLUMNS",
+    "concat_fills",
+    "from_grvt_fills",
+    "from_nado_matches",
+    "from_standx_trades",
+    "inventory",
+    "load_grvt",
+    "load_nado",
+    "load_standx",
+    "summarize",
+    "with_positions",
+]
+
+_METRICS = {"inventory", "summarize", "with_positions"}
+
+
+def __getattr__(name):
+    if name in _METRICS:
+        from analytics import metrics
+        return getattr(metrics, name)
+    if name in __all__:
+        from analytics import fills
+        return getattr(fills, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
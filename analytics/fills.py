@@ -0,0 +1,392 @@
+"""
+Fill Loaders
+成交记录加载：把 GRVT / Nado / StandX 的成交转换为统一的列式 DataFrame
+
+统一列（FILL_COLUMNS）：
+- venue: 交易所（"grvt" / "nado" / "standx"）
+- account: 子账户
+- symbol: 交易对
+- time: 成交时间（UTC，datetime64[ns]）
+- qty: 带符号成交数量，买入为正、卖出为负
+- price: 成交价格
+- fee: 手续费（正数为支付，负数为返佣）
+- is_maker: 是否为 maker 成交（未知时为 <NA>）
+- trade_id / order_id: 成交 ID / 订单 ID
+
+所有转换都按列整体进行（不逐行构造对象），百万级成交可以在秒级完成。
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+FILL_COLUMNS = [
+    "venue",
+    "account",
+    "symbol",
+    "time",
+    "qty",
+    "price",
+    "fee",
+    "is_maker",
+    "trade_id",
+    "order_id",
+]
+
+X18 = 1e18
+
+Records = Union[pd.DataFrame, Iterable[Dict[str, Any]]]
+
+
+def empty_fills() -> pd.DataFrame:
+    """返回没有成交的统一格式 DataFrame"""
+    return _finish(pd.DataFrame({name: [] for name in FILL_COLUMNS}))
+
+
+def concat_fills(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """合并多个交易所的成交，按时间升序"""
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        return empty_fills()
+    merged = pd.concat([f[FILL_COLUMNS] for f in frames], ignore_index=True)
+    return _finish(merged)
+
+
+def _frame(records: Records) -> pd.DataFrame:
+    if isinstance(records, pd.DataFrame):
+        return records
+    return pd.DataFrame.from_records(list(records))
+
+
+def _column(frame: pd.DataFrame, name: str, default: Any = None) -> pd.Series:
+    if name in frame.columns:
+        return frame[name]
+    return pd.Series(default, index=frame.index, dtype=object)
+
+
+def _numeric(values: pd.Series) -> np.ndarray:
+    return pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64")
+
+
+def _finish(frame: pd.DataFrame) -> pd.DataFrame:
+    """统一 dtype 并按时间排序"""
+    out = pd.DataFrame(
+        {
+            "venue": frame["venue"].astype("category"),
+            "account": frame["account"].astype(str).astype("category"),
+            "symbol": frame["symbol"].astype(str).astype("category"),
+            "time": pd.to_datetime(frame["time"], utc=True),
+            "qty": frame["qty"].astype("float64"),
+            "price": frame["price"].astype("float64"),
+            "fee": frame["fee"].astype("float64"),
+            "is_maker": frame["is_maker"].astype("boolean"),
+            "trade_id": frame["trade_id"].astype(str),
+            "order_id": frame["order_id"].astype(str),
+        }
+    )
+    out = out.dropna(subset=["time", "qty", "price"])
+    return out.sort_values("time", kind="stable").reset_index(drop=True)
+
+
+# ==================== GRVT ====================
+
+
+def from_grvt_fills(fills: Records, account: Optional[str] = None) -> pd.DataFrame:
+    """
+    转换 GRVT 成交
+
+    Args:
+        fills: fetch_my_trades 的 result 列表，或 GrvtHistorySync.fills() 的返回值
+            （列表或 DataFrame）
+        account: 覆盖 sub_account_id
+
+    Returns:
+        pd.DataFrame: 统一格式的成交
+    """
+    raw = _frame(fills)
+    if raw.empty:
+        return empty_fills()
+    side = np.where(_column(raw, "is_buyer").astype(str).str.lower() == "true", 1.0, -1.0)
+    is_taker = _column(raw, "is_taker")
+    return _finish(
+        pd.DataFrame(
+            {
+                "venue": "grvt",
+                "account": account if account is not None else _column(raw, "sub_account_id"),
+                "symbol": _column(raw, "instrument"),
+                "time": pd.to_datetime(
+                    pd.to_numeric(_column(raw, "event_time"), errors="coerce"), unit="ns"
+                ),
+                "qty": side * _numeric(_column(raw, "size")),
+                "price": _numeric(_column(raw, "price")),
+                "fee": np.nan_to_num(_numeric(_column(raw, "fee"))),
+                "is_maker": is_taker.map(_negate_flag),
+                "trade_id": _column(raw, "trade_id"),
+                "order_id": _column(raw, "order_id"),
+            }
+        )
+    )
+
+
+def load_grvt(
+    client: Any,
+    symbol: Optional[str] = None,
+    since: Optional[int] = None,
+    page_size: int = 1000,
+    max_pages: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    沿 cursor 拉取 GRVT 成交历史（fetch_my_trades）
+
+    需要反复分析同一账户时，建议先用 utils.history_sync.GrvtHistorySync 同步到本地，
+    再用 from_grvt_fills(sync.fills(as_dataframe=True)) 加载。
+
+    Args:
+        client: GrvtCcxt 实例
+        symbol: 只拉取该交易对
+        since: 起始时间（纳秒）
+        page_size: 每页条数
+        max_pages: 最多拉取的页数
+
+    Returns:
+        pd.DataFrame: 统一格式的成交
+    """
+    fills: List[Dict[str, Any]] = []
+    cursor = None
+    pages = 0
+    while max_pages is None or pages < max_pages:
+        params = {"cursor": cursor} if cursor else {}
+        response = client.fetch_my_trades(symbol=symbol, since=since, limit=page_size, params=params)
+        fills.extend(response.get("result") or [])
+        pages += 1
+        cursor = response.get("next")
+        if not cursor or not response.get("result"):
+            break
+    return from_grvt_fills(fills)
+
+
+# ==================== Nado ====================
+
+
+def _value(obj: Any, name: str) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _match_orders(tx: Any) -> Any:
+    """match_orders 交易的数据（模型或 dict），不是撮合交易时返回 None"""
+    data = _value(tx, "tx") if tx is not None else None
+    return _value(data, "match_orders") if data is not None else None
+
+
+def _same_order(a: Any, b: Any) -> bool:
+    return (
+        a is not None
+        and b is not None
+        and str(_value(a, "sender")).lower() == str(_value(b, "sender")).lower()
+        and str(_value(a, "nonce")) == str(_value(b, "nonce"))
+    )
+
+
+def from_nado_matches(
+    matches: Iterable[Any],
+    txs: Iterable[Any] = (),
+    symbols: Optional[Dict[int, str]] = None,
+    account: Optional[str] = None,
+    product_id: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    转换 Nado 撮合记录（IndexerClient.get_matches）
+
+    交易对和 maker/taker 从同一 submission_idx 的 match_orders 交易中读取：
+    成交订单与交易中的 maker 订单相同时为 maker 成交。
+
+    Args:
+        matches: IndexerMatch 列表
+        txs: get_matches 返回的 txs
+        symbols: product_id -> 交易对名称，缺失时使用 product_id
+        account: 子账户，默认使用订单的 sender
+        product_id: 所有撮合都属于该产品时直接指定（没有 txs 时使用）
+
+    Returns:
+        pd.DataFrame: 统一格式的成交
+    """
+    symbols = symbols or {}
+    tx_by_idx = {str(_value(tx, "submission_idx")): tx for tx in txs}
+    rows: Dict[str, List[Any]] = {name: [] for name in FILL_COLUMNS}
+    for match in matches:
+        order = _value(match, "order")
+        data = _match_orders(tx_by_idx.get(str(_value(match, "submission_idx"))))
+        pid = product_id
+        is_maker = None
+        if data is not None:
+            pid = _value(data, "product_id") if pid is None else pid
+            maker = _value(data, "maker")
+            taker = _value(data, "taker")
+            if _same_order(order, _value(maker, "order") if maker is not None else None):
+                is_maker = True
+            elif _same_order(order, _value(taker, "order") if taker is not None else None):
+                is_maker = False
+        if is_maker is None and _value(match, "is_taker") is not None:
+            is_maker = not _value(match, "is_taker")
+        rows["venue"].append("nado")
+        rows["account"].append(account if account is not None else _value(order, "sender"))
+        rows["symbol"].append(symbols.get(int(pid), str(pid)) if pid is not None else None)
+        rows["time"].append(_value(match, "timestamp"))
+        rows["qty"].append(_value(match, "base_filled"))
+        rows["price"].append(_value(match, "quote_filled"))
+        rows["fee"].append(_value(match, "fee"))
+        rows["is_maker"].append(is_maker)
+        rows["trade_id"].append(_value(match, "submission_idx"))
+        rows["order_id"].append(_value(match, "digest"))
+    if not rows["venue"]:
+        return empty_fills()
+
+    raw = pd.DataFrame(rows)
+    # x18 定点数转为浮点数；成交价 = -quote_filled / base_filled
+    base = _numeric(raw["qty"]) / X18
+    quote = _numeric(raw["price"]) / X18
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw["price"] = np.abs(quote / base)
+    raw["qty"] = base
+    raw["fee"] = _numeric(raw["fee"]) / X18
+    raw["time"] = pd.to_datetime(_numeric(raw["time"]), unit="s")
+    raw = raw[base != 0]
+    return _finish(raw)
+
+
+def load_nado(
+    indexer: Any,
+    subaccount: str,
+    product_ids: Optional[List[int]] = None,
+    symbols: Optional[Dict[int, str]] = None,
+    page_size: int = 500,
+    max_items: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    拉取 Nado 子账户的全部撮合记录（沿 submission_idx 翻页，预取下一页）
+
+    Args:
+        indexer: IndexerClient（或 NadoClient.context.indexer_client）
+        subaccount: 子账户（bytes32 hex）
+        product_ids: 只拉取这些产品
+        symbols: product_id -> 交易对名称
+        page_size: 每页条数
+        max_items: 最多拉取的撮合数
+
+    Returns:
+        pd.DataFrame: 统一格式的成交
+    """
+    from nado_protocol.indexer_client.pagination import HistoryPaginator
+    from nado_protocol.indexer_client.types.query import IndexerMatchesParams
+
+    params = IndexerMatchesParams(subaccounts=[subaccount], product_ids=product_ids)
+    txs: Dict[str, Any] = {}
+
+    def fetch(cursor):
+        data = indexer.get_matches(params.copy(update={"idx": cursor, "limit": page_size}))
+        for tx in data.txs:
+            txs[str(tx.submission_idx)] = tx
+        if len(data.matches) < page_size:
+            return data.matches, None
+        return data.matches, int(data.matches[-1].submission_idx)
+
+    paginator = HistoryPaginator(
+        fetch,
+        idx_of=lambda m: int(m.submission_idx),
+        key_of=lambda m: m.digest,
+        max_items=max_items,
+    )
+    matches = list(paginator)
+    return from_nado_matches(matches, txs.values(), symbols=symbols, account=subaccount)
+
+
+# ==================== StandX ====================
+
+
+def from_standx_trades(trades: Records, account: Optional[str] = None) -> pd.DataFrame:
+    """
+    转换 StandX 成交（StandXPerpHTTP.query_trades 的 result）
+
+    Args:
+        trades: 成交列表或 DataFrame
+        account: 账户标识（StandX 接口不返回账户）
+
+    Returns:
+        pd.DataFrame: 统一格式的成交
+    """
+    raw = _frame(trades)
+    if raw.empty:
+        return empty_fills()
+    side = np.where(_column(raw, "side").astype(str).str.lower() == "buy", 1.0, -1.0)
+    if "is_maker" in raw.columns:
+        is_maker = raw["is_maker"].map(_flag)
+    else:
+        role = _column(raw, "role").astype(str).str.lower()
+        is_maker = role.map({"maker": True, "taker": False})
+    return _finish(
+        pd.DataFrame(
+            {
+                "venue": "standx",
+                "account": account if account is not None else "",
+                "symbol": _column(raw, "symbol"),
+                "time": pd.to_datetime(_column(raw, "created_at"), utc=True, errors="coerce"),
+                "qty": side * np.abs(_numeric(_column(raw, "qty"))),
+                "price": _numeric(_column(raw, "price")),
+                "fee": np.nan_to_num(_numeric(_column(raw, "fee_qty"))),
+                "is_maker": is_maker,
+                "trade_id": _column(raw, "id"),
+                "order_id": _column(raw, "order_id"),
+            }
+        )
+    )
+
+
+def load_standx(
+    http_client: Any,
+    token: str,
+    symbol: Optional[str] = None,
+    account: Optional[str] = None,
+    page_size: int = 500,
+    max_pages: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    拉取 StandX 成交历史（按 last_id 向更早的成交翻页）
+
+    Args:
+        http_client: StandXPerpHTTP 实例
+        token: 登录令牌
+        symbol: 只拉取该交易对
+        account: 账户标识
+        page_size: 每页条数
+        max_pages: 最多拉取的页数
+
+    Returns:
+        pd.DataFrame: 统一格式的成交
+    """
+    trades: List[Dict[str, Any]] = []
+    last_id = None
+    pages = 0
+    while max_pages is None or pages < max_pages:
+        response = http_client.query_trades(token, symbol=symbol, last_id=last_id, limit=page_size)
+        result = response.get("result") or []
+        trades.extend(result)
+        pages += 1
+        if len(result) < page_size:
+            break
+        last_id = min(int(t["id"]) for t in result)
+    return from_standx_trades(trades, account=account)
+
+
+def _flag(value: Any) -> Any:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, str):
+        return value.strip().lower() == "true"
+    return bool(value)
+
+
+def _negate_flag(value: Any) -> Any:
+    flag = _flag(value)
+    return None if flag is None else not flag
@@ -0,0 +1,187 @@
+"""
+Fill Metrics
+基于统一成交表（analytics.fills）的指标计算：已实现盈亏、手续费、maker 比例、成交量、持仓
+
+已实现盈亏支持两种计价方式：
+- fifo: 先开先平。按数量把第 k 个买入单位与第 k 个卖出单位配对（持仓翻转也成立），
+  用累计数量的区间重叠一次性算出所有配对，全程向量化
+- avg: 平均成本。开仓更新均价、平仓按均价结算，逐笔递推（每个交易对一个紧凑循环）
+
+盈亏按 (venue, account, symbol) 分别计算，计价单位为各交易对的报价币种。
+"""
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+POSITION_KEYS = ["venue", "account", "symbol"]
+
+METHODS = ("fifo", "avg")
+
+
+def _fifo(qty: np.ndarray, price: np.ndarray) -> np.ndarray:
+    """单个交易对的 FIFO 已实现盈亏，计入完成配对的那笔成交"""
+    n = len(qty)
+    buys = np.flatnonzero(qty > 0)
+    sells = np.flatnonzero(qty < 0)
+    if not len(buys) or not len(sells):
+        return np.zeros(n)
+    buy_edges = np.cumsum(qty[buys])
+    sell_edges = np.cumsum(-qty[sells])
+    matched = min(buy_edges[-1], sell_edges[-1])
+
+    # 买卖累计数量的所有分界点把 [0, matched] 切成若干段，每段只属于一笔买入和一笔卖出
+    edges = np.union1d(buy_edges, sell_edges)
+    edges = np.concatenate(([0.0], edges[edges < matched], [matched]))
+    lengths = np.diff(edges)
+    middle = edges[:-1] + lengths / 2
+    buy_pos = np.minimum(np.searchsorted(buy_edges, middle), len(buys) - 1)
+    sell_pos = np.minimum(np.searchsorted(sell_edges, middle), len(sells) - 1)
+    buy_rows = buys[buy_pos]
+    sell_rows = sells[sell_pos]
+    pnl = (price[sell_rows] - price[buy_rows]) * lengths
+    return np.bincount(np.maximum(buy_rows, sell_rows), weights=pnl, minlength=n)
+
+
+def _average_cost(qty: np.ndarray, price: np.ndarray) -> np.ndarray:
+    """单个交易对的平均成本已实现盈亏"""
+    realized = np.zeros(len(qty))
+    position = 0.0
+    cost = 0.0
+    for i, (q, p) in enumerate(zip(qty.tolist(), price.tolist())):
+        if position == 0.0 or (position > 0) == (q > 0):
+            position, cost = position + q, cost + q * p
+            continue
+        closed = q if abs(q) <= abs(position) else -position
+        average = cost / position
+        realized[i] = -closed * (p - average)
+        position += q
+        if abs(position) <= 1e-12 * abs(q):
+            position, cost = 0.0, 0.0
+        elif (position > 0) == (q > 0):
+            # 翻转：剩余部分按成交价开新仓
+            cost = position * p
+        else:
+            cost = position * average
+    return realized
+
+
+def with_positions(fills: pd.DataFrame, method: str = "fifo") -> pd.DataFrame:
+    """
+    为每笔成交计算成交后的持仓和已实现盈亏
+
+    Args:
+        fills: 统一格式的成交（analytics.fills）
+        method: "fifo" 或 "avg"
+
+    Returns:
+        pd.DataFrame: 增加 notional / position / realized_pnl 列的副本，行顺序不变
+    """
+    if method not in METHODS:
+        raise ValueError(f"不支持的计价方式: {method}，可选 {METHODS}")
+    realize = _fifo if method == "fifo" else _average_cost
+    out = fills.copy()
+    qty = out["qty"].to_numpy(dtype="float64")
+    price = out["price"].to_numpy(dtype="float64")
+    position = np.zeros(len(out))
+    realized = np.zeros(len(out))
+    if len(out):
+        # 每个持仓按时间排序后独立计算（成交表本身已按时间排序）
+        times = out["time"].dt.tz_convert(None).to_numpy(dtype="datetime64[ns]").view("int64")
+        for rows in out.groupby(POSITION_KEYS, observed=True, sort=False).indices.values():
+            rows = rows[np.argsort(times[rows], kind="stable")]
+            position[rows] = np.cumsum(qty[rows])
+            realized[rows] = realize(qty[rows], price[rows])
+    out["notional"] = np.abs(qty) * price
+    out["position"] = position
+    out["realized_pnl"] = realized
+    return out
+
+
+def summarize(
+    fills: pd.DataFrame,
+    by: Sequence[str] = ("venue", "account", "symbol"),
+    freq: Optional[str] = None,
+    method: str = "fifo",
+) -> pd.DataFrame:
+    """
+    按维度汇总成交指标
+
+    Args:
+        fills: 统一格式的成交，或 with_positions() 的结果
+        by: 分组列，例如 ("venue", "account") 为按账户汇总
+        freq: 时间分桶（pandas 频率，如 "1D" 为按天），None 为不分桶
+        method: 已实现盈亏的计价方式
+
+    Returns:
+        pd.DataFrame: 每组一行，列为
+            fills: 成交笔数
+            volume: 成交数量（绝对值之和）
+            notional / buy_notional / sell_notional: 成交额
+            fees: 手续费（负数为净返佣）
+            maker_notional / maker_ratio: maker 成交额及其占比（按已知 maker 标记的成交额计算）
+            realized_pnl: 已实现盈亏
+            net_pnl: 已实现盈亏 - 手续费
+            position: 组内最后一笔成交后的持仓（按交易对分组时有意义）
+    """
+    if "realized_pnl" not in fills.columns:
+        fills = with_positions(fills, method=method)
+    keys: List = list(by)
+    frame = fills
+    if freq is not None:
+        frame = fills.assign(period=fills["time"].dt.floor(freq))
+        keys.append("period")
+
+    notional = frame["notional"]
+    is_buy = frame["qty"] > 0
+    maker = frame["is_maker"]
+    known = maker.notna().to_numpy()
+    is_maker = maker.fillna(False).to_numpy(dtype=bool)
+    frame = frame.assign(
+        volume=frame["qty"].abs(),
+        buy_notional=notional.where(is_buy, 0.0),
+        sell_notional=notional.where(~is_buy, 0.0),
+        maker_notional=notional.where(is_maker, 0.0),
+        known_notional=notional.where(known, 0.0),
+    )
+    grouped = frame.groupby(keys, observed=True, sort=True)
+    summary = grouped.agg(
+        fills=("qty", "size"),
+        volume=("volume", "sum"),
+        notional=("notional", "sum"),
+        buy_notional=("buy_notional", "sum"),
+        sell_notional=("sell_notional", "sum"),
+        fees=("fee", "sum"),
+        maker_notional=("maker_notional", "sum"),
+        known_notional=("known_notional", "sum"),
+        realized_pnl=("realized_pnl", "sum"),
+        position=("position", "last"),
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        summary["maker_ratio"] = summary["maker_notional"] / summary["known_notional"]
+    summary["net_pnl"] = summary["realized_pnl"] - summary["fees"]
+    return summary.drop(columns="known_notional")
+
+
+def inventory(fills: pd.DataFrame, freq: str = "1h", method: str = "fifo") -> pd.DataFrame:
+    """
+    持仓随时间的变化
+
+    Args:
+        fills: 统一格式的成交，或 with_positions() 的结果
+        freq: 采样频率（pandas 频率）
+        method: 计价方式（只在需要重新计算持仓时使用）
+
+    Returns:
+        pd.DataFrame: 行为时间桶（桶结束时的持仓），列为 (venue, account, symbol)
+    """
+    if "position" not in fills.columns:
+        fills = with_positions(fills, method=method)
+    if not len(fills):
+        return pd.DataFrame()
+    frame = fills.assign(period=fills["time"].dt.floor(freq))
+    last = frame.groupby(["period"] + POSITION_KEYS, observed=True).agg(position=("position", "last"))
+    wide = last["position"].unstack(POSITION_KEYS)
+    full_index = pd.date_range(wide.index.min(), wide.index.max(), freq=freq)
+    return wide.reindex(full_index).ffill().fillna(0.0)
+
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Fill Analytics Benchmark
+
+合成指定数量的成交（多个账户、交易对，随机买卖和 maker 标记），测量
+analytics 模块的已实现盈亏计算（fifo / avg）和按交易对、按天汇总的耗时。
+
+使用示例:
+    python benchmarks/fill_analytics.py
+    python benchmarks/fill_analytics.py --fills 5000000 --symbols 20
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from analytics import concat_fills, summarize, with_positions
+
+
+def build_fills(fills: int, symbols: int, accounts: int, seed: int = 0) -> pd.DataFrame:
+    """合成统一格式的成交表"""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(
+        {
+            "venue": rng.choice(["grvt", "nado", "standx"], fills),
+            "account": rng.integers(0, accounts, fills).astype(str),
+            "symbol": np.char.add("SYM", rng.integers(0, symbols, fills).astype(str)),
+            "time": pd.date_range("2024-01-01", periods=fills, freq="250ms", tz="UTC"),
+            "qty": rng.choice([-3.0, -2.0, -1.0, 1.0, 2.0, 3.0], fills) * 0.001,
+            "price": 100.0 + rng.standard_normal(fills).cumsum() * 0.01,
+            "fee": 0.0002,
+            "is_maker": rng.random(fills) < 0.7,
+            "trade_id": np.arange(fills).astype(str),
+            "order_id": "",
+        }
+    )
+    return concat_fills([frame])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="成交分析耗时基准")
+    parser.add_argument("--fills", type=int, default=1_000_000, help="成交笔数")
+    parser.add_argument("--symbols", type=int, default=10, help="交易对数量")
+    parser.add_argument("--accounts", type=int, default=3, help="每个交易所的账户数量")
+    args = parser.parse_args()
+
+    fills = build_fills(args.fills, args.symbols, args.accounts)
+    print(f"成交: {len(fills):,} 笔, 持仓: {fills.groupby(['venue', 'account', 'symbol'], observed=True).ngroups}")
+
+    for method in ("fifo", "avg"):
+        start = time.perf_counter()
+        enriched = with_positions(fills, method=method)
+        realized = time.perf_counter() - start
+
+        start = time.perf_counter()
+        by_symbol = summarize(enriched)
+        by_day = summarize(enriched, by=("venue", "account"), freq="1D")
+        aggregated = time.perf_counter() - start
+
+        print(
+            f"{method:<5} 已实现盈亏 {realized:6.2f} s | 汇总 {aggregated:6.2f} s | "
+            f"{len(by_symbol)} 个持仓, {len(by_day)} 个账户日, "
+            f"合计盈亏 {by_symbol['realized_pnl'].sum():,.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+GRVT Response Decode Benchmark
+
+对比 dacite.from_dict 和 pysdk.grvt_raw_decoder 的解码吞吐量（条/秒），
+以及 json 和可选的 orjson 后端的解析耗时。
+
+响应按接口的数据结构合成（open_orders_v1、fill_history_v1、orderbook_levels_v1 等），不访问网络。
+
+使用示例:
+    python benchmarks/grvt_decode.py
+    python benchmarks/grvt_decode.py --items 500 --seconds 2
+"""
+import argparse
+import dataclasses
+import json
+import os
+import sys
+import time
+import typing
+from enum import Enum
+from typing import Any, Callable, Dict, List, Tuple
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+grvt_sdk_path = os.path.join(project_root, "exchange", "exchange_grvt", "src")
+if grvt_sdk_path not in sys.path:
+    sys.path.insert(0, grvt_sdk_path)
+
+from dacite import Config, from_dict
+
+from pysdk import grvt_raw_types as types
+from pysdk.grvt_raw_decoder import JSON_BACKEND, decode, json_loads
+
+
+def _sample_value(tp: Any, items: int) -> Any:
+    args = typing.get_args(tp)
+    if type(None) in args:
+        tp = next(a for a in args if a is not type(None))
+        args = typing.get_args(tp)
+    if tp is str:
+        return "1700000000000000000"
+    if tp is int:
+        return 42
+    if tp is float:
+        return 1.5
+    if tp is bool:
+        return False
+    if tp is Any:
+        return None
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return list(tp)[0].value
+    if dataclasses.is_dataclass(tp):
+        return sample_dict(tp, items=1)
+    if typing.get_origin(tp) is list:
+        return [_sample_value(args[0], 1) for _ in range(items)]
+    raise TypeError(f"unexpected type {tp!r}")
+
+
+def sample_dict(cls: type, items: int) -> Dict[str, Any]:
+    """
+    按数据类结构合成一条响应，列表字段（如 result、bids、asks）包含 items 个元素
+
+    Args:
+        cls: grvt_raw_types 中的响应类型
+        items: 顶层列表字段的元素数
+    """
+    hints = typing.get_type_hints(cls)
+    return {f.name: _sample_value(hints[f.name], items) for f in dataclasses.fields(cls)}
+
+
+RESPONSE_TYPES = [
+    ("open_orders_v1", types.ApiOpenOrdersResponse),
+    ("order_history_v1", types.ApiOrderHistoryResponse),
+    ("fill_history_v1", types.ApiFillHistoryResponse),
+    ("orderbook_levels_v1", types.ApiOrderbookLevelsResponse),
+    ("positions_v1", types.ApiPositionsResponse),
+    ("all_instruments_v1", types.ApiGetAllInstrumentsResponse),
+    ("account_summary_v1", types.ApiSubAccountSummaryResponse),
+]
+
+
+def _throughput(fn: Callable[[], Any], seconds: float) -> float:
+    fn()  # 预热（生成解码器）
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        fn()
+        count += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            return count / (now - start)
+
+
+def run(items: int, seconds: float) -> List[Tuple[str, float, float, float, float]]:
+    rows = []
+    dacite_config = Config(cast=[Enum])
+    for name, cls in RESPONSE_TYPES:
+        data = sample_dict(cls, items)
+        raw = json.dumps(data).encode("utf-8")
+        assert decode(cls, data) == from_dict(cls, data, dacite_config)
+        dacite_rate = _throughput(lambda: from_dict(cls, data, Config(cast=[Enum])), seconds)
+        fast_rate = _throughput(lambda: decode(cls, data), seconds)
+        json_rate = _throughput(lambda: json.loads(raw), seconds)
+        fast_json_rate = _throughput(lambda: json_loads(raw), seconds)
+        rows.append((name, dacite_rate, fast_rate, json_rate, fast_json_rate))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="GRVT 响应解码吞吐量")
+    parser.add_argument("--items", type=int, default=100, help="每个响应中列表字段的元素数")
+    parser.add_argument("--seconds", type=float, default=0.5, help="每项测量的时长")
+    args = parser.parse_args()
+
+    print(f"每个响应 {args.items} 条，JSON 后端: {JSON_BACKEND}（单位：响应/秒）")
+    print(f"{'response':<22}{'dacite':>10}{'decoder':>10}{'speedup':>9}{'json':>10}{JSON_BACKEND:>10}")
+    for name, dacite_rate, fast_rate, json_rate, fast_json_rate in run(args.items, args.seconds):
+        print(
+            f"{name:<22}{dacite_rate:>10.0f}{fast_rate:>10.0f}{fast_rate / dacite_rate:>8.1f}x"
+            f"{json_rate:>10.0f}{fast_json_rate:>10.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
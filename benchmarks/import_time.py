@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Import Time Benchmark
+
+用 `python -X importtime` 测量冷启动导入耗时，超出预算或加载了不该加载的重依赖时返回非零退出码，
+可以直接放进 CI 防止启动时间回退。
+
+检查项:
+- 每个模块的累计导入耗时（多次运行取最小值）不超过预算
+- 导入后 sys.modules 中不包含重依赖（交易所 SDK、pandas、TA-Lib 等只应在被选中时加载）
+
+使用示例:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 5 --scale 2.0   # 慢机器上放宽预算
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 模块 -> 累计导入耗时预算（毫秒）
+DEFAULT_BUDGETS_MS: Dict[str, float] = {
+    "adapters": 50.0,
+    "utils": 50.0,
+    "strategys.strategy_common.notrade_mm": 150.0,
+}
+
+# 导入上述模块后不应出现在 sys.modules 中的重依赖
+FORBIDDEN_MODULES: List[str] = [
+    "web3",
+    "eth_account",
+    "aiohttp",
+    "websockets",
+    "dacite",
+    "pandas",
+    "talib",
+    "numpy",
+    "asyncio",
+    "pysdk.grvt_raw_types",
+    "adapters.standx_adapter",
+    "adapters.grvt_adapter",
+    "risk.indicators",
+]
+
+
+def _run_python(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", code]
+    env = dict(os.environ, PYTHONPATH=project_root)
+    return subprocess.run(cmd, cwd=project_root, env=env, capture_output=True, text=True)
+
+
+def measure_import_ms(module: str) -> Optional[float]:
+    """
+    在新进程中导入模块，返回 -X importtime 报告的累计耗时（毫秒）
+
+    Args:
+        module: 模块路径
+
+    Returns:
+        累计耗时，导入失败返回 None
+    """
+    result = _run_python(f"import {module}", importtime=True)
+    if result.returncode != 0:
+        print(result.stderr.strip().splitlines()[-1] if result.stderr else "", file=sys.stderr)
+        return None
+    # 格式: "import time: self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) == 3 and parts[2].strip() == module and not parts[2].startswith("  "):
+            return int(parts[1]) / 1000.0
+    return None
+
+
+def loaded_forbidden_modules(module: str) -> List[str]:
+    """
+    返回导入 module 后被加载的重依赖列表
+
+    Args:
+        module: 模块路径
+    """
+    code = f"import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"
+    result = _run_python(code)
+    if result.returncode != 0:
+        return []
+    loaded = set(json.loads(result.stdout.strip().splitlines()[-1]))
+    return [name for name in FORBIDDEN_MODULES if name in loaded]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="冷启动导入耗时基准")
+    parser.add_argument("--runs", type=int, default=3, help="每个模块的运行次数，取最小值")
+    parser.add_argument("--scale", type=float, default=1.0, help="预算倍数（慢机器上放宽）")
+    parser.add_argument("modules", nargs="*", help="要测量的模块，默认使用内置预算表")
+    args = parser.parse_args()
+
+    budgets = {m: DEFAULT_BUDGETS_MS.get(m, 100.0) for m in args.modules} or DEFAULT_BUDGETS_MS
+    failed = False
+    for module, budget in budgets.items():
+        budget *= args.scale
+        samples = [measure_import_ms(module) for _ in range(max(1, args.runs))]
+        valid = [s for s in samples if s is not None]
+        if not valid:
+            print(f"FAIL  {module}: 导入失败")
+            failed = True
+            continue
+        best = min(valid)
+        forbidden = loaded_forbidden_modules(module)
+        ok = best <= budget and not forbidden
+        failed = failed or not ok
+        print(f"{'OK  ' if ok else 'FAIL'}  {module}: {best:.1f} ms (预算 {budget:.0f} ms)")
+        if forbidden:
+            print(f"      加载了重依赖: {', '.join(forbidden)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Nado Engine Query Decode Benchmark
+
+对比 EngineQueryClient 默认解码（pydantic QueryResponse）和 fast_decode 模式
+（orjson + 按查询类型直接构造的 slotted struct）在热点查询上的单次 CPU 耗时。
+
+使用固定的响应内容替换 HTTP session，只测量请求构造和响应解析，不访问网络。
+
+使用示例:
+    python benchmarks/nado_query_decode.py
+    python benchmarks/nado_query_decode.py --orders 200 --levels 100 --iterations 2000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+nado_sdk_path = os.path.join(project_root, "exchange", "exchange_nado")
+if nado_sdk_path not in sys.path:
+    sys.path.insert(0, nado_sdk_path)
+
+from nado_protocol.engine_client import EngineClient
+from nado_protocol.engine_client.types import EngineClientOpts
+from nado_protocol.utils.fast_json import JSON_BACKEND
+
+SENDER = "0xBE3faCAE76A38c3b61492E57BF65ae0628c4A80864656661756c740000000000"
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, body: bytes):
+        self.content = body
+        self.text = body.decode("utf-8")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class _FakeSession:
+    """按查询类型返回固定响应的 session"""
+
+    def __init__(self, responses: Dict[str, bytes]):
+        self._responses = {k: _Response(v) for k, v in responses.items()}
+
+    def post(self, url: str, json: Dict[str, Any]) -> _Response:
+        return self._responses[json["type"]]
+
+
+def _order(product_id: int, i: int) -> Dict[str, Any]:
+    return {
+        "product_id": product_id,
+        "sender": SENDER,
+        "price_x18": str(30000 * 10**18 + i * 10**17),
+        "amount": str(-(10**18)),
+        "expiration": "4294967295",
+        "nonce": str(1764428860167815857 + i),
+        "unfilled_amount": str(-(10**18)),
+        "digest": "0x" + f"{i:064x}",
+        "placed_at": "1682437739",
+    }
+
+
+def build_responses(orders: int, levels: int) -> Dict[str, bytes]:
+    """
+    合成热点查询的响应
+
+    Args:
+        orders: 每个产品的挂单数
+        levels: 盘口每侧的档位数
+    """
+    def body(data: Dict[str, Any]) -> bytes:
+        return json.dumps({"status": "success", "data": data}).encode("utf-8")
+
+    return {
+        "subaccount_orders": body(
+            {"sender": SENDER, "orders": [_order(1, i) for i in range(orders)]}
+        ),
+        "orders": body(
+            {
+                "sender": SENDER,
+                "product_orders": [
+                    {"product_id": p, "orders": [_order(p, i) for i in range(orders)]}
+                    for p in (1, 2, 3)
+                ],
+            }
+        ),
+        "market_liquidity": body(
+            {
+                "bids": [[str(29990 * 10**18 - i * 10**18), str(10**18)] for i in range(levels)],
+                "asks": [[str(30010 * 10**18 + i * 10**18), str(10**18)] for i in range(levels)],
+                "timestamp": "1682437739",
+            }
+        ),
+        "market_price": body(
+            {"product_id": 1, "bid_x18": str(29990 * 10**18), "ask_x18": str(30010 * 10**18)}
+        ),
+    }
+
+
+QUERIES: List[Tuple[str, Callable[[EngineClient], Any]]] = [
+    ("get_subaccount_open_orders", lambda c: c.get_subaccount_open_orders(1, SENDER)),
+    (
+        "get_subaccount_multi_products_open_orders",
+        lambda c: c.get_subaccount_multi_products_open_orders([1, 2, 3], SENDER),
+    ),
+    ("get_market_liquidity", lambda c: c.get_market_liquidity(1, 100)),
+    ("get_market_price", lambda c: c.get_market_price(1)),
+]
+
+
+def cpu_us_per_query(client: EngineClient, query: Callable[[EngineClient], Any], iterations: int) -> float:
+    query(client)  # 预热
+    start = time.process_time()
+    for _ in range(iterations):
+        query(client)
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Nado 热点查询解码 CPU 耗时")
+    parser.add_argument("--orders", type=int, default=50, help="每个产品的挂单数")
+    parser.add_argument("--levels", type=int, default=100, help="盘口每侧档位数")
+    parser.add_argument("--iterations", type=int, default=500, help="每个查询的执行次数")
+    args = parser.parse_args()
+
+    responses = build_responses(args.orders, args.levels)
+    clients = {}
+    for fast in (False, True):
+        client = EngineClient(EngineClientOpts(url="http://localhost", fast_decode=fast))
+        client.session = _FakeSession(responses)
+        clients[fast] = client
+
+    print(f"挂单 {args.orders}/产品，盘口 {args.levels} 档/侧，JSON 后端: {JSON_BACKEND}（单位：µs CPU/次）")
+    print(f"{'query':<44}{'pydantic':>10}{'fast':>10}{'speedup':>9}")
+    for name, query in QUERIES:
+        slow_us = cpu_us_per_query(clients[False], query, args.iterations)
+        fast_us = cpu_us_per_query(clients[True], query, args.iterations)
+        print(f"{name:<44}{slow_us:>10.1f}{fast_us:>10.1f}{slow_us / fast_us:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
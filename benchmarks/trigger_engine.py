@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Trigger Engine Benchmark
+
+在一个交易对上挂载大量止损 / 止盈条件单，测量 TriggerEngine.on_price 的单次决策耗时：
+- 不触发的 tick（只比较堆顶）
+- 每个 tick 触发一个条件单（弹出堆顶 + 提交订单到适配器线程池）
+
+使用假的适配器（下单立即返回），不访问网络。
+
+使用示例:
+    python benchmarks/trigger_engine.py
+    python benchmarks/trigger_engine.py --triggers 100000 --ticks 200000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from execution.triggers import TriggerEngine
+
+
+class _FakeAdapter:
+    """只实现 TriggerEngine 用到的接口"""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=4)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        return self._executor
+
+    def place_order(self, **kwargs):
+        return None
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return {
+        "p50": samples[len(samples) // 2] * 1e6,
+        "p99": samples[int(len(samples) * 0.99)] * 1e6,
+        "max": samples[-1] * 1e6,
+        "mean": statistics.fmean(samples) * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="条件单引擎决策耗时基准")
+    parser.add_argument("--triggers", type=int, default=50_000, help="挂载的条件单数量")
+    parser.add_argument("--ticks", type=int, default=100_000, help="不触发的 tick 数量")
+    parser.add_argument("--fires", type=int, default=2_000, help="触发的 tick 数量")
+    args = parser.parse_args()
+
+    random.seed(0)
+    adapter = _FakeAdapter()
+    engine = TriggerEngine(adapter)
+    symbol = "BTC-USD"
+    price = 100_000.0
+
+    start = time.perf_counter()
+    for _ in range(args.triggers // 2):
+        engine.add_stop(symbol, "long", "0.001", price * random.uniform(0.80, 0.95))
+        engine.add_take_profit(symbol, "long", "0.001", price * random.uniform(1.05, 1.20))
+    added = time.perf_counter() - start
+    print(f"挂载 {args.triggers:,} 个条件单: {added * 1e3:.1f} ms ({added / args.triggers * 1e6:.2f} us/个)")
+
+    # 价格在 [0.96, 1.04] 之间波动，不会触发
+    ticks = [price * random.uniform(0.96, 1.04) for _ in range(args.ticks)]
+    samples = []
+    for tick in ticks:
+        t0 = time.perf_counter()
+        engine.on_price(symbol, tick)
+        samples.append(time.perf_counter() - t0)
+    stats = _percentiles(samples)
+    print(
+        f"不触发 tick: p50 {stats['p50']:.2f} us, p99 {stats['p99']:.2f} us, "
+        f"max {stats['max']:.2f} us"
+    )
+
+    # 价格逐步下探：每个 tick 越过下一个止损价
+    stops = sorted((t.trigger_price for t in engine.armed(symbol) if t.side == "sell" and t.trigger_price < price), reverse=True)
+    samples = []
+    fired = 0
+    for stop in stops[: args.fires]:
+        t0 = time.perf_counter()
+        fired += len(engine.on_price(symbol, float(stop)))
+        samples.append(time.perf_counter() - t0)
+    stats = _percentiles(samples)
+    print(
+        f"触发 tick（共触发 {fired} 个）: p50 {stats['p50']:.2f} us, p99 {stats['p99']:.2f} us, "
+        f"max {stats['max']:.2f} us"
+    )
+    adapter._executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    main()
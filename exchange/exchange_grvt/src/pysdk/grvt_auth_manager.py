@@ -0,0 +1,231 @@
+# ruff: noqa: D200
+# ruff: noqa: D204
+# ruff: noqa: D205
+# ruff: noqa: D404
+# ruff: noqa: W291
+# ruff: noqa: D400
+# ruff: noqa: E501
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import requests
+
+from .grvt_ccxt_utils import get_cookie_with_expiration
+
+# Cookie is renewed this many seconds before it expires.
+DEFAULT_REFRESH_BEFORE_SECS = 300
+# Wait between failed login attempts.
+DEFAULT_RETRY_SECS = 5
+
+GrvtCookieDict = dict[str, Any]
+
+
+class GrvtAuthManager:
+    """
+    Keeps the GRVT session cookie fresh in a background thread.
+
+    The cookie is renewed well before it expires and swapped in atomically, so request
+    paths only read the latest cookie and never wait on a login POST. One manager per
+    (auth path, api key) is shared by the sync, async and WebSocket clients of a process
+    via `GrvtAuthManager.shared()`. A custom `login_fn` (e.g. a cookie cache) is registered
+    once per key through `shared()`; registering a different one later raises ValueError.
+
+    Cookies use the ccxt dict format returned by `get_cookie_with_expiration`:
+        {"gravity": str, "expires": float (unix secs), "X-Grvt-Account-Id": str}
+
+    Examples:
+        >>> manager = GrvtAuthManager.shared(auth_path, api_key)
+        >>> cookie = manager.get_cookie()  # blocks only if there is no valid cookie yet
+    """
+
+    _registry: dict[tuple[str, str], "GrvtAuthManager"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(
+        self,
+        auth_path: str,
+        api_key: str,
+        logger: logging.Logger | None = None,
+        refresh_before_secs: float = DEFAULT_REFRESH_BEFORE_SECS,
+        retry_secs: float = DEFAULT_RETRY_SECS,
+        login_fn: Callable[[], GrvtCookieDict | None] | None = None,
+    ):
+        self.auth_path = auth_path
+        self.logger = logger or logging.getLogger(__name__)
+        self.refresh_before_secs = refresh_before_secs
+        self.retry_secs = retry_secs
+        self._api_key = api_key
+        self._http = requests.Session()
+        self._login_fn = login_fn or self._default_login
+        self.has_login_fn = login_fn is not None
+        self._cookie: GrvtCookieDict | None = None
+        self._obtained_at: float = 0.0
+        self._login_lock = threading.Lock()
+        self._listeners: list[Callable[[GrvtCookieDict], None]] = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def shared(
+        cls,
+        auth_path: str,
+        api_key: str,
+        logger: logging.Logger | None = None,
+        login_fn: Callable[[], GrvtCookieDict | None] | None = None,
+        **kwargs,
+    ) -> "GrvtAuthManager":
+        """
+        Returns the process-wide manager for (auth_path, api_key), creating it if needed.
+
+        Callers without a login_fn get the existing manager as is. A login_fn passed for
+        an existing manager that still uses the default login replaces it; a different
+        login_fn than the one already registered, or settings that differ from the
+        existing manager's, raise ValueError instead of being ignored.
+        """
+        key = (auth_path, api_key)
+        with cls._registry_lock:
+            manager = cls._registry.get(key)
+            if manager is None:
+                manager = cls(auth_path, api_key, logger=logger, login_fn=login_fn, **kwargs)
+                cls._registry[key] = manager
+                return manager
+            for name, value in kwargs.items():
+                if getattr(manager, name, None) != value:
+                    raise ValueError(
+                        f"GrvtAuthManager for {auth_path} already exists with "
+                        f"{name}={getattr(manager, name, None)!r}, got {value!r}"
+                    )
+            if login_fn is not None and login_fn is not manager._login_fn:
+                if manager.has_login_fn:
+                    raise ValueError(
+                        f"GrvtAuthManager for {auth_path} already has a login_fn registered"
+                    )
+                manager._login_fn = login_fn
+                manager.has_login_fn = True
+            return manager
+
+    @classmethod
+    def registered(cls, auth_path: str, api_key: str) -> "GrvtAuthManager | None":
+        """Returns the process-wide manager for (auth_path, api_key) if one exists."""
+        with cls._registry_lock:
+            return cls._registry.get((auth_path, api_key))
+
+    def _default_login(self) -> GrvtCookieDict | None:
+        return get_cookie_with_expiration(self.auth_path, self._api_key, session=self._http)
+
+    # COOKIE ACCESS
+    @staticmethod
+    def is_fresh(cookie: GrvtCookieDict | None, margin_secs: float = 5) -> bool:
+        """True if the cookie exists and is valid for at least margin_secs more."""
+        if not cookie or not cookie.get("expires"):
+            return False
+        return float(cookie["expires"]) - time.time() > margin_secs
+
+    def current_cookie(self) -> GrvtCookieDict | None:
+        """Returns the latest valid cookie without ever blocking (None if there is none)."""
+        cookie = self._cookie
+        return cookie if self.is_fresh(cookie) else None
+
+    def get_cookie(self) -> GrvtCookieDict | None:
+        """
+        Returns a valid cookie.
+        Blocks on a login only when no valid cookie exists (first use, or the background
+        refresh kept failing until expiry). Concurrent callers share a single login.
+        """
+        cookie = self.current_cookie()
+        if cookie is not None:
+            self._ensure_started()
+            return cookie
+        with self._login_lock:
+            cookie = self.current_cookie()
+            if cookie is None:
+                cookie = self._login()
+        self._ensure_started()
+        return cookie
+
+    def add_listener(self, callback: Callable[[GrvtCookieDict], None]) -> None:
+        """Registers a callback invoked (in the refresh thread) with each new cookie."""
+        self._listeners.append(callback)
+
+    def invalidate(self, cookie: GrvtCookieDict | None = None) -> None:
+        """
+        Forces a refresh, e.g. after the exchange rejected the cookie.
+        When the rejected cookie is given and was already replaced, nothing happens, so
+        concurrent requests failing with the same cookie trigger a single login.
+        """
+        if cookie is not None and self._cookie is not cookie:
+            return
+        self._cookie = None
+        self._wake.set()
+
+    # BACKGROUND REFRESH
+    def _login(self) -> GrvtCookieDict | None:
+        FN = f"GrvtAuthManager _login {self.auth_path=}"
+        try:
+            cookie = self._login_fn()
+        except Exception as e:
+            self.logger.error(f"{FN} login failed: {e}")
+            return None
+        if not cookie:
+            self.logger.warning(f"{FN} login returned no cookie")
+            return None
+        # Single reference assignment: readers see either the old or the new cookie.
+        self._cookie = cookie
+        self._obtained_at = time.time()
+        self.logger.info(f"{FN} cookie refreshed, expires={cookie.get('expires')}")
+        for callback in list(self._listeners):
+            try:
+                callback(cookie)
+            except Exception as e:
+                self.logger.warning(f"{FN} listener failed: {e}")
+        return cookie
+
+    def _next_refresh_delay(self) -> float:
+        cookie = self._cookie
+        if not cookie or not cookie.get("expires"):
+            return 0.0
+        expires = float(cookie["expires"])
+        lifetime = expires - self._obtained_at
+        # Short-lived cookies are renewed half way through their lifetime.
+        refresh_before = min(self.refresh_before_secs, lifetime / 2)
+        return max(0.0, expires - refresh_before - time.time())
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            delay = self._next_refresh_delay()
+            if delay > 0:
+                self._wake.wait(delay)
+                self._wake.clear()
+                if self._stop.is_set():
+                    return
+                if self._next_refresh_delay() > 0 and self._cookie is not None:
+                    continue
+            with self._login_lock:
+                # A caller blocked in get_cookie() may have logged in while we waited.
+                if self._cookie is not None and self._next_refresh_delay() > 0:
+                    continue
+                cookie = self._login()
+            if cookie is None:
+                self._stop.wait(self.retry_secs)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None or self._stop.is_set():
+            return
+        with self._registry_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="grvt-auth-refresh", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the background refresh thread."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
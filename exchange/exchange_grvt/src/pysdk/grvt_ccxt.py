@@ -7,6 +7,8 @@
 # ruff: noqa: E501
 import json
 import logging
+import threading
+import time
 from typing import Any, Literal
 
 import requests
@@ -24,7 +26,6 @@ from .grvt_ccxt_types import (
 from .grvt_ccxt_utils import (
     EnumEncoder,
     GrvtOrder,
-    get_cookie_with_expiration,
     get_grvt_order,
     get_order_payload,
 )
@@ -59,15 +60,28 @@ class GrvtCcxt(GrvtCcxtBase):
         self._session: requests.Session = requests.Session()
         self._session.headers.update({"Content-Type": "application/json"})
         self.refresh_cookie()
-        # Assign markets here
-        self.markets: dict[str, dict] = self.load_markets()
+        # Assign markets here: start from the on-disk cache when possible and
+        # revalidate it in the background, otherwise load synchronously.
+        markets, needs_refresh = self._markets_from_cache()
+        if markets:
+            self.markets: dict[str, dict] = markets
+            if needs_refresh:
+                threading.Thread(
+                    target=self.load_markets, name="grvt-load-markets", daemon=True
+                ).start()
+        else:
+            self.markets = self.load_markets()
 
     def refresh_cookie(self) -> dict | None:
-        """Refresh the session cookie."""
+        """
+        Picks up the latest session cookie from the auth manager.
+        The manager renews the cookie in the background, so this only blocks on a
+        login when no valid cookie exists.
+        """
         if not self.should_refresh_cookie():
             return self._cookie
         path = get_grvt_endpoint(self.env, "AUTH")
-        self._cookie = get_cookie_with_expiration(path, self._api_key)
+        self._cookie = self._auth_manager.get_cookie() if self._auth_manager else None
         self._path_return_value_map[path] = self._cookie
         if self._cookie:
             self._session.cookies.update({"gravity": self._cookie["gravity"]})
@@ -76,37 +90,55 @@ class GrvtCcxt(GrvtCcxtBase):
                     {"X-Grvt-Account-Id": self._cookie["X-Grvt-Account-Id"]}
                 )
             self.logger.info(
-                f"refresh_cookie {self._cookie=} {self._session.cookies=} {self._session.headers=}"
+                "refresh_cookie cookie refreshed, expires=%s", self._cookie.get("expires")
+            )
+            self.logger.debug(
+                "refresh_cookie cookie=%s cookies=%s headers=%s",
+                self._cookie,
+                self._session.cookies,
+                self._session.headers,
             )
         return self._cookie
 
     # PRIVATE API CALLS
-    def _auth_and_post(self, path: str, payload: dict) -> dict:
-        FN = f"_auth_and_post {path=}"
-        MAX_LEN_TO_LOG = 1280
+    def _auth_and_post(self, path: str, payload: dict, retry_auth: bool = True) -> dict:
+        # Log with lazy %-style arguments only: this runs on every order request and
+        # must not pay for formatting payloads/responses when the level is disabled.
         response: dict = {}
         if not path:
-            self.logger.warning(f"{FN} Invalid path {path=} {payload=}")
-            raise GrvtInvalidOrder(f"{FN} Invalid path {path=} {payload=}")
-        # Always see if need to referesh cookie before sending a request
+            self.logger.warning("_auth_and_post Invalid path %r payload=%s", path, payload)
+            raise GrvtInvalidOrder(f"_auth_and_post Invalid path {path=} {payload=}")
+        # Cheap check: only swaps in a cookie renewed by the auth manager
         self.refresh_cookie()
         payload_json = json.dumps(payload, cls=EnumEncoder)
-        self.logger.info(f"{FN} {payload=}\n{payload_json=}")
+        self.logger.debug("_auth_and_post path=%r payload_json=%s", path, payload_json)
         return_value = self._session.post(path, data=payload_json, timeout=5)
-        return_text: str = ""
+        if return_value.status_code == 401 and retry_auth and self._auth_manager is not None:
+            # The exchange rejected the cookie (revoked key, server-side logout):
+            # log in again once instead of reusing it until it expires.
+            self.logger.warning("_auth_and_post path=%r cookie rejected, logging in again", path)
+            self._auth_manager.invalidate(self._cookie)
+            return self._auth_and_post(path, payload, retry_auth=False)
         try:
-            return_text = return_value.text
             response = return_value.json()
         except Exception as err:
-            self.logger.warning(f"{FN} Unable to parse {return_value=} as json. {err=}")
+            self.logger.warning(
+                "_auth_and_post path=%r Unable to parse %r as json. err=%r",
+                path,
+                return_value,
+                err,
+            )
         if not return_value.ok:
-            self.logger.warning(f"{FN} ERROR {payload_json=}\n{return_value=}\n{response=}")
+            self.logger.warning(
+                "_auth_and_post path=%r ERROR payload_json=%s\nreturn_value=%r\nresponse=%s",
+                path,
+                payload_json,
+                return_value,
+                response,
+            )
         else:
-            if len(return_text) > MAX_LEN_TO_LOG:
-                self.logger.debug(f"{FN} OK {return_value=} {response=}")
-                self.logger.info(f"{FN} OK {return_value=} response=**TOO LONG**")
-            else:
-                self.logger.info(f"{FN} OK {return_value=} {response=}")
+            self.logger.info("_auth_and_post path=%r OK %r", path, return_value)
+            self.logger.debug("_auth_and_post path=%r response=%s", path, response)
         self._path_return_value_map[path] = response
         return response
 
@@ -116,7 +148,7 @@ class GrvtCcxt(GrvtCcxtBase):
         :param order: The GrvtOrder object.
         Return: dictionary representing the order response.
         """
-        FN = f"{self._clsname} _create_grvt_order cloid:{order.metadata.client_order_id}"
+        cloid = order.metadata.client_order_id
         order_payload = get_order_payload(
             order,
             private_key=self._private_key,
@@ -124,14 +156,24 @@ class GrvtCcxt(GrvtCcxtBase):
             instruments=self.markets,
         )
         path = get_grvt_endpoint(self.env, "CREATE_ORDER")
-        self.logger.info(f"{FN} {path=} {order_payload=}")
+        self.logger.debug(
+            "%s _create_grvt_order cloid:%s path=%r order_payload=%s",
+            self._clsname,
+            cloid,
+            path,
+            order_payload,
+        )
         response: dict = self._auth_and_post(path, payload=order_payload)
         if response.get("result") is None:
-            self.logger.error(f"{FN} Error: {response}")
+            self.logger.error(
+                "%s _create_grvt_order cloid:%s Error: %s", self._clsname, cloid, response
+            )
             return {}
         self.logger.info(
-            f"{FN} Order created:"
-            f"{response.get('result', {}).get('metadata', {}).get('client_order_id')}"
+            "%s _create_grvt_order cloid:%s Order created:%s",
+            self._clsname,
+            cloid,
+            response.get("result", {}).get("metadata", {}).get("client_order_id"),
         )
         return response.get("result", {})
 
@@ -146,6 +188,9 @@ class GrvtCcxt(GrvtCcxtBase):
     ) -> dict:
         """Ccxt compliant signature."""
         self._check_account_auth()
+        if self._should_reload_markets(symbol):
+            self.logger.info(f"{self._clsname} create_order: {symbol=} unknown, reloading markets")
+            self.load_markets()
         self._check_valid_symbol(symbol)
         # Validate order fields
         self._check_order_arguments(order_type, side, amount, price)
@@ -364,6 +409,8 @@ class GrvtCcxt(GrvtCcxtBase):
                 `quote`: (str) - The quote currency filter. Defaults to all quote currencies.<br>
                 `expiration`: (int)	The expiration time in nanoseconds. Defaults to all.<br>
                 `strike_price`: (str) The strike price to apply. Defaults to all strike prices.<br>
+                `start_time`: (int) fetch orders since this timestamp in nanoseconds.<br>
+                `end_time`: (int) fetch orders until this timestamp in nanoseconds.<br>
                 `limit`: (int) The limit to query for. Defaults to 500; Max 1000.<br>
                 `cursor`: (str) The cursor to use for pagination. If nil, return the first page.<br>
         Return: a dictionary with keys:
@@ -527,6 +574,7 @@ class GrvtCcxt(GrvtCcxtBase):
     # **************** PUBLIC API CALLS
     def load_markets(self) -> dict[str, dict]:
         self.logger.info("load_markets START")
+        self._markets_loaded_at = time.time()
         instruments = self.fetch_markets(
             params={
                 "kind": GrvtInstrumentKind.PERPETUAL,
@@ -535,10 +583,12 @@ class GrvtCcxt(GrvtCcxtBase):
             }
         )
         if instruments:
+            # Single reference assignment: concurrent readers see the old or the new dict
             self.markets = {
                 str(i.get("instrument", "")): i for i in instruments if i.get("instrument")
             }
             self.logger.info(f"load_markets: loaded {len(self.markets)} markets.")
+            self._save_markets_to_cache()
         else:
             self.logger.warning("load_markets: No markets found.")
         return self.markets
@@ -12,7 +12,8 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Any, get_args
 
-from .grvt_ccxt_env import GrvtEnv
+from .grvt_auth_manager import GrvtAuthManager
+from .grvt_ccxt_env import GrvtEnv, get_grvt_endpoint
 from .grvt_ccxt_types import (
     CandlestickInterval,
     CandlestickType,
@@ -23,8 +24,12 @@ from .grvt_ccxt_types import (
     ccxt_interval_to_grvt_candlestick_interval,
 )
 from .grvt_ccxt_utils import get_kuq_from_symbol, sign_derisk_mm_ratio_request
+from .grvt_instrument_cache import DEFAULT_TTL_SECS, GrvtInstrumentCache
 
 # COOKIE_REFRESH_INTERVAL_SECS = 60 * 60  # 30 minutes
+# An order for an unknown symbol reloads markets at most this often: the instrument
+# cache may predate a new listing even while it is within its TTL.
+MARKETS_MISS_RELOAD_SECS = 30
 
 
 class GrvtCcxtBase:
@@ -37,6 +42,8 @@ class GrvtCcxtBase:
         logger (logging.Logger, optional). Defaults to None.
         parameters: (dict, optional). Dict with trading_account_id, private_key, api_key etc
                 defaults to empty.
+                Instrument cache keys: `instrument_cache` (bool, default True),
+                `instrument_cache_dir` (str), `instrument_cache_ttl` (secs).
     """
 
     def __init__(
@@ -57,7 +64,24 @@ class GrvtCcxtBase:
 
         self._path_return_value_map: dict = {}
         self._cookie: dict | None = None
+        # Cookie is renewed in the background and shared with other clients using the same api key
+        self._auth_manager: GrvtAuthManager | None = parameters.get("auth_manager")
+        if self._auth_manager is None and self._api_key:
+            self._auth_manager = GrvtAuthManager.shared(
+                get_grvt_endpoint(env, "AUTH"), self._api_key, self.logger
+            )
         self.markets: dict = {}
+        # Last time markets were requested from the exchange (0 while only the cache was used)
+        self._markets_loaded_at: float = 0.0
+        # Instruments are cached on disk so startup does not wait for load_markets()
+        self._instrument_cache: GrvtInstrumentCache | None = None
+        if parameters.get("instrument_cache", True):
+            self._instrument_cache = GrvtInstrumentCache(
+                env,
+                directory=parameters.get("instrument_cache_dir"),
+                ttl_secs=parameters.get("instrument_cache_ttl", DEFAULT_TTL_SECS),
+                logger=self.logger,
+            )
         self._clsname: str = type(self).__name__
         self.logger.info(f"GrvtCcxtBase: {self.env=}, {self._trading_account_id=}")
 
@@ -97,14 +121,39 @@ class GrvtCcxtBase:
         """Returns True if order book should be returned in CCXT format."""
         return self._order_book_ccxt_format
 
+    def _markets_from_cache(self) -> tuple[dict[str, dict] | None, bool]:
+        """
+        Returns:
+            (markets, needs_refresh): markets from the on-disk cache (None if missing,
+            expired or disabled) and whether they should be revalidated from the exchange.
+        """
+        if self._instrument_cache is None:
+            return None, True
+        markets, is_fresh = self._instrument_cache.load()
+        return markets, not is_fresh
+
+    def _should_reload_markets(self, symbol: str) -> bool:
+        """True if symbol is unknown and markets were not requested from the exchange recently."""
+        if symbol in self.markets:
+            return False
+        return time.time() - self._markets_loaded_at > MARKETS_MISS_RELOAD_SECS
+
+    def _save_markets_to_cache(self) -> None:
+        if self._instrument_cache is not None and self.markets:
+            self._instrument_cache.save(self.markets)
+
     def should_refresh_cookie(self) -> bool:
         """
         Retuns:
-            True if this object has API key and the session cookie should be refreshed.
+            True if this object has API key and the session cookie should be refreshed
+                (the auth manager holds a newer cookie, or there is no valid cookie).
             False - otherwise.
         """
         if not self._api_key:
             return False
+        if self._auth_manager is not None:
+            latest = self._auth_manager.current_cookie()
+            return latest is None or latest is not self._cookie
         time_till_expiration = None
         if self._cookie and "expires" in self._cookie:
             time_till_expiration = self._cookie["expires"] - time.time()
@@ -234,6 +283,12 @@ class GrvtCcxtBase:
         else:
             if symbol:
                 payload["instrument"] = symbol
+                # Fill history has no instrument filter: narrow it server side by
+                # kind/base/quote, fetch_my_trades() filters the rest by instrument
+                market = self.markets.get(symbol) or {}
+                for key in ("kind", "base", "quote"):
+                    if market.get(key):
+                        payload[key] = [market[key]]
             else:
                 if "kind" in params:
                     payload["kind"] = [params["kind"]]
@@ -318,7 +373,7 @@ class GrvtCcxtBase:
                 payload["start_time"] = str(start_time)
             if end_time:
                 payload["end_time"] = str(end_time)
-            payload["limit"] = limit | 500
+            payload["limit"] = limit or 500
         return payload
 
     def _get_payload_fetch_positions(self, symbols: list[str] = [], params={}) -> dict:
@@ -369,6 +424,8 @@ class GrvtCcxtBase:
                 `quote`: (str) - The quote currency filter. Defaults to all quote currencies.<br>
                 `expiration`: (int)	The expiration time in nanoseconds. Defaults to all.<br>
                 `strike_price`: (str) The strike price to apply. Defaults to all strike prices.<br>
+                `start_time`: (int) fetch orders since this timestamp in nanoseconds.<br>
+                `end_time`: (int) fetch orders until this timestamp in nanoseconds.<br>
                 `limit`: (int) The limit to query for. Defaults to 500; Max 1000.<br>
                 `cursor`: (str) The cursor to use for pagination. If nil, return the first page.<br>
         Returns: a dictionary with a payload for Rest API call to fetch order history.<br>
@@ -391,6 +448,10 @@ class GrvtCcxtBase:
                 payload["expiration"] = [params["expiration"]]
             if "strike_price" in params:
                 payload["strike_price"] = [params["strike_price"]]
+            if params.get("start_time"):
+                payload["start_time"] = str(params["start_time"])
+            if params.get("end_time"):
+                payload["end_time"] = str(params["end_time"])
         return payload
 
     def _get_payload_fetch_open_orders(
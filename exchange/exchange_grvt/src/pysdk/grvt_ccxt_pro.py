@@ -9,6 +9,7 @@
 import asyncio
 import json
 import logging
+import time
 from typing import Literal
 
 import aiohttp
@@ -29,8 +30,6 @@ from .grvt_ccxt_types import (
 from .grvt_ccxt_utils import (
     EnumEncoder,
     GrvtOrder,
-    get_cookie_with_expiration,
-    get_cookie_with_expiration_async,
     get_grvt_order,
     get_order_payload,
 )
@@ -63,9 +62,7 @@ class GrvtCcxtPro(GrvtCcxtBase):
         self._clsname: str = type(self).__name__
         self._session = aiohttp.ClientSession(headers={"Content-Type": "application/json"})
         # Force sync call to get cookie here
-        self._cookie = get_cookie_with_expiration(
-            get_grvt_endpoint(self.env, "AUTH"), self._api_key
-        )
+        self._cookie = self._auth_manager.get_cookie() if self._auth_manager else None
         self.update_session_with_cookie()
 
     def __del__(self):
@@ -83,56 +80,89 @@ class GrvtCcxtPro(GrvtCcxtBase):
                     {"X-Grvt-Account-Id": self._cookie["X-Grvt-Account-Id"]}
                 )
             self.logger.info(
-                f"update_session_with_cookie {self._cookie=} {self._session.cookie_jar=}"
-                f" {self._session.headers=}"
+                "update_session_with_cookie cookie refreshed, expires=%s",
+                self._cookie.get("expires"),
+            )
+            self.logger.debug(
+                "update_session_with_cookie cookie=%s cookie_jar=%s headers=%s",
+                self._cookie,
+                self._session.cookie_jar,
+                self._session.headers,
             )
 
     async def refresh_cookie(self) -> dict | None:
-        """Refresh the session cookie."""
+        """
+        Picks up the latest session cookie from the auth manager.
+        The manager renews the cookie in a background thread; a login is awaited
+        (off the event loop) only when no valid cookie exists.
+        """
         if not self.should_refresh_cookie():
             return self._cookie
         path: str = get_grvt_endpoint(self.env, "AUTH")
-        self._cookie = await get_cookie_with_expiration_async(path, self._api_key)
+        cookie = self._auth_manager.current_cookie() if self._auth_manager else None
+        if cookie is None and self._auth_manager is not None:
+            cookie = await asyncio.get_running_loop().run_in_executor(
+                None, self._auth_manager.get_cookie
+            )
+        self._cookie = cookie
         self._path_return_value_map[path] = self._cookie
         self.update_session_with_cookie()
         return self._cookie
 
     # PRIVATE API CALLS
     async def _auth_and_post(self, path: str, payload: dict) -> dict:
-        FN = f"{self._clsname} _auth_and_post {path=}"
-        MAX_LEN_TO_LOG = 1280
+        # Log with lazy %-style arguments only: this runs on every order request and
+        # must not pay for formatting payloads/responses when the level is disabled.
         response: dict = {}
         if not path:
-            self.logger.warning(f"{FN} Invalid path {path=} {payload=}")
-            raise GrvtInvalidOrder(f"{FN} Invalid path {path=} {payload=}")
-        # Always see if need to referesh cookie before sending a request
+            self.logger.warning(
+                "%s _auth_and_post Invalid path %r payload=%s", self._clsname, path, payload
+            )
+            raise GrvtInvalidOrder(
+                f"{self._clsname} _auth_and_post Invalid path {path=} {payload=}"
+            )
+        # Cheap check: only swaps in a cookie renewed by the auth manager
         await self.refresh_cookie()
         payload_json = json.dumps(payload, cls=EnumEncoder)
-        self.logger.info(f"{FN} {payload=}\n{payload_json=}")
-        return_text: str = ""
+        self.logger.debug(
+            "%s _auth_and_post path=%r payload_json=%s", self._clsname, path, payload_json
+        )
         async with self._session.post(
             url=path,
             data=payload_json,
             headers={"Content-Type": "application/json"},
             timeout=5,
         ) as return_value:
-            return_text: str = ""
             try:
-                return_text = await return_value.text()
                 response = await return_value.json(content_type="application/json")
             except Exception as err:
                 self.logger.warning(
-                    f"{FN} Unable to parse {return_value=} as "
-                    f" json(content_type='application/json'). {err=}"
+                    "%s _auth_and_post path=%r Unable to parse %r as"
+                    " json(content_type='application/json'). err=%r",
+                    self._clsname,
+                    path,
+                    return_value,
+                    err,
                 )
             if not return_value.ok:
-                self.logger.warning(f"{FN} {payload_json=}\n{return_value=}\n{response=}")
+                self.logger.warning(
+                    "%s _auth_and_post path=%r payload_json=%s\nreturn_value=%r\nresponse=%s",
+                    self._clsname,
+                    path,
+                    payload_json,
+                    return_value,
+                    response,
+                )
             else:
-                if len(return_text) > MAX_LEN_TO_LOG:
-                    self.logger.debug(f"{FN} OK {return_value=} response={response}")
-                    self.logger.info(f"{FN} OK {return_value=} response=**TOO LONG**")
-                else:
-                    self.logger.info(f"{FN} OK {return_value=} response={response}")
+                self.logger.info(
+                    "%s _auth_and_post path=%r OK status=%s",
+                    self._clsname,
+                    path,
+                    return_value.status,
+                )
+                self.logger.debug(
+                    "%s _auth_and_post path=%r response=%s", self._clsname, path, response
+                )
         self._path_return_value_map[path] = response
         return response or {}
 
@@ -197,6 +227,9 @@ class GrvtCcxtPro(GrvtCcxtBase):
         params={},
     ) -> dict:
         """Ccxt compliant signature."""
+        if self._should_reload_markets(symbol):
+            self.logger.info(f"{self._clsname} create_order: {symbol=} unknown, reloading markets")
+            await self.load_markets()
         order = self._get_order_with_validations(symbol, order_type, side, amount, price, params)
         return await self._create_grvt_order(order)
 
@@ -400,6 +433,8 @@ class GrvtCcxtPro(GrvtCcxtBase):
                 `quote`: (str) - The quote currency filter. Defaults to all quote currencies.<br>
                 `expiration`: (int)	The expiration time in nanoseconds. Defaults to all.<br>
                 `strike_price`: (str) The strike price to apply. Defaults to all strike prices.<br>
+                `start_time`: (int) fetch orders since this timestamp in nanoseconds.<br>
+                `end_time`: (int) fetch orders until this timestamp in nanoseconds.<br>
                 `limit`: (int) The limit to query for. Defaults to 500; Max 1000.<br>
                 `cursor`: (str) The cursor to use for pagination. If nil, return the first page.<br>
         Return: a dictionary with keys:
@@ -563,6 +598,7 @@ class GrvtCcxtPro(GrvtCcxtBase):
     # **************** PUBLIC API CALLS
     async def load_markets(self) -> dict | None:
         self.logger.info("load_markets START")
+        self._markets_loaded_at = time.time()
         instruments = await self.fetch_markets(
             params={
                 "kind": GrvtInstrumentKind.PERPETUAL,
@@ -571,10 +607,26 @@ class GrvtCcxtPro(GrvtCcxtBase):
         if instruments:
             self.markets = {i.get("instrument"): i for i in instruments}
             self.logger.info(f"load_markets: loaded {len(self.markets)} markets.")
+            self._save_markets_to_cache()
         else:
             self.logger.warning("load_markets: No markets found.")
         return self.markets
 
+    async def initialize_markets(self) -> dict | None:
+        """
+        Assigns markets from the on-disk instrument cache and revalidates them in a
+        background task when stale. Awaits load_markets() only if there is no cache.
+        """
+        markets, needs_refresh = self._markets_from_cache()
+        if not markets:
+            return await self.load_markets()
+        self.markets = markets
+        if needs_refresh:
+            self._markets_refresh_task = asyncio.get_running_loop().create_task(
+                self.load_markets()
+            )
+        return self.markets
+
     async def fetch_markets(
         self,
         params: dict = {},
@@ -11,7 +11,7 @@ import logging
 import random
 import time
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
 from enum import Enum
 from http.cookies import SimpleCookie
@@ -81,10 +81,11 @@ def get_EIP712_domain_data(env: GrvtEnv) -> dict[str, str | int]:
 
 
 def get_cookie_with_expiration(
-    path: str, api_key: str | None
+    path: str, api_key: str | None, session: requests.Session | None = None
 ) -> dict[str, str | float | None] | None:
     """
     Authenticates and retrieves the session cookie, its expiration time and grvt-account-id token.
+    :param session: optional keep-alive session to reuse; a new one is created if missing.
     :return: The session cookie.
     """
     FN = f"get_cookie_with_expiration {path=}"
@@ -92,7 +93,7 @@ def get_cookie_with_expiration(
         data = {}
         try:
             data = {"api_key": api_key}
-            session = requests.Session()
+            session = session or requests.Session()
             return_value = session.post(
                 path,
                 json=data,
@@ -103,10 +104,11 @@ def get_cookie_with_expiration(
                 cookie = SimpleCookie()
                 cookie.load(return_value.headers.get("Set-Cookie", ""))
                 cookie_value: str = cookie["gravity"].value
+                # Expires is a GMT date: parse as UTC, not local time
                 cookie_expiry: datetime = datetime.strptime(
                     cookie["gravity"]["expires"],
                     "%a, %d %b %Y %H:%M:%S %Z",
-                )
+                ).replace(tzinfo=timezone.utc)
                 grvt_account_id: str = return_value.headers.get("X-Grvt-Account-Id", "")
                 logging.info(
                     f"{FN} OK response {cookie_value=} {cookie_expiry=} {grvt_account_id=}"
@@ -148,7 +150,7 @@ async def get_cookie_with_expiration_async(
                         cookie_expiry: datetime = datetime.strptime(
                             cookie["gravity"]["expires"],
                             "%a, %d %b %Y %H:%M:%S %Z",
-                        )
+                        ).replace(tzinfo=timezone.utc)
                         grvt_account_id: str = return_value.headers.get("X-Grvt-Account-Id", "")
                         logging.info(
                             f"{FN} OK response {cookie_value=} {cookie_expiry=} {grvt_account_id=}"
@@ -331,21 +333,25 @@ class GrvtOrder:
 def get_signable_message(
     order: GrvtOrder, env: GrvtEnv, instruments: dict[str, dict]
 ) -> bytes | None:
-    FN = f"get_signable_message {order=}"
+    # Called for every order: never format the order or the instrument map eagerly.
     size_multiplier = BTC_ETH_SIZE_MULTIPLIER
     PRICE_MULTIPLIER = 1_000_000_000
     legs = []
     for leg in order.legs:
         instrument = instruments.get(leg.instrument)
         if not instrument or not isinstance(instrument, dict):
-            logging.error(f"{FN}: {leg.instrument=} not found in {instruments=}")
+            logging.error(
+                "get_signable_message: instrument %r not found in %d loaded instruments",
+                leg.instrument,
+                len(instruments),
+            )
             return None
         if "base_decimals" not in instrument:
-            logging.error(f"{FN}: no 'base_decimals' in {instrument=}")
+            logging.error("get_signable_message: no 'base_decimals' in instrument=%s", instrument)
             return None
         size_multiplier = 10 ** instrument["base_decimals"]
         if "instrument_hash" not in instrument:
-            logging.error(f"{FN}: no 'instrument_hash' in {instrument=}")
+            logging.error("get_signable_message: no 'instrument_hash' in instrument=%s", instrument)
             return None
         legs.append(
             {
@@ -366,7 +372,7 @@ def get_signable_message(
         "expiration": order.signature.expiration,
     }
     domain_data: dict[str, str | int]= get_EIP712_domain_data(env)
-    logging.info(f"{FN} {domain_data=}\n{EIP712_ORDER_MESSAGE_TYPE=}\n{message_data=}")
+    logging.debug("get_signable_message domain_data=%s message_data=%s", domain_data, message_data)
     return encode_typed_data(domain_data, EIP712_ORDER_MESSAGE_TYPE, message_data)
 
 
@@ -103,7 +103,7 @@ class GrvtCcxtWS(GrvtCcxtPro):
         """
         Prepares the GrvtCcxtPro instance and connects to WS server.
         """
-        await self.load_markets()
+        await self.initialize_markets()
         await self.refresh_cookie()
         self._loop.create_task(self.connect_all_channels())
 
@@ -170,6 +170,8 @@ class GrvtCcxtWS(GrvtCcxtPro):
                 self.logger.info(f"{FN} Already connected")
                 return True
             self.subscribed_streams[grvt_endpoint_type] = {}
+            # (Re)connect with the latest cookie renewed by the auth manager
+            await self.refresh_cookie()
             extra_headers = {}
             if self._cookie:
                 extra_headers = {"Cookie": f"gravity={self._cookie['gravity']}"}
@@ -0,0 +1,101 @@
+# ruff: noqa: D200
+# ruff: noqa: D204
+# ruff: noqa: D205
+# ruff: noqa: D404
+# ruff: noqa: W291
+# ruff: noqa: D400
+# ruff: noqa: E501
+
+import json
+import logging
+import os
+import time
+
+from .grvt_ccxt_env import GrvtEnv
+
+# Bump when the cached instrument format changes: older files are then ignored.
+CACHE_FORMAT_VERSION = 1
+# Cache younger than this is used as is; older cache is used at startup and revalidated in the background.
+DEFAULT_TTL_SECS = 60 * 60
+# Cache older than this is ignored and markets are loaded synchronously.
+DEFAULT_MAX_AGE_SECS = 7 * 24 * 60 * 60
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "grvt-pysdk")
+
+
+class GrvtInstrumentCache:
+    """
+    On-disk cache of instrument metadata (instrument_hash, base_decimals, tick_size, ...)
+    keyed by environment, so clients can sign orders right after start without waiting
+    for load_markets().
+
+    Args:
+        env: GrvtEnv the instruments belong to
+        directory: cache directory, defaults to $GRVT_CACHE_DIR or ~/.cache/grvt-pysdk
+        ttl_secs: age after which the cache should be revalidated in the background
+        max_age_secs: age after which the cache is not used at all
+        logger: logging.Logger
+    """
+
+    def __init__(
+        self,
+        env: GrvtEnv,
+        directory: str | None = None,
+        ttl_secs: float = DEFAULT_TTL_SECS,
+        max_age_secs: float = DEFAULT_MAX_AGE_SECS,
+        logger: logging.Logger | None = None,
+    ):
+        self.env = env
+        self.directory = directory or os.getenv("GRVT_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.ttl_secs = ttl_secs
+        self.max_age_secs = max_age_secs
+        self.logger = logger or logging.getLogger(__name__)
+        self.path = os.path.join(
+            self.directory, f"instruments_{env.value}_v{CACHE_FORMAT_VERSION}.json"
+        )
+
+    def load(self) -> tuple[dict[str, dict] | None, bool]:
+        """
+        Returns:
+            (markets, is_fresh): markets is None if there is no usable cache;
+            is_fresh is False when the cache should be revalidated.
+        """
+        FN = f"GrvtInstrumentCache load {self.path=}"
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None, False
+        except Exception as e:
+            self.logger.warning(f"{FN} unreadable cache: {e}")
+            return None, False
+        if data.get("version") != CACHE_FORMAT_VERSION or data.get("env") != self.env.value:
+            return None, False
+        markets = data.get("markets")
+        if not isinstance(markets, dict) or not markets:
+            return None, False
+        age = time.time() - float(data.get("saved_at", 0))
+        if age > self.max_age_secs:
+            self.logger.info(f"{FN} cache too old ({age:.0f} secs), ignoring")
+            return None, False
+        self.logger.info(f"{FN} loaded {len(markets)} markets, age={age:.0f} secs")
+        return markets, age <= self.ttl_secs
+
+    def save(self, markets: dict[str, dict]) -> None:
+        """Atomically replaces the cache file (readers see the old or the new file)."""
+        FN = f"GrvtInstrumentCache save {self.path=}"
+        if not markets:
+            return
+        data = {
+            "version": CACHE_FORMAT_VERSION,
+            "env": self.env.value,
+            "saved_at": time.time(),
+            "markets": markets,
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.logger.warning(f"{FN} failed: {e}")
@@ -1,17 +1,19 @@
+import asyncio
 import dataclasses
 import json
 import logging
 import time
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
-from http.cookies import SimpleCookie
 from typing import Any
 
 import aiohttp
 import requests  # type: ignore
 from eth_account import Account
 
+from .grvt_auth_manager import GrvtAuthManager
+from .grvt_raw_decoder import json_loads
 from .grvt_raw_env import GrvtEnv, GrvtEnvConfig, get_env_config
 
 
@@ -50,6 +52,16 @@ class GrvtRawBase:
         self.env: GrvtEnvConfig = get_env_config(config.env)
         self.logger: logging.Logger = config.logger or logging.getLogger(__name__)
         self._cookie: GrvtCookie | None = None
+        # Source dict of self._cookie, as handed out by the auth manager
+        self._cookie_source: dict | None = None
+        # Cookie is renewed in the background and shared with other clients using the same api key
+        self._auth_manager: GrvtAuthManager | None = None
+        if self.config.api_key:
+            self._auth_manager = GrvtAuthManager.shared(
+                self.env.edge.rpc_endpoint + "/auth/api_key/login",
+                str(self.config.api_key),
+                self.logger,
+            )
         if self.config.private_key is not None:
             self.account: Account = Account.from_key(self.config.private_key)
 
@@ -58,18 +70,24 @@ class GrvtRawBase:
     """
 
     def _should_refresh_cookie(self) -> bool:
-        if not self.config.api_key:
+        if not self.config.api_key or self._auth_manager is None:
             raise ValueError("Attempting to use Authenticated API without API key set")
-        time_till_expiration = None
-        if self._cookie and self._cookie.expires:
-            time_till_expiration = self._cookie.expires.timestamp() - time.time()
-        is_cookie_fresh = time_till_expiration is not None and time_till_expiration > 5
-        if not is_cookie_fresh:
-            self.logger.info(
-                f"cookie should be refreshed now={time.time()}"
-                f" {time_till_expiration=} secs"
-            )
-        return not is_cookie_fresh
+        # Cheap check: the auth manager renews the cookie in the background
+        latest = self._auth_manager.current_cookie()
+        if latest is None:
+            self.logger.info(f"cookie should be refreshed now={time.time()}")
+        return latest is None or latest is not self._cookie_source
+
+    def _set_cookie(self, cookie: dict | None) -> None:
+        self._cookie_source = cookie
+        if not cookie:
+            self._cookie = None
+            return
+        self._cookie = GrvtCookie(
+            gravity=str(cookie["gravity"]),
+            expires=datetime.fromtimestamp(float(cookie["expires"]), tz=timezone.utc),
+            grvt_account_id=cookie.get("X-Grvt-Account-Id") or None,
+        )
 
 
 class GrvtRawSyncBase(GrvtRawBase):
@@ -86,11 +104,9 @@ class GrvtRawSyncBase(GrvtRawBase):
     def _refresh_cookie(self) -> None:
         if not self._should_refresh_cookie():
             return None
-        # Get cookie
-        self._cookie = self._get_cookie(
-            self.env.edge.rpc_endpoint + "/auth/api_key/login", str(self.config.api_key)
-        )
-        self.logger.info(f"refresh_cookie cookie={self._cookie}")
+        # Get cookie (blocks on a login only when no valid cookie exists)
+        self._set_cookie(self._auth_manager.get_cookie())
+        self.logger.info(f"refresh_cookie expires={self._cookie and self._cookie.expires}")
         # Update cookie in session
         if self._cookie:
             self._session.cookies.update({"gravity": self._cookie.gravity})
@@ -100,43 +116,6 @@ class GrvtRawSyncBase(GrvtRawBase):
                 )
         return None
 
-    def _get_cookie(self, path: str, api_key: str) -> GrvtCookie | None:
-        FN = f"_get_cookie {path=}"
-        try:
-            return_value = self._session.post(
-                path,
-                json={"api_key": api_key},
-                headers={"Content-Type": "application/json"},
-                timeout=5,
-            )
-            self.logger.info(f"{FN} {return_value=}")
-            if return_value.ok:
-                cookie = SimpleCookie()
-                cookie_header = return_value.headers.get("Set-Cookie")
-                grvt_cookie = return_value.cookies.get("gravity")
-                self.logger.info(
-                    f"{FN} OK {return_value.headers=} \n "
-                    f"{return_value.cookies=}\n{grvt_cookie=}\n{cookie_header=}"
-                )
-                cookie.load(cookie_header)
-                cookie_value = cookie["gravity"].value
-                cookie_expiry = datetime.strptime(
-                    cookie["gravity"]["expires"],
-                    "%a, %d %b %Y %H:%M:%S %Z",
-                )
-                grvt_account_id: str | None = return_value.headers.get(
-                    "X-Grvt-Account-Id"
-                )
-                return GrvtCookie(
-                    gravity=cookie_value,
-                    expires=cookie_expiry,
-                    grvt_account_id=grvt_account_id,
-                )
-            return None
-        except Exception as e:
-            self.logger.error(f"{FN} Error getting cookie: {e}")
-            return None
-
     """
     Post handling
     """
@@ -153,10 +132,11 @@ class GrvtRawSyncBase(GrvtRawBase):
         self.logger.debug(f"{FN} {req_json=}")
         resp: requests.Response = self._session.post(path, data=req_json, timeout=5)
         try:
-            resp_json = resp.json()
+            resp_json = json_loads(resp.content)
             if not resp.ok:
                 self.logger.warning(f"{FN} Error {resp_json=}")
-            else:
+            elif self.logger.isEnabledFor(logging.DEBUG):
+                # Large responses: only format them when debug logging is on
                 self.logger.debug(f"{FN} OK {resp_json=}")
         except Exception as err:
             self.logger.error(f"{FN} Unable to parse {resp.text=} as json:{err=}")
@@ -179,11 +159,14 @@ class GrvtRawAsyncBase(GrvtRawBase):
         if not self._should_refresh_cookie():
             return None
 
-        # Get cookie
-        self._cookie = await self._get_cookie(
-            self.env.edge.rpc_endpoint + "/auth/api_key/login", str(self.config.api_key)
-        )
-        self.logger.info(f"refresh_cookie cookie={self._cookie}")
+        # Get cookie: login runs off the event loop, and only when no valid cookie exists
+        cookie = self._auth_manager.current_cookie()
+        if cookie is None:
+            cookie = await asyncio.get_running_loop().run_in_executor(
+                None, self._auth_manager.get_cookie
+            )
+        self._set_cookie(cookie)
+        self.logger.info(f"refresh_cookie expires={self._cookie and self._cookie.expires}")
 
         # Update cookie in session
         if self._cookie:
@@ -194,41 +177,6 @@ class GrvtRawAsyncBase(GrvtRawBase):
                 )
         return None
 
-    async def _get_cookie(self, path: str, api_key: str) -> GrvtCookie | None:
-        FN = f"_get_cookie {path=}"
-        try:
-            data = {"api_key": api_key}
-            self.logger.info(f"{FN} ask for cookie {path=} {data=}")
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url=path, json=data, timeout=5) as return_value:
-                    self.logger.info(f"{FN} {return_value=}")
-                    if return_value.ok:
-                        cookie = SimpleCookie()
-                        cookie_header = return_value.headers.get("Set-Cookie")
-                        grvt_cookie = return_value.cookies.get("gravity")
-                        self.logger.info(
-                            f"{FN} OK {return_value.headers=} \n "
-                            f"{return_value.cookies=}\n{grvt_cookie=}\n{cookie_header=}"
-                        )
-                        cookie.load(cookie_header)
-                        cookie_value = cookie["gravity"].value
-                        cookie_expiry = datetime.strptime(
-                            cookie["gravity"]["expires"],
-                            "%a, %d %b %Y %H:%M:%S %Z",
-                        )
-                        grvt_account_id: str | None = return_value.headers.get(
-                            "X-Grvt-Account-Id"
-                        )
-                        return GrvtCookie(
-                            gravity=cookie_value,
-                            expires=cookie_expiry,
-                            grvt_account_id=grvt_account_id,
-                        )
-            return None
-        except Exception as e:
-            self.logger.error(f"{FN} Error getting cookie: {e}")
-            return None
-
     """
     Post handling
     """
@@ -248,10 +196,10 @@ class GrvtRawAsyncBase(GrvtRawBase):
         )
         try:
             resp_text = await resp.text()
-            resp_json = json.loads(resp_text)
+            resp_json = json_loads(resp_text)
             if not resp.ok:
                 self.logger.warning(f"{FN} Error {resp_text=}")
-            else:
+            elif self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(f"{FN} OK {resp_text=}")
         except Exception as err:
             self.logger.error(f"{FN} Unable to parse {resp_text=} as json:{err=}")
@@ -0,0 +1,168 @@
+# ruff: noqa: D200
+# ruff: noqa: D204
+# ruff: noqa: D205
+# ruff: noqa: D404
+# ruff: noqa: W291
+# ruff: noqa: D400
+# ruff: noqa: E501
+
+import dataclasses
+import json
+import threading
+import types as pytypes
+import typing
+from collections.abc import Callable
+from enum import Enum
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+try:
+    import orjson
+
+    def json_loads(data: str | bytes) -> Any:
+        """Parses JSON with orjson when it is installed (falls back to json.loads)."""
+        return orjson.loads(data)
+
+    JSON_BACKEND = "orjson"
+except ImportError:  # pragma: no cover - optional dependency
+    json_loads = json.loads
+    JSON_BACKEND = "json"
+
+_PRIMITIVES = (str, int, float, bool)
+_MISSING = object()
+
+_decoders: dict[type, Callable[[dict], Any]] = {}
+_in_progress: set[type] = set()
+_lock = threading.RLock()
+
+
+def decode(cls: type[T], data: dict) -> T:
+    """
+    Builds dataclass `cls` from a response dict using a generated, cached decoder.
+
+    Drop-in replacement for `dacite.from_dict(cls, data, Config(cast=[Enum]))` on the
+    types in grvt_raw_types: enums are cast from their values, nested dataclasses, lists
+    and optionals are decoded recursively, missing optional fields become None (or the
+    field default) and unknown keys are ignored. Unlike dacite, field types are not
+    validated at runtime.
+    """
+    decoder = _decoders.get(cls)
+    if decoder is None:
+        decoder = get_decoder(cls)
+    return decoder(data)
+
+
+def get_decoder(cls: type[T]) -> Callable[[dict], T]:
+    """Returns the decoder function for dataclass `cls`, generating it on first use."""
+    decoder = _decoders.get(cls)
+    if decoder is not None:
+        return decoder
+    with _lock:
+        decoder = _decoders.get(cls)
+        if decoder is None:
+            decoder = _compile(cls)
+            _decoders[cls] = decoder
+        return decoder
+
+
+def _is_optional(tp: Any) -> tuple[bool, Any]:
+    origin = typing.get_origin(tp)
+    if origin is typing.Union or origin is pytypes.UnionType:
+        args = [a for a in typing.get_args(tp) if a is not type(None)]
+        if len(args) < len(typing.get_args(tp)):
+            return True, args[0] if len(args) == 1 else Any
+    return False, tp
+
+
+def _converter(tp: Any, ns: dict, owner: type) -> str | None:
+    """
+    Returns the name of a one-argument converter for values of type `tp` placed in
+    `ns`, or None if values are used as is.
+    """
+    optional, inner = _is_optional(tp)
+    if optional:
+        conv = _converter(inner, ns, owner)
+        if conv is None:
+            return None
+        name = f"_opt_{len(ns)}"
+        exec(f"def {name}(v):\n    return None if v is None else {conv}(v)\n", ns)
+        return name
+    if tp is Any or tp in _PRIMITIVES:
+        return None
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        name = f"_enum_{tp.__name__}"
+        ns[name] = tp
+        return name
+    if dataclasses.is_dataclass(tp):
+        name = f"_dec_{tp.__name__}"
+        if tp in _in_progress:
+            # Self-referencing types: resolve lazily once the decoder exists
+            ns[name] = lambda v, _tp=tp: _decoders[_tp](v)
+        else:
+            ns[name] = get_decoder(tp)
+        return name
+    origin = typing.get_origin(tp)
+    if origin in (list, tuple, set):
+        args = typing.get_args(tp)
+        item_conv = _converter(args[0], ns, owner) if args else None
+        if item_conv is None:
+            return None
+        name = f"_list_{len(ns)}"
+        exec(f"def {name}(v):\n    return [{item_conv}(x) for x in v]\n", ns)
+        return name
+    if origin is dict:
+        args = typing.get_args(tp)
+        value_conv = _converter(args[1], ns, owner) if len(args) == 2 else None
+        if value_conv is None:
+            return None
+        name = f"_dict_{len(ns)}"
+        exec(f"def {name}(v):\n    return {{k: {value_conv}(x) for k, x in v.items()}}\n", ns)
+        return name
+    raise TypeError(f"grvt_raw_decoder: unsupported type {tp!r} in {owner.__name__}")
+
+
+def _compile(cls: type) -> Callable[[dict], Any]:
+    if not dataclasses.is_dataclass(cls):
+        raise TypeError(f"grvt_raw_decoder: {cls!r} is not a dataclass")
+    _in_progress.add(cls)
+    try:
+        hints = typing.get_type_hints(cls)
+        ns: dict[str, Any] = {"_cls": cls, "_MISSING": _MISSING}
+        lines = [f"def _decode_{cls.__name__}(d):"]
+        args = []
+        for i, field in enumerate(dataclasses.fields(cls)):
+            if not field.init:
+                continue
+            tp = hints.get(field.name, field.type)
+            conv = _converter(tp, ns, cls)
+            key = repr(field.name)
+            var = f"v{i}"
+            has_default = (
+                field.default is not dataclasses.MISSING
+                or field.default_factory is not dataclasses.MISSING
+            )
+            if has_default:
+                # Missing key keeps the dataclass default
+                lines.append(f"    {var} = d.get({key}, _MISSING)")
+                value = var if conv is None else f"{conv}({var})"
+                lines.append(f"    if {var} is not _MISSING: {var} = {value}")
+                args.append((field.name, var, True))
+                continue
+            optional, _ = _is_optional(tp)
+            getter = f"d.get({key})" if optional else f"d[{key}]"
+            lines.append(f"    {var} = {getter if conv is None else f'{conv}({getter})'}")
+            args.append((field.name, var, False))
+        required = ", ".join(f"{name}={var}" for name, var, dflt in args if not dflt)
+        defaulted = [(name, var) for name, var, dflt in args if dflt]
+        if defaulted:
+            lines.append("    kw = {}")
+            for name, var in defaulted:
+                lines.append(f"    if {var} is not _MISSING: kw[{name!r}] = {var}")
+            lines.append(f"    return _cls({required}{', ' if required else ''}**kw)")
+        else:
+            lines.append(f"    return _cls({required})")
+        exec("\n".join(lines) + "\n", ns)
+        return ns[f"_decode_{cls.__name__}"]
+    finally:
+        _in_progress.discard(cls)
@@ -1,9 +1,6 @@
-from enum import Enum
-
-from dacite import Config, from_dict
-
 from . import grvt_raw_types as types
 from .grvt_raw_base import GrvtApiConfig, GrvtError, GrvtRawSyncBase
+from .grvt_raw_decoder import decode
 
 # mypy: disable-error-code="no-any-return"
 
@@ -20,7 +17,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/instrument", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiGetInstrumentResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiGetInstrumentResponse, resp)
 
     def get_all_instruments_v1(
         self, req: types.ApiGetAllInstrumentsRequest
@@ -28,7 +25,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/all_instruments", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiGetAllInstrumentsResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiGetAllInstrumentsResponse, resp)
 
     def get_filtered_instruments_v1(
         self, req: types.ApiGetFilteredInstrumentsRequest
@@ -36,9 +33,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/instruments", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(
-            types.ApiGetFilteredInstrumentsResponse, resp, Config(cast=[Enum])
-        )
+        return decode(types.ApiGetFilteredInstrumentsResponse, resp)
 
     def get_currency_v1(
         self, req: types.ApiGetCurrencyRequest
@@ -46,7 +41,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/currency", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiGetCurrencyResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiGetCurrencyResponse, resp)
 
     def mini_ticker_v1(
         self, req: types.ApiMiniTickerRequest
@@ -54,7 +49,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/mini", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiMiniTickerResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiMiniTickerResponse, resp)
 
     def ticker_v1(
         self, req: types.ApiTickerRequest
@@ -62,7 +57,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/ticker", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiTickerResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiTickerResponse, resp)
 
     def orderbook_levels_v1(
         self, req: types.ApiOrderbookLevelsRequest
@@ -70,13 +65,13 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/book", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiOrderbookLevelsResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiOrderbookLevelsResponse, resp)
 
     def trade_v1(self, req: types.ApiTradeRequest) -> types.ApiTradeResponse | GrvtError:
         resp = self._post(False, self.md_rpc + "/full/v1/trade", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiTradeResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiTradeResponse, resp)
 
     def trade_history_v1(
         self, req: types.ApiTradeHistoryRequest
@@ -84,7 +79,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/trade_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiTradeHistoryResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiTradeHistoryResponse, resp)
 
     def candlestick_v1(
         self, req: types.ApiCandlestickRequest
@@ -92,7 +87,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/kline", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiCandlestickResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiCandlestickResponse, resp)
 
     def funding_rate_v1(
         self, req: types.ApiFundingRateRequest
@@ -100,7 +95,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/funding", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiFundingRateResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiFundingRateResponse, resp)
 
     def create_order_v1(
         self, req: types.ApiCreateOrderRequest
@@ -108,7 +103,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/create_order", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiCreateOrderResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiCreateOrderResponse, resp)
 
     def cancel_order_v1(
         self, req: types.ApiCancelOrderRequest
@@ -116,7 +111,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/cancel_order", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return decode(types.AckResponse, resp)
 
     def cancel_all_orders_v1(
         self, req: types.ApiCancelAllOrdersRequest
@@ -124,7 +119,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/cancel_all_orders", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return decode(types.AckResponse, resp)
 
     def get_order_v1(
         self, req: types.ApiGetOrderRequest
@@ -132,7 +127,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/order", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiGetOrderResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiGetOrderResponse, resp)
 
     def open_orders_v1(
         self, req: types.ApiOpenOrdersRequest
@@ -140,7 +135,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/open_orders", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiOpenOrdersResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiOpenOrdersResponse, resp)
 
     def order_history_v1(
         self, req: types.ApiOrderHistoryRequest
@@ -148,7 +143,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/order_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiOrderHistoryResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiOrderHistoryResponse, resp)
 
     def cancel_on_disconnect_v1(
         self, req: types.ApiCancelOnDisconnectRequest
@@ -156,7 +151,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/cancel_on_disconnect", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return decode(types.AckResponse, resp)
 
     def fill_history_v1(
         self, req: types.ApiFillHistoryRequest
@@ -164,7 +159,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/fill_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiFillHistoryResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiFillHistoryResponse, resp)
 
     def positions_v1(
         self, req: types.ApiPositionsRequest
@@ -172,7 +167,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/positions", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiPositionsResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiPositionsResponse, resp)
 
     def funding_payment_history_v1(
         self, req: types.ApiFundingPaymentHistoryRequest
@@ -180,9 +175,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/funding_payment_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(
-            types.ApiFundingPaymentHistoryResponse, resp, Config(cast=[Enum])
-        )
+        return decode(types.ApiFundingPaymentHistoryResponse, resp)
 
     def deposit_history_v1(
         self, req: types.ApiDepositHistoryRequest
@@ -190,7 +183,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/deposit_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiDepositHistoryResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiDepositHistoryResponse, resp)
 
     def transfer_v1(
         self, req: types.ApiTransferRequest
@@ -198,7 +191,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/transfer", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiTransferResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiTransferResponse, resp)
 
     def transfer_history_v1(
         self, req: types.ApiTransferHistoryRequest
@@ -206,7 +199,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/transfer_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiTransferHistoryResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiTransferHistoryResponse, resp)
 
     def withdrawal_v1(
         self, req: types.ApiWithdrawalRequest
@@ -214,7 +207,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/withdrawal", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return decode(types.AckResponse, resp)
 
     def withdrawal_history_v1(
         self, req: types.ApiWithdrawalHistoryRequest
@@ -222,7 +215,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/withdrawal_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiWithdrawalHistoryResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiWithdrawalHistoryResponse, resp)
 
     def sub_account_summary_v1(
         self, req: types.ApiSubAccountSummaryRequest
@@ -230,7 +223,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/account_summary", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiSubAccountSummaryResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiSubAccountSummaryResponse, resp)
 
     def sub_account_history_v1(
         self, req: types.ApiSubAccountHistoryRequest
@@ -238,7 +231,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/account_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiSubAccountHistoryResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiSubAccountHistoryResponse, resp)
 
     def aggregated_account_summary_v1(
         self, req: types.EmptyRequest
@@ -246,9 +239,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/aggregated_account_summary", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(
-            types.ApiAggregatedAccountSummaryResponse, resp, Config(cast=[Enum])
-        )
+        return decode(types.ApiAggregatedAccountSummaryResponse, resp)
 
     def funding_account_summary_v1(
         self, req: types.EmptyRequest
@@ -256,9 +247,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/funding_account_summary", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(
-            types.ApiFundingAccountSummaryResponse, resp, Config(cast=[Enum])
-        )
+        return decode(types.ApiFundingAccountSummaryResponse, resp)
 
     def set_derisk_mm_ratio_v1(
         self, req: types.ApiSetDeriskToMaintenanceMarginRatioRequest
@@ -266,9 +255,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/set_derisk_mm_ratio", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(
-            types.ApiSetDeriskToMaintenanceMarginRatioResponse, resp, Config(cast=[Enum])
-        )
+        return decode(types.ApiSetDeriskToMaintenanceMarginRatioResponse, resp)
 
     def get_all_initial_leverage_v1(
         self, req: types.ApiGetAllInitialLeverageRequest
@@ -276,9 +263,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/get_all_initial_leverage", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(
-            types.ApiGetAllInitialLeverageResponse, resp, Config(cast=[Enum])
-        )
+        return decode(types.ApiGetAllInitialLeverageResponse, resp)
 
     def set_initial_leverage_v1(
         self, req: types.ApiSetInitialLeverageRequest
@@ -286,7 +271,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/set_initial_leverage", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiSetInitialLeverageResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiSetInitialLeverageResponse, resp)
 
     def vault_burn_tokens_v1(
         self, req: types.ApiVaultBurnTokensRequest
@@ -294,7 +279,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/vault_burn_tokens", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return decode(types.AckResponse, resp)
 
     def vault_invest_v1(
         self, req: types.ApiVaultInvestRequest
@@ -302,7 +287,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/vault_invest", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return decode(types.AckResponse, resp)
 
     def vault_investor_summary_v1(
         self, req: types.ApiVaultInvestorSummaryRequest
@@ -310,7 +295,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/vault_investor_summary", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiVaultInvestorSummaryResponse, resp, Config(cast=[Enum]))
+        return decode(types.ApiVaultInvestorSummaryResponse, resp)
 
     def vault_redeem_v1(
         self, req: types.ApiVaultRedeemRequest
@@ -318,7 +303,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/vault_redeem", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return decode(types.AckResponse, resp)
 
     def vault_redeem_cancel_v1(
         self, req: types.ApiVaultRedeemCancelRequest
@@ -326,7 +311,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/vault_redeem_cancel", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return decode(types.AckResponse, resp)
 
     def vault_redemption_queue_v1(
         self, req: types.ApiVaultViewRedemptionQueueRequest
@@ -334,9 +319,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/vault_view_redemption_queue", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(
-            types.ApiVaultViewRedemptionQueueResponse, resp, Config(cast=[Enum])
-        )
+        return decode(types.ApiVaultViewRedemptionQueueResponse, resp)
 
     def query_vault_manager_investor_history_v1(
         self, req: types.ApiQueryVaultManagerInvestorHistoryRequest
@@ -346,6 +329,4 @@ class GrvtRawSync(GrvtRawSyncBase):
         )
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(
-            types.ApiQueryVaultManagerInvestorHistoryResponse, resp, Config(cast=[Enum])
-        )
+        return decode(types.ApiQueryVaultManagerInvestorHistoryResponse, resp)
@@ -2,8 +2,6 @@ import os
 import sys
 import time
 import yaml
-import csv
-from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
 from typing import Any, Dict, Tuple, Optional
@@ -17,6 +15,12 @@ if str(project_root) not in sys.path:
 from src.pysdk.grvt_ccxt import GrvtCcxt
 from src.pysdk.grvt_ccxt_env import GrvtEnv
 from src.pysdk.grvt_ccxt_types import PRICE_MULTIPLIER
+# 仓库根目录（用于导入 utils 等公共模块）
+repo_root = project_root.parent.parent
+if str(repo_root) not in sys.path:
+    sys.path.append(str(repo_root))
+
+from utils.order_journal import OrderJournal
 from tests.risk_script import (
     check_time_permission,
     get_current_china_time,
@@ -27,49 +31,22 @@ from tests.risk_script import (
 # ADX风控状态：记录是否因为ADX过高而触发风控
 _adx_risk_triggered = False
 
-# CSV日志文件路径（按日期命名）
-_log_file_path: Optional[Path] = None
+# 订单流水：后台线程批量写盘，按天轮转（替代每条记录都打开一次 CSV 文件）
+_order_journal: Optional[OrderJournal] = None
 
 
-def get_log_file_path() -> Path:
+def get_order_journal() -> OrderJournal:
     """
-    获取日志文件路径（按日期命名）
+    获取订单流水（首次调用时创建，文件位于 logs/ 目录下，按日期命名）
     
     Returns:
-        日志文件路径
+        订单流水实例
     """
-    global _log_file_path
-    if _log_file_path is None:
-        script_dir = Path(__file__).parent
-        today = datetime.now().strftime("%Y-%m-%d")
-        log_dir = script_dir / "logs"
-        log_dir.mkdir(exist_ok=True)
-        _log_file_path = log_dir / f"order_log_{today}.csv"
-    return _log_file_path
-
-
-def init_order_log() -> None:
-    """
-    初始化订单日志CSV文件（如果不存在则创建并写入表头）
-    """
-    log_file = get_log_file_path()
-    
-    # 如果文件不存在，创建并写入表头
-    if not log_file.exists():
-        with open(log_file, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                "时间戳",
-                "操作类型",
-                "交易对",
-                "方向",
-                "价格",
-                "数量",
-                "订单ID",
-                "状态",
-                "错误信息",
-                "备注"
-            ])
+    global _order_journal
+    if _order_journal is None:
+        log_dir = Path(__file__).parent / "logs"
+        _order_journal = OrderJournal(str(log_dir), fmt="csv", prefix="order_log", exchange="grvt")
+    return _order_journal
 
 
 def log_order_operation(
@@ -84,7 +61,7 @@ def log_order_operation(
     notes: Optional[str] = None
 ) -> None:
     """
-    记录订单操作到CSV文件
+    记录订单操作到订单流水（只写入内存缓冲区，由后台线程批量写盘）
     
     Args:
         operation_type: 操作类型（下单/撤单/市价平仓/限价平仓/批量撤单）
@@ -98,33 +75,17 @@ def log_order_operation(
         notes: 备注，可选
     """
     try:
-        # 确保日志文件已初始化
-        init_order_log()
-        
-        log_file = get_log_file_path()
-        
-        # 获取当前时间戳（精确到毫秒）
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        
-        # 准备数据行
-        row = [
-            timestamp,
+        get_order_journal().record(
             operation_type,
-            symbol,
-            side or "",
-            f"{price:.2f}" if price is not None else "",
-            f"{amount:.6f}" if amount is not None else "",
-            order_id or "",
-            status,
-            error_message or "",
-            notes or ""
-        ]
-        
-        # 追加写入CSV文件
-        with open(log_file, "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(row)
-            
+            symbol=symbol,
+            side=side,
+            price=price,
+            quantity=amount,
+            order_id=order_id,
+            status=status,
+            error=error_message,
+            notes=notes,
+        )
     except Exception as e:
         # 记录日志失败不应该影响主程序运行
         print(f"⚠️  记录订单日志失败: {e}")
@@ -1075,9 +1036,8 @@ def main():
     config, grvt = load_and_parse_config()
     
     # 初始化订单日志
-    init_order_log()
-    log_file = get_log_file_path()
-    print(f"订单日志文件: {log_file}")
+    journal = get_order_journal()
+    print(f"订单日志目录: {journal.directory}")
     
     # 从配置读取循环间隔（秒），默认60秒
     loop_interval = config.get("loop_interval", 60)
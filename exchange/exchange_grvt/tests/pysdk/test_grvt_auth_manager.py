@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from pysdk.grvt_auth_manager import GrvtAuthManager
+from pysdk.grvt_ccxt import GrvtCcxt
+from pysdk.grvt_ccxt_env import GrvtEnv
+
+
+class FakeLogin:
+    def __init__(self, lifetime_secs: float, delay_secs: float = 0.0):
+        self.lifetime_secs = lifetime_secs
+        self.delay_secs = delay_secs
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self) -> dict:
+        time.sleep(self.delay_secs)
+        with self.lock:
+            self.calls += 1
+            n = self.calls
+        return {
+            "gravity": f"cookie-{n}",
+            "expires": time.time() + self.lifetime_secs,
+            "X-Grvt-Account-Id": "acc",
+        }
+
+
+def test_get_cookie_logs_in_once_for_concurrent_callers():
+    login = FakeLogin(lifetime_secs=3600, delay_secs=0.1)
+    manager = GrvtAuthManager("path", "key", login_fn=login)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(manager.get_cookie()))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    manager.stop()
+    assert login.calls == 1
+    assert all(r is results[0] for r in results)
+    assert manager.current_cookie() is results[0]
+
+
+def test_cookie_is_renewed_in_background_before_expiry():
+    # Lifetime is shorter than refresh_before, so it is renewed half way through.
+    login = FakeLogin(lifetime_secs=0.6)
+    manager = GrvtAuthManager("path", "key", login_fn=login, refresh_before_secs=300)
+    first = manager._login()
+    manager._ensure_started()
+    time.sleep(0.5)
+    manager.stop()
+    assert login.calls >= 2
+    assert manager._cookie is not first
+    assert manager._cookie["expires"] > first["expires"]
+
+
+def test_current_cookie_never_blocks_and_ignores_expired_cookie():
+    manager = GrvtAuthManager("path", "key", login_fn=FakeLogin(lifetime_secs=1))
+    assert manager.current_cookie() is None
+    manager._cookie = {"gravity": "old", "expires": time.time() - 1}
+    assert manager.current_cookie() is None
+
+
+def test_failed_login_returns_none_and_listeners_see_new_cookie():
+    seen = []
+    manager = GrvtAuthManager("path", "key", login_fn=lambda: None)
+    manager.add_listener(seen.append)
+    assert manager._login() is None
+    manager._login_fn = FakeLogin(lifetime_secs=3600)
+    cookie = manager._login()
+    assert seen == [cookie]
+
+
+def test_shared_returns_same_manager_per_key():
+    a = GrvtAuthManager.shared("path-shared", "key-1")
+    b = GrvtAuthManager.shared("path-shared", "key-1")
+    c = GrvtAuthManager.shared("path-shared", "key-2")
+    assert a is b
+    assert a is not c
+
+
+def test_shared_registers_login_fn_once():
+    plain = GrvtAuthManager.shared("path-login", "key-1")
+    cached = FakeLogin(lifetime_secs=3600)
+
+    # the cache-backed login replaces the default login of a manager created first
+    assert GrvtAuthManager.shared("path-login", "key-1", login_fn=cached) is plain
+    assert plain._login_fn is cached
+    assert GrvtAuthManager.shared("path-login", "key-1", login_fn=cached) is plain
+    assert GrvtAuthManager.registered("path-login", "key-1") is plain
+
+    with pytest.raises(ValueError, match="login_fn"):
+        GrvtAuthManager.shared("path-login", "key-1", login_fn=FakeLogin(lifetime_secs=1))
+    with pytest.raises(ValueError, match="retry_secs"):
+        GrvtAuthManager.shared("path-login", "key-1", retry_secs=1)
+    assert plain._login_fn is cached
+
+
+def test_invalidate_ignores_cookie_that_was_already_replaced():
+    login = FakeLogin(lifetime_secs=3600)
+    manager = GrvtAuthManager("path", "key", login_fn=login)
+    rejected = manager.get_cookie()
+    manager.invalidate(rejected)
+    renewed = manager.get_cookie()
+    # a second request failing with the same (stale) cookie must not log in again
+    manager.invalidate(rejected)
+    assert manager.get_cookie() is renewed
+    manager.stop()
+    assert login.calls == 2
+
+
+def test_rejected_cookie_triggers_one_login_and_retry():
+    login = FakeLogin(lifetime_secs=3600)
+    manager = GrvtAuthManager("path", "key", login_fn=login)
+    client = GrvtCcxt.__new__(GrvtCcxt)
+    client.env = GrvtEnv.TESTNET
+    client.logger = logging.getLogger(__name__)
+    client._api_key = "key"
+    client._auth_manager = manager
+    client._cookie = None
+    client._path_return_value_map = {}
+    client._session = MagicMock()
+    client._session.cookies = {}
+    client._session.headers = {}
+    rejected = SimpleNamespace(status_code=401, ok=False, json=lambda: {"code": 1000})
+    accepted = SimpleNamespace(status_code=200, ok=True, json=lambda: {"result": "ok"})
+
+    client._session.post.side_effect = [rejected, accepted]
+    assert client._auth_and_post("https://example/order", {}) == {"result": "ok"}
+    assert client._session.cookies["gravity"] == "cookie-2"
+
+    # a cookie rejected twice in a row is not retried again
+    client._session.post.side_effect = [rejected, rejected]
+    assert client._auth_and_post("https://example/order", {}) == {"code": 1000}
+    manager.stop()
+    assert login.calls == 3
+    assert client._session.post.call_count == 4
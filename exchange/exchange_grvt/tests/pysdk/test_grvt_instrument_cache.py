@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+
+import pytest
+
+from pysdk.grvt_ccxt import GrvtCcxt
+from pysdk.grvt_ccxt_types import GrvtInvalidOrder
+from pysdk.grvt_ccxt_env import GrvtEnv
+from pysdk.grvt_instrument_cache import CACHE_FORMAT_VERSION, GrvtInstrumentCache
+
+MARKETS = {
+    "BTC_USDT_Perp": {
+        "instrument": "BTC_USDT_Perp",
+        "instrument_hash": "0x030501",
+        "base_decimals": 9,
+        "tick_size": "0.1",
+        "min_size": "0.001",
+    }
+}
+
+
+def test_save_and_load_round_trip(tmp_path):
+    cache = GrvtInstrumentCache(GrvtEnv.TESTNET, directory=str(tmp_path))
+    assert cache.load() == (None, False)
+    cache.save(MARKETS)
+    markets, is_fresh = cache.load()
+    assert markets == MARKETS
+    assert is_fresh
+
+
+def test_stale_expired_and_mismatched_cache(tmp_path):
+    cache = GrvtInstrumentCache(
+        GrvtEnv.TESTNET, directory=str(tmp_path), ttl_secs=10, max_age_secs=100
+    )
+    cache.save(MARKETS)
+    with open(cache.path) as f:
+        data = json.load(f)
+
+    data["saved_at"] = time.time() - 50
+    with open(cache.path, "w") as f:
+        json.dump(data, f)
+    assert cache.load() == (MARKETS, False)
+
+    data["saved_at"] = time.time() - 500
+    with open(cache.path, "w") as f:
+        json.dump(data, f)
+    assert cache.load() == (None, False)
+
+    data["saved_at"] = time.time()
+    data["version"] = CACHE_FORMAT_VERSION + 1
+    with open(cache.path, "w") as f:
+        json.dump(data, f)
+    assert cache.load() == (None, False)
+
+    # Caches are kept per environment
+    assert GrvtInstrumentCache(GrvtEnv.PROD, directory=str(tmp_path)).load() == (None, False)
+
+
+def test_client_starts_from_cache_and_revalidates_in_background(tmp_path, monkeypatch):
+    fetched = threading.Event()
+    new_markets = dict(MARKETS, ETH_USDT_Perp={"instrument": "ETH_USDT_Perp"})
+
+    def fake_fetch_markets(self, params={}):
+        fetched.wait(5)
+        return list(new_markets.values())
+
+    monkeypatch.setattr(GrvtCcxt, "fetch_markets", fake_fetch_markets)
+    GrvtInstrumentCache(GrvtEnv.TESTNET, directory=str(tmp_path)).save(MARKETS)
+
+    params = {"instrument_cache_dir": str(tmp_path), "instrument_cache_ttl": 0}
+    api = GrvtCcxt(GrvtEnv.TESTNET, parameters=params)
+    # Constructor did not wait for the (blocked) fetch
+    assert api.markets == MARKETS
+    fetched.set()
+    deadline = time.time() + 5
+    while api.markets == MARKETS and time.time() < deadline:
+        time.sleep(0.01)
+    assert api.markets == new_markets
+    cached, _ = GrvtInstrumentCache(GrvtEnv.TESTNET, directory=str(tmp_path)).load()
+    assert cached == new_markets
+
+
+def test_unknown_symbol_reloads_fresh_cache_once(tmp_path, monkeypatch):
+    listed = dict(MARKETS, ETH_USDT_Perp=dict(MARKETS["BTC_USDT_Perp"], instrument="ETH_USDT_Perp"))
+    fetches = []
+
+    def fake_fetch_markets(self, params={}):
+        fetches.append(params)
+        return list(listed.values())
+
+    monkeypatch.setattr(GrvtCcxt, "fetch_markets", fake_fetch_markets)
+    monkeypatch.setattr(GrvtCcxt, "_create_grvt_order", lambda self, order: order)
+    GrvtInstrumentCache(GrvtEnv.TESTNET, directory=str(tmp_path)).save(MARKETS)
+
+    params = {"instrument_cache_dir": str(tmp_path), "trading_account_id": "1"}
+    api = GrvtCcxt(GrvtEnv.TESTNET, parameters=params)
+    assert api.markets == MARKETS and not fetches
+
+    # ETH was listed after the (still fresh) cache was written
+    order = api.create_order("ETH_USDT_Perp", "limit", "buy", 1, 100)
+    assert order.legs[0].instrument == "ETH_USDT_Perp"
+    assert len(fetches) == 1
+    assert api.markets == listed
+
+    # a symbol that really does not exist does not reload markets on every order
+    with pytest.raises(GrvtInvalidOrder):
+        api.create_order("DOGE_USDT_Perp", "limit", "buy", 1, 100)
+    assert len(fetches) == 1
@@ -0,0 +1,73 @@
+import dataclasses
+import typing
+from enum import Enum
+
+import pytest
+from dacite import Config, from_dict
+
+from pysdk import grvt_raw_types as types
+from pysdk.grvt_raw_decoder import decode, get_decoder, json_loads
+
+ALL_TYPES = [
+    t for t in vars(types).values() if isinstance(t, type) and dataclasses.is_dataclass(t)
+]
+
+
+def sample_value(tp, fill_optional: bool):
+    args = typing.get_args(tp)
+    if type(None) in args:
+        if not fill_optional:
+            return None
+        tp = next(a for a in args if a is not type(None))
+        args = typing.get_args(tp)
+    if tp is str:
+        return "123"
+    if tp is int:
+        return 7
+    if tp is float:
+        return 1.5
+    if tp is bool:
+        return True
+    if tp is typing.Any:
+        return {"any": 1}
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return list(tp)[-1].value
+    if dataclasses.is_dataclass(tp):
+        return sample_dict(tp, fill_optional)
+    if typing.get_origin(tp) is list:
+        return [sample_value(args[0], fill_optional) for _ in range(2)]
+    raise AssertionError(f"unexpected type {tp!r}")
+
+
+def sample_dict(cls, fill_optional: bool = True) -> dict:
+    hints = typing.get_type_hints(cls)
+    return {
+        f.name: sample_value(hints[f.name], fill_optional)
+        for f in dataclasses.fields(cls)
+        if fill_optional or f.default is dataclasses.MISSING
+    }
+
+
+@pytest.mark.parametrize("cls", ALL_TYPES, ids=lambda c: c.__name__)
+@pytest.mark.parametrize("fill_optional", [True, False])
+def test_decoder_matches_dacite(cls, fill_optional):
+    data = sample_dict(cls, fill_optional)
+    assert decode(cls, data) == from_dict(cls, data, Config(cast=[Enum]))
+
+
+def test_decoder_is_cached_and_ignores_unknown_keys():
+    assert get_decoder(types.Order) is get_decoder(types.Order)
+    data = sample_dict(types.OrderbookLevel)
+    data["unexpected"] = "x"
+    assert decode(types.OrderbookLevel, data) == types.OrderbookLevel(**sample_dict(types.OrderbookLevel))
+
+
+def test_missing_required_field_raises():
+    data = sample_dict(types.OrderbookLevel)
+    del data["price"]
+    with pytest.raises(KeyError):
+        decode(types.OrderbookLevel, data)
+
+
+def test_json_loads_accepts_text_and_bytes():
+    assert json_loads('{"a": [1, "2"]}') == json_loads(b'{"a": [1, "2"]}') == {"a": [1, "2"]}
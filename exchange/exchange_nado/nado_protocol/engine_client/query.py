@@ -1,5 +1,5 @@
 import json
-from typing import Optional
+from typing import Callable, Optional, TypeVar, Union
 import requests
 
 from nado_protocol.engine_client import EngineClientOpts
@@ -54,12 +54,21 @@ from nado_protocol.engine_client.types.query import (
     SpotsAprData,
     IsolatedPositionsData,
 )
+from nado_protocol.engine_client.types.fast import (
+    FastMarketLiquidityData,
+    FastMarketPriceData,
+    FastSubaccountMultiProductsOpenOrdersData,
+    FastSubaccountOpenOrdersData,
+)
+from nado_protocol.utils import fast_json
 from nado_protocol.utils.exceptions import (
     BadStatusCodeException,
     QueryFailedException,
 )
 from nado_protocol.utils.model import ensure_data_type
 
+T = TypeVar("T")
+
 
 class EngineQueryClient:
     """
@@ -77,6 +86,7 @@ class EngineQueryClient:
         self.url: str = self._opts.url
         self.url_v2: str = self.url.replace("/v1", "") + "/v2"
         self.session = requests.Session()  # type: ignore
+        self.fast_decode: bool = self._opts.fast_decode
 
     def query(self, req: QueryRequest) -> QueryResponse:
         """
@@ -103,6 +113,38 @@ class EngineQueryClient:
             raise QueryFailedException(res.text)
         return query_res
 
+    def _query_fast(self, req: QueryRequest, decoder: Callable[[dict], T]) -> T:
+        """
+        Send a query to the engine and decode only its `data` with `decoder`.
+
+        Skips `QueryResponse` validation and union discrimination: the caller already
+        knows the response type of the query.
+
+        Args:
+            req (QueryRequest): The query request parameters.
+
+            decoder (Callable[[dict], T]): Builds the result from the response data.
+
+        Returns:
+            T: The decoded response data.
+
+        Raises:
+            BadStatusCodeException: If the response status code is not 200.
+            QueryFailedException: If the query status is not "success" or the response is malformed.
+        """
+        res = self.session.post(f"{self.url}/query", json=req.dict())
+        if res.status_code != 200:
+            raise BadStatusCodeException(res.text)
+        try:
+            body = fast_json.loads(res.content)
+            if body.get("status") != "success":
+                raise QueryFailedException(res.text)
+            return decoder(body["data"])
+        except QueryFailedException:
+            raise
+        except Exception:
+            raise QueryFailedException(res.text)
+
     def _query_v2(self, url):
         res = self.session.get(url)
         if res.status_code != 200:
@@ -222,7 +264,7 @@ class EngineQueryClient:
 
     def get_subaccount_open_orders(
         self, product_id: int, sender: str
-    ) -> SubaccountOpenOrdersData:
+    ) -> Union[SubaccountOpenOrdersData, FastSubaccountOpenOrdersData]:
         """
         Retrieves the open orders for a subaccount on a specific product.
 
@@ -233,18 +275,22 @@ class EngineQueryClient:
 
         Returns:
             SubaccountOpenOrdersData: A data object containing the open orders for the
-            specified subaccount on the provided product.
+            specified subaccount on the provided product
+            (`FastSubaccountOpenOrdersData` when `fast_decode` is enabled).
         """
+        params = QuerySubaccountOpenOrdersParams(product_id=product_id, sender=sender)
+        if self.fast_decode:
+            return self._query_fast(params, FastSubaccountOpenOrdersData)
         return ensure_data_type(
-            self.query(
-                QuerySubaccountOpenOrdersParams(product_id=product_id, sender=sender)
-            ).data,
+            self.query(params).data,
             SubaccountOpenOrdersData,
         )
 
     def get_subaccount_multi_products_open_orders(
         self, product_ids: list[int], sender: str
-    ) -> SubaccountMultiProductsOpenOrdersData:
+    ) -> Union[
+        SubaccountMultiProductsOpenOrdersData, FastSubaccountMultiProductsOpenOrdersData
+    ]:
         """
         Retrieves the open orders for a subaccount on a specific product.
 
@@ -255,18 +301,22 @@ class EngineQueryClient:
 
         Returns:
             SubaccountMultiProductsOpenOrdersData: A data object containing the open orders for the
-            specified subaccount on the provided product.
+            specified subaccount on the provided product
+            (`FastSubaccountMultiProductsOpenOrdersData` when `fast_decode` is enabled).
         """
+        params = QuerySubaccountMultiProductOpenOrdersParams(
+            product_ids=product_ids, sender=sender
+        )
+        if self.fast_decode:
+            return self._query_fast(params, FastSubaccountMultiProductsOpenOrdersData)
         return ensure_data_type(
-            self.query(
-                QuerySubaccountMultiProductOpenOrdersParams(
-                    product_ids=product_ids, sender=sender
-                )
-            ).data,
+            self.query(params).data,
             SubaccountMultiProductsOpenOrdersData,
         )
 
-    def get_market_liquidity(self, product_id: int, depth: int) -> MarketLiquidityData:
+    def get_market_liquidity(
+        self, product_id: int, depth: int
+    ) -> Union[MarketLiquidityData, FastMarketLiquidityData]:
         """
         Query the engine for market liquidity data for a specific product.
 
@@ -276,12 +326,14 @@ class EngineQueryClient:
             depth (int): The depth of the market.
 
         Returns:
-            MarketLiquidityData: Market liquidity data for the specified product.
+            MarketLiquidityData: Market liquidity data for the specified product
+            (`FastMarketLiquidityData` when `fast_decode` is enabled).
         """
+        params = QueryMarketLiquidityParams(product_id=product_id, depth=depth)
+        if self.fast_decode:
+            return self._query_fast(params, FastMarketLiquidityData)
         return ensure_data_type(
-            self.query(
-                QueryMarketLiquidityParams(product_id=product_id, depth=depth)
-            ).data,
+            self.query(params).data,
             MarketLiquidityData,
         )
 
@@ -318,7 +370,9 @@ class EngineQueryClient:
             self.query(QueryAllProductsParams()).data, AllProductsData
         )
 
-    def get_market_price(self, product_id: int) -> MarketPriceData:
+    def get_market_price(
+        self, product_id: int
+    ) -> Union[MarketPriceData, FastMarketPriceData]:
         """
         Retrieves the highest bid and lowest ask price levels
         from the orderbook for a given product.
@@ -327,10 +381,14 @@ class EngineQueryClient:
             product_id (int): The id of the product.
 
         Returns:
-            MarketPriceData: Market price data for the specified product.
+            MarketPriceData: Market price data for the specified product
+            (`FastMarketPriceData` when `fast_decode` is enabled).
         """
+        params = QueryMarketPriceParams(product_id=product_id)
+        if self.fast_decode:
+            return self._query_fast(params, FastMarketPriceData)
         return ensure_data_type(
-            self.query(QueryMarketPriceParams(product_id=product_id)).data,
+            self.query(params).data,
             MarketPriceData,
         )
 
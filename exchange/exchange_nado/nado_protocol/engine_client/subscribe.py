@@ -0,0 +1,430 @@
+import asyncio
+import inspect
+import itertools
+import json
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from eth_account.signers.local import LocalAccount
+
+from nado_protocol.contracts.eip712.sign import (
+    build_eip712_typed_data,
+    sign_eip712_typed_data,
+)
+from nado_protocol.contracts.types import NadoTxType
+from nado_protocol.engine_client.types.stream import (
+    STREAM_EVENT_TYPES,
+    BookDepthEvent,
+    StreamEvent,
+    StreamGap,
+    StreamSubscription,
+    StreamType,
+)
+from nado_protocol.utils.bytes32 import hex_to_bytes32
+from nado_protocol.utils.fast_json import loads as json_loads
+
+StreamCallback = Callable[[StreamEvent], Union[None, Awaitable[None]]]
+GapCallback = Callable[[StreamGap], Union[None, Awaitable[None]]]
+
+# Streams filtered by subaccount. Fill and position change events carry a
+# `subaccount` field; order update events do not and are routed by subscription.
+SUBACCOUNT_STREAMS = {
+    StreamType.FILL.value,
+    StreamType.POSITION_CHANGE.value,
+    StreamType.ORDER_UPDATE.value,
+}
+
+logger = logging.getLogger(__name__)
+
+
+def subscription_url(gateway_url: str) -> str:
+    """
+    Derive the subscription websocket URL from an engine gateway URL.
+
+    Args:
+        gateway_url (str): e.g. "https://gateway.prod.nado.xyz/v1".
+
+    Returns:
+        str: e.g. "wss://gateway.prod.nado.xyz/v1/subscribe".
+    """
+    url = gateway_url.rstrip("/")
+    if url.startswith("https://"):
+        url = "wss://" + url[len("https://") :]
+    elif url.startswith("http://"):
+        url = "ws://" + url[len("http://") :]
+    return f"{url}/subscribe"
+
+
+class EngineSubscriptionClient:
+    """
+    Asyncio websocket client for the engine subscription streams (book depth, best
+    bid/offer, trades, fills, position changes, order updates).
+
+    - Reconnects with exponential backoff and resubscribes every active subscription.
+    - Detects sequence gaps in book depth updates (`last_max_timestamp` must equal the
+      previous `max_timestamp`) and reports them, together with reconnects, to gap
+      callbacks so local state can be resynced from a snapshot.
+    - Delivers events as typed models to per-subscription callbacks (sync or async).
+      Callbacks run in a separate task, in arrival order, so a callback may itself
+      call `subscribe` / `unsubscribe` without stalling the reader.
+    - Authenticates the connection when a signer is given, for subaccount streams.
+
+    Examples:
+        >>> client = EngineSubscriptionClient(subscription_url(NadoBackendURL.MAINNET_GATEWAY.value))
+        >>> await client.subscribe(StreamSubscription(type=StreamType.BOOK_DEPTH, product_id=2), on_book)
+        >>> client.on_gap(on_gap)
+        >>> await client.start()
+    """
+
+    def __init__(
+        self,
+        url: str,
+        signer: Optional[LocalAccount] = None,
+        sender: Optional[str] = None,
+        endpoint_addr: Optional[str] = None,
+        chain_id: Optional[int] = None,
+        ping_interval: float = 20.0,
+        request_timeout: float = 10.0,
+        min_reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            url (str): The subscription websocket URL, see `subscription_url`.
+
+            signer (Optional[LocalAccount]): Signs the stream authentication; needed for subaccount streams.
+
+            sender (Optional[str]): Subaccount (hex) the connection authenticates as.
+
+            endpoint_addr (Optional[str]): Nado's endpoint address, the EIP-712 verifying contract.
+
+            chain_id (Optional[int]): The network chain ID.
+
+            ping_interval (float): Seconds between websocket pings.
+
+            request_timeout (float): Seconds to wait for the response of a request.
+
+            min_reconnect_delay (float): First reconnect delay; doubles after each failure.
+
+            max_reconnect_delay (float): Upper bound of the reconnect delay.
+        """
+        self.url = url
+        self.signer = signer
+        self.sender = sender
+        self.endpoint_addr = endpoint_addr
+        self.chain_id = chain_id
+        self.ping_interval = ping_interval
+        self.request_timeout = request_timeout
+        self.min_reconnect_delay = min_reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self._subscriptions: dict[tuple, StreamSubscription] = {}
+        self._callbacks: dict[tuple, list[StreamCallback]] = {}
+        self._gap_callbacks: list[GapCallback] = []
+        self._pending: dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._book_seq: dict[int, str] = {}
+        self._ws: Any = None
+        self._connected = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._events: asyncio.Queue = asyncio.Queue()
+        self._closed = False
+        self.reconnects = 0
+
+    # PUBLIC API
+
+    async def start(self) -> None:
+        """
+        Start the connection loop in a background task and wait for the first connection.
+        """
+        if self._task is None:
+            self._closed = False
+            loop = asyncio.get_running_loop()
+            self._dispatcher = loop.create_task(self._dispatch_loop())
+            self._task = loop.create_task(self._run())
+        await self.wait_connected()
+
+    async def wait_connected(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until the client is connected (and authenticated and resubscribed).
+
+        Args:
+            timeout (Optional[float]): Seconds to wait at most.
+        """
+        await asyncio.wait_for(self._connected.wait(), timeout)
+
+    async def close(self) -> None:
+        """
+        Close the connection and stop reconnecting.
+        """
+        self._closed = True
+        if self._ws is not None:
+            await self._ws.close()
+        for task in (self._task, self._dispatcher):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+        self._dispatcher = None
+
+    async def subscribe(
+        self, subscription: StreamSubscription, callback: StreamCallback
+    ) -> None:
+        """
+        Subscribe to a stream. Subscriptions survive reconnects.
+
+        Args:
+            subscription (StreamSubscription): The stream to subscribe to.
+
+            callback (StreamCallback): Called with each typed event of the stream.
+
+        Raises:
+            RuntimeError: If the server rejects the subscription; it is then not kept.
+        """
+        key = subscription.key
+        self._callbacks.setdefault(key, []).append(callback)
+        if key in self._subscriptions:
+            return
+        self._subscriptions[key] = subscription
+        if not self._connected.is_set():
+            return
+        try:
+            await self._request("subscribe", stream=self._stream_params(subscription))
+        except Exception:
+            # Not subscribed: do not resubscribe it on reconnect nor keep its callback
+            self._subscriptions.pop(key, None)
+            self._drop_callback(key, callback)
+            raise
+
+    async def unsubscribe(self, subscription: StreamSubscription) -> None:
+        """
+        Unsubscribe from a stream and drop its callbacks.
+
+        Args:
+            subscription (StreamSubscription): The stream to unsubscribe from.
+        """
+        key = subscription.key
+        self._callbacks.pop(key, None)
+        if self._subscriptions.pop(key, None) is None:
+            return
+        if subscription.type == StreamType.BOOK_DEPTH and subscription.product_id is not None:
+            self._book_seq.pop(subscription.product_id, None)
+        if self._connected.is_set():
+            await self._request("unsubscribe", stream=self._stream_params(subscription))
+
+    def _drop_callback(self, key: tuple, callback: StreamCallback) -> None:
+        callbacks = self._callbacks.get(key, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            self._callbacks.pop(key, None)
+
+    def on_gap(self, callback: GapCallback) -> None:
+        """
+        Register a callback for sequence gaps, reconnects and subscriptions the server
+        rejected when resubscribing after a reconnect (`reason="rejected"`, dropped).
+
+        Args:
+            callback (GapCallback): Called with a `StreamGap` per affected subscription.
+        """
+        self._gap_callbacks.append(callback)
+
+    # CONNECTION LOOP
+
+    async def _run(self) -> None:
+        try:
+            import websockets
+        except ImportError:  # pragma: no cover - optional dependency
+            raise ImportError(
+                "EngineSubscriptionClient requires websockets: pip install websockets"
+            )
+        delay = self.min_reconnect_delay
+        first = True
+        while not self._closed:
+            try:
+                async with websockets.connect(
+                    self.url, ping_interval=self.ping_interval, max_size=None
+                ) as ws:
+                    self._ws = ws
+                    reader = asyncio.get_running_loop().create_task(self._read(ws))
+                    try:
+                        await self._on_connected(first)
+                        first = False
+                        delay = self.min_reconnect_delay
+                        await reader
+                    finally:
+                        reader.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("nado subscription connection error: %r", e)
+            finally:
+                self._ws = None
+                self._connected.clear()
+                self._fail_pending(ConnectionError("websocket disconnected"))
+            if self._closed:
+                break
+            self.reconnects += 1
+            await asyncio.sleep(delay * (1 + random.random() * 0.2))
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _on_connected(self, first: bool) -> None:
+        if self.signer is not None:
+            await self._authenticate()
+        self._book_seq.clear()
+        for key, subscription in list(self._subscriptions.items()):
+            try:
+                await self._request("subscribe", stream=self._stream_params(subscription))
+            except RuntimeError as e:
+                # Rejected by the server (e.g. a delisted product): drop it and tell the
+                # gap callbacks, the other subscriptions keep the connection.
+                logger.warning("nado subscription: %s rejected on resubscribe: %s", key, e)
+                self._subscriptions.pop(key, None)
+                self._callbacks.pop(key, None)
+                self._notify_gap(StreamGap(subscription=subscription, reason="rejected"))
+        self._connected.set()
+        if not first:
+            for subscription in list(self._subscriptions.values()):
+                self._notify_gap(StreamGap(subscription=subscription, reason="reconnect"))
+
+    async def _authenticate(self) -> None:
+        if not (self.sender and self.endpoint_addr and self.chain_id is not None):
+            raise ValueError("sender, endpoint_addr and chain_id are required to authenticate")
+        expiration = int(time.time() * 1000) + 60_000
+        typed_data = build_eip712_typed_data(
+            NadoTxType.AUTHENTICATE_STREAM,
+            {"sender": hex_to_bytes32(self.sender), "expiration": expiration},
+            self.endpoint_addr,
+            self.chain_id,
+        )
+        signature = sign_eip712_typed_data(typed_data, self.signer)  # type: ignore[arg-type]
+        await self._request(
+            "authenticate",
+            tx={"sender": self.sender, "expiration": str(expiration)},
+            signature=signature,
+        )
+
+    async def _request(self, method: str, **params: Any) -> Any:
+        ws = self._ws
+        if ws is None:
+            raise ConnectionError("websocket is not connected")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await ws.send(json.dumps({"method": method, "id": request_id, **params}))
+            return await asyncio.wait_for(future, self.request_timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    def _fail_pending(self, exc: Exception) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(exc)
+        self._pending.clear()
+
+    @staticmethod
+    def _stream_params(subscription: StreamSubscription) -> dict:
+        params: dict = {"type": subscription.type.value}
+        if subscription.product_id is not None:
+            params["product_id"] = subscription.product_id
+        if subscription.subaccount is not None:
+            params["subaccount"] = subscription.subaccount
+        return params
+
+    # DISPATCH
+
+    async def _read(self, ws: Any) -> None:
+        async for raw in ws:
+            try:
+                msg = json_loads(raw)
+            except Exception:
+                logger.warning("nado subscription: unparsable message %r", raw)
+                continue
+            if "type" in msg:
+                self._dispatch(msg)
+            elif msg.get("id") in self._pending:
+                future = self._pending[msg["id"]]
+                if future.done():
+                    continue
+                if msg.get("error"):
+                    future.set_exception(RuntimeError(f"nado subscription: {msg['error']}"))
+                else:
+                    future.set_result(msg.get("result"))
+        # Connection closed: requests still waiting for a response will not get one
+        self._fail_pending(ConnectionError("websocket closed"))
+
+    def _dispatch(self, msg: dict) -> None:
+        event_cls = STREAM_EVENT_TYPES.get(msg["type"])
+        if event_cls is None:
+            return
+        try:
+            event = event_cls.parse_obj(msg)
+        except Exception as e:
+            logger.warning("nado subscription: invalid %s event: %r", msg["type"], e)
+            return
+        if isinstance(event, BookDepthEvent):
+            self._check_book_sequence(event)
+        for key in self._routes(msg, event.product_id):
+            for callback in self._callbacks.get(key, ()):
+                self._events.put_nowait((callback, event))
+
+    def _routes(self, msg: dict, product_id: int) -> set:
+        stream = msg["type"]
+        if stream not in SUBACCOUNT_STREAMS:
+            return {(stream, product_id, None), (stream, None, None)}
+        if msg.get("subaccount"):
+            subaccount = msg["subaccount"].lower()
+            return {(stream, product_id, subaccount), (stream, None, subaccount)}
+        # The event does not name its subaccount: the server only sends it to
+        # the subscriptions it matches, so route by the subscription's own key.
+        return {
+            key
+            for key in self._subscriptions
+            if key[0] == stream and key[1] in (product_id, None)
+        }
+
+    def _check_book_sequence(self, event: BookDepthEvent) -> None:
+        previous = self._book_seq.get(event.product_id)
+        self._book_seq[event.product_id] = event.max_timestamp
+        if previous is None or event.last_max_timestamp == previous:
+            return
+        subscription = self._subscriptions.get(
+            (StreamType.BOOK_DEPTH.value, event.product_id, None)
+        )
+        if subscription is not None:
+            self._notify_gap(
+                StreamGap(
+                    subscription=subscription,
+                    reason="sequence",
+                    expected=previous,
+                    received=event.last_max_timestamp,
+                )
+            )
+
+    def _notify_gap(self, gap: StreamGap) -> None:
+        for callback in list(self._gap_callbacks):
+            self._events.put_nowait((callback, gap))
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            callback, arg = await self._events.get()
+            await self._call(callback, arg)
+
+    @staticmethod
+    async def _call(callback: Callable, arg: Any) -> None:
+        try:
+            result = callback(arg)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.exception("nado subscription: callback failed")
@@ -8,8 +8,16 @@ from nado_protocol.utils.backend import NadoClientOpts
 class EngineClientOpts(NadoClientOpts):
     """
     Model defining the configuration options for the Engine Client.
+
+    Attributes:
+        fast_decode (bool): Opt-in lightweight decoding for hot queries (open orders,
+            market liquidity, market price): responses are parsed with orjson when
+            available and returned as slotted structs from
+            `nado_protocol.engine_client.types.fast` instead of validated pydantic models.
     """
 
+    fast_decode: bool = False
+
 
 __all__ = [
     "BaseParams",
@@ -100,6 +108,16 @@ __all__ = [
     "MaxOrderSizeDirection",
     "MarketLiquidity",
     "StreamAuthenticationParams",
+    "StreamType",
+    "StreamSubscription",
+    "StreamEvent",
+    "StreamGap",
+    "BookDepthEvent",
+    "BestBidOfferEvent",
+    "TradeEvent",
+    "FillEvent",
+    "PositionChangeEvent",
+    "OrderUpdateEvent",
     "Asset",
     "MarketPair",
     "SpotApr",
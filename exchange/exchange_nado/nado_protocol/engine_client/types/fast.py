@@ -0,0 +1,168 @@
+"""
+Lightweight response structs for hot engine queries.
+
+When `EngineClientOpts.fast_decode` is enabled, `get_subaccount_open_orders`,
+`get_subaccount_multi_products_open_orders`, `get_market_liquidity` and
+`get_market_price` return these slotted structs instead of pydantic models. They
+expose the same attributes as their pydantic counterparts but skip validation and
+union discrimination, since the query type already determines the response shape.
+"""
+from typing import Any
+
+
+class FastStruct:
+    """
+    Base class for slotted response structs.
+    """
+
+    __slots__ = ()
+
+    def dict(self) -> dict:
+        """
+        Convert the struct to a dictionary (nested structs included).
+
+        Returns:
+            dict: The struct as a dictionary.
+        """
+        return {name: _to_builtin(getattr(self, name)) for name in self.__slots__}
+
+    def __eq__(self, other: Any) -> bool:
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+def _to_builtin(value: Any) -> Any:
+    if isinstance(value, FastStruct):
+        return value.dict()
+    if isinstance(value, list):
+        return [_to_builtin(v) for v in value]
+    return value
+
+
+class FastOrderData(FastStruct):
+    """
+    Slotted counterpart of `OrderData`.
+    """
+
+    __slots__ = (
+        "product_id",
+        "sender",
+        "price_x18",
+        "amount",
+        "expiration",
+        "nonce",
+        "unfilled_amount",
+        "digest",
+        "placed_at",
+    )
+
+    def __init__(self, data: dict):
+        self.product_id: int = int(data["product_id"])
+        self.sender: str = data["sender"]
+        self.price_x18: str = data["price_x18"]
+        self.amount: str = data["amount"]
+        self.expiration: str = data["expiration"]
+        self.nonce: str = data["nonce"]
+        self.unfilled_amount: str = data["unfilled_amount"]
+        self.digest: str = data["digest"]
+        self.placed_at: str = data["placed_at"]
+
+
+class FastSubaccountOpenOrdersData(FastStruct):
+    """
+    Slotted counterpart of `SubaccountOpenOrdersData`.
+    """
+
+    __slots__ = ("sender", "orders")
+
+    def __init__(self, data: dict):
+        self.sender: str = data["sender"]
+        self.orders: list[FastOrderData] = [FastOrderData(o) for o in data["orders"]]
+
+    @classmethod
+    def from_orders(
+        cls, sender: str, orders: list[FastOrderData]
+    ) -> "FastSubaccountOpenOrdersData":
+        """
+        Build the struct from already decoded orders.
+
+        Args:
+            sender (str): The subaccount the orders belong to.
+
+            orders (list[FastOrderData]): The decoded orders.
+
+        Returns:
+            FastSubaccountOpenOrdersData: The struct.
+        """
+        obj = cls.__new__(cls)
+        obj.sender = sender
+        obj.orders = orders
+        return obj
+
+
+class FastProductOpenOrdersData(FastStruct):
+    """
+    Slotted counterpart of `ProductOpenOrdersData`.
+    """
+
+    __slots__ = ("product_id", "orders")
+
+    def __init__(self, data: dict):
+        self.product_id: int = int(data["product_id"])
+        self.orders: list[FastOrderData] = [FastOrderData(o) for o in data["orders"]]
+
+
+class FastSubaccountMultiProductsOpenOrdersData(FastStruct):
+    """
+    Slotted counterpart of `SubaccountMultiProductsOpenOrdersData`.
+    """
+
+    __slots__ = ("sender", "product_orders")
+
+    def __init__(self, data: dict):
+        self.sender: str = data["sender"]
+        self.product_orders: list[FastProductOpenOrdersData] = [
+            FastProductOpenOrdersData(p) for p in data["product_orders"]
+        ]
+
+
+class FastMarketLiquidityData(FastStruct):
+    """
+    Slotted counterpart of `MarketLiquidityData`. Levels are `[price_x18, size]` pairs.
+    """
+
+    __slots__ = ("bids", "asks", "timestamp")
+
+    def __init__(self, data: dict):
+        self.bids: list[list[str]] = data["bids"]
+        self.asks: list[list[str]] = data["asks"]
+        self.timestamp: str = data["timestamp"]
+
+
+class FastMarketPriceData(FastStruct):
+    """
+    Slotted counterpart of `MarketPriceData`.
+    """
+
+    __slots__ = ("product_id", "bid_x18", "ask_x18")
+
+    def __init__(self, data: dict):
+        self.product_id: int = int(data["product_id"])
+        self.bid_x18: str = data["bid_x18"]
+        self.ask_x18: str = data["ask_x18"]
+
+
+__all__ = [
+    "FastStruct",
+    "FastOrderData",
+    "FastSubaccountOpenOrdersData",
+    "FastProductOpenOrdersData",
+    "FastSubaccountMultiProductsOpenOrdersData",
+    "FastMarketLiquidityData",
+    "FastMarketPriceData",
+]
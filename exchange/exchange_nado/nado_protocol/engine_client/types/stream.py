@@ -1,6 +1,169 @@
+from typing import Optional, Union
+
 from nado_protocol.engine_client.types.execute import SignatureParams
+from nado_protocol.engine_client.types.models import MarketLiquidity
+from nado_protocol.utils.enum import StrEnum
+from nado_protocol.utils.model import NadoBaseModel
 
 
 class StreamAuthenticationParams(SignatureParams):
     sender: str
     expiration: int
+
+
+class StreamType(StrEnum):
+    """
+    Enumeration of the engine subscription streams.
+    """
+
+    BOOK_DEPTH = "book_depth"
+    BEST_BID_OFFER = "best_bid_offer"
+    TRADE = "trade"
+    FILL = "fill"
+    POSITION_CHANGE = "position_change"
+    ORDER_UPDATE = "order_update"
+
+
+class StreamSubscription(NadoBaseModel):
+    """
+    A subscription to an engine stream.
+
+    Attributes:
+        type (StreamType): The stream.
+
+        product_id (Optional[int]): The product to subscribe to.
+
+        subaccount (Optional[str]): The subaccount, for subaccount streams (fills, position changes, order updates).
+    """
+
+    type: StreamType
+    product_id: Optional[int]
+    subaccount: Optional[str]
+
+    @property
+    def key(self) -> tuple:
+        subaccount = self.subaccount.lower() if self.subaccount else None
+        return (self.type.value, self.product_id, subaccount)
+
+
+class BookDepthEvent(NadoBaseModel):
+    """
+    Incremental orderbook update. `last_max_timestamp` equals the `max_timestamp` of
+    the previous event of the same product; a mismatch means updates were missed.
+    """
+
+    type: StreamType
+    product_id: int
+    min_timestamp: str
+    max_timestamp: str
+    last_max_timestamp: str
+    bids: list[MarketLiquidity]
+    asks: list[MarketLiquidity]
+
+
+class BestBidOfferEvent(NadoBaseModel):
+    """
+    Top of book update.
+    """
+
+    type: StreamType
+    product_id: int
+    timestamp: str
+    bid_price: str
+    bid_qty: str
+    ask_price: str
+    ask_qty: str
+
+
+class TradeEvent(NadoBaseModel):
+    """
+    Public trade.
+    """
+
+    type: StreamType
+    product_id: int
+    timestamp: str
+    price: str
+    taker_qty: str
+    maker_qty: str
+    is_taker_buyer: bool
+
+
+class FillEvent(NadoBaseModel):
+    """
+    Fill of an order of the subscribed subaccount.
+    """
+
+    type: StreamType
+    product_id: int
+    timestamp: str
+    subaccount: str
+    order_digest: str
+    filled_qty: str
+    remaining_qty: str
+    original_qty: str
+    price: str
+    is_taker: bool
+    is_bid: bool
+    appendix: Optional[str]
+
+
+class PositionChangeEvent(NadoBaseModel):
+    """
+    Position change of the subscribed subaccount.
+    """
+
+    type: StreamType
+    product_id: int
+    timestamp: str
+    subaccount: str
+    amount: str
+    v_quote_amount: str
+    is_lp: Optional[bool]
+    reason: Optional[str]
+
+
+class OrderUpdateEvent(NadoBaseModel):
+    """
+    Order status change of the subscribed subaccount.
+    """
+
+    type: StreamType
+    product_id: int
+    timestamp: str
+    digest: str
+    amount: str
+    reason: str
+
+
+StreamEvent = Union[
+    BookDepthEvent,
+    BestBidOfferEvent,
+    TradeEvent,
+    FillEvent,
+    PositionChangeEvent,
+    OrderUpdateEvent,
+]
+
+STREAM_EVENT_TYPES: dict[str, type] = {
+    StreamType.BOOK_DEPTH.value: BookDepthEvent,
+    StreamType.BEST_BID_OFFER.value: BestBidOfferEvent,
+    StreamType.TRADE.value: TradeEvent,
+    StreamType.FILL.value: FillEvent,
+    StreamType.POSITION_CHANGE.value: PositionChangeEvent,
+    StreamType.ORDER_UPDATE.value: OrderUpdateEvent,
+}
+
+
+class StreamGap(NadoBaseModel):
+    """
+    Reported when events of a subscription may have been missed: a sequence gap in
+    book depth updates, or a reconnect. Local state built from the stream (e.g. an
+    orderbook) should be resynced from a snapshot query. Also reported, with reason
+    "rejected", for a subscription the server refused on resubscribe; it is dropped.
+    """
+
+    subscription: StreamSubscription
+    reason: str
+    expected: Optional[str]
+    received: Optional[str]
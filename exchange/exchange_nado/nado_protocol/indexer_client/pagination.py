@@ -0,0 +1,371 @@
+import asyncio
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Generic,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from nado_protocol.indexer_client.types.models import (
+    IndexerEvent,
+    IndexerHistoricalOrder,
+    IndexerMatch,
+    IndexerPayment,
+)
+from nado_protocol.indexer_client.types.query import (
+    IndexerEventsParams,
+    IndexerEventsTxsLimit,
+    IndexerInterestAndFundingParams,
+    IndexerMatchesParams,
+    IndexerSubaccountHistoricalOrdersParams,
+)
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+
+# Fetches the page starting at a cursor (None = newest), newest first, and returns it
+# with the cursor of the next page (None when this is the last page).
+PageFetcher = Callable[[Optional[int]], Tuple[List[T], Optional[int]]]
+
+logger = logging.getLogger(__name__)
+
+
+class IndexerPaymentEntry(NamedTuple):
+    """An interest or funding payment, as yielded by payment paginators."""
+
+    kind: str  # "interest" or "funding"
+    payment: IndexerPayment
+
+
+class HistoryPaginator(Generic[T]):
+    """
+    Walks all pages of a cursor-paginated indexer query, newest first.
+
+    - Iterate it for items (`for match in paginator`), `pages()` for pages, or use
+      `async for` / `apages()` from asyncio code (requests run in the default executor).
+    - The next page is requested as soon as the current one arrives, so it downloads
+      while the current page is consumed. At most two pages are held in memory.
+    - `cursor` is the start of the first page not fully consumed: pass it back as
+      `start_idx` to resume an interrupted walk. `watermark` is the newest index seen:
+      pass it as `stop_idx` on the next run to fetch only newer items.
+
+    Cursors are inclusive (`submission_idx` returns items at or below it), so items at
+    the cursor that were already yielded on the previous page are skipped.
+    """
+
+    def __init__(
+        self,
+        fetch: PageFetcher,
+        idx_of: Callable[[T], int],
+        key_of: Callable[[T], Hashable],
+        start_idx: Optional[int] = None,
+        stop_idx: Optional[int] = None,
+        min_time: Optional[int] = None,
+        time_of: Optional[Callable[[T], Optional[int]]] = None,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ):
+        """
+        Initialize the paginator.
+
+        Args:
+            fetch (PageFetcher): Fetches one page, see `PageFetcher`.
+
+            idx_of (Callable[[T], int]): The cursor index of an item.
+
+            key_of (Callable[[T], Hashable]): Identifies items sharing the same index.
+
+            start_idx (Optional[int]): Index to start from (inclusive); the newest items when None.
+
+            stop_idx (Optional[int]): Stop before items at or below this index, e.g. a stored `watermark`.
+
+            min_time (Optional[int]): Stop before items older than this timestamp (seconds).
+
+            time_of (Optional[Callable[[T], Optional[int]]]): The timestamp of an item; required with `min_time`.
+
+            max_items (Optional[int]): Stop after this many items.
+
+            prefetch (bool): Request the next page while the current one is consumed.
+        """
+        if min_time is not None and time_of is None:
+            raise ValueError("time_of is required with min_time")
+        self._fetch = fetch
+        self._idx_of = idx_of
+        self._key_of = key_of
+        self.stop_idx = stop_idx
+        self.min_time = min_time
+        self._time_of = time_of
+        self.max_items = max_items
+        self.prefetch = prefetch
+        self.cursor: Optional[int] = start_idx
+        self.watermark: Optional[int] = None
+        self.items_yielded = 0
+        self.pages_fetched = 0
+        self.exhausted = False
+        # Keys of the items at `cursor` that were already yielded
+        self._seen: set = set()
+
+    def __iter__(self) -> Iterator[T]:
+        for page in self.pages():
+            yield from page
+
+    def pages(self) -> Iterator[List[T]]:
+        """
+        Iterate over pages of items, newest first. Pages may be empty.
+        """
+        if self.exhausted:
+            return
+        executor = ThreadPoolExecutor(max_workers=1) if self.prefetch else None
+        try:
+            cursor = self.cursor
+            future = self._submit(executor, cursor)
+            while True:
+                items, next_cursor = future.result()
+                page, next_cursor, done = self._process(cursor, items, next_cursor)
+                if not done:
+                    future = self._submit(executor, next_cursor)
+                yield page
+                if done:
+                    self.exhausted = True
+                    return
+                self.cursor = cursor = next_cursor
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self._aiter_items()
+
+    async def _aiter_items(self) -> AsyncIterator[T]:
+        async for page in self.apages():
+            for item in page:
+                yield item
+
+    async def apages(self) -> AsyncIterator[List[T]]:
+        """
+        Same as `pages`, for asyncio code.
+        """
+        if self.exhausted:
+            return
+        loop = asyncio.get_running_loop()
+        cursor = self.cursor
+        pending: Optional[asyncio.Future] = loop.run_in_executor(None, self._fetch, cursor)
+        while True:
+            if pending is None:
+                pending = loop.run_in_executor(None, self._fetch, cursor)
+            items, next_cursor = await pending
+            pending = None
+            page, next_cursor, done = self._process(cursor, items, next_cursor)
+            if not done and self.prefetch:
+                pending = loop.run_in_executor(None, self._fetch, next_cursor)
+            yield page
+            if done:
+                self.exhausted = True
+                return
+            self.cursor = cursor = next_cursor
+
+    # INTERNALS
+
+    def _submit(self, executor: Optional[ThreadPoolExecutor], cursor: Optional[int]) -> Future:
+        if executor is not None:
+            return executor.submit(self._fetch, cursor)
+        future: Future = Future()
+        try:
+            future.set_result(self._fetch(cursor))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def _process(
+        self, cursor: Optional[int], items: List[T], next_cursor: Optional[int]
+    ) -> Tuple[List[T], Optional[int], bool]:
+        self.pages_fetched += 1
+        page: List[T] = []
+        done = next_cursor is None
+        for item in items:
+            idx = self._idx_of(item)
+            if idx == cursor and self._key_of(item) in self._seen:
+                continue
+            if self.stop_idx is not None and idx <= self.stop_idx:
+                done = True
+                break
+            if self.min_time is not None:
+                timestamp = self._time_of(item)  # type: ignore[misc]
+                if timestamp is not None and timestamp < self.min_time:
+                    done = True
+                    break
+            if self.watermark is None or idx > self.watermark:
+                self.watermark = idx
+            page.append(item)
+            self.items_yielded += 1
+            if self.max_items is not None and self.items_yielded >= self.max_items:
+                done = True
+                break
+
+        if not done:
+            if next_cursor == cursor:
+                # A full page of items sharing one index: move past it
+                logger.warning(
+                    "nado indexer pagination: page full at index %s, skipping to the next index",
+                    cursor,
+                )
+                next_cursor = cursor - 1  # type: ignore[operator]
+            self._seen = {
+                self._key_of(item) for item in items if self._idx_of(item) == next_cursor
+            }
+        return page, next_cursor, done
+
+
+def _timestamp(item: Any) -> Optional[int]:
+    return int(item.timestamp) if item.timestamp is not None else None
+
+
+def _page_size(limit: Any, page_size: Optional[int]) -> int:
+    if page_size is not None:
+        return page_size
+    if isinstance(limit, int):
+        return limit
+    return getattr(limit, "txs", None) or getattr(limit, "raw", None) or DEFAULT_PAGE_SIZE
+
+
+def paginate_matches(
+    client: Any,
+    params: IndexerMatchesParams,
+    page_size: Optional[int] = None,
+    **kwargs: Any,
+) -> HistoryPaginator[IndexerMatch]:
+    """
+    Paginator over `get_matches`, see `HistoryPaginator` for the keyword arguments.
+    """
+    params = IndexerMatchesParams.parse_obj(params)
+    limit = _page_size(params.limit, page_size)
+
+    def fetch(cursor: Optional[int]) -> Tuple[List[IndexerMatch], Optional[int]]:
+        matches = client.get_matches(params.copy(update={"idx": cursor, "limit": limit})).matches
+        if len(matches) < limit:
+            return matches, None
+        return matches, int(matches[-1].submission_idx)
+
+    kwargs.setdefault("start_idx", params.idx)
+    return HistoryPaginator(
+        fetch,
+        idx_of=lambda m: int(m.submission_idx),
+        key_of=lambda m: m.digest,
+        time_of=_timestamp,
+        **kwargs,
+    )
+
+
+def paginate_subaccount_historical_orders(
+    client: Any,
+    params: IndexerSubaccountHistoricalOrdersParams,
+    page_size: Optional[int] = None,
+    **kwargs: Any,
+) -> HistoryPaginator[IndexerHistoricalOrder]:
+    """
+    Paginator over `get_subaccount_historical_orders`, see `HistoryPaginator` for the
+    keyword arguments.
+    """
+    params = IndexerSubaccountHistoricalOrdersParams.parse_obj(params)
+    limit = _page_size(params.limit, page_size)
+
+    def fetch(cursor: Optional[int]) -> Tuple[List[IndexerHistoricalOrder], Optional[int]]:
+        orders = client.get_subaccount_historical_orders(
+            params.copy(update={"idx": cursor, "limit": limit})
+        ).orders
+        if len(orders) < limit:
+            return orders, None
+        return orders, int(orders[-1].submission_idx)
+
+    kwargs.setdefault("start_idx", params.idx)
+    return HistoryPaginator(
+        fetch,
+        idx_of=lambda o: int(o.submission_idx),
+        key_of=lambda o: o.digest,
+        time_of=_timestamp,
+        **kwargs,
+    )
+
+
+def paginate_events(
+    client: Any,
+    params: IndexerEventsParams,
+    page_size: Optional[int] = None,
+    **kwargs: Any,
+) -> HistoryPaginator[IndexerEvent]:
+    """
+    Paginator over `get_events`, see `HistoryPaginator` for the keyword arguments.
+
+    Pages are limited by transaction count (`IndexerEventsTxsLimit`) so that the events
+    of a transaction are never split across pages.
+    """
+    params = IndexerEventsParams.parse_obj(params)
+    limit = _page_size(params.limit, page_size)
+
+    def fetch(cursor: Optional[int]) -> Tuple[List[IndexerEvent], Optional[int]]:
+        events = client.get_events(
+            params.copy(update={"idx": cursor, "limit": IndexerEventsTxsLimit(txs=limit)})
+        ).events
+        if len({e.submission_idx for e in events}) < limit:
+            return events, None
+        return events, int(events[-1].submission_idx)
+
+    kwargs.setdefault("start_idx", params.idx)
+    return HistoryPaginator(
+        fetch,
+        idx_of=lambda e: int(e.submission_idx),
+        key_of=lambda e: (e.subaccount, e.product_id, e.isolated, e.event_type),
+        time_of=_timestamp,
+        **kwargs,
+    )
+
+
+def paginate_interest_and_funding_payments(
+    client: Any,
+    params: IndexerInterestAndFundingParams,
+    page_size: Optional[int] = None,
+    **kwargs: Any,
+) -> HistoryPaginator[IndexerPaymentEntry]:
+    """
+    Paginator over `get_interest_and_funding_payments`, yielding interest and funding
+    payments merged by index. See `HistoryPaginator` for the keyword arguments.
+    """
+    params = IndexerInterestAndFundingParams.parse_obj(params)
+    limit = page_size or params.limit
+
+    def fetch(cursor: Optional[int]) -> Tuple[List[IndexerPaymentEntry], Optional[int]]:
+        data = client.get_interest_and_funding_payments(
+            params.copy(update={"max_idx": cursor, "limit": limit})
+        )
+        entries = [IndexerPaymentEntry("interest", p) for p in data.interest_payments]
+        entries += [IndexerPaymentEntry("funding", p) for p in data.funding_payments]
+        entries.sort(key=lambda e: int(e.payment.idx), reverse=True)
+        if (
+            len(data.interest_payments) < limit and len(data.funding_payments) < limit
+        ) or not data.next_idx:
+            return entries, None
+        # The stream with sparser indexes reaches past the next cursor; its entries
+        # below the cursor come again with the next page.
+        next_idx = int(data.next_idx)
+        return [e for e in entries if int(e.payment.idx) >= next_idx], next_idx
+
+    kwargs.setdefault(
+        "start_idx", int(params.max_idx) if params.max_idx is not None else None
+    )
+    return HistoryPaginator(
+        fetch,
+        idx_of=lambda e: int(e.payment.idx),
+        key_of=lambda e: (e.kind, e.payment.product_id),
+        time_of=lambda e: int(e.payment.timestamp),
+        **kwargs,
+    )
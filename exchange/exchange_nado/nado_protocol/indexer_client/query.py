@@ -1,7 +1,20 @@
 from typing import Optional, Union
 import requests
 from functools import singledispatchmethod
+from nado_protocol.indexer_client.pagination import (
+    HistoryPaginator,
+    IndexerPaymentEntry,
+    paginate_events,
+    paginate_interest_and_funding_payments,
+    paginate_matches,
+    paginate_subaccount_historical_orders,
+)
 from nado_protocol.indexer_client.types import IndexerClientOpts
+from nado_protocol.indexer_client.types.models import (
+    IndexerEvent,
+    IndexerHistoricalOrder,
+    IndexerMatch,
+)
 from nado_protocol.indexer_client.types.models import MarketType
 from nado_protocol.indexer_client.types.query import (
     IndexerCandlesticksParams,
@@ -385,3 +398,81 @@ class IndexerQueryClient:
             self.query(IndexerAccountSnapshotsParams.parse_obj(params)).data,
             IndexerAccountSnapshotsData,
         )
+
+    def iter_matches(
+        self, params: IndexerMatchesParams, page_size: Optional[int] = None, **kwargs
+    ) -> HistoryPaginator[IndexerMatch]:
+        """
+        Iterates over all matches, newest first, following `submission_idx` cursors.
+
+        Args:
+            params (IndexerMatchesParams): The match filters; `submission_idx` is the start cursor.
+
+            page_size (Optional[int]): Matches per request; defaults to `params.limit` or 100.
+
+            **kwargs: `HistoryPaginator` options (`stop_idx`, `min_time`, `max_items`, `prefetch`).
+
+        Returns:
+            HistoryPaginator[IndexerMatch]: A sync and async iterator over the matches.
+        """
+        return paginate_matches(self, params, page_size, **kwargs)
+
+    def iter_events(
+        self, params: IndexerEventsParams, page_size: Optional[int] = None, **kwargs
+    ) -> HistoryPaginator[IndexerEvent]:
+        """
+        Iterates over all events, newest first, following `submission_idx` cursors.
+
+        Args:
+            params (IndexerEventsParams): The event filters; `submission_idx` is the start cursor.
+
+            page_size (Optional[int]): Transactions per request; defaults to `params.limit` or 100.
+
+            **kwargs: `HistoryPaginator` options (`stop_idx`, `min_time`, `max_items`, `prefetch`).
+
+        Returns:
+            HistoryPaginator[IndexerEvent]: A sync and async iterator over the events.
+        """
+        return paginate_events(self, params, page_size, **kwargs)
+
+    def iter_subaccount_historical_orders(
+        self,
+        params: IndexerSubaccountHistoricalOrdersParams,
+        page_size: Optional[int] = None,
+        **kwargs,
+    ) -> HistoryPaginator[IndexerHistoricalOrder]:
+        """
+        Iterates over all historical orders, newest first, following `submission_idx` cursors.
+
+        Args:
+            params (IndexerSubaccountHistoricalOrdersParams): The order filters; `submission_idx` is the start cursor.
+
+            page_size (Optional[int]): Orders per request; defaults to `params.limit` or 100.
+
+            **kwargs: `HistoryPaginator` options (`stop_idx`, `min_time`, `max_items`, `prefetch`).
+
+        Returns:
+            HistoryPaginator[IndexerHistoricalOrder]: A sync and async iterator over the orders.
+        """
+        return paginate_subaccount_historical_orders(self, params, page_size, **kwargs)
+
+    def iter_interest_and_funding_payments(
+        self,
+        params: IndexerInterestAndFundingParams,
+        page_size: Optional[int] = None,
+        **kwargs,
+    ) -> HistoryPaginator[IndexerPaymentEntry]:
+        """
+        Iterates over all interest and funding payments, newest first, following `next_idx` cursors.
+
+        Args:
+            params (IndexerInterestAndFundingParams): The payment filters; `max_idx` is the start cursor.
+
+            page_size (Optional[int]): Payments of each kind per request; defaults to `params.limit`.
+
+            **kwargs: `HistoryPaginator` options (`stop_idx`, `min_time`, `max_items`, `prefetch`).
+
+        Returns:
+            HistoryPaginator[IndexerPaymentEntry]: A sync and async iterator over the payments.
+        """
+        return paginate_interest_and_funding_payments(self, params, page_size, **kwargs)
@@ -0,0 +1,34 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+
+    JSON_BACKEND = "orjson"
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """
+        Parses a JSON document with orjson.
+
+        Args:
+            data (str | bytes): The JSON document.
+
+        Returns:
+            Any: The parsed value.
+        """
+        return orjson.loads(data)
+
+except ImportError:  # pragma: no cover - optional dependency
+    JSON_BACKEND = "json"
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """
+        Parses a JSON document with the standard library (orjson is not installed).
+
+        Args:
+            data (str | bytes): The JSON document.
+
+        Returns:
+            Any: The parsed value.
+        """
+        return json.loads(data)
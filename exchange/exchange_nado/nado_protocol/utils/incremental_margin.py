@@ -0,0 +1,535 @@
+"""
+Incremental Margin Manager - cross margin health kept up to date from deltas.
+
+`MarginManager` recomputes an `AccountSummary` from a full `SubaccountInfoData`
+snapshot. This module keeps per-product state in x18 integers instead, together
+with running health totals, so a fill, position change or oracle price tick only
+recomputes the affected product. Health, margin usage, leverage and liquidation
+prices are then available without network calls or pydantic models, e.g. for
+pre-trade checks.
+
+Formulas match `MarginManager` (cross margin only; isolated positions are separate):
+- Balance value = amount * oracle_price (+ v_quote_balance for perps)
+- Health contribution = amount * oracle_price * weight (+ v_quote_balance for perps),
+  with long weights when amount >= 0 and short weights otherwise
+- Unweighted health uses weight 1
+
+Health components the per-balance formulas do not model (e.g. spreads) are kept as
+a constant residual: the difference between the engine's healths and the computed
+sum at the time of the snapshot.
+"""
+
+import threading
+from decimal import Decimal
+from typing import Dict, Optional, Union, TYPE_CHECKING
+
+from nado_protocol.engine_client.types.query import SubaccountInfoData
+from nado_protocol.utils.bytes32 import subaccount_to_hex
+from nado_protocol.utils.margin_manager import (
+    TEN_TO_18,
+    MarginUsageFractions,
+)
+
+if TYPE_CHECKING:
+    from nado_protocol.client import NadoClient
+    from nado_protocol.engine_client.types.stream import (
+        FillEvent,
+        PositionChangeEvent,
+    )
+
+X18 = 10**18
+QUOTE_PRODUCT_ID = 0
+
+
+def _mul_x18(x: int, y: int) -> int:
+    return x * y // X18
+
+
+def _to_decimal(value_x18: int) -> Decimal:
+    return Decimal(value_x18) / TEN_TO_18
+
+
+class ProductMarginState:
+    """
+    Per-product balance, oracle price and risk weights (x18 integers), with the
+    product's cached health contributions.
+    """
+
+    __slots__ = (
+        "product_id",
+        "is_perp",
+        "amount_x18",
+        "v_quote_x18",
+        "oracle_price_x18",
+        "long_weight_initial_x18",
+        "long_weight_maintenance_x18",
+        "short_weight_initial_x18",
+        "short_weight_maintenance_x18",
+        "initial_x18",
+        "maintenance_x18",
+        "unweighted_x18",
+        "notional_x18",
+    )
+
+    def __init__(
+        self,
+        product_id: int,
+        is_perp: bool,
+        amount_x18: int,
+        v_quote_x18: int,
+        oracle_price_x18: int,
+        long_weight_initial_x18: int,
+        long_weight_maintenance_x18: int,
+        short_weight_initial_x18: int,
+        short_weight_maintenance_x18: int,
+    ):
+        self.product_id = product_id
+        self.is_perp = is_perp
+        self.amount_x18 = amount_x18
+        self.v_quote_x18 = v_quote_x18
+        self.oracle_price_x18 = oracle_price_x18
+        self.long_weight_initial_x18 = long_weight_initial_x18
+        self.long_weight_maintenance_x18 = long_weight_maintenance_x18
+        self.short_weight_initial_x18 = short_weight_initial_x18
+        self.short_weight_maintenance_x18 = short_weight_maintenance_x18
+        self.initial_x18 = 0
+        self.maintenance_x18 = 0
+        self.unweighted_x18 = 0
+        self.notional_x18 = 0
+        self.recompute()
+
+    def weights(self, amount_x18: int) -> "tuple[int, int]":
+        """
+        Returns the (initial, maintenance) weights that apply to a balance of `amount_x18`.
+        """
+        if amount_x18 >= 0:
+            return self.long_weight_initial_x18, self.long_weight_maintenance_x18
+        return self.short_weight_initial_x18, self.short_weight_maintenance_x18
+
+    def is_zero_health(self) -> bool:
+        """
+        Products with long_weight=0 and short_weight=2 do not count towards leverage.
+        """
+        return self.long_weight_initial_x18 == 0 and self.short_weight_initial_x18 == 2 * X18
+
+    def recompute(self) -> None:
+        """
+        Recomputes the cached health contributions from the current state.
+        """
+        value = _mul_x18(self.amount_x18, self.oracle_price_x18)
+        weight_initial, weight_maintenance = self.weights(self.amount_x18)
+        self.initial_x18 = _mul_x18(value, weight_initial) + self.v_quote_x18
+        self.maintenance_x18 = _mul_x18(value, weight_maintenance) + self.v_quote_x18
+        self.unweighted_x18 = value + self.v_quote_x18
+        self.notional_x18 = abs(value)
+
+
+class IncrementalMarginManager:
+    """
+    Cross margin calculator updated incrementally from fills, position changes and
+    oracle price ticks.
+
+    Initialize it from one `get_subaccount_info` snapshot, then feed it stream events
+    (`apply_fill`, `apply_position_change`) and oracle prices (`update_oracle_price`).
+    Every update is O(1): only the affected product is recomputed and the running
+    totals are adjusted by the difference.
+
+    Examples:
+        >>> manager = IncrementalMarginManager.from_client(client)
+        >>> manager.update_oracle_price(2, 95_000 * 10**18)
+        >>> manager.initial_health, manager.account_leverage, manager.liquidation_price(2)
+    """
+
+    QUOTE_PRODUCT_ID = QUOTE_PRODUCT_ID
+
+    def __init__(self, subaccount_info: SubaccountInfoData):
+        """
+        Initialize the manager from a subaccount snapshot.
+
+        Args:
+            subaccount_info (SubaccountInfoData): Subaccount information from the engine.
+        """
+        self.subaccount = subaccount_info.subaccount
+        self.products: Dict[int, ProductMarginState] = {}
+        self._lock = threading.Lock()
+        self._initial_x18 = 0
+        self._maintenance_x18 = 0
+        self._unweighted_x18 = 0
+        self._leverage_notional_x18 = 0
+        # Products with a perp position or a spot borrow
+        self._active: set = set()
+        self._residual = (0, 0, 0)
+        self.reset(subaccount_info)
+
+    @classmethod
+    def from_client(
+        cls,
+        client: "NadoClient",
+        *,
+        subaccount: Optional[str] = None,
+        subaccount_name: str = "default",
+    ) -> "IncrementalMarginManager":
+        """
+        Initialize the manager with a single `get_subaccount_info` request.
+
+        Args:
+            client (NadoClient): Configured Nado client.
+
+            subaccount (Optional[str]): Subaccount hex (bytes32). Derived from the client's signer
+                and `subaccount_name` when omitted.
+
+            subaccount_name (str): Subaccount suffix used when deriving the subaccount hex.
+
+        Returns:
+            IncrementalMarginManager: The manager populated with the current engine state.
+        """
+        if subaccount is None:
+            signer = client.context.signer
+            if signer is None:
+                raise ValueError(
+                    "subaccount must be provided when the client has no signer"
+                )
+            subaccount = subaccount_to_hex(signer.address, subaccount_name)
+        return cls(client.context.engine_client.get_subaccount_info(subaccount))
+
+    def reset(self, subaccount_info: SubaccountInfoData) -> None:
+        """
+        Replace all state with a fresh snapshot, e.g. to resync after a stream gap.
+
+        Args:
+            subaccount_info (SubaccountInfoData): Subaccount information from the engine.
+        """
+        products: Dict[int, ProductMarginState] = {}
+        for balances, product_list, is_perp in (
+            (subaccount_info.spot_balances, subaccount_info.spot_products, False),
+            (subaccount_info.perp_balances, subaccount_info.perp_products, True),
+        ):
+            by_id = {product.product_id: product for product in product_list}
+            for balance in balances:
+                product = by_id.get(balance.product_id)
+                if product is None:
+                    continue
+                risk = product.risk
+                products[balance.product_id] = ProductMarginState(
+                    product_id=balance.product_id,
+                    is_perp=is_perp,
+                    amount_x18=int(balance.balance.amount),
+                    v_quote_x18=int(balance.balance.v_quote_balance) if is_perp else 0,  # type: ignore[union-attr]
+                    oracle_price_x18=int(product.oracle_price_x18),
+                    long_weight_initial_x18=int(risk.long_weight_initial_x18),
+                    long_weight_maintenance_x18=int(risk.long_weight_maintenance_x18),
+                    short_weight_initial_x18=int(risk.short_weight_initial_x18),
+                    short_weight_maintenance_x18=int(risk.short_weight_maintenance_x18),
+                )
+
+        with self._lock:
+            self.subaccount = subaccount_info.subaccount
+            self.products = products
+            self._initial_x18 = sum(p.initial_x18 for p in products.values())
+            self._maintenance_x18 = sum(p.maintenance_x18 for p in products.values())
+            self._unweighted_x18 = sum(p.unweighted_x18 for p in products.values())
+            self._leverage_notional_x18 = sum(
+                self._leverage_notional(p) for p in products.values()
+            )
+            self._active = {p.product_id for p in products.values() if self._is_active(p)}
+            engine_healths = [int(h.health) for h in subaccount_info.healths[:3]]
+            if len(engine_healths) == 3:
+                self._residual = (
+                    engine_healths[0] - self._initial_x18,
+                    engine_healths[1] - self._maintenance_x18,
+                    engine_healths[2] - self._unweighted_x18,
+                )
+            else:
+                self._residual = (0, 0, 0)
+
+    # UPDATES
+
+    def update_oracle_price(self, product_id: int, oracle_price_x18: Union[int, str]) -> None:
+        """
+        Apply an oracle price tick to one product.
+
+        Args:
+            product_id (int): The product id.
+
+            oracle_price_x18 (Union[int, str]): The new oracle price, x18.
+        """
+        with self._lock:
+            state = self.products.get(product_id)
+            if state is None:
+                return
+            self._replace(state, oracle_price_x18=int(oracle_price_x18))
+
+    def update_oracle_prices(self, prices_x18: Dict[int, Union[int, str]]) -> None:
+        """
+        Apply oracle price ticks to several products.
+
+        Args:
+            prices_x18 (Dict[int, Union[int, str]]): New oracle prices (x18) by product id.
+        """
+        with self._lock:
+            for product_id, price in prices_x18.items():
+                state = self.products.get(product_id)
+                if state is not None:
+                    self._replace(state, oracle_price_x18=int(price))
+
+    def apply_position_change(self, event: "PositionChangeEvent") -> None:
+        """
+        Apply a `position_change` stream event, which carries the new balance of a product.
+
+        Args:
+            event (PositionChangeEvent): The event.
+        """
+        self.set_balance(
+            event.product_id, int(event.amount), int(event.v_quote_amount)
+        )
+
+    def set_balance(
+        self,
+        product_id: int,
+        amount_x18: Union[int, str],
+        v_quote_x18: Union[int, str] = 0,
+    ) -> None:
+        """
+        Set the balance of a known product.
+
+        Args:
+            product_id (int): The product id.
+
+            amount_x18 (Union[int, str]): The new balance amount, x18.
+
+            v_quote_x18 (Union[int, str]): The new v_quote balance (perps only), x18.
+
+        Raises:
+            KeyError: If the product was not in the snapshot; call `reset` with a fresh one.
+        """
+        with self._lock:
+            state = self.products[product_id]
+            self._replace(
+                state,
+                amount_x18=int(amount_x18),
+                v_quote_x18=int(v_quote_x18) if state.is_perp else 0,
+            )
+
+    def apply_fill(
+        self,
+        product_id: int,
+        amount_delta_x18: Union[int, str],
+        price_x18: Union[int, str],
+        fee_x18: Union[int, str] = 0,
+    ) -> None:
+        """
+        Apply a fill: the base balance changes by `amount_delta_x18` and the quote side
+        by `-amount_delta * price - fee` (v_quote for perps, the quote balance for spot).
+
+        Args:
+            product_id (int): The product id.
+
+            amount_delta_x18 (Union[int, str]): Signed filled amount, positive for buys, x18.
+
+            price_x18 (Union[int, str]): Fill price, x18.
+
+            fee_x18 (Union[int, str]): Fee paid in quote, x18.
+        """
+        amount_delta = int(amount_delta_x18)
+        quote_delta = -_mul_x18(amount_delta, int(price_x18)) - int(fee_x18)
+        with self._lock:
+            state = self.products[product_id]
+            if state.is_perp:
+                self._replace(
+                    state,
+                    amount_x18=state.amount_x18 + amount_delta,
+                    v_quote_x18=state.v_quote_x18 + quote_delta,
+                )
+                return
+            self._replace(state, amount_x18=state.amount_x18 + amount_delta)
+            quote = self.products.get(self.QUOTE_PRODUCT_ID)
+            if quote is not None:
+                self._replace(quote, amount_x18=quote.amount_x18 + quote_delta)
+
+    def apply_fill_event(self, event: "FillEvent") -> None:
+        """
+        Apply a `fill` stream event. The event carries no fee, so quote balances are
+        estimated until the matching `position_change` event sets them exactly.
+
+        Args:
+            event (FillEvent): The event.
+        """
+        filled = abs(int(event.filled_qty))
+        self.apply_fill(
+            event.product_id, filled if event.is_bid else -filled, event.price
+        )
+
+    # METRICS
+
+    @property
+    def initial_health_x18(self) -> int:
+        return self._initial_x18 + self._residual[0]
+
+    @property
+    def maintenance_health_x18(self) -> int:
+        return self._maintenance_x18 + self._residual[1]
+
+    @property
+    def unweighted_health_x18(self) -> int:
+        return self._unweighted_x18 + self._residual[2]
+
+    @property
+    def initial_health(self) -> Decimal:
+        """
+        Initial health; funds available for new positions when positive.
+        """
+        return _to_decimal(self.initial_health_x18)
+
+    @property
+    def maintenance_health(self) -> Decimal:
+        """
+        Maintenance health; the subaccount is liquidatable below zero.
+        """
+        return _to_decimal(self.maintenance_health_x18)
+
+    @property
+    def unweighted_health(self) -> Decimal:
+        """
+        Unweighted health, i.e. the cross margin account value.
+        """
+        return _to_decimal(self.unweighted_health_x18)
+
+    @property
+    def margin_usage(self) -> MarginUsageFractions:
+        """
+        Margin usage fractions bounded to [0, 1], as in `MarginManager.calculate_margin_usage_fractions`.
+        """
+        unweighted = self.unweighted_health_x18
+        if unweighted == 0 or not self._active:
+            return MarginUsageFractions(initial=Decimal(0), maintenance=Decimal(0))
+        initial = self.initial_health_x18
+        maintenance = self.maintenance_health_x18
+        return MarginUsageFractions(
+            initial=Decimal(1)
+            if initial < 0
+            else min(Decimal(unweighted - initial) / Decimal(unweighted), Decimal(1)),
+            maintenance=Decimal(1)
+            if maintenance < 0
+            else min(Decimal(unweighted - maintenance) / Decimal(unweighted), Decimal(1)),
+        )
+
+    @property
+    def account_leverage(self) -> Decimal:
+        """
+        Sum of non-quote notional values over unweighted health, as in `MarginManager.calculate_account_leverage`.
+        """
+        unweighted = self.unweighted_health_x18
+        if unweighted == 0 or not self._active:
+            return Decimal(0)
+        return Decimal(self._leverage_notional_x18) / Decimal(unweighted)
+
+    def liquidation_price_x18(self, product_id: int) -> Optional[int]:
+        """
+        Oracle price of `product_id` at which maintenance health reaches zero, all other
+        prices unchanged. None for the quote product, a zero balance, or when a price move
+        cannot liquidate.
+
+        Args:
+            product_id (int): The product id.
+
+        Returns:
+            Optional[int]: The liquidation price, x18.
+        """
+        state = self.products.get(product_id)
+        if state is None or state.amount_x18 == 0 or product_id == QUOTE_PRODUCT_ID:
+            return None
+        _, weight_maintenance = state.weights(state.amount_x18)
+        # d(maintenance health) / d(price) = amount * weight
+        slope_x18 = _mul_x18(state.amount_x18, weight_maintenance)
+        if slope_x18 == 0:
+            return None
+        price = state.oracle_price_x18 - self.maintenance_health_x18 * X18 // slope_x18
+        return price if price > 0 else None
+
+    def liquidation_price(self, product_id: int) -> Optional[Decimal]:
+        """
+        Same as `liquidation_price_x18`, as a Decimal.
+        """
+        price = self.liquidation_price_x18(product_id)
+        return None if price is None else _to_decimal(price)
+
+    def liquidation_distance(self, product_id: int) -> Optional[Decimal]:
+        """
+        Relative oracle price move that liquidates the subaccount through `product_id`,
+        e.g. 0.2 for a 20% move. Zero if already liquidatable.
+
+        Args:
+            product_id (int): The product id.
+
+        Returns:
+            Optional[Decimal]: The distance, None when `liquidation_price` is None.
+        """
+        price = self.liquidation_price_x18(product_id)
+        if price is None:
+            return None
+        if self.maintenance_health_x18 <= 0:
+            return Decimal(0)
+        oracle = self.products[product_id].oracle_price_x18
+        return Decimal(abs(oracle - price)) / Decimal(oracle)
+
+    def initial_health_after_x18(
+        self, product_id: int, amount_delta_x18: int, price_x18: Optional[int] = None
+    ) -> int:
+        """
+        Initial health after a hypothetical fill, without changing the state.
+
+        Args:
+            product_id (int): The product id.
+
+            amount_delta_x18 (int): Signed amount, positive for buys, x18.
+
+            price_x18 (Optional[int]): Fill price, x18. Defaults to the oracle price.
+
+        Returns:
+            int: The post-trade initial health, x18.
+        """
+        state = self.products[product_id]
+        price = state.oracle_price_x18 if price_x18 is None else price_x18
+        amount = state.amount_x18 + amount_delta_x18
+        weight_initial, _ = state.weights(amount)
+        quote_delta = -_mul_x18(amount_delta_x18, price)
+        value = _mul_x18(amount, state.oracle_price_x18)
+        health = self.initial_health_x18 - state.initial_x18
+        if state.is_perp:
+            return health + _mul_x18(value, weight_initial) + state.v_quote_x18 + quote_delta
+        health += _mul_x18(value, weight_initial)
+        quote = self.products.get(self.QUOTE_PRODUCT_ID)
+        if quote is None or product_id == self.QUOTE_PRODUCT_ID:
+            return health + quote_delta
+        quote_amount = quote.amount_x18 + quote_delta
+        quote_weight, _ = quote.weights(quote_amount)
+        quote_value = _mul_x18(quote_amount, quote.oracle_price_x18)
+        return health - quote.initial_x18 + _mul_x18(quote_value, quote_weight)
+
+    # INTERNALS
+
+    def _replace(self, state: ProductMarginState, **changes: int) -> None:
+        old_initial = state.initial_x18
+        old_maintenance = state.maintenance_x18
+        old_unweighted = state.unweighted_x18
+        old_leverage = self._leverage_notional(state)
+        for name, value in changes.items():
+            setattr(state, name, value)
+        state.recompute()
+        self._initial_x18 += state.initial_x18 - old_initial
+        self._maintenance_x18 += state.maintenance_x18 - old_maintenance
+        self._unweighted_x18 += state.unweighted_x18 - old_unweighted
+        self._leverage_notional_x18 += self._leverage_notional(state) - old_leverage
+        if self._is_active(state):
+            self._active.add(state.product_id)
+        else:
+            self._active.discard(state.product_id)
+
+    def _leverage_notional(self, state: ProductMarginState) -> int:
+        if state.product_id == self.QUOTE_PRODUCT_ID or state.is_zero_health():
+            return 0
+        return state.notional_x18
+
+    @staticmethod
+    def _is_active(state: ProductMarginState) -> bool:
+        return state.amount_x18 != 0 if state.is_perp else state.amount_x18 < 0
@@ -0,0 +1,351 @@
+"""
+Margin Simulator - local what-if checks for orders before they are sent.
+
+`EngineQueryClient.get_max_order_size` answers "does this order fit the margin?" with
+a network round trip. This module answers it locally from the cross margin state of
+an `IncrementalMarginManager`, with the per-balance health formulas of
+`MarginManager`:
+
+- A perp fill of `d` at `price` changes the amount by `d` and v_quote by `-d * price - fee`
+- A spot fill changes the amount by `d` and the quote balance by `-d * price - fee`
+- The product's health contribution is recomputed with the weights of the new amount
+
+Only the traded product (and the quote product for spot) changes, so a candidate
+costs O(1), and a grid of sizes x prices shares the per-size terms.
+
+Post-trade health is concave in the order size (long weights <= 1 <= short weights),
+so the orders that keep initial health >= 0 form an interval starting at zero and
+the max order size is found by bisection.
+"""
+
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+
+from nado_protocol.engine_client.types.query import SubaccountInfoData
+from nado_protocol.utils.incremental_margin import (
+    IncrementalMarginManager,
+    ProductMarginState,
+)
+
+if TYPE_CHECKING:
+    from nado_protocol.client import NadoClient
+
+X18 = 10**18
+
+
+def _mul_x18(x: int, y: int) -> int:
+    return x * y // X18
+
+
+class TradeCandidate(NamedTuple):
+    """A hypothetical fill; `amount_x18` is positive for buys."""
+
+    product_id: int
+    amount_x18: int
+    price_x18: Optional[int] = None
+    fee_x18: int = 0
+
+
+class SimulatedHealth(NamedTuple):
+    """Post-trade cross margin health, x18."""
+
+    initial_x18: int
+    maintenance_x18: int
+
+    @property
+    def fits(self) -> bool:
+        """
+        Whether the trade keeps initial health non-negative.
+        """
+        return self.initial_x18 >= 0
+
+
+class MarginSimulator:
+    """
+    Evaluates candidate orders against the current margin state without network calls.
+
+    The simulator reads the live state of its `IncrementalMarginManager`, so it stays
+    current as fills and oracle prices are applied to the manager.
+
+    Examples:
+        >>> simulator = MarginSimulator.from_client(client)
+        >>> simulator.simulate(TradeCandidate(2, 10**17, 95_000 * 10**18)).fits
+        >>> simulator.max_order_size_x18(2, is_bid=True, price_x18=95_000 * 10**18)
+        >>> grid = simulator.simulate_grid(2, sizes_x18, prices_x18)
+    """
+
+    def __init__(self, manager: IncrementalMarginManager):
+        """
+        Initialize the simulator.
+
+        Args:
+            manager (IncrementalMarginManager): The cross margin state to simulate against.
+        """
+        self.manager = manager
+
+    @classmethod
+    def from_subaccount_info(cls, subaccount_info: SubaccountInfoData) -> "MarginSimulator":
+        """
+        Initialize the simulator from a subaccount snapshot.
+
+        Args:
+            subaccount_info (SubaccountInfoData): Subaccount information from the engine.
+        """
+        return cls(IncrementalMarginManager(subaccount_info))
+
+    @classmethod
+    def from_client(
+        cls,
+        client: "NadoClient",
+        *,
+        subaccount: Optional[str] = None,
+        subaccount_name: str = "default",
+    ) -> "MarginSimulator":
+        """
+        Initialize the simulator with a single `get_subaccount_info` request, see
+        `IncrementalMarginManager.from_client`.
+        """
+        return cls(
+            IncrementalMarginManager.from_client(
+                client, subaccount=subaccount, subaccount_name=subaccount_name
+            )
+        )
+
+    # SIMULATION
+
+    def simulate(self, candidate: TradeCandidate) -> SimulatedHealth:
+        """
+        Post-trade health of one candidate fill.
+
+        Args:
+            candidate (TradeCandidate): The hypothetical fill.
+
+        Returns:
+            SimulatedHealth: Initial and maintenance health after the fill.
+        """
+        return self.simulate_many([candidate])[0]
+
+    def simulate_many(self, candidates: Sequence[TradeCandidate]) -> List[SimulatedHealth]:
+        """
+        Post-trade health of independent candidate fills (each against the current state).
+
+        Args:
+            candidates (Sequence[TradeCandidate]): The hypothetical fills.
+
+        Returns:
+            List[SimulatedHealth]: Health after each fill, in order.
+        """
+        manager = self.manager
+        with manager._lock:
+            base = (manager.initial_health_x18, manager.maintenance_health_x18)
+            results = []
+            for candidate in candidates:
+                state = self._state(candidate.product_id)
+                price = (
+                    state.oracle_price_x18
+                    if candidate.price_x18 is None
+                    else int(candidate.price_x18)
+                )
+                results.append(
+                    self._health_after(
+                        base, state, int(candidate.amount_x18), price, int(candidate.fee_x18)
+                    )
+                )
+            return results
+
+    def simulate_grid(
+        self,
+        product_id: int,
+        amounts_x18: Sequence[int],
+        prices_x18: Sequence[int],
+        fee_rate_x18: int = 0,
+    ) -> List[List[SimulatedHealth]]:
+        """
+        Post-trade health for every combination of size and price on one product.
+
+        Args:
+            product_id (int): The product id.
+
+            amounts_x18 (Sequence[int]): Signed sizes, positive for buys, x18.
+
+            prices_x18 (Sequence[int]): Fill prices, x18.
+
+            fee_rate_x18 (int): Fee as a fraction of the fill notional, x18.
+
+        Returns:
+            List[List[SimulatedHealth]]: `grid[i][j]` is the health after filling
+            `amounts_x18[i]` at `prices_x18[j]`.
+        """
+        manager = self.manager
+        with manager._lock:
+            state = self._state(product_id)
+            initial = manager.initial_health_x18 - state.initial_x18
+            maintenance = manager.maintenance_health_x18 - state.maintenance_x18
+            quote = self._quote(state)
+            if quote is not None:
+                initial -= quote.initial_x18
+                maintenance -= quote.maintenance_x18
+
+            grid = []
+            for amount_delta in amounts_x18:
+                amount_delta = int(amount_delta)
+                # Terms that only depend on the size
+                amount = state.amount_x18 + amount_delta
+                value = _mul_x18(amount, state.oracle_price_x18)
+                weight_initial, weight_maintenance = state.weights(amount)
+                size_initial = initial + _mul_x18(value, weight_initial)
+                size_maintenance = maintenance + _mul_x18(value, weight_maintenance)
+                if state.is_perp:
+                    size_initial += state.v_quote_x18
+                    size_maintenance += state.v_quote_x18
+                abs_delta = abs(amount_delta)
+                row = []
+                for price in prices_x18:
+                    price = int(price)
+                    quote_delta = -_mul_x18(amount_delta, price) - _mul_x18(
+                        _mul_x18(abs_delta, price), fee_rate_x18
+                    )
+                    if quote is None:
+                        row.append(
+                            SimulatedHealth(
+                                size_initial + quote_delta, size_maintenance + quote_delta
+                            )
+                        )
+                    else:
+                        quote_initial, quote_maintenance = _contribution(
+                            quote, quote.amount_x18 + quote_delta
+                        )
+                        row.append(
+                            SimulatedHealth(
+                                size_initial + quote_initial,
+                                size_maintenance + quote_maintenance,
+                            )
+                        )
+                grid.append(row)
+            return grid
+
+    def max_order_size_x18(
+        self,
+        product_id: int,
+        is_bid: bool,
+        price_x18: Optional[int] = None,
+        fee_rate_x18: int = 0,
+        size_increment_x18: int = 1,
+        reduce_only: bool = False,
+        max_size_x18: int = 10**12 * X18,
+    ) -> int:
+        """
+        Largest order size that keeps initial health >= 0, the local counterpart of
+        `EngineQueryClient.get_max_order_size`. When initial health is already
+        negative, the largest size that does not lower it (i.e. reducing orders).
+
+        Args:
+            product_id (int): The product id.
+
+            is_bid (bool): True for buys, False for sells.
+
+            price_x18 (Optional[int]): Fill price, x18. Defaults to the oracle price.
+
+            fee_rate_x18 (int): Fee as a fraction of the fill notional, x18.
+
+            size_increment_x18 (int): The result is rounded down to a multiple of this size.
+
+            reduce_only (bool): Cap the size at the current position in the opposite direction.
+
+            max_size_x18 (int): Upper bound of the search.
+
+        Returns:
+            int: The max order size (unsigned), x18.
+        """
+        manager = self.manager
+        with manager._lock:
+            state = self._state(product_id)
+            price = state.oracle_price_x18 if price_x18 is None else int(price_x18)
+            sign = 1 if is_bid else -1
+            base = (manager.initial_health_x18, manager.maintenance_health_x18)
+
+            def initial_after(size: int) -> int:
+                fee = _mul_x18(_mul_x18(size, price), fee_rate_x18)
+                return self._health_after(base, state, sign * size, price, fee).initial_x18
+
+            upper = max_size_x18
+            if reduce_only:
+                upper = min(upper, max(0, -sign * state.amount_x18))
+            threshold = min(0, base[0])
+
+            # Exponential search for a size that does not fit, then bisection
+            low, high = 0, min(size_increment_x18, upper)
+            while high < upper and initial_after(high) >= threshold:
+                low, high = high, min(high * 2, upper)
+            if initial_after(high) >= threshold:
+                low = high
+            else:
+                while high - low > 1:
+                    middle = (low + high) // 2
+                    if initial_after(middle) >= threshold:
+                        low = middle
+                    else:
+                        high = middle
+            return low - low % size_increment_x18
+
+    # INTERNALS
+
+    def _state(self, product_id: int) -> ProductMarginState:
+        state = self.manager.products.get(product_id)
+        if state is None:
+            raise KeyError(
+                f"product {product_id} is not part of the margin state; resync the manager"
+            )
+        return state
+
+    def _quote(self, state: ProductMarginState) -> Optional[ProductMarginState]:
+        if state.is_perp or state.product_id == self.manager.QUOTE_PRODUCT_ID:
+            return None
+        return self.manager.products.get(self.manager.QUOTE_PRODUCT_ID)
+
+    def _health_after(
+        self,
+        base: Tuple[int, int],
+        state: ProductMarginState,
+        amount_delta_x18: int,
+        price_x18: int,
+        fee_x18: int,
+    ) -> SimulatedHealth:
+        quote_delta = -_mul_x18(amount_delta_x18, price_x18) - fee_x18
+        amount = state.amount_x18 + amount_delta_x18
+        initial = base[0] - state.initial_x18
+        maintenance = base[1] - state.maintenance_x18
+        quote = self._quote(state)
+        if state.is_perp:
+            product_initial, product_maintenance = _contribution(
+                state, amount, state.v_quote_x18 + quote_delta
+            )
+        elif quote is None:
+            # The quote product itself, or no quote balance to move
+            product_initial, product_maintenance = _contribution(state, amount)
+            product_initial += quote_delta
+            product_maintenance += quote_delta
+        else:
+            product_initial, product_maintenance = _contribution(state, amount)
+            quote_initial, quote_maintenance = _contribution(
+                quote, quote.amount_x18 + quote_delta
+            )
+            product_initial += quote_initial - quote.initial_x18
+            product_maintenance += quote_maintenance - quote.maintenance_x18
+        return SimulatedHealth(
+            initial + product_initial, maintenance + product_maintenance
+        )
+
+
+def _contribution(
+    state: ProductMarginState, amount_x18: int, v_quote_x18: Union[int, None] = None
+) -> Tuple[int, int]:
+    """
+    (initial, maintenance) health contribution of `state` holding `amount_x18`.
+    """
+    value = _mul_x18(amount_x18, state.oracle_price_x18)
+    weight_initial, weight_maintenance = state.weights(amount_x18)
+    v_quote = 0 if v_quote_x18 is None else v_quote_x18
+    return (
+        _mul_x18(value, weight_initial) + v_quote,
+        _mul_x18(value, weight_maintenance) + v_quote,
+    )
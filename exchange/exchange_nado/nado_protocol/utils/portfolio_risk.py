@@ -0,0 +1,409 @@
+"""
+Portfolio Risk - cross margin metrics for many subaccounts at once.
+
+`MarginManager` works on one subaccount at a time, with a `get_subaccount_info`
+request per subaccount and `Decimal` math per balance. This module fetches indexer
+snapshots for N subaccounts with a few `get_multi_subaccount_snapshots` requests and
+keeps their balances in columns of x18 integers, one column per product. Health,
+margin usage, leverage and Est. PnL of every subaccount are then computed in a single
+pass per product, and can be recomputed at new oracle prices without refetching.
+
+Formulas match `MarginManager` (cross margin only):
+- Health = sum(amount * oracle_price * weight (+ v_quote_balance for perps)),
+  with long weights when amount >= 0 and short weights otherwise
+- Unweighted health uses weight 1
+- Leverage = sum(abs(amount * oracle_price)) for non-quote products / unweighted health
+- Est. PnL = sum(amount * oracle_price - net_entry_unrealized) over perp positions
+
+Healths are computed from the snapshot balances: engine health components the
+per-balance formulas do not model (e.g. spreads) are not included.
+
+Columns hold plain Python ints: x18 values overflow 64-bit integers.
+"""
+
+from decimal import Decimal
+from time import time
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+    TYPE_CHECKING,
+)
+
+from nado_protocol.indexer_client.types.query import (
+    IndexerAccountSnapshotsData,
+    IndexerAccountSnapshotsParams,
+)
+from nado_protocol.utils.margin_manager import TEN_TO_18
+
+if TYPE_CHECKING:
+    from nado_protocol.client import NadoClient
+    from nado_protocol.indexer_client import IndexerQueryClient
+
+X18 = 10**18
+QUOTE_PRODUCT_ID = 0
+DEFAULT_CHUNK_SIZE = 100
+
+
+def _to_decimal(value_x18: int) -> Decimal:
+    return Decimal(value_x18) / TEN_TO_18
+
+
+class SubaccountRisk(NamedTuple):
+    """Cross margin metrics of one subaccount."""
+
+    subaccount: str
+    initial_health: Decimal
+    maintenance_health: Decimal
+    unweighted_health: Decimal
+    margin_usage_fraction: Decimal
+    maint_margin_usage_fraction: Decimal
+    account_leverage: Decimal
+    est_pnl: Optional[Decimal]
+
+
+class PortfolioRiskReport:
+    """
+    Metrics of N subaccounts as columns of x18 integers, in the order of `subaccounts`.
+    """
+
+    def __init__(
+        self,
+        subaccounts: List[str],
+        initial_health_x18: List[int],
+        maintenance_health_x18: List[int],
+        unweighted_health_x18: List[int],
+        leverage_notional_x18: List[int],
+        est_pnl_x18: List[Optional[int]],
+        active: List[bool],
+    ):
+        self.subaccounts = subaccounts
+        self.initial_health_x18 = initial_health_x18
+        self.maintenance_health_x18 = maintenance_health_x18
+        self.unweighted_health_x18 = unweighted_health_x18
+        self.leverage_notional_x18 = leverage_notional_x18
+        self.est_pnl_x18 = est_pnl_x18
+        # Subaccounts with a perp position or a spot borrow
+        self.active = active
+
+    def __len__(self) -> int:
+        return len(self.subaccounts)
+
+    def margin_usage(self, index: int) -> "tuple[Decimal, Decimal]":
+        """
+        (initial, maintenance) margin usage fractions bounded to [0, 1], as in
+        `MarginManager.calculate_margin_usage_fractions`.
+
+        Args:
+            index (int): Position of the subaccount in `subaccounts`.
+        """
+        unweighted = self.unweighted_health_x18[index]
+        if unweighted == 0 or not self.active[index]:
+            return Decimal(0), Decimal(0)
+        return (
+            _usage(self.initial_health_x18[index], unweighted),
+            _usage(self.maintenance_health_x18[index], unweighted),
+        )
+
+    def account_leverage(self, index: int) -> Decimal:
+        """
+        Account leverage, as in `MarginManager.calculate_account_leverage`.
+
+        Args:
+            index (int): Position of the subaccount in `subaccounts`.
+        """
+        unweighted = self.unweighted_health_x18[index]
+        if unweighted == 0 or not self.active[index]:
+            return Decimal(0)
+        return Decimal(self.leverage_notional_x18[index]) / Decimal(unweighted)
+
+    def row(self, index: int) -> SubaccountRisk:
+        """
+        Metrics of one subaccount as Decimals.
+
+        Args:
+            index (int): Position of the subaccount in `subaccounts`.
+        """
+        initial_usage, maint_usage = self.margin_usage(index)
+        est_pnl = self.est_pnl_x18[index]
+        return SubaccountRisk(
+            subaccount=self.subaccounts[index],
+            initial_health=_to_decimal(self.initial_health_x18[index]),
+            maintenance_health=_to_decimal(self.maintenance_health_x18[index]),
+            unweighted_health=_to_decimal(self.unweighted_health_x18[index]),
+            margin_usage_fraction=initial_usage,
+            maint_margin_usage_fraction=maint_usage,
+            account_leverage=self.account_leverage(index),
+            est_pnl=None if est_pnl is None else _to_decimal(est_pnl),
+        )
+
+    def rows(self) -> Iterator[SubaccountRisk]:
+        """
+        Metrics of every subaccount, in the order of `subaccounts`.
+        """
+        return (self.row(i) for i in range(len(self.subaccounts)))
+
+    def at_risk(self, max_maint_margin_usage: Union[Decimal, float]) -> List[str]:
+        """
+        Subaccounts whose maintenance margin usage exceeds a threshold.
+
+        Args:
+            max_maint_margin_usage (Union[Decimal, float]): Threshold in [0, 1]; 1 means liquidatable.
+
+        Returns:
+            List[str]: The subaccounts, most used first.
+        """
+        threshold = Decimal(str(max_maint_margin_usage))
+        usages = [
+            (self.margin_usage(i)[1], subaccount)
+            for i, subaccount in enumerate(self.subaccounts)
+        ]
+        return [s for usage, s in sorted(usages, reverse=True) if usage > threshold]
+
+
+class PortfolioRiskEngine:
+    """
+    Cross margin calculator for many subaccounts, built from indexer snapshots.
+
+    Balances are stored per product as parallel columns (subaccount row, amount,
+    v_quote balance, net entry), so computing all subaccounts costs one pass over the
+    non-zero balances, and oracle price overrides apply to every subaccount at once.
+
+    Examples:
+        >>> engine = PortfolioRiskEngine.from_client(client, subaccounts)
+        >>> report = engine.compute()
+        >>> report.at_risk(0.8)
+        >>> prices = client.context.indexer_client.get_oracle_prices(engine.product_ids)
+        >>> report = engine.compute({p.product_id: p.oracle_price_x18 for p in prices.prices})
+    """
+
+    QUOTE_PRODUCT_ID = QUOTE_PRODUCT_ID
+
+    def __init__(self, subaccounts: Iterable[str]):
+        """
+        Initialize an engine without balances; see `from_snapshots` and `from_indexer`.
+
+        Args:
+            subaccounts (Iterable[str]): Subaccount hex (bytes32) identifiers, in report order.
+        """
+        self.subaccounts: List[str] = list(subaccounts)
+        self._row_of: Dict[str, int] = {
+            s.lower(): i for i, s in enumerate(self.subaccounts)
+        }
+        self.product_ids: List[int] = []
+        self._column_of: Dict[int, int] = {}
+        # Per product
+        self.is_perp: List[bool] = []
+        self.oracle_price_x18: List[int] = []
+        self.long_weight_initial_x18: List[int] = []
+        self.long_weight_maintenance_x18: List[int] = []
+        self.short_weight_initial_x18: List[int] = []
+        self.short_weight_maintenance_x18: List[int] = []
+        # Per product: balances of the subaccounts holding it
+        self._rows: List[List[int]] = []
+        self._amounts: List[List[int]] = []
+        self._v_quotes: List[List[int]] = []
+        self._net_entries: List[List[Optional[int]]] = []
+
+    @classmethod
+    def from_snapshots(
+        cls,
+        snapshots: Union[IndexerAccountSnapshotsData, Iterable[IndexerAccountSnapshotsData]],
+        subaccounts: Optional[Iterable[str]] = None,
+    ) -> "PortfolioRiskEngine":
+        """
+        Build the engine from `get_multi_subaccount_snapshots` responses, using the
+        latest snapshot of each subaccount. Isolated balances are skipped.
+
+        Args:
+            snapshots (Union[IndexerAccountSnapshotsData, Iterable[IndexerAccountSnapshotsData]]): One or
+                more snapshot responses.
+
+            subaccounts (Optional[Iterable[str]]): Report order; subaccounts without snapshot get
+                zero metrics. Defaults to the subaccounts found in the responses.
+
+        Returns:
+            PortfolioRiskEngine: The populated engine.
+        """
+        responses = (
+            [snapshots]
+            if isinstance(snapshots, IndexerAccountSnapshotsData)
+            else list(snapshots)
+        )
+        latest: Dict[str, list] = {}
+        for response in responses:
+            for subaccount, by_timestamp in (response.snapshots or {}).items():
+                if by_timestamp:
+                    latest[subaccount] = by_timestamp[max(by_timestamp, key=int)] or []
+
+        engine = cls(latest if subaccounts is None else subaccounts)
+        for subaccount, events in latest.items():
+            row = engine._row_of.get(subaccount.lower())
+            if row is None:
+                continue
+            for event in events:
+                if not event.isolated:
+                    engine._add_event(row, event)
+        return engine
+
+    @classmethod
+    def from_indexer(
+        cls,
+        indexer_client: "IndexerQueryClient",
+        subaccounts: Iterable[str],
+        *,
+        timestamp: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        active_only: bool = True,
+    ) -> "PortfolioRiskEngine":
+        """
+        Fetch the latest snapshots of `subaccounts`, `chunk_size` subaccounts per request.
+
+        Args:
+            indexer_client (IndexerQueryClient): The indexer client.
+
+            subaccounts (Iterable[str]): Subaccount hex (bytes32) identifiers.
+
+            timestamp (Optional[int]): Epoch seconds of the snapshots; defaults to now.
+
+            chunk_size (int): Subaccounts per `get_multi_subaccount_snapshots` request.
+
+            active_only (bool): Passed as the indexer's `active` filter.
+
+        Returns:
+            PortfolioRiskEngine: The populated engine.
+        """
+        subaccounts = list(subaccounts)
+        timestamp = timestamp or int(time())
+        responses = [
+            indexer_client.get_multi_subaccount_snapshots(
+                IndexerAccountSnapshotsParams(
+                    subaccounts=subaccounts[i : i + chunk_size],
+                    timestamps=[timestamp],
+                    isolated=False,
+                    active=active_only,
+                )
+            )
+            for i in range(0, len(subaccounts), chunk_size)
+        ]
+        return cls.from_snapshots(responses, subaccounts)
+
+    @classmethod
+    def from_client(
+        cls, client: "NadoClient", subaccounts: Iterable[str], **kwargs: Any
+    ) -> "PortfolioRiskEngine":
+        """
+        Same as `from_indexer`, with the indexer client of a `NadoClient`.
+        """
+        return cls.from_indexer(client.context.indexer_client, subaccounts, **kwargs)
+
+    def compute(
+        self, oracle_prices_x18: Optional[Dict[int, Union[int, str]]] = None
+    ) -> PortfolioRiskReport:
+        """
+        Compute the metrics of every subaccount.
+
+        Args:
+            oracle_prices_x18 (Optional[Dict[int, Union[int, str]]]): Oracle price overrides per
+                product id, x18. Other products use the snapshot prices.
+
+        Returns:
+            PortfolioRiskReport: The metrics, in the order of `subaccounts`.
+        """
+        n = len(self.subaccounts)
+        initial = [0] * n
+        maintenance = [0] * n
+        unweighted = [0] * n
+        leverage_notional = [0] * n
+        est_pnl: List[Optional[int]] = [None] * n
+        active = [False] * n
+        overrides = oracle_prices_x18 or {}
+
+        for j, product_id in enumerate(self.product_ids):
+            price = int(overrides.get(product_id, self.oracle_price_x18[j]))
+            long_initial = self.long_weight_initial_x18[j]
+            long_maintenance = self.long_weight_maintenance_x18[j]
+            short_initial = self.short_weight_initial_x18[j]
+            short_maintenance = self.short_weight_maintenance_x18[j]
+            is_perp = self.is_perp[j]
+            counts_leverage = product_id != QUOTE_PRODUCT_ID and not (
+                long_initial == 0 and short_initial == 2 * X18
+            )
+            for row, amount, v_quote, net_entry in zip(
+                self._rows[j], self._amounts[j], self._v_quotes[j], self._net_entries[j]
+            ):
+                value = amount * price // X18
+                if amount >= 0:
+                    initial[row] += value * long_initial // X18 + v_quote
+                    maintenance[row] += value * long_maintenance // X18 + v_quote
+                else:
+                    initial[row] += value * short_initial // X18 + v_quote
+                    maintenance[row] += value * short_maintenance // X18 + v_quote
+                unweighted[row] += value + v_quote
+                if counts_leverage:
+                    leverage_notional[row] += abs(value)
+                if is_perp:
+                    if amount != 0:
+                        active[row] = True
+                        if net_entry is not None:
+                            est_pnl[row] = (est_pnl[row] or 0) + value - net_entry
+                elif amount < 0:
+                    active[row] = True
+
+        return PortfolioRiskReport(
+            list(self.subaccounts),
+            initial,
+            maintenance,
+            unweighted,
+            leverage_notional,
+            est_pnl,
+            active,
+        )
+
+    # INTERNALS
+
+    def _column(self, product_id: int, product: Any, is_perp: bool) -> int:
+        column = self._column_of.get(product_id)
+        if column is not None:
+            return column
+        risk = product.risk
+        column = self._column_of[product_id] = len(self.product_ids)
+        self.product_ids.append(product_id)
+        self.is_perp.append(is_perp)
+        self.oracle_price_x18.append(int(product.oracle_price_x18))
+        self.long_weight_initial_x18.append(int(risk.long_weight_initial_x18))
+        self.long_weight_maintenance_x18.append(int(risk.long_weight_maintenance_x18))
+        self.short_weight_initial_x18.append(int(risk.short_weight_initial_x18))
+        self.short_weight_maintenance_x18.append(int(risk.short_weight_maintenance_x18))
+        self._rows.append([])
+        self._amounts.append([])
+        self._v_quotes.append([])
+        self._net_entries.append([])
+        return column
+
+    def _add_event(self, row: int, event: Any) -> None:
+        is_perp = hasattr(event.product, "perp")
+        product = event.product.perp if is_perp else event.product.spot
+        balance = event.post_balance.perp if is_perp else event.post_balance.spot
+        column = self._column(event.product_id, product, is_perp)
+        try:
+            net_entry: Optional[int] = int(event.net_entry_unrealized)
+        except (TypeError, ValueError):
+            net_entry = None
+        self._rows[column].append(row)
+        self._amounts[column].append(int(balance.balance.amount))
+        self._v_quotes[column].append(
+            int(balance.balance.v_quote_balance) if is_perp else 0
+        )
+        self._net_entries[column].append(net_entry)
+
+
+def _usage(health: int, unweighted: int) -> Decimal:
+    if health < 0:
+        return Decimal(1)
+    return min(Decimal(unweighted - health) / Decimal(unweighted), Decimal(1))
@@ -0,0 +1,392 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from nado_protocol.engine_client.query import EngineQueryClient
+from nado_protocol.engine_client.types.fast import (
+    FastProductOpenOrdersData,
+    FastSubaccountOpenOrdersData,
+)
+from nado_protocol.engine_client.types.query import SubaccountOpenOrdersData
+
+DEFAULT_WINDOW_SECONDS = 0.002
+DEFAULT_MAX_BATCH = 64
+
+# Default cache TTL per query, in seconds. 0 disables caching for that query.
+DEFAULT_TTLS: Dict[str, float] = {
+    "subaccount_orders": 0.0,
+    "market_price": 0.2,
+    "funding_rate": 5.0,
+    "oracle_price": 1.0,
+}
+
+
+class TTLCache:
+    """
+    Thread-safe cache whose entries expire after a per-entry TTL.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Entries kept at most; expired entries are purged first, then the oldest.
+        """
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Tuple[bool, Any]: (hit, value); value is None on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            return False, None
+        return True, value
+
+    def put(self, key: Hashable, value: Any, ttl: float) -> None:
+        """
+        Store a value.
+
+        Args:
+            key (Hashable): The cache key.
+
+            value (Any): The value.
+
+            ttl (float): Seconds the value stays valid; non-positive values are not stored.
+        """
+        if ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._purge(now)
+            self._entries[key] = (now + ttl, value)
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> None:
+        """
+        Drop entries.
+
+        Args:
+            predicate (Optional[Callable[[Hashable], bool]]): Drops the keys it returns True for; all keys if None.
+        """
+        with self._lock:
+            if predicate is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if predicate(k)]:
+                    del self._entries[key]
+
+    def _purge(self, now: float) -> None:
+        for key in [k for k, (exp, _) in self._entries.items() if exp < now]:
+            del self._entries[key]
+        if len(self._entries) >= self.max_entries:
+            oldest = sorted(self._entries.items(), key=lambda kv: kv[1][0])
+            for key, _ in oldest[: len(self._entries) - self.max_entries + 1]:
+                del self._entries[key]
+
+
+class _Batch:
+    __slots__ = ("futures", "full")
+
+    def __init__(self):
+        self.futures: Dict[Hashable, Future] = {}
+        self.full = threading.Event()
+
+
+class RequestCoalescer:
+    """
+    Gathers per-key requests made by concurrent threads within a short window into a
+    single batched fetch, and fans the results back out to the callers.
+
+    The first caller of a group waits `window` seconds (less if `max_batch` keys are
+    gathered) and then runs `fetch(group, keys)` on behalf of everyone in the batch.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Hashable, list], Dict[Hashable, Any]],
+        window: float = DEFAULT_WINDOW_SECONDS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        """
+        Initialize the coalescer.
+
+        Args:
+            fetch (Callable[[Hashable, list], Dict[Hashable, Any]]): Fetches all keys of a group in one request,
+                returning a result per key. Keys missing from the result raise `KeyError` in their callers.
+
+            window (float): Seconds the first caller waits for other requests to join the batch.
+
+            max_batch (int): Batch size that triggers the fetch before the window ends.
+        """
+        self._fetch = fetch
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[Hashable, _Batch] = {}
+        self._lock = threading.Lock()
+
+    def get(self, group: Hashable, key: Hashable) -> Any:
+        """
+        Request one key, sharing the fetch with concurrent requests of the same group.
+
+        Args:
+            group (Hashable): Requests of the same group can be fetched together (e.g. same sender).
+
+            key (Hashable): The requested key (e.g. product id).
+
+        Returns:
+            Any: The result for `key`.
+        """
+        with self._lock:
+            batch = self._pending.get(group)
+            leader = batch is None
+            if leader:
+                batch = _Batch()
+                self._pending[group] = batch
+            future = batch.futures.get(key)
+            if future is None:
+                future = batch.futures[key] = Future()
+            if len(batch.futures) >= self.max_batch:
+                del self._pending[group]
+                batch.full.set()
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._pending.get(group) is batch:
+                    del self._pending[group]
+            self._run(group, batch)
+        return future.result()
+
+    def _run(self, group: Hashable, batch: _Batch) -> None:
+        keys = list(batch.futures)
+        try:
+            results = self._fetch(group, keys)
+        except BaseException as e:
+            for future in batch.futures.values():
+                future.set_exception(e)
+            return
+        for key, future in batch.futures.items():
+            if key in results:
+                future.set_result(results[key])
+            else:
+                future.set_exception(KeyError(key))
+
+
+class CoalescingQueryClient:
+    """
+    Wraps an `EngineQueryClient` (and optionally an `IndexerQueryClient`) so that
+    per-product queries issued concurrently for several products become one
+    multi-product request, with a short-TTL cache for idempotent queries.
+
+    - `get_subaccount_open_orders` -> `get_subaccount_multi_products_open_orders` per sender
+    - `get_perp_funding_rate` -> `IndexerQueryClient.get_perp_funding_rates`
+    - `get_oracle_price` -> `IndexerQueryClient.get_oracle_prices`
+    - `get_market_price` has no multi-product engine query: concurrent identical
+      requests share one in-flight request and its cached result.
+
+    Other attributes are delegated to the wrapped engine client.
+    """
+
+    def __init__(
+        self,
+        engine_client: EngineQueryClient,
+        indexer_client: Any = None,
+        window: float = DEFAULT_WINDOW_SECONDS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        ttls: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            engine_client (EngineQueryClient): The engine client queries are sent with.
+
+            indexer_client (Optional[IndexerQueryClient]): Needed for funding rates and oracle prices.
+
+            window (float): Seconds to wait for concurrent requests to join a batch.
+
+            max_batch (int): Maximum products per batched request.
+
+            ttls (Optional[Dict[str, float]]): Cache TTL overrides per query, see `DEFAULT_TTLS`.
+        """
+        self.engine_client = engine_client
+        self.indexer_client = indexer_client
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.cache = TTLCache()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._open_orders = RequestCoalescer(self._fetch_open_orders, window, max_batch)
+        self._funding_rates = RequestCoalescer(self._fetch_funding_rates, window, max_batch)
+        self._oracle_prices = RequestCoalescer(self._fetch_oracle_prices, window, max_batch)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.engine_client, name)
+
+    # QUERIES
+
+    def get_subaccount_open_orders(self, product_id: int, sender: str):
+        """
+        Retrieves the open orders for a subaccount on a specific product, batched with
+        concurrent requests for other products of the same subaccount.
+
+        Args:
+            product_id (int): The product id.
+
+            sender (str): Identifier of the subaccount (owner's address + subaccount name) sent as a hex string.
+
+        Returns:
+            SubaccountOpenOrdersData: Open orders of the subaccount on the product
+            (`FastSubaccountOpenOrdersData` when the engine client uses `fast_decode`).
+        """
+        return self._cached(
+            ("subaccount_orders", sender, product_id),
+            self.ttls["subaccount_orders"],
+            lambda: self._open_orders.get(sender, product_id),
+        )
+
+    def get_market_price(self, product_id: int):
+        """
+        Retrieves the best bid and ask of a product; concurrent calls share one request.
+
+        Args:
+            product_id (int): The product id.
+
+        Returns:
+            MarketPriceData: Market price data for the product.
+        """
+        return self._cached(
+            ("market_price", product_id),
+            self.ttls["market_price"],
+            lambda: self.engine_client.get_market_price(product_id),
+        )
+
+    def get_perp_funding_rate(self, product_id: int):
+        """
+        Retrieves the latest funding rate of a perp product, batched with concurrent requests.
+
+        Args:
+            product_id (int): The perp product id.
+
+        Returns:
+            IndexerFundingRateData: The latest funding rate of the product.
+        """
+        return self._cached(
+            ("funding_rate", product_id),
+            self.ttls["funding_rate"],
+            lambda: self._funding_rates.get(None, product_id),
+        )
+
+    def get_oracle_price(self, product_id: int):
+        """
+        Retrieves the oracle price of a product, batched with concurrent requests.
+
+        Args:
+            product_id (int): The product id.
+
+        Returns:
+            IndexerOraclePrice: The oracle price of the product.
+        """
+        return self._cached(
+            ("oracle_price", product_id),
+            self.ttls["oracle_price"],
+            lambda: self._oracle_prices.get(None, product_id),
+        )
+
+    def invalidate(self, query: Optional[str] = None, sender: Optional[str] = None) -> None:
+        """
+        Drop cached results, e.g. open orders after placing or cancelling orders.
+
+        Args:
+            query (Optional[str]): Only drop this query type (a key of `DEFAULT_TTLS`).
+
+            sender (Optional[str]): Only drop open orders of this subaccount.
+        """
+        def matches(key: Hashable) -> bool:
+            if query is not None and key[0] != query:  # type: ignore[index]
+                return False
+            if sender is not None:
+                return key[0] == "subaccount_orders" and key[1] == sender  # type: ignore[index]
+            return True
+
+        self.cache.invalidate(matches)
+
+    # INTERNALS
+
+    def _cached(self, key: Hashable, ttl: float, fetch: Callable[[], Any]) -> Any:
+        hit, value = self.cache.get(key)
+        if hit:
+            return value
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            value = fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self.cache.put(key, value, ttl)
+            future.set_result(value)
+            return value
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _fetch_open_orders(self, sender: str, product_ids: list) -> Dict[int, Any]:
+        data = self.engine_client.get_subaccount_multi_products_open_orders(
+            product_ids, sender
+        )
+        by_product = {p.product_id: p.orders for p in data.product_orders}
+        fast = getattr(self.engine_client, "fast_decode", False) or any(
+            isinstance(p, FastProductOpenOrdersData) for p in data.product_orders
+        )
+        results: Dict[int, Any] = {}
+        for product_id in product_ids:
+            orders = by_product.get(product_id, [])
+            if fast:
+                results[product_id] = FastSubaccountOpenOrdersData.from_orders(
+                    data.sender, orders
+                )
+            else:
+                # Orders were validated as part of the multi-product response
+                results[product_id] = SubaccountOpenOrdersData.construct(
+                    sender=data.sender, orders=orders
+                )
+        return results
+
+    def _require_indexer(self) -> Any:
+        if self.indexer_client is None:
+            raise ValueError("indexer_client is required for funding rates and oracle prices")
+        return self.indexer_client
+
+    def _fetch_funding_rates(self, _: Any, product_ids: list) -> Dict[int, Any]:
+        data = self._require_indexer().get_perp_funding_rates(product_ids)
+        return {int(product_id): rate for product_id, rate in _items(data)}
+
+    def _fetch_oracle_prices(self, _: Any, product_ids: list) -> Dict[int, Any]:
+        data = self._require_indexer().get_oracle_prices(product_ids)
+        return {price.product_id: price for price in data.prices}
+
+
+def _items(data: Any) -> Iterable[Tuple[Any, Any]]:
+    return data.items() if isinstance(data, dict) else ((r.product_id, r) for r in data)
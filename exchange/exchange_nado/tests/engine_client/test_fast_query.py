@@ -0,0 +1,120 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from nado_protocol.engine_client import EngineClient
+from nado_protocol.engine_client.types import EngineClientOpts
+from nado_protocol.engine_client.types.fast import (
+    FastMarketLiquidityData,
+    FastMarketPriceData,
+    FastSubaccountMultiProductsOpenOrdersData,
+    FastSubaccountOpenOrdersData,
+)
+from nado_protocol.engine_client.types.query import (
+    MarketLiquidityData,
+    MarketPriceData,
+    SubaccountMultiProductsOpenOrdersData,
+    SubaccountOpenOrdersData,
+)
+from nado_protocol.utils.exceptions import QueryFailedException
+
+
+def _order(sender: str, product_id: int, digest: str) -> dict:
+    return {
+        "product_id": product_id,
+        "sender": sender,
+        "price_x18": "30000000000000000000000",
+        "amount": "-1000000000000000000",
+        "expiration": "4294967295",
+        "nonce": "1764428860167815857",
+        "unfilled_amount": "-1000000000000000000",
+        "digest": digest,
+        "placed_at": "1682437739",
+    }
+
+
+def _mock_response(data: dict, status: str = "success") -> MagicMock:
+    body = {"status": status, "data": data}
+    response = MagicMock()
+    response.status_code = 200
+    response.content = json.dumps(body).encode()
+    response.text = json.dumps(body)
+    response.json.return_value = body
+    return response
+
+
+@pytest.fixture
+def clients(url: str) -> tuple[EngineClient, EngineClient]:
+    fast = EngineClient(opts=EngineClientOpts(url=url, fast_decode=True))
+    slow = EngineClient(opts=EngineClientOpts(url=url))
+    return fast, slow
+
+
+def _query_both(clients, data: dict, method: str, *args):
+    fast, slow = clients
+    for client in (fast, slow):
+        client.session = MagicMock()
+        client.session.post.return_value = _mock_response(data)
+    return getattr(fast, method)(*args), getattr(slow, method)(*args)
+
+
+def test_fast_open_orders_match_pydantic(clients, senders: list[str]):
+    data = {
+        "sender": senders[0],
+        "orders": [_order(senders[0], 1, "0x01"), _order(senders[0], 1, "0x02")],
+    }
+    fast_res, slow_res = _query_both(
+        clients, data, "get_subaccount_open_orders", 1, senders[0]
+    )
+    assert isinstance(fast_res, FastSubaccountOpenOrdersData)
+    assert isinstance(slow_res, SubaccountOpenOrdersData)
+    assert fast_res.dict() == slow_res.dict()
+    assert fast_res.orders[1].digest == "0x02"
+
+
+def test_fast_multi_product_open_orders_match_pydantic(clients, senders: list[str]):
+    data = {
+        "sender": senders[0],
+        "product_orders": [
+            {"product_id": 1, "orders": [_order(senders[0], 1, "0x01")]},
+            {"product_id": 2, "orders": []},
+        ],
+    }
+    fast_res, slow_res = _query_both(
+        clients, data, "get_subaccount_multi_products_open_orders", [1, 2], senders[0]
+    )
+    assert isinstance(fast_res, FastSubaccountMultiProductsOpenOrdersData)
+    assert isinstance(slow_res, SubaccountMultiProductsOpenOrdersData)
+    assert fast_res.dict() == slow_res.dict()
+
+
+def test_fast_market_queries_match_pydantic(clients):
+    liquidity = {
+        "bids": [["29990000000000000000000", "1000000000000000000"]],
+        "asks": [["30010000000000000000000", "2000000000000000000"]],
+        "timestamp": "1682437739",
+    }
+    fast_res, slow_res = _query_both(clients, liquidity, "get_market_liquidity", 1, 10)
+    assert isinstance(fast_res, FastMarketLiquidityData)
+    assert isinstance(slow_res, MarketLiquidityData)
+    assert fast_res.dict() == slow_res.dict()
+
+    price = {"product_id": 1, "bid_x18": "29990", "ask_x18": "30010"}
+    fast_res, slow_res = _query_both(clients, price, "get_market_price", 1)
+    assert isinstance(fast_res, FastMarketPriceData)
+    assert isinstance(slow_res, MarketPriceData)
+    assert fast_res.dict() == slow_res.dict()
+    assert fast_res == FastMarketPriceData(price)
+
+
+def test_fast_query_failures(url: str):
+    client = EngineClient(opts=EngineClientOpts(url=url, fast_decode=True))
+    client.session = MagicMock()
+    client.session.post.return_value = _mock_response({}, status="failure")
+    with pytest.raises(QueryFailedException):
+        client.get_market_price(1)
+
+    client.session.post.return_value = _mock_response({"product_id": 1})
+    with pytest.raises(QueryFailedException):
+        client.get_market_price(1)
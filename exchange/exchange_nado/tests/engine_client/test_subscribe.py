@@ -0,0 +1,254 @@
+import asyncio
+import json
+
+import pytest
+import websockets
+from eth_account import Account
+
+from nado_protocol.engine_client.subscribe import (
+    EngineSubscriptionClient,
+    subscription_url,
+)
+from nado_protocol.engine_client.types.stream import (
+    BookDepthEvent,
+    FillEvent,
+    OrderUpdateEvent,
+    StreamSubscription,
+    StreamType,
+)
+
+
+class StandInServer:
+    """Local stand-in for the engine subscription endpoint."""
+
+    def __init__(self):
+        self.requests: list[dict] = []
+        self.connections: list = []
+        self.subscribed = asyncio.Event()
+        self.rejected_products: set[int] = set()
+
+    async def handler(self, ws):
+        self.connections.append(ws)
+        async for raw in ws:
+            msg = json.loads(raw)
+            self.requests.append(msg)
+            if msg.get("stream", {}).get("product_id") in self.rejected_products:
+                await ws.send(json.dumps({"error": "invalid product_id", "id": msg["id"]}))
+                continue
+            await ws.send(json.dumps({"result": None, "id": msg["id"]}))
+            if msg["method"] == "subscribe":
+                self.subscribed.set()
+
+    async def push(self, event: dict):
+        await self.connections[-1].send(json.dumps(event))
+
+    def methods(self) -> list[str]:
+        return [r["method"] for r in self.requests]
+
+
+def _book(product_id: int, last_max: str, max_ts: str) -> dict:
+    return {
+        "type": "book_depth",
+        "product_id": product_id,
+        "min_timestamp": last_max,
+        "max_timestamp": max_ts,
+        "last_max_timestamp": last_max,
+        "bids": [["100", "1"]],
+        "asks": [],
+    }
+
+
+async def _until(predicate, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_subscription_url():
+    assert (
+        subscription_url("https://gateway.prod.nado.xyz/v1")
+        == "wss://gateway.prod.nado.xyz/v1/subscribe"
+    )
+    assert subscription_url("http://localhost:80/") == "ws://localhost:80/subscribe"
+
+
+def test_typed_events_gaps_and_resubscribe_on_reconnect():
+    async def scenario():
+        server = StandInServer()
+        async with websockets.serve(server.handler, "127.0.0.1", 0) as ws_server:
+            port = ws_server.sockets[0].getsockname()[1]
+            client = EngineSubscriptionClient(
+                f"ws://127.0.0.1:{port}", min_reconnect_delay=0.05
+            )
+            events, gaps = [], []
+            client.on_gap(gaps.append)
+            book = StreamSubscription(type=StreamType.BOOK_DEPTH, product_id=2)
+            await client.subscribe(book, events.append)
+            await client.start()
+            await server.subscribed.wait()
+            assert server.requests[0]["stream"] == {"type": "book_depth", "product_id": 2}
+
+            await server.push(_book(2, "0", "10"))
+            await server.push(_book(2, "10", "20"))
+            await server.push(_book(2, "25", "30"))
+            await server.push(_book(3, "0", "5"))  # not subscribed
+            await _until(lambda: len(events) == 3)
+            assert all(isinstance(e, BookDepthEvent) for e in events)
+            assert [(g.reason, g.expected, g.received) for g in gaps] == [
+                ("sequence", "20", "25")
+            ]
+
+            await server.connections[-1].close()
+            await _until(lambda: len(server.connections) == 2 and client._connected.is_set())
+            assert server.methods() == ["subscribe", "subscribe"]
+            assert client.reconnects == 1
+            assert gaps[-1].reason == "reconnect"
+
+            await client.unsubscribe(book)
+            assert server.methods()[-1] == "unsubscribe"
+            await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_authenticates_and_routes_subaccount_events(
+    private_keys: list[str], senders: list[str], endpoint_addr: str, chain_id: int
+):
+    async def scenario():
+        server = StandInServer()
+        async with websockets.serve(server.handler, "127.0.0.1", 0) as ws_server:
+            port = ws_server.sockets[0].getsockname()[1]
+            client = EngineSubscriptionClient(
+                f"ws://127.0.0.1:{port}",
+                signer=Account.from_key(private_keys[0]),
+                sender=senders[0],
+                endpoint_addr=endpoint_addr,
+                chain_id=chain_id,
+            )
+            fills = []
+
+            async def on_fill(event):
+                fills.append(event)
+
+            await client.start()
+            await client.subscribe(
+                StreamSubscription(
+                    type=StreamType.FILL, product_id=2, subaccount=senders[0]
+                ),
+                on_fill,
+            )
+            auth = server.requests[0]
+            assert auth["method"] == "authenticate"
+            assert auth["tx"]["sender"] == senders[0]
+            assert auth["signature"].startswith("0x")
+
+            fill = {
+                "type": "fill",
+                "product_id": 2,
+                "timestamp": "1",
+                "subaccount": senders[0].lower(),
+                "order_digest": "0x01",
+                "filled_qty": "1",
+                "remaining_qty": "0",
+                "original_qty": "1",
+                "price": "100",
+                "is_taker": True,
+                "is_bid": False,
+            }
+            await server.push(fill)
+            await server.push({**fill, "subaccount": senders[1]})  # other subaccount
+            await _until(lambda: len(fills) == 1)
+            await asyncio.sleep(0.05)
+            assert len(fills) == 1 and isinstance(fills[0], FillEvent)
+            await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_order_updates_routed_by_subscription_and_callbacks_may_subscribe(
+    senders: list[str],
+):
+    async def scenario():
+        server = StandInServer()
+        async with websockets.serve(server.handler, "127.0.0.1", 0) as ws_server:
+            port = ws_server.sockets[0].getsockname()[1]
+            client = EngineSubscriptionClient(
+                f"ws://127.0.0.1:{port}", request_timeout=1.0
+            )
+            updates, trades = [], []
+
+            async def on_update(event):
+                updates.append(event)
+                # subscribing from a callback must not wait for the reader it runs under
+                await client.subscribe(
+                    StreamSubscription(type=StreamType.TRADE, product_id=2),
+                    trades.append,
+                )
+
+            await client.start()
+            await client.subscribe(
+                StreamSubscription(
+                    type=StreamType.ORDER_UPDATE, product_id=2, subaccount=senders[0]
+                ),
+                on_update,
+            )
+            started = asyncio.get_running_loop().time()
+            await server.push(
+                {
+                    "type": "order_update",
+                    "product_id": 2,
+                    "timestamp": "1",
+                    "digest": "0x01",
+                    "amount": "0",
+                    "reason": "filled",
+                }
+            )
+            await _until(lambda: server.methods().count("subscribe") == 2)
+            assert asyncio.get_running_loop().time() - started < client.request_timeout
+            assert len(updates) == 1 and isinstance(updates[0], OrderUpdateEvent)
+            assert server.requests[-1]["stream"] == {"type": "trade", "product_id": 2}
+            await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_rejected_subscriptions_are_dropped():
+    async def scenario():
+        server = StandInServer()
+        async with websockets.serve(server.handler, "127.0.0.1", 0) as ws_server:
+            port = ws_server.sockets[0].getsockname()[1]
+            client = EngineSubscriptionClient(
+                f"ws://127.0.0.1:{port}", min_reconnect_delay=0.05
+            )
+            events, gaps = [], []
+            client.on_gap(gaps.append)
+            book = StreamSubscription(type=StreamType.BOOK_DEPTH, product_id=2)
+            delisted = StreamSubscription(type=StreamType.BOOK_DEPTH, product_id=999)
+            await client.subscribe(book, events.append)
+            await client.subscribe(delisted, events.append)
+            await client.start()
+
+            # the product is delisted while disconnected: only its stream is lost
+            server.rejected_products.add(999)
+            await server.connections[-1].close()
+            await _until(lambda: len(server.connections) == 2 and client._connected.is_set())
+            assert list(client._subscriptions) == [book.key]
+            assert delisted.key not in client._callbacks
+            await _until(lambda: len(gaps) == 2)
+            assert [(g.subscription.product_id, g.reason) for g in gaps] == [
+                (999, "rejected"),
+                (2, "reconnect"),
+            ]
+
+            # a rejected subscribe is not kept for the next reconnect
+            with pytest.raises(RuntimeError):
+                await client.subscribe(delisted, events.append)
+            assert list(client._subscriptions) == [book.key]
+            assert delisted.key not in client._callbacks
+
+            await server.push(_book(2, "0", "10"))
+            await _until(lambda: len(events) == 1)
+            await client.close()
+
+    asyncio.run(scenario())
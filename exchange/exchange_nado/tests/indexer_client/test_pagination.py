@@ -0,0 +1,217 @@
+import asyncio
+from types import SimpleNamespace
+
+from nado_protocol.indexer_client import IndexerClient
+from nado_protocol.indexer_client.types.query import (
+    IndexerEventsParams,
+    IndexerInterestAndFundingParams,
+    IndexerMatchesParams,
+)
+
+
+def _match(idx, digest=None):
+    return SimpleNamespace(
+        submission_idx=str(idx), digest=digest or f"0x{idx:x}", timestamp=str(1000 + idx)
+    )
+
+
+class FakeIndexer(IndexerClient):
+    """Serves matches newest first, like the indexer: `submission_idx` is inclusive."""
+
+    def __init__(self, matches):
+        super().__init__({"url": "http://localhost"})
+        self.matches = sorted(matches, key=lambda m: -int(m.submission_idx))
+        self.requests = []
+
+    def get_matches(self, params):
+        self.requests.append(params.idx)
+        items = [
+            m
+            for m in self.matches
+            if params.idx is None or int(m.submission_idx) <= params.idx
+        ]
+        return SimpleNamespace(matches=items[: params.limit], txs=[])
+
+    def get_events(self, params):
+        self.requests.append((params.idx, params.limit.txs))
+        items = [
+            SimpleNamespace(
+                submission_idx=m.submission_idx,
+                subaccount="0x1",
+                product_id=product_id,
+                isolated=False,
+                event_type="match_orders",
+                timestamp=m.timestamp,
+            )
+            for m in self.matches
+            if params.idx is None or int(m.submission_idx) <= params.idx
+            for product_id in (0, 2)
+        ]
+        return SimpleNamespace(events=items[: 2 * params.limit.txs], txs=[])
+
+
+def test_iter_matches_walks_all_pages():
+    indexer = FakeIndexer([_match(i) for i in range(1, 251)])
+    paginator = indexer.iter_matches(IndexerMatchesParams(subaccounts=["0x1"]), page_size=100)
+
+    idxs = [int(m.submission_idx) for m in paginator]
+
+    assert idxs == list(range(250, 0, -1))
+    assert indexer.requests == [None, 151, 52]
+    assert paginator.exhausted
+    assert paginator.watermark == 250
+
+
+def test_iter_matches_skips_items_already_yielded_at_the_cursor():
+    indexer = FakeIndexer(
+        [_match(6, "a"), _match(5, "a"), _match(5, "b"), _match(5, "c"), _match(4, "a")]
+    )
+    items = [
+        (int(m.submission_idx), m.digest)
+        for m in indexer.iter_matches(IndexerMatchesParams(), page_size=3, prefetch=False)
+    ]
+
+    assert items == [(6, "a"), (5, "a"), (5, "b"), (5, "c"), (4, "a")]
+
+
+def test_watermark_and_resume():
+    indexer = FakeIndexer([_match(i) for i in range(1, 101)])
+
+    # Incremental sync: only items newer than the stored watermark
+    newer = indexer.iter_matches(IndexerMatchesParams(), page_size=30, stop_idx=80)
+    assert [int(m.submission_idx) for m in newer] == list(range(100, 80, -1))
+    assert newer.watermark == 100
+
+    # Interrupted walk: resume from the cursor of the first unfinished page
+    paginator = indexer.iter_matches(IndexerMatchesParams(), page_size=30)
+    pages = paginator.pages()
+    first = next(pages)
+    next(pages)
+    pages.close()
+    assert paginator.cursor == int(first[-1].submission_idx)
+
+    resumed = indexer.iter_matches(
+        IndexerMatchesParams(), page_size=30, start_idx=paginator.cursor
+    )
+    seen = {int(m.submission_idx) for m in first} | {
+        int(m.submission_idx) for m in resumed
+    }
+    assert seen == set(range(1, 101))
+
+
+def test_min_time_and_max_items():
+    indexer = FakeIndexer([_match(i) for i in range(1, 101)])
+
+    recent = list(indexer.iter_matches(IndexerMatchesParams(), page_size=10, min_time=1095))
+    assert [int(m.submission_idx) for m in recent] == [100, 99, 98, 97, 96, 95]
+
+    limited = indexer.iter_matches(IndexerMatchesParams(), page_size=10, max_items=25)
+    assert len(list(limited)) == 25
+    assert limited.pages_fetched == 3
+
+
+def test_iter_events_uses_transaction_limits():
+    indexer = FakeIndexer([_match(i) for i in range(1, 11)])
+    events = list(indexer.iter_events(IndexerEventsParams(), page_size=4))
+
+    assert len(events) == 20
+    assert indexer.requests == [(None, 4), (7, 4), (4, 4), (1, 4)]
+
+
+def test_async_iteration():
+    indexer = FakeIndexer([_match(i) for i in range(1, 51)])
+
+    async def collect():
+        return [
+            int(m.submission_idx)
+            async for m in indexer.iter_matches(IndexerMatchesParams(), page_size=20)
+        ]
+
+    assert asyncio.run(collect()) == list(range(50, 0, -1))
+
+
+def test_iter_interest_and_funding_payments():
+    pages = {
+        None: {
+            "interest_payments": [_payment(9), _payment(7)],
+            "funding_payments": [_payment(8), _payment(6)],
+            "next_idx": "5",
+        },
+        5: {
+            "interest_payments": [_payment(3)],
+            "funding_payments": [],
+            "next_idx": "0",
+        },
+    }
+    requests = []
+
+    def get_interest_and_funding_payments(params):
+        requests.append(params.max_idx)
+        return SimpleNamespace(**pages[params.max_idx])
+
+    indexer = IndexerClient({"url": "http://localhost"})
+    indexer.get_interest_and_funding_payments = get_interest_and_funding_payments
+    entries = list(
+        indexer.iter_interest_and_funding_payments(
+            IndexerInterestAndFundingParams(
+                subaccount="0x1", product_ids=[2], max_idx=None, limit=2
+            )
+        )
+    )
+
+    assert [(e.kind, e.payment.idx) for e in entries] == [
+        ("interest", "9"),
+        ("funding", "8"),
+        ("interest", "7"),
+        ("funding", "6"),
+        ("interest", "3"),
+    ]
+    assert requests == [None, 5]
+
+
+def test_iter_interest_and_funding_payments_with_different_densities():
+    interest = [10, 9, 7, 6]
+    funding = [8, 4, 2]
+    requests = []
+
+    def get_interest_and_funding_payments(params):
+        # Each stream returns up to `limit` payments at or below max_idx; the next
+        # cursor follows the stream that reached the least far.
+        requests.append(params.max_idx)
+        page = {}
+        for kind, idxs in (("interest", interest), ("funding", funding)):
+            page[kind] = [
+                i for i in idxs if params.max_idx is None or i <= params.max_idx
+            ][: params.limit]
+        lasts = [idxs[-1] for idxs in page.values() if len(idxs) == params.limit]
+        return SimpleNamespace(
+            interest_payments=[_payment(i) for i in page["interest"]],
+            funding_payments=[_payment(i) for i in page["funding"]],
+            next_idx=str(max(lasts) - 1) if lasts else "0",
+        )
+
+    indexer = IndexerClient({"url": "http://localhost"})
+    indexer.get_interest_and_funding_payments = get_interest_and_funding_payments
+    entries = list(
+        indexer.iter_interest_and_funding_payments(
+            IndexerInterestAndFundingParams(
+                subaccount="0x1", product_ids=[2], max_idx=None, limit=2
+            ),
+            prefetch=False,
+        )
+    )
+
+    assert [(e.kind, int(e.payment.idx)) for e in entries] == [
+        ("interest", 10),
+        ("interest", 9),
+        ("funding", 8),
+        ("interest", 7),
+        ("interest", 6),
+        ("funding", 4),
+        ("funding", 2),
+    ]
+    assert requests == [None, 8, 5, 1]
+
+
+def _payment(idx):
+    return SimpleNamespace(product_id=2, idx=str(idx), timestamp=str(1000 + idx))
@@ -0,0 +1,231 @@
+from decimal import Decimal
+
+import pytest
+
+from nado_protocol.engine_client.types.query import SubaccountInfoData
+from nado_protocol.engine_client.types.stream import FillEvent, PositionChangeEvent
+from nado_protocol.utils.incremental_margin import IncrementalMarginManager
+from nado_protocol.utils.margin_manager import MarginManager
+
+X18 = 10**18
+SUBACCOUNT = "0xbe3facae76a38c3b61492e57bf65ae0628c4a80864656661756c740000000000"
+
+
+def _risk(long_initial, long_maint, short_initial, short_maint, price):
+    return {
+        "long_weight_initial_x18": str(int(long_initial * X18)),
+        "long_weight_maintenance_x18": str(int(long_maint * X18)),
+        "short_weight_initial_x18": str(int(short_initial * X18)),
+        "short_weight_maintenance_x18": str(int(short_maint * X18)),
+        "price_x18": str(price),
+    }
+
+
+def _book_info():
+    return {
+        "size_increment": str(10**15),
+        "price_increment_x18": str(X18),
+        "min_size": str(10**15),
+        "collected_fees": "0",
+    }
+
+
+def _spot_product(product_id, price, weights):
+    return {
+        "product_id": product_id,
+        "oracle_price_x18": str(price),
+        "risk": _risk(*weights, price),
+        "book_info": _book_info(),
+        "config": {
+            "token": "0x" + "0" * 40,
+            "interest_inflection_util_x18": "0",
+            "interest_floor_x18": "0",
+            "interest_small_cap_x18": "0",
+            "interest_large_cap_x18": "0",
+            "withdraw_fee_x18": "0",
+            "min_deposit_rate_x18": "0",
+        },
+        "state": {
+            "cumulative_deposits_multiplier_x18": str(X18),
+            "cumulative_borrows_multiplier_x18": str(X18),
+            "total_deposits_normalized": "0",
+            "total_borrows_normalized": "0",
+        },
+    }
+
+
+def _perp_product(product_id, price, weights):
+    return {
+        "product_id": product_id,
+        "oracle_price_x18": str(price),
+        "risk": _risk(*weights, price),
+        "book_info": _book_info(),
+        "state": {
+            "cumulative_funding_long_x18": "0",
+            "cumulative_funding_short_x18": "0",
+            "available_settle": "0",
+            "open_interest": "0",
+        },
+    }
+
+
+def _health(value_x18):
+    return {"assets": "0", "liabilities": "0", "health": str(value_x18)}
+
+
+def _info(quote, btc_amount, btc_v_quote, btc_price, eth_amount=0, eth_price=3000 * X18, healths=None):
+    """Snapshot with a quote deposit, a BTC perp and an ETH perp."""
+    info = {
+        "subaccount": SUBACCOUNT,
+        "exists": True,
+        "healths": [],
+        "health_contributions": [],
+        "spot_count": 1,
+        "perp_count": 2,
+        "spot_balances": [{"product_id": 0, "balance": {"amount": str(quote)}}],
+        "perp_balances": [
+            {
+                "product_id": 2,
+                "balance": {
+                    "amount": str(btc_amount),
+                    "v_quote_balance": str(btc_v_quote),
+                    "last_cumulative_funding_x18": "0",
+                },
+            },
+            {
+                "product_id": 4,
+                "balance": {
+                    "amount": str(eth_amount),
+                    "v_quote_balance": str(-eth_amount * eth_price // X18),
+                    "last_cumulative_funding_x18": "0",
+                },
+            },
+        ],
+        "spot_products": [_spot_product(0, X18, (1, 1, 1, 1))],
+        "perp_products": [
+            _perp_product(2, btc_price, (Decimal("0.9"), Decimal("0.95"), Decimal("1.1"), Decimal("1.05"))),
+            _perp_product(4, eth_price, (Decimal("0.8"), Decimal("0.9"), Decimal("1.2"), Decimal("1.1"))),
+        ],
+        "pre_state": None,
+    }
+    if healths is None:
+        # Engine healths consistent with the per-balance formulas
+        healths = IncrementalMarginManager(SubaccountInfoData.parse_obj(info))
+        healths = [
+            healths.initial_health_x18,
+            healths.maintenance_health_x18,
+            healths.unweighted_health_x18,
+        ]
+    info["healths"] = [_health(h) for h in healths]
+    return SubaccountInfoData.parse_obj(info)
+
+
+def _assert_same(incremental: IncrementalMarginManager, fresh: IncrementalMarginManager):
+    assert incremental.initial_health_x18 == fresh.initial_health_x18
+    assert incremental.maintenance_health_x18 == fresh.maintenance_health_x18
+    assert incremental.unweighted_health_x18 == fresh.unweighted_health_x18
+    assert incremental.account_leverage == fresh.account_leverage
+
+
+def test_snapshot_matches_engine_healths_and_margin_manager():
+    info = _info(
+        10_000 * X18, X18 // 2, -30_000 * X18, 62_000 * X18,
+        healths=[5_000 * X18, 7_000 * X18, 11_000 * X18],
+    )
+    manager = IncrementalMarginManager(info)
+    summary = MarginManager(info).calculate_account_summary()
+
+    assert manager.initial_health == summary.initial_health
+    assert manager.maintenance_health == summary.maintenance_health
+    assert manager.unweighted_health == summary.unweighted_health
+    assert manager.margin_usage.initial == summary.margin_usage_fraction
+    assert manager.margin_usage.maintenance == summary.maint_margin_usage_fraction
+    assert manager.account_leverage == summary.account_leverage
+
+
+def test_oracle_ticks_and_fills_match_fresh_snapshot():
+    manager = IncrementalMarginManager(_info(10_000 * X18, X18, -60_000 * X18, 60_000 * X18))
+
+    manager.update_oracle_price(2, 55_000 * X18)
+    _assert_same(manager, IncrementalMarginManager(_info(10_000 * X18, X18, -60_000 * X18, 55_000 * X18)))
+
+    # Sell 0.5 BTC at 56k: v_quote += 28k
+    manager.apply_fill(2, -X18 // 2, 56_000 * X18)
+    _assert_same(
+        manager,
+        IncrementalMarginManager(_info(10_000 * X18, X18 // 2, -32_000 * X18, 55_000 * X18)),
+    )
+
+    manager.apply_fill_event(
+        FillEvent.parse_obj(
+            {
+                "type": "fill",
+                "product_id": 2,
+                "timestamp": "1",
+                "subaccount": SUBACCOUNT,
+                "order_digest": "0x" + "0" * 64,
+                "filled_qty": str(X18 // 2),
+                "remaining_qty": "0",
+                "original_qty": str(X18 // 2),
+                "price": str(56_000 * X18),
+                "is_taker": True,
+                "is_bid": False,
+                "appendix": None,
+            }
+        )
+    )
+    manager.apply_position_change(
+        PositionChangeEvent.parse_obj(
+            {
+                "type": "position_change",
+                "product_id": 2,
+                "timestamp": "1",
+                "subaccount": SUBACCOUNT,
+                "amount": "0",
+                "v_quote_amount": str(-5 * X18),
+                "is_lp": None,
+                "reason": None,
+            }
+        )
+    )
+    flat = IncrementalMarginManager(_info(10_000 * X18, 0, -5 * X18, 55_000 * X18))
+    _assert_same(manager, flat)
+    assert manager.account_leverage == 0
+    assert manager.margin_usage.initial == 0
+
+
+def test_liquidation_price_zeroes_maintenance_health():
+    manager = IncrementalMarginManager(
+        _info(10_000 * X18, X18, -60_000 * X18, 60_000 * X18, eth_amount=-2 * X18)
+    )
+    for product_id in (2, 4):
+        price = manager.liquidation_price_x18(product_id)
+        assert price is not None
+        moved = IncrementalMarginManager(_info(10_000 * X18, X18, -60_000 * X18, 60_000 * X18, eth_amount=-2 * X18))
+        moved.update_oracle_price(product_id, price)
+        assert abs(moved.maintenance_health_x18) < 10**6
+        assert manager.liquidation_distance(product_id) > 0
+
+    # Long BTC liquidates on the way down, short ETH on the way up
+    assert manager.liquidation_price_x18(2) < 60_000 * X18
+    assert manager.liquidation_price_x18(4) > 3_000 * X18
+    assert manager.liquidation_price(0) is None
+
+
+def test_initial_health_after_does_not_mutate():
+    manager = IncrementalMarginManager(_info(10_000 * X18, 0, 0, 60_000 * X18))
+    before = manager.initial_health_x18
+    after = manager.initial_health_after_x18(2, X18, 60_000 * X18)
+    # Buying 1 BTC at the oracle price uses notional * (1 - long_weight_initial)
+    assert after == before - 6_000 * X18
+    assert manager.initial_health_x18 == before
+
+    manager.apply_fill(2, X18, 60_000 * X18)
+    assert manager.initial_health_x18 == after
+
+
+def test_unknown_product_requires_resync():
+    manager = IncrementalMarginManager(_info(10_000 * X18, 0, 0, 60_000 * X18))
+    manager.update_oracle_price(99, X18)
+    with pytest.raises(KeyError):
+        manager.set_balance(99, X18)
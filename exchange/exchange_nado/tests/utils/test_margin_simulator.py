@@ -0,0 +1,179 @@
+from decimal import Decimal
+
+import pytest
+
+from nado_protocol.engine_client.types.query import SubaccountInfoData
+from nado_protocol.utils.incremental_margin import IncrementalMarginManager
+from nado_protocol.utils.margin_simulator import MarginSimulator, TradeCandidate
+
+X18 = 10**18
+
+
+def _product(product_id, price, weights, is_perp):
+    long_initial, long_maint, short_initial, short_maint = weights
+    product = {
+        "product_id": product_id,
+        "oracle_price_x18": str(price),
+        "risk": {
+            "long_weight_initial_x18": str(int(long_initial * X18)),
+            "long_weight_maintenance_x18": str(int(long_maint * X18)),
+            "short_weight_initial_x18": str(int(short_initial * X18)),
+            "short_weight_maintenance_x18": str(int(short_maint * X18)),
+            "price_x18": str(price),
+        },
+        "book_info": {
+            "size_increment": str(10**15),
+            "price_increment_x18": str(X18),
+            "min_size": str(10**15),
+            "collected_fees": "0",
+        },
+    }
+    if is_perp:
+        product["state"] = {
+            "cumulative_funding_long_x18": "0",
+            "cumulative_funding_short_x18": "0",
+            "available_settle": "0",
+            "open_interest": "0",
+        }
+    else:
+        product["config"] = {
+            "token": "0x" + "0" * 40,
+            "interest_inflection_util_x18": "0",
+            "interest_floor_x18": "0",
+            "interest_small_cap_x18": "0",
+            "interest_large_cap_x18": "0",
+            "withdraw_fee_x18": "0",
+            "min_deposit_rate_x18": "0",
+        }
+        product["state"] = {
+            "cumulative_deposits_multiplier_x18": str(X18),
+            "cumulative_borrows_multiplier_x18": str(X18),
+            "total_deposits_normalized": "0",
+            "total_borrows_normalized": "0",
+        }
+    return product
+
+
+def _info(quote, weth=0, btc=0, btc_v_quote=0):
+    """10% initial margin BTC perp at 60k, 20% WETH spot at 3k."""
+    return SubaccountInfoData.parse_obj(
+        {
+            "subaccount": "0x" + "ab" * 32,
+            "exists": True,
+            "healths": [],
+            "health_contributions": [],
+            "spot_count": 2,
+            "perp_count": 1,
+            "spot_balances": [
+                {"product_id": 0, "balance": {"amount": str(quote)}},
+                {"product_id": 1, "balance": {"amount": str(weth)}},
+            ],
+            "perp_balances": [
+                {
+                    "product_id": 2,
+                    "balance": {
+                        "amount": str(btc),
+                        "v_quote_balance": str(btc_v_quote),
+                        "last_cumulative_funding_x18": "0",
+                    },
+                }
+            ],
+            "spot_products": [
+                _product(0, X18, (1, 1, 1, 1), False),
+                _product(
+                    1,
+                    3_000 * X18,
+                    (Decimal("0.8"), Decimal("0.9"), Decimal("1.2"), Decimal("1.1")),
+                    False,
+                ),
+            ],
+            "perp_products": [
+                _product(
+                    2,
+                    60_000 * X18,
+                    (Decimal("0.9"), Decimal("0.95"), Decimal("1.1"), Decimal("1.05")),
+                    True,
+                )
+            ],
+            "pre_state": None,
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "candidate",
+    [
+        TradeCandidate(2, X18 // 10, 61_000 * X18, fee_x18=5 * X18),
+        TradeCandidate(2, -X18, 59_000 * X18),
+        TradeCandidate(1, 2 * X18, 3_100 * X18),
+        TradeCandidate(1, -X18, None),
+    ],
+)
+def test_simulate_matches_applied_fill(candidate):
+    info = _info(10_000 * X18, weth=X18, btc=X18 // 2, btc_v_quote=-29_000 * X18)
+    simulator = MarginSimulator.from_subaccount_info(info)
+    result = simulator.simulate(candidate)
+
+    manager = IncrementalMarginManager(info)
+    price = candidate.price_x18 or manager.products[candidate.product_id].oracle_price_x18
+    manager.apply_fill(candidate.product_id, candidate.amount_x18, price, candidate.fee_x18)
+    assert result.initial_x18 == manager.initial_health_x18
+    assert result.maintenance_x18 == manager.maintenance_health_x18
+    # The simulator's state is untouched
+    assert simulator.manager.initial_health_x18 != manager.initial_health_x18
+
+
+@pytest.mark.parametrize("product_id", [1, 2])
+def test_grid_matches_individual_simulations(product_id):
+    simulator = MarginSimulator.from_subaccount_info(
+        _info(5_000 * X18, weth=X18, btc=-X18 // 10, btc_v_quote=6_100 * X18)
+    )
+    amounts = [-2 * X18, -X18 // 10, 0, X18 // 3, 3 * X18]
+    prices = [2_900 * X18, 3_000 * X18, 59_000 * X18, 61_000 * X18]
+    fee_rate = 2 * 10**14
+
+    grid = simulator.simulate_grid(product_id, amounts, prices, fee_rate_x18=fee_rate)
+    for i, amount in enumerate(amounts):
+        for j, price in enumerate(prices):
+            fee = abs(amount) * price // X18 * fee_rate // X18
+            assert grid[i][j] == simulator.simulate(
+                TradeCandidate(product_id, amount, price, fee)
+            )
+
+
+def test_max_order_size():
+    simulator = MarginSimulator.from_subaccount_info(_info(10_000 * X18))
+
+    # 10k of free collateral at 10% initial margin on 60k BTC: 10k / 6k BTC either way
+    assert simulator.max_order_size_x18(2, is_bid=True) == 10 * X18 // 6
+    assert simulator.max_order_size_x18(2, is_bid=False, size_increment_x18=10**15) == 1666 * 10**15
+    size = simulator.max_order_size_x18(2, is_bid=True, price_x18=60_000 * X18, fee_rate_x18=10**15)
+    assert simulator.simulate(
+        TradeCandidate(2, size, 60_000 * X18, size * 60_000 * 10**15 // X18)
+    ).fits
+    assert not simulator.simulate(
+        TradeCandidate(2, size + 10**12, 60_000 * X18, (size + 10**12) * 60_000 * 10**15 // X18)
+    ).fits
+
+    # Spot buys spend quote at weight 1 and add WETH at weight 0.8: 10k / 600 WETH
+    spot = simulator.max_order_size_x18(1, is_bid=True)
+    assert spot == 10_000 * X18 // 600
+    assert simulator.simulate(TradeCandidate(1, spot)).fits
+    assert not simulator.simulate(TradeCandidate(1, spot + 1)).fits
+
+
+def test_max_order_size_reduce_only_and_unhealthy():
+    # Long 1 BTC with 2k of quote: initial health 2k - 6k < 0
+    simulator = MarginSimulator.from_subaccount_info(
+        _info(2_000 * X18, btc=X18, btc_v_quote=-60_000 * X18)
+    )
+    assert simulator.manager.initial_health_x18 < 0
+    # Buying more lowers health further
+    assert simulator.max_order_size_x18(2, is_bid=True) == 0
+    # Selling raises health until the position is flat, then lowers it again
+    size = simulator.max_order_size_x18(2, is_bid=False)
+    assert size >= X18
+    assert simulator.max_order_size_x18(2, is_bid=False, reduce_only=True) == X18
+
+    with pytest.raises(KeyError):
+        simulator.max_order_size_x18(99, is_bid=True)
@@ -0,0 +1,178 @@
+from decimal import Decimal
+
+from nado_protocol.indexer_client.types.query import IndexerAccountSnapshotsData
+from nado_protocol.utils.portfolio_risk import PortfolioRiskEngine
+
+X18 = 10**18
+ALICE = "0x" + "aa" * 32
+BOB = "0x" + "bb" * 32
+CAROL = "0x" + "cc" * 32
+
+
+def _risk(weights, price):
+    long_initial, long_maint, short_initial, short_maint = weights
+    return {
+        "long_weight_initial_x18": str(int(long_initial * X18)),
+        "long_weight_maintenance_x18": str(int(long_maint * X18)),
+        "short_weight_initial_x18": str(int(short_initial * X18)),
+        "short_weight_maintenance_x18": str(int(short_maint * X18)),
+        "price_x18": str(price),
+    }
+
+
+def _product(product_id, price, weights, is_perp):
+    product = {
+        "product_id": product_id,
+        "oracle_price_x18": str(price),
+        "risk": _risk(weights, price),
+        "book_info": {
+            "size_increment": "1",
+            "price_increment_x18": "1",
+            "min_size": "1",
+            "collected_fees": "0",
+        },
+    }
+    if is_perp:
+        product["state"] = {
+            "cumulative_funding_long_x18": "0",
+            "cumulative_funding_short_x18": "0",
+            "available_settle": "0",
+            "open_interest": "0",
+        }
+        return {"perp": product}
+    product["config"] = {
+        "token": "0x" + "0" * 40,
+        "interest_inflection_util_x18": "0",
+        "interest_floor_x18": "0",
+        "interest_small_cap_x18": "0",
+        "interest_large_cap_x18": "0",
+        "withdraw_fee_x18": "0",
+        "min_deposit_rate_x18": "0",
+    }
+    product["state"] = {
+        "cumulative_deposits_multiplier_x18": str(X18),
+        "cumulative_borrows_multiplier_x18": str(X18),
+        "total_deposits_normalized": "0",
+        "total_borrows_normalized": "0",
+    }
+    return {"spot": product}
+
+
+QUOTE = _product(0, X18, (1, 1, 1, 1), False)
+BTC = _product(
+    2, 60_000 * X18, (Decimal("0.9"), Decimal("0.95"), Decimal("1.1"), Decimal("1.05")), True
+)
+
+
+def _event(subaccount, product, amount, v_quote=0, net_entry=0, isolated=False):
+    kind = "perp" if "perp" in product else "spot"
+    balance = {"amount": str(amount)}
+    if kind == "perp":
+        balance.update(v_quote_balance=str(v_quote), last_cumulative_funding_x18="0")
+    post = {kind: {"product_id": product[kind]["product_id"], "balance": balance}}
+    return {
+        "submission_idx": "1",
+        "timestamp": "100",
+        "net_interest_unrealized": "0",
+        "net_interest_cumulative": "0",
+        "net_funding_unrealized": "0",
+        "net_funding_cumulative": "0",
+        "net_entry_unrealized": str(net_entry),
+        "net_entry_cumulative": str(net_entry),
+        "quote_volume_cumulative": "0",
+        "subaccount": subaccount,
+        "product_id": product[kind]["product_id"],
+        "event_type": "match_orders",
+        "product": product,
+        "pre_balance": post,
+        "post_balance": post,
+        "isolated": isolated,
+        "isolated_product_id": None,
+    }
+
+
+def _snapshots(events_by_subaccount):
+    return IndexerAccountSnapshotsData.parse_obj(
+        {
+            "snapshots": {
+                subaccount: {"100": events}
+                for subaccount, events in events_by_subaccount.items()
+            }
+        }
+    )
+
+
+SNAPSHOTS = {
+    # 10k USDT, long 1 BTC entered at 60k
+    ALICE: [
+        _event(ALICE, QUOTE, 10_000 * X18),
+        _event(ALICE, BTC, X18, -60_000 * X18, net_entry=60_000 * X18),
+    ],
+    # 5k USDT, short 0.5 BTC entered at 62k
+    BOB: [
+        _event(BOB, QUOTE, 5_000 * X18),
+        _event(BOB, BTC, -X18 // 2, 31_000 * X18, net_entry=-31_000 * X18),
+        _event(BOB, BTC, X18, -60_000 * X18, isolated=True),
+    ],
+}
+
+
+def test_compute_matches_margin_formulas():
+    engine = PortfolioRiskEngine.from_snapshots(_snapshots(SNAPSHOTS), [ALICE, BOB, CAROL])
+    report = engine.compute()
+    alice, bob, carol = report.rows()
+
+    # 10k + 60k * 0.9 - 60k
+    assert alice.initial_health == Decimal(4_000)
+    assert alice.maintenance_health == Decimal(7_000)
+    assert alice.unweighted_health == Decimal(10_000)
+    assert alice.account_leverage == Decimal(6)
+    assert alice.margin_usage_fraction == Decimal("0.6")
+    assert alice.est_pnl == Decimal(0)
+
+    # 5k - 30k * 1.1 + 31k; the isolated balance is skipped
+    assert bob.initial_health == Decimal(3_000)
+    assert bob.unweighted_health == Decimal(6_000)
+    assert bob.est_pnl == Decimal(1_000)
+
+    assert carol.unweighted_health == 0
+    assert carol.account_leverage == 0
+    assert carol.est_pnl is None
+
+
+def test_compute_with_price_overrides():
+    engine = PortfolioRiskEngine.from_snapshots(_snapshots(SNAPSHOTS))
+    report = engine.compute({2: 52_000 * X18})
+    alice, bob = report.rows()
+
+    # 10k + 52k * 0.95 - 60k
+    assert alice.maintenance_health == Decimal(-600)
+    assert alice.maint_margin_usage_fraction == 1
+    assert alice.est_pnl == Decimal(-8_000)
+    assert bob.est_pnl == Decimal(5_000)
+    assert report.at_risk(Decimal("0.9")) == [ALICE]
+    # Snapshot prices are unchanged
+    assert engine.compute().row(0).maintenance_health == Decimal(7_000)
+
+
+def test_from_indexer_fetches_in_chunks():
+    class FakeIndexer:
+        def __init__(self):
+            self.requests = []
+
+        def get_multi_subaccount_snapshots(self, params):
+            self.requests.append(params.subaccounts)
+            return _snapshots({s: SNAPSHOTS[s] for s in params.subaccounts if s in SNAPSHOTS})
+
+    indexer = FakeIndexer()
+    engine = PortfolioRiskEngine.from_indexer(
+        indexer, [ALICE, BOB, CAROL], timestamp=100, chunk_size=2
+    )
+
+    assert indexer.requests == [[ALICE, BOB], [CAROL]]
+    assert engine.subaccounts == [ALICE, BOB, CAROL]
+    assert [r.initial_health for r in engine.compute().rows()] == [
+        Decimal(4_000),
+        Decimal(3_000),
+        Decimal(0),
+    ]
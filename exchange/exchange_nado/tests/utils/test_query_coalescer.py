@@ -0,0 +1,139 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from nado_protocol.engine_client.types.query import (
+    MarketPriceData,
+    ProductOpenOrdersData,
+    SubaccountMultiProductsOpenOrdersData,
+    SubaccountOpenOrdersData,
+)
+from nado_protocol.indexer_client.types.models import IndexerOraclePrice
+from nado_protocol.indexer_client.types.query import (
+    IndexerFundingRateData,
+    IndexerOraclePricesData,
+)
+from nado_protocol.utils.query_coalescer import (
+    CoalescingQueryClient,
+    RequestCoalescer,
+    TTLCache,
+)
+
+
+def _run_concurrently(fns):
+    results = [None] * len(fns)
+    errors = []
+
+    def run(i, fn):
+        try:
+            results[i] = fn()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i, fn)) for i, fn in enumerate(fns)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors, errors
+    return results
+
+
+def _multi_open_orders(product_ids, sender):
+    return SubaccountMultiProductsOpenOrdersData(
+        sender=sender,
+        product_orders=[
+            ProductOpenOrdersData(product_id=p, orders=[]) for p in product_ids if p != 3
+        ],
+    )
+
+
+def test_open_orders_are_coalesced_per_sender(senders: list[str]):
+    engine = MagicMock()
+    engine.fast_decode = False
+    engine.get_subaccount_multi_products_open_orders.side_effect = _multi_open_orders
+    client = CoalescingQueryClient(engine, window=0.05)
+
+    results = _run_concurrently(
+        [
+            lambda p=p: client.get_subaccount_open_orders(p, senders[0])
+            for p in (1, 2, 3, 4)
+        ]
+    )
+    assert engine.get_subaccount_multi_products_open_orders.call_count == 1
+    product_ids, sender = engine.get_subaccount_multi_products_open_orders.call_args[0]
+    assert sorted(product_ids) == [1, 2, 3, 4]
+    assert sender == senders[0]
+    assert all(isinstance(r, SubaccountOpenOrdersData) for r in results)
+    assert all(r.sender == senders[0] and r.orders == [] for r in results)
+
+
+def test_market_price_single_flight_and_ttl():
+    engine = MagicMock()
+
+    def slow_price(product_id):
+        time.sleep(0.05)
+        return MarketPriceData(product_id=product_id, bid_x18="1", ask_x18="2")
+
+    engine.get_market_price.side_effect = slow_price
+    client = CoalescingQueryClient(engine, ttls={"market_price": 10})
+    results = _run_concurrently([lambda: client.get_market_price(1)] * 5)
+    assert engine.get_market_price.call_count == 1
+    assert all(r is results[0] for r in results)
+
+    assert client.get_market_price(1) is results[0]
+    client.invalidate("market_price")
+    client.get_market_price(1)
+    assert engine.get_market_price.call_count == 2
+
+
+def test_indexer_queries_are_batched():
+    indexer = MagicMock()
+    indexer.get_perp_funding_rates.side_effect = lambda ids: {
+        str(p): IndexerFundingRateData(product_id=p, funding_rate_x18="5", update_time="1")
+        for p in ids
+    }
+    indexer.get_oracle_prices.side_effect = lambda ids: IndexerOraclePricesData(
+        prices=[
+            IndexerOraclePrice(product_id=p, oracle_price_x18="7", update_time="1")
+            for p in ids
+        ]
+    )
+    client = CoalescingQueryClient(MagicMock(), indexer, window=0.05)
+
+    rates = _run_concurrently([lambda p=p: client.get_perp_funding_rate(p) for p in (2, 4)])
+    prices = _run_concurrently([lambda p=p: client.get_oracle_price(p) for p in (2, 4)])
+    assert indexer.get_perp_funding_rates.call_count == 1
+    assert indexer.get_oracle_prices.call_count == 1
+    assert [r.product_id for r in rates] == [2, 4]
+    assert [p.product_id for p in prices] == [2, 4]
+
+
+def test_coalescer_propagates_errors_and_missing_keys():
+    def fetch(group, keys):
+        if group == "bad":
+            raise RuntimeError("boom")
+        return {k: k * 10 for k in keys if k != 0}
+
+    coalescer = RequestCoalescer(fetch, window=0.0)
+    assert coalescer.get("ok", 1) == 10
+    with pytest.raises(KeyError):
+        coalescer.get("ok", 0)
+    with pytest.raises(RuntimeError):
+        coalescer.get("bad", 1)
+
+
+def test_ttl_cache_expiry_and_bound():
+    cache = TTLCache(max_entries=2)
+    cache.put("a", 1, ttl=0.01)
+    assert cache.get("a") == (True, 1)
+    time.sleep(0.02)
+    assert cache.get("a") == (False, None)
+    cache.put("x", 1, ttl=0)
+    assert cache.get("x") == (False, None)
+    for key in ("b", "c", "d"):
+        cache.put(key, key, ttl=10)
+    assert cache.get("d") == (True, "d")
+    assert len(cache._entries) <= 2
@@ -329,7 +329,103 @@ class StandXPerpHTTP:
             raise ValueError(f"HTTP {response.status_code}: {response.text}")
         
         return response.json()
-    
+
+    def query_order(
+        self,
+        token: str,
+        order_id: Optional[int] = None,
+        cl_ord_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Query a single order (open or closed) by order id or client order id.
+
+        Args:
+            token: Authentication token
+            order_id: Order ID (optional)
+            cl_ord_id: Client order ID (optional, used when order_id is not given)
+
+        Returns:
+            Order dictionary (id, cl_ord_id, symbol, side, order_type, qty, fill_qty,
+            fill_avg_price, price, status, time_in_force, reduce_only, created_at, updated_at)
+
+        Raises:
+            ValueError: If neither id is given or the request fails
+        """
+        if order_id is None and not cl_ord_id:
+            raise ValueError("order_id or cl_ord_id is required")
+
+        url = f"{self.base_url}/api/query_order"
+        headers = {
+            "Authorization": f"Bearer {token}"
+        }
+
+        params: Dict[str, Any] = {}
+        if order_id is not None:
+            params["order_id"] = order_id
+        else:
+            params["cl_ord_id"] = cl_ord_id
+
+        response = requests.get(url, headers=headers, params=params)
+
+        if not response.ok:
+            raise ValueError(f"HTTP {response.status_code}: {response.text}")
+
+        return response.json()
+
+    def query_trades(
+        self,
+        token: str,
+        symbol: Optional[str] = None,
+        last_id: Optional[int] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: int = 500
+    ) -> Dict[str, Any]:
+        """
+        Query user trade history, newest first.
+
+        Args:
+            token: Authentication token
+            symbol: Trading pair (optional, e.g., "BTC-USD")
+            last_id: Only return trades with id below this one (pagination cursor)
+            start: Start time, ISO 8601 (optional)
+            end: End time, ISO 8601 (optional)
+            limit: Results limit (default: 500)
+
+        Returns:
+            Response dictionary with fields:
+            - page_size: Page size
+            - result: List of trade dictionaries (id, created_at, order_id, symbol,
+              side, price, qty, value, fee_qty, fee_asset, pnl)
+            - total: Total number of trades
+
+        Raises:
+            ValueError: If request fails
+        """
+        url = f"{self.base_url}/api/query_trades"
+        headers = {
+            "Authorization": f"Bearer {token}"
+        }
+
+        params: Dict[str, Any] = {}
+        if symbol:
+            params["symbol"] = symbol
+        if last_id is not None:
+            params["last_id"] = last_id
+        if start:
+            params["start"] = start
+        if end:
+            params["end"] = end
+        if limit:
+            params["limit"] = limit
+
+        response = requests.get(url, headers=headers, params=params)
+
+        if not response.ok:
+            raise ValueError(f"HTTP {response.status_code}: {response.text}")
+
+        return response.json()
+
     def cancel_orders(
         self,
         token: str,
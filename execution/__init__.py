@@ -0,0 +1,23 @@
+"""
+Execution Module
+客户端拆单执行（TWAP / Iceberg / POV）、条件单（止损 / 止盈）和跨交易所 delta 对冲，适用于任意 BasePerpAdapter
+"""
+from execution.scheduler import (
+    ExecutionScheduler,
+    ParentOrder,
+    close_position_twap,
+)
+from execution.hedger import DeltaHedger, HedgeAsset, HedgeRecord, HedgeStats
+from execution.triggers import Trigger, TriggerEngine
+
+__all__ = [
+    "DeltaHedger",
+    "ExecutionScheduler",
+    "HedgeAsset",
+    "HedgeRecord",
+    "HedgeStats",
+    "ParentOrder",
+    "Trigger",
+    "TriggerEngine",
+    "close_position_twap",
+]
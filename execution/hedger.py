@@ -0,0 +1,485 @@
+"""
+Delta Hedger
+
+跨交易所 delta 中性对冲引擎（基于适配器 API，替代在浏览器 DOM 中读取持仓的对冲脚本）：
+
+- 每个交易所一个协程并发轮询持仓（get_positions）和对冲腿的参考价（get_ticker）；
+  有 WS 成交推送时调用 on_fill()，在下一个事件循环 tick 内重新计算并对冲
+- 按资产（如 BTC）汇总所有交易所的带符号持仓得到净 delta，超过容差时在该资产的
+  对冲交易所下 IOC 限价单（价格 = 参考价 ± max_slippage_bps）
+- 已发出但持仓尚未反映的对冲数量计入净 delta，避免轮询滞后导致重复对冲
+- 统计每笔对冲的延迟（发现 delta 偏离 -> 下单返回）和滑点（成交价相对参考价，bps）
+
+使用示例:
+    hedger = DeltaHedger(
+        {"nado": nado_adapter, "grvt": grvt_adapter},
+        [HedgeAsset("BTC", {"nado": "BTC-PERP", "grvt": "BTC_USDT_Perp"}, hedge_venue="grvt",
+                    quantity_step="0.001")],
+    )
+    await hedger.run()          # 或 asyncio.create_task(hedger.run())，hedger.stop() 结束
+    hedger.stats["BTC"].summary()
+"""
+import asyncio
+import functools
+import itertools
+import logging
+import statistics
+import time
+from collections import deque
+from decimal import Decimal, ROUND_DOWN
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from adapters.base_adapter import new_client_order_id
+
+logger = logging.getLogger(__name__)
+
+Number = Union[Decimal, float, int, str]
+
+_hedge_ids = itertools.count(1)
+
+
+class HedgeAsset:
+    """一个需要保持 delta 中性的资产及其在各交易所的交易对"""
+
+    def __init__(
+        self,
+        asset: str,
+        symbols: Dict[str, str],
+        hedge_venue: str,
+        tolerance: Number = "0",
+        quantity_step: Number = "0",
+        min_quantity: Number = "0",
+        max_slippage_bps: float = 20.0,
+        target_delta: Number = "0",
+    ):
+        """
+        Args:
+            asset: 资产名称，如 "BTC"
+            symbols: 交易所名称 -> 交易对，如 {"nado": "BTC-PERP", "grvt": "BTC_USDT_Perp"}
+            hedge_venue: 下对冲单的交易所（必须在 symbols 中）
+            tolerance: 净 delta 绝对值不超过该值时不对冲
+            quantity_step: 对冲交易所的数量最小变动单位
+            min_quantity: 对冲单最小数量
+            max_slippage_bps: IOC 限价相对参考价的最大偏离（基点）
+            target_delta: 目标净 delta，默认 0
+        """
+        if hedge_venue not in symbols:
+            raise ValueError(f"对冲交易所 {hedge_venue} 不在 {asset} 的交易对配置中")
+        self.asset = asset
+        self.symbols = dict(symbols)
+        self.hedge_venue = hedge_venue
+        self.tolerance = Decimal(str(tolerance))
+        self.quantity_step = Decimal(str(quantity_step))
+        self.min_quantity = Decimal(str(min_quantity))
+        self.max_slippage_bps = max_slippage_bps
+        self.target_delta = Decimal(str(target_delta))
+
+    @property
+    def hedge_symbol(self) -> str:
+        return self.symbols[self.hedge_venue]
+
+
+class HedgeRecord:
+    """一笔对冲单"""
+
+    __slots__ = (
+        "hedge_id", "client_order_id", "asset", "venue", "symbol", "side", "quantity", "reference_price",
+        "limit_price", "detected_at", "acked_at", "filled_quantity", "fill_price",
+        "order_id", "error",
+    )
+
+    def __init__(self, asset: HedgeAsset, side: str, quantity: Decimal,
+                 reference_price: Optional[Decimal], limit_price: Optional[Decimal], detected_at: float):
+        self.hedge_id = f"hedge{int(time.time())}{next(_hedge_ids)}"
+        # 对冲单的 client_order_id（数字，GRVT/Nado 只接受整数 ID）
+        self.client_order_id = new_client_order_id()
+        self.asset = asset.asset
+        self.venue = asset.hedge_venue
+        self.symbol = asset.hedge_symbol
+        self.side = side
+        self.quantity = quantity
+        self.reference_price = reference_price
+        self.limit_price = limit_price
+        self.detected_at = detected_at
+        self.acked_at: Optional[float] = None
+        self.filled_quantity = Decimal("0")
+        self.fill_price: Optional[Decimal] = None
+        self.order_id: Optional[str] = None
+        self.error: Optional[str] = None
+
+    @property
+    def latency_ms(self) -> Optional[float]:
+        if self.acked_at is None:
+            return None
+        return (self.acked_at - self.detected_at) * 1000
+
+    @property
+    def slippage_bps(self) -> Optional[float]:
+        """相对参考价的不利滑点（基点，正数为不利）"""
+        if self.fill_price is None or not self.reference_price:
+            return None
+        diff = (self.fill_price - self.reference_price) / self.reference_price * 10000
+        return float(diff if self.side == "buy" else -diff)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "hedge_id": self.hedge_id,
+            "client_order_id": self.client_order_id,
+            "asset": self.asset,
+            "venue": self.venue,
+            "symbol": self.symbol,
+            "side": self.side,
+            "quantity": str(self.quantity),
+            "reference_price": str(self.reference_price) if self.reference_price is not None else None,
+            "limit_price": str(self.limit_price) if self.limit_price is not None else None,
+            "fill_price": str(self.fill_price) if self.fill_price is not None else None,
+            "latency_ms": self.latency_ms,
+            "slippage_bps": self.slippage_bps,
+            "order_id": self.order_id,
+            "error": self.error,
+        }
+
+
+class HedgeStats:
+    """对冲延迟和滑点统计（保留最近 window 笔）"""
+
+    def __init__(self, window: int = 1000):
+        self.hedges = 0
+        self.failures = 0
+        self.hedged_quantity = Decimal("0")
+        self.latencies_ms: Deque[float] = deque(maxlen=window)
+        self.slippages_bps: Deque[float] = deque(maxlen=window)
+
+    def record(self, record: HedgeRecord) -> None:
+        if record.error is not None:
+            self.failures += 1
+            return
+        self.hedges += 1
+        self.hedged_quantity += record.quantity
+        if record.latency_ms is not None:
+            self.latencies_ms.append(record.latency_ms)
+
+    def record_slippage(self, slippage_bps: float) -> None:
+        self.slippages_bps.append(slippage_bps)
+
+    @staticmethod
+    def _describe(samples: Deque[float]) -> Dict[str, Optional[float]]:
+        if not samples:
+            return {"mean": None, "p50": None, "p95": None, "max": None}
+        ordered = sorted(samples)
+        return {
+            "mean": statistics.fmean(ordered),
+            "p50": ordered[len(ordered) // 2],
+            "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            "max": ordered[-1],
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """统计摘要"""
+        return {
+            "hedges": self.hedges,
+            "failures": self.failures,
+            "hedged_quantity": str(self.hedged_quantity),
+            "latency_ms": self._describe(self.latencies_ms),
+            "slippage_bps": self._describe(self.slippages_bps),
+        }
+
+
+class DeltaHedger:
+    """
+    在一个 asyncio 事件循环中并发监控多个交易所的持仓，按资产保持净 delta 中性
+
+    on_fill / on_position 可以在任意线程中调用（WS 回调），会切换到事件循环线程处理。
+    """
+
+    def __init__(
+        self,
+        adapters: Dict[str, Any],
+        assets: List[HedgeAsset],
+        poll_interval: float = 1.0,
+        price_field: str = "mid_price",
+        on_hedge: Optional[Callable[[HedgeRecord], None]] = None,
+    ):
+        """
+        Args:
+            adapters: 交易所名称 -> BasePerpAdapter 实例
+            assets: 需要对冲的资产
+            poll_interval: 持仓 / 参考价轮询间隔（秒），0 为只依赖 on_fill / on_position 推送
+            price_field: 参考价字段（不存在时依次回退 mark_price、last_price）
+            on_hedge: 每笔对冲单返回后的回调
+        """
+        for asset in assets:
+            for venue in asset.symbols:
+                if venue not in adapters:
+                    raise ValueError(f"{asset.asset} 配置的交易所 {venue} 没有对应的适配器")
+        self.adapters = adapters
+        self.assets = {a.asset: a for a in assets}
+        self.poll_interval = poll_interval
+        self.price_field = price_field
+        self.on_hedge = on_hedge
+        # (交易所, 交易对) -> 资产
+        self._asset_by_symbol = {
+            (venue, symbol): a.asset for a in assets for venue, symbol in a.symbols.items()
+        }
+        # (交易所, 资产) -> 带符号持仓
+        self.positions: Dict[Tuple[str, str], Decimal] = {}
+        # (交易所, 资产) -> 最近一次成交推送的时间，早于它开始的持仓查询结果已过期
+        self._fill_at: Dict[Tuple[str, str], float] = {}
+        # 资产 -> 对冲腿参考价
+        self.prices: Dict[str, Decimal] = {}
+        # 资产 -> 已发出但持仓尚未反映的对冲数量（带符号）及其返回时间
+        self._pending: Dict[str, List[Tuple[Decimal, float, str]]] = {a.asset: [] for a in assets}
+        self._in_flight: Dict[str, bool] = {a.asset: False for a in assets}
+        self._dirty: Dict[str, bool] = {a.asset: False for a in assets}
+        self.stats: Dict[str, HedgeStats] = {a.asset: HedgeStats() for a in assets}
+        self.history: Deque[HedgeRecord] = deque(maxlen=1000)
+        # 对冲单 client_order_id -> HedgeRecord（只保留 history 中的对冲单）
+        self._records: Dict[str, HedgeRecord] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+
+    # ==================== 运行 ====================
+
+    async def run(self) -> None:
+        """并发轮询所有交易所直到 stop()"""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        tasks = []
+        if self.poll_interval > 0:
+            tasks = [
+                self._loop.create_task(self._poll_venue(venue), name=f"hedger-{venue}")
+                for venue in self.adapters
+            ]
+        try:
+            await self._stopped.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self) -> None:
+        """停止 run()（可在任意线程调用）"""
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    # ==================== 持仓输入 ====================
+
+    def on_fill(
+        self,
+        venue: str,
+        symbol: str,
+        quantity: Number,
+        price: Optional[Number] = None,
+        client_order_id: Optional[str] = None,
+    ) -> None:
+        """
+        成交推送：按带符号数量（买入为正）更新持仓并立即重新计算
+
+        Args:
+            venue: 交易所名称
+            symbol: 交易对
+            quantity: 带符号成交数量
+            price: 成交价（对冲单的成交用于滑点统计）
+            client_order_id: 客户端订单 ID（对冲单的 ID 为 HedgeRecord.client_order_id）
+        """
+        self._dispatch(self._apply_fill, venue, symbol, Decimal(str(quantity)),
+                       Decimal(str(price)) if price is not None else None, client_order_id)
+
+    def on_position(self, venue: str, symbol: str, size: Number) -> None:
+        """持仓推送：设置带符号持仓（多为正、空为负）并立即重新计算"""
+        self._dispatch(self._apply_position, venue, symbol, Decimal(str(size)), time.monotonic())
+
+    def net_delta(self, asset: str) -> Decimal:
+        """资产的净 delta（各交易所持仓之和 + 未反映的对冲数量 - 目标 delta）"""
+        config = self.assets[asset]
+        held = sum((self.positions.get((venue, asset), Decimal("0")) for venue in config.symbols), Decimal("0"))
+        pending = sum((q for q, _, _ in self._pending[asset]), Decimal("0"))
+        return held + pending - config.target_delta
+
+    def record_for(self, client_order_id: str) -> Optional[HedgeRecord]:
+        """按订单的 client_order_id 查找对冲单记录"""
+        return self._records.get(str(client_order_id))
+
+    # ==================== 内部实现 ====================
+
+    def _dispatch(self, func: Callable, *args) -> None:
+        loop = self._loop
+        if loop is None:
+            # 尚未运行：直接更新状态，不对冲
+            func(*args, evaluate=False)
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            func(*args)
+        else:
+            loop.call_soon_threadsafe(functools.partial(func, *args))
+
+    def _apply_fill(self, venue: str, symbol: str, quantity: Decimal, price: Optional[Decimal],
+                    client_order_id: Optional[str], evaluate: bool = True) -> None:
+        asset = self._asset_by_symbol.get((venue, symbol))
+        if asset is None:
+            return
+        key = (venue, asset)
+        self.positions[key] = self.positions.get(key, Decimal("0")) + quantity
+        self._fill_at[key] = time.monotonic()
+        record = self._records.get(str(client_order_id)) if client_order_id else None
+        if record is not None:
+            # 对冲单成交：从未反映数量中扣除，并记录成交价
+            self._settle(asset, record.hedge_id, quantity)
+            if price is not None:
+                total = record.filled_quantity + abs(quantity)
+                previous = (record.fill_price or price) * record.filled_quantity
+                record.fill_price = (previous + price * abs(quantity)) / total
+                record.filled_quantity = total
+                if record.filled_quantity >= record.quantity and record.slippage_bps is not None:
+                    self.stats[asset].record_slippage(record.slippage_bps)
+        if evaluate:
+            self._schedule(asset)
+
+    def _apply_position(self, venue: str, symbol: str, size: Decimal, observed_at: float,
+                        evaluate: bool = True) -> None:
+        asset = self._asset_by_symbol.get((venue, symbol))
+        if asset is None:
+            return
+        key = (venue, asset)
+        if observed_at < self._fill_at.get(key, float("-inf")):
+            return
+        if venue == self.assets[asset].hedge_venue and self._pending[asset]:
+            if any(acked_at >= observed_at for _, acked_at, _ in self._pending[asset]):
+                # 查询与未确认的对冲单重叠，无法判断是否已包含该对冲单，丢弃
+                return
+            # 在所有对冲单返回之后开始的查询已经包含这些对冲单
+            self._pending[asset] = []
+        self.positions[key] = size
+        if evaluate:
+            self._schedule(asset)
+
+    def _settle(self, asset: str, hedge_id: str, quantity: Decimal) -> None:
+        remaining = []
+        for pending_quantity, acked_at, pending_id in self._pending[asset]:
+            if pending_id == hedge_id:
+                pending_quantity -= quantity
+                if pending_quantity == 0 or (pending_quantity > 0) != (quantity > 0):
+                    continue
+            remaining.append((pending_quantity, acked_at, pending_id))
+        self._pending[asset] = remaining
+
+    def _schedule(self, asset: str) -> None:
+        """在下一个事件循环 tick 评估资产；正在对冲时标记为待重新评估"""
+        if self._in_flight[asset]:
+            self._dirty[asset] = True
+            return
+        self._in_flight[asset] = True
+        self._loop.create_task(self._hedge(asset, time.monotonic()))
+
+    async def _hedge(self, asset: str, detected_at: float) -> None:
+        config = self.assets[asset]
+        try:
+            if any((venue, asset) not in self.positions for venue in config.symbols):
+                # 等所有交易所都返回过持仓再对冲
+                return
+            net = self.net_delta(asset)
+            if abs(net) <= config.tolerance:
+                return
+            quantity = abs(net)
+            if config.quantity_step > 0:
+                quantity = (quantity / config.quantity_step).to_integral_value(ROUND_DOWN) * config.quantity_step
+            if quantity <= 0 or quantity < config.min_quantity:
+                return
+            side = "sell" if net > 0 else "buy"
+            reference = self.prices.get(asset)
+            limit = None
+            if reference is not None:
+                offset = reference * Decimal(str(config.max_slippage_bps)) / Decimal(10000)
+                limit = reference + offset if side == "buy" else reference - offset
+            record = HedgeRecord(config, side, quantity, reference, limit, detected_at)
+            self._records[record.client_order_id] = record
+            signed = quantity if side == "buy" else -quantity
+            # 先计入未反映数量，下单期间到达的持仓推送不会触发重复对冲
+            self._pending[asset].append((signed, float("inf"), record.hedge_id))
+            logger.info("对冲 %s: 净 delta=%s, %s %s %s @ %s", asset, net, side, quantity, record.symbol, limit)
+            try:
+                order = await self._call(
+                    config.hedge_venue,
+                    "place_order",
+                    symbol=record.symbol,
+                    side=side,
+                    order_type="limit" if limit is not None else "market",
+                    quantity=quantity,
+                    price=limit,
+                    time_in_force="ioc",
+                    client_order_id=record.client_order_id,
+                )
+                record.acked_at = time.monotonic()
+                record.order_id = getattr(order, "order_id", None)
+                self._mark_acked(asset, record)
+            except Exception as e:
+                record.acked_at = time.monotonic()
+                record.error = str(e)
+                self._settle(asset, record.hedge_id, signed)
+                logger.error("对冲下单失败: %s, 错误=%s", record.to_dict(), e)
+            self.stats[asset].record(record)
+            if len(self.history) == self.history.maxlen:
+                self._records.pop(self.history[0].client_order_id, None)
+            self.history.append(record)
+            if self.on_hedge is not None:
+                self.on_hedge(record)
+        except Exception as e:
+            logger.error("对冲评估异常: %s, 错误=%s", asset, e)
+        finally:
+            self._in_flight[asset] = False
+            if self._dirty[asset]:
+                self._dirty[asset] = False
+                self._schedule(asset)
+
+    def _mark_acked(self, asset: str, record: HedgeRecord) -> None:
+        self._pending[asset] = [
+            (q, record.acked_at if pending_id == record.hedge_id else acked_at, pending_id)
+            for q, acked_at, pending_id in self._pending[asset]
+        ]
+
+    async def _poll_venue(self, venue: str) -> None:
+        symbols = {symbol: asset for (v, symbol), asset in self._asset_by_symbol.items() if v == venue}
+        hedge_symbols = {a.hedge_symbol: a.asset for a in self.assets.values() if a.hedge_venue == venue}
+        loop = asyncio.get_running_loop()
+        next_run = loop.time()
+        while True:
+            started = time.monotonic()
+            try:
+                positions, tickers = await asyncio.gather(
+                    self._call(venue, "get_positions"),
+                    asyncio.gather(*(self._call(venue, "get_ticker", s) for s in hedge_symbols)),
+                )
+                for symbol, ticker in zip(hedge_symbols, tickers):
+                    price = self._ticker_price(ticker)
+                    if price is not None:
+                        self.prices[hedge_symbols[symbol]] = price
+                sizes = {symbol: Decimal("0") for symbol in symbols}
+                for position in positions:
+                    if position.symbol in sizes:
+                        size = abs(Decimal(str(position.size)))
+                        sizes[position.symbol] = size if position.side in ("long", "buy") else -size
+                for symbol, size in sizes.items():
+                    self._apply_position(venue, symbol, size, started)
+            except Exception as e:
+                logger.warning("对冲持仓轮询失败: %s, 错误=%s", venue, e)
+            next_run += self.poll_interval
+            await asyncio.sleep(max(0.0, next_run - loop.time()))
+
+    def _ticker_price(self, ticker: Dict[str, Any]) -> Optional[Decimal]:
+        for field in (self.price_field, "mark_price", "last_price"):
+            value = ticker.get(field)
+            if value:
+                return Decimal(str(value))
+        return None
+
+    async def _call(self, venue: str, method: str, *args, **kwargs) -> Any:
+        """在适配器线程池中执行阻塞调用"""
+        adapter = self.adapters[venue]
+        return await asyncio.get_running_loop().run_in_executor(
+            adapter._get_executor(), functools.partial(getattr(adapter, method), *args, **kwargs)
+        )
@@ -0,0 +1,657 @@
+"""
+Execution Scheduler
+
+客户端拆单执行调度器，适用于没有原生 TWAP 的交易所（StandX、GRVT；Nado 可以使用服务端
+TWAP：TriggerExecuteClient.place_twap_order）。可以驱动任意 BasePerpAdapter：
+
+- TWAP: 总数量在 duration 内均分为 slices 份，每份在自己的时间片内完成
+- Iceberg: 盘口只挂 display_quantity，成交后再挂下一份，超时未成交按最新盘口重新定价
+- POV: 按市场成交量的 participation 比例跟随（市场成交量由调用方提供）
+
+子单定价：先在己方最优价挂单（买单挂买一、卖单挂卖一）；时间片剩余时间不足 catch_up
+比例仍未完成时，改为对手方最优价吃单。价格不会超过母单的 limit_price。
+时间片按绝对截止时间调度（不累积 sleep 误差），多个母单在同一个事件循环中并发执行；
+适配器的阻塞调用在适配器线程池中执行，下单/撤单仍然经过适配器的限频器和订单流水。
+母单结束（完成、取消或出错）时撤销仍在挂单的子单。
+
+成交确认：适配器 reports_order_fills 为 True 时按 get_order 返回的成交量和状态；否则（或
+get_order 查不到订单时）按子单是否仍在 get_open_orders 中和母单开始以来的持仓变化推断，
+这要求执行期间没有其他订单在同一交易对上成交。两种方式都不可用时母单不会开始执行（FAILED）。
+
+使用示例:
+    scheduler = ExecutionScheduler(adapter)
+    parent = scheduler.twap("BTC-USD", "sell", Decimal("0.5"), duration=300, slices=10)
+    await scheduler.wait(parent)
+    print(parent.filled_quantity, parent.avg_price)
+
+    # 同步代码中
+    close_position_twap(adapter, "BTC-USD", duration=60, slices=6)
+"""
+import asyncio
+import functools
+import inspect
+import itertools
+import logging
+import time
+from decimal import Decimal, ROUND_CEILING, ROUND_DOWN, ROUND_FLOOR
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from adapters.base_adapter import new_client_order_id
+
+logger = logging.getLogger(__name__)
+
+TWAP = "twap"
+ICEBERG = "iceberg"
+POV = "pov"
+ALGOS = (TWAP, ICEBERG, POV)
+
+# 母单状态
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+# 子单的终态（BasePerpAdapter Order.status）
+_FINAL_ORDER_STATUSES = {"filled", "cancelled", "rejected"}
+
+_parent_ids = itertools.count(1)
+
+Number = Union[Decimal, float, int, str]
+# 返回市场累计成交量的函数（同步或协程函数），用于 POV
+VolumeSource = Callable[[], Any]
+
+
+def _decimal(value: Optional[Number]) -> Optional[Decimal]:
+    return None if value is None else Decimal(str(value))
+
+
+def _round_down(quantity: Decimal, step: Decimal) -> Decimal:
+    if step <= 0:
+        return quantity
+    return (quantity / step).to_integral_value(ROUND_DOWN) * step
+
+
+class ParentOrder:
+    """母单：按算法拆成子单执行的总数量"""
+
+    def __init__(
+        self,
+        symbol: str,
+        side: str,
+        quantity: Number,
+        algo: str = TWAP,
+        duration: Optional[float] = 60.0,
+        slices: int = 10,
+        display_quantity: Optional[Number] = None,
+        participation: float = 0.1,
+        market_volume: Optional[VolumeSource] = None,
+        limit_price: Optional[Number] = None,
+        reduce_only: bool = False,
+        quantity_step: Number = 0,
+        price_tick: Number = 0,
+        min_quantity: Number = 0,
+        child_timeout: Optional[float] = None,
+        catch_up: float = 0.3,
+        finish_with_market: bool = False,
+        parent_id: Optional[str] = None,
+    ):
+        """
+        Args:
+            symbol: 交易对符号
+            side: "buy"/"sell"（"long"/"short" 视为 buy/sell）
+            quantity: 总数量
+            algo: "twap"、"iceberg" 或 "pov"
+            duration: 执行时长（秒）。TWAP 必填；Iceberg/POV 为最长执行时间，None 为不限
+            slices: TWAP 的份数；POV 按 duration / slices 的间隔检查市场成交量
+            display_quantity: Iceberg 每次挂出的数量
+            participation: POV 参与率（0-1）
+            market_volume: POV 使用，返回市场累计成交量的函数（同步或协程）
+            limit_price: 价格上限（买）/ 下限（卖），None 为不限
+            reduce_only: 子单是否只减仓
+            quantity_step: 数量最小变动单位，子单数量向下取整
+            price_tick: 价格最小变动单位，买单向下、卖单向上取整
+            min_quantity: 子单最小数量，不足时并入下一份
+            child_timeout: 子单最长挂单时间（秒），超时撤单后按最新盘口重新定价；
+                默认 TWAP/POV 为一个时间片，Iceberg 为 30 秒
+            catch_up: 时间片剩余时间低于该比例仍未完成时改为吃单（0 为始终挂单）
+            finish_with_market: 结束时剩余数量是否用市价单补齐
+            parent_id: 母单 ID（只在本地使用；子单的 client_order_id 是 new_client_order_id()
+                生成的数字 ID，见 child_ids）
+        """
+        if algo not in ALGOS:
+            raise ValueError(f"不支持的拆单算法: {algo}，可选 {ALGOS}")
+        side = {"long": "buy", "short": "sell"}.get(side.lower(), side.lower())
+        if side not in ("buy", "sell"):
+            raise ValueError(f"订单方向无效: {side}")
+        if algo == TWAP and (not duration or slices < 1):
+            raise ValueError("TWAP 需要 duration > 0 且 slices >= 1")
+        if algo == ICEBERG and not display_quantity:
+            raise ValueError("Iceberg 需要 display_quantity")
+        if algo == POV and (market_volume is None or not 0 < participation <= 1):
+            raise ValueError("POV 需要 market_volume 且 0 < participation <= 1")
+
+        self.parent_id = parent_id or f"algo{int(time.time())}{next(_parent_ids)}"
+        self.symbol = symbol
+        self.side = side
+        self.quantity = _decimal(quantity)
+        self.algo = algo
+        self.duration = duration
+        self.slices = max(1, int(slices))
+        self.display_quantity = _decimal(display_quantity)
+        self.participation = participation
+        self.market_volume = market_volume
+        self.limit_price = _decimal(limit_price)
+        self.reduce_only = reduce_only
+        self.quantity_step = _decimal(quantity_step)
+        self.price_tick = _decimal(price_tick)
+        self.min_quantity = _decimal(min_quantity)
+        self.child_timeout = child_timeout
+        self.catch_up = catch_up
+        self.finish_with_market = finish_with_market
+
+        # 执行状态
+        self.status = PENDING
+        self.filled_quantity = Decimal("0")
+        self.filled_notional = Decimal("0")
+        self.child_count = 0
+        # 子单的 client_order_id（按下单顺序）
+        self.child_ids: List[str] = []
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._working: Optional[Any] = None  # 正在挂单的子单（adapters Order）
+        # 按持仓推断成交时母单开始时的持仓（带符号，多为正）
+        self._position_base: Optional[Decimal] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_buy(self) -> bool:
+        return self.side == "buy"
+
+    @property
+    def remaining(self) -> Decimal:
+        return max(Decimal("0"), self.quantity - self.filled_quantity)
+
+    @property
+    def avg_price(self) -> Optional[Decimal]:
+        """成交均价（按子单价格估算；市价单按下单时的对手价估算）"""
+        if self.filled_quantity <= 0:
+            return None
+        return self.filled_notional / self.filled_quantity
+
+    @property
+    def done(self) -> bool:
+        return self.status in (DONE, CANCELLED, FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        avg_price = self.avg_price
+        return {
+            "parent_id": self.parent_id,
+            "symbol": self.symbol,
+            "side": self.side,
+            "algo": self.algo,
+            "quantity": str(self.quantity),
+            "filled_quantity": str(self.filled_quantity),
+            "avg_price": str(avg_price) if avg_price is not None else None,
+            "status": self.status,
+            "child_count": self.child_count,
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"<ParentOrder({self.parent_id} {self.algo} {self.side} {self.filled_quantity}/"
+            f"{self.quantity} {self.symbol} {self.status})>"
+        )
+
+
+class ExecutionScheduler:
+    """
+    在一个 asyncio 事件循环中并发执行多个母单
+
+    submit() 等方法需要在事件循环中调用；同步代码使用 run_sync() 或 close_position_twap()。
+    """
+
+    def __init__(
+        self,
+        adapter,
+        poll_interval: float = 0.5,
+        book_depth: int = 1,
+        sweep_timeout: float = 5.0,
+    ):
+        """
+        Args:
+            adapter: BasePerpAdapter 实例
+            poll_interval: 子单状态轮询间隔（秒）
+            book_depth: 定价时查询的盘口深度
+            sweep_timeout: 市价补齐单等待成交确认的最长时间（秒）
+        """
+        self.adapter = adapter
+        self.poll_interval = poll_interval
+        self.book_depth = book_depth
+        self.sweep_timeout = sweep_timeout
+        self.parents: Dict[str, ParentOrder] = {}
+        # get_orderbook 未实现的适配器改用 get_ticker 的买一/卖一
+        self._use_ticker = False
+
+    # ==================== 母单管理 ====================
+
+    def submit(self, parent: ParentOrder) -> ParentOrder:
+        """开始执行母单（立即返回），用 wait() 等待完成"""
+        if parent.status != PENDING:
+            raise ValueError(f"母单已执行过: {parent!r}")
+        self.parents[parent.parent_id] = parent
+        parent._task = asyncio.get_running_loop().create_task(
+            self._run(parent), name=f"execution-{parent.parent_id}"
+        )
+        return parent
+
+    def twap(self, symbol: str, side: str, quantity: Number, duration: float, slices: int, **kwargs) -> ParentOrder:
+        """提交 TWAP 母单，其他参数见 ParentOrder"""
+        return self.submit(ParentOrder(symbol, side, quantity, TWAP, duration=duration, slices=slices, **kwargs))
+
+    def iceberg(self, symbol: str, side: str, quantity: Number, display_quantity: Number, **kwargs) -> ParentOrder:
+        """提交 Iceberg 母单，其他参数见 ParentOrder"""
+        kwargs.setdefault("duration", None)
+        return self.submit(
+            ParentOrder(symbol, side, quantity, ICEBERG, display_quantity=display_quantity, **kwargs)
+        )
+
+    def pov(
+        self,
+        symbol: str,
+        side: str,
+        quantity: Number,
+        participation: float,
+        market_volume: VolumeSource,
+        **kwargs,
+    ) -> ParentOrder:
+        """提交 POV 母单，其他参数见 ParentOrder"""
+        return self.submit(
+            ParentOrder(
+                symbol, side, quantity, POV,
+                participation=participation, market_volume=market_volume, **kwargs,
+            )
+        )
+
+    async def wait(self, parent: ParentOrder, timeout: Optional[float] = None) -> ParentOrder:
+        """等待母单结束"""
+        if parent._task is not None:
+            await asyncio.wait_for(asyncio.shield(parent._task), timeout)
+        return parent
+
+    async def execute(self, parent: ParentOrder) -> ParentOrder:
+        """执行母单直到结束"""
+        return await self.wait(self.submit(parent))
+
+    def cancel(self, parent: ParentOrder) -> None:
+        """取消母单（正在挂单的子单会被撤销）"""
+        if parent._task is not None and not parent._task.done():
+            parent._task.cancel()
+
+    async def cancel_all(self) -> None:
+        """取消所有未结束的母单并等待子单撤销完成"""
+        active = self.active()
+        for parent in active:
+            self.cancel(parent)
+        await asyncio.gather(*(self.wait(p) for p in active), return_exceptions=True)
+
+    def active(self) -> List[ParentOrder]:
+        """未结束的母单"""
+        return [p for p in self.parents.values() if not p.done]
+
+    def run_sync(self, parent: ParentOrder) -> ParentOrder:
+        """在同步代码中执行母单直到结束（内部创建事件循环）"""
+        return asyncio.run(self.execute(parent))
+
+    # ==================== 算法 ====================
+
+    async def _run(self, parent: ParentOrder) -> None:
+        loop = asyncio.get_running_loop()
+        parent.status = RUNNING
+        parent.started_at = time.time()
+        start = loop.time()
+        logger.info("母单开始: %r", parent)
+        try:
+            await self._prepare(parent)
+            if parent.algo == TWAP:
+                await self._run_twap(parent, start)
+            elif parent.algo == ICEBERG:
+                await self._run_iceberg(parent, start)
+            else:
+                await self._run_pov(parent, start)
+            if parent.finish_with_market and self._tradable(parent, parent.remaining) > 0:
+                await self._sweep(parent)
+                if self._tradable(parent, parent.remaining) > 0:
+                    raise RuntimeError(f"市价补齐后仍有 {parent.remaining} 未确认成交")
+            parent.status = DONE
+        except asyncio.CancelledError:
+            parent.status = CANCELLED
+        except Exception as e:
+            parent.status = FAILED
+            parent.error = str(e)
+            logger.error("母单执行失败: %r, 错误=%s", parent, e)
+        finally:
+            await self._cancel_working(parent)
+            parent.finished_at = time.time()
+            logger.info("母单结束: %r, 均价=%s", parent, parent.avg_price)
+
+    async def _prepare(self, parent: ParentOrder) -> None:
+        """
+        确认子单成交可以观测：记录母单开始时的持仓，用于 get_order 查不到订单时推断成交
+
+        Raises:
+            RuntimeError: 适配器 get_order 不返回成交且无法查询持仓，或同一交易对上已有
+                按持仓推断成交的母单在执行
+        """
+        try:
+            parent._position_base = await self._signed_position(parent.symbol)
+        except Exception as e:
+            if not getattr(self.adapter, "reports_order_fills", False):
+                raise RuntimeError(f"无法确认子单成交：get_order 不返回成交量且查询持仓失败（{e}）")
+            logger.warning("查询持仓失败，只按 get_order 确认成交: %s, 错误=%s", parent.symbol, e)
+            return
+        if not getattr(self.adapter, "reports_order_fills", False):
+            for other in self.active():
+                if other is not parent and other.symbol == parent.symbol and other.status == RUNNING:
+                    raise RuntimeError(f"{parent.symbol} 已有母单在执行，无法按持仓变化区分成交")
+
+    async def _signed_position(self, symbol: str) -> Decimal:
+        """当前持仓（带符号：多仓为正，空仓为负）"""
+        position = await self._call(self.adapter.get_position, symbol)
+        if position is None or not position.size:
+            return Decimal("0")
+        size = abs(Decimal(str(position.size)))
+        return size if position.side in ("long", "buy") else -size
+
+    async def _run_twap(self, parent: ParentOrder, start: float) -> None:
+        interval = parent.duration / parent.slices
+        for i in range(parent.slices):
+            target = parent.quantity * (i + 1) / parent.slices
+            slice_end = start + (i + 1) * interval
+            await self._work_until(parent, target, slice_end, interval)
+            await self._sleep_until(slice_end)
+
+    async def _run_iceberg(self, parent: ParentOrder, start: float) -> None:
+        loop = asyncio.get_running_loop()
+        timeout = parent.child_timeout or 30.0
+        end = start + parent.duration if parent.duration else None
+        while self._tradable(parent, parent.remaining) > 0:
+            now = loop.time()
+            if end is not None and now >= end:
+                break
+            child_end = now + timeout if end is None else min(now + timeout, end)
+            target = parent.filled_quantity + min(parent.display_quantity, parent.remaining)
+            # Iceberg 只挂被动单
+            await self._work_until(parent, target, child_end, timeout, allow_cross=False)
+
+    async def _run_pov(self, parent: ParentOrder, start: float) -> None:
+        loop = asyncio.get_running_loop()
+        interval = parent.child_timeout or (parent.duration / parent.slices if parent.duration else 5.0)
+        end = start + parent.duration if parent.duration else None
+        base_volume = Decimal(str(await self._market_volume(parent)))
+        next_check = start
+        while self._tradable(parent, parent.remaining) > 0:
+            if end is not None and loop.time() >= end:
+                break
+            next_check += interval
+            traded = Decimal(str(await self._market_volume(parent))) - base_volume
+            target = min(parent.quantity, traded * Decimal(str(parent.participation)))
+            await self._work_until(parent, target, next_check, interval)
+            await self._sleep_until(next_check)
+
+    async def _work_until(
+        self,
+        parent: ParentOrder,
+        target: Decimal,
+        deadline: float,
+        slice_length: float,
+        allow_cross: bool = True,
+    ) -> None:
+        """在 deadline 之前把累计成交推进到 target"""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            left = deadline - now
+            quantity = self._tradable(parent, target - parent.filled_quantity)
+            if left <= 0 or quantity <= 0:
+                return
+            catch_up_at = parent.catch_up * slice_length
+            cross = allow_cross and left <= catch_up_at
+            timeout = left if parent.child_timeout is None else min(parent.child_timeout, left)
+            if allow_cross and not cross:
+                # 被动单挂到追赶时间点为止，之后按对手价重新下单
+                timeout = min(timeout, left - catch_up_at)
+            price = await self._child_price(parent, cross)
+            await self._work_child(parent, quantity, price, timeout)
+
+    # ==================== 子单 ====================
+
+    def _tradable(self, parent: ParentOrder, quantity: Decimal) -> Decimal:
+        """可下单数量：不超过剩余数量，按数量单位取整，低于最小数量时为 0"""
+        quantity = _round_down(min(quantity, parent.remaining), parent.quantity_step)
+        if quantity <= 0 or quantity < parent.min_quantity:
+            return Decimal("0")
+        return quantity
+
+    async def _work_child(self, parent: ParentOrder, quantity: Decimal, price: Decimal, timeout: float) -> None:
+        loop = asyncio.get_running_loop()
+        place = asyncio.ensure_future(self._call(
+            self.adapter.place_order,
+            symbol=parent.symbol,
+            side=parent.side,
+            order_type="limit",
+            quantity=quantity,
+            price=price,
+            time_in_force="gtc",
+            reduce_only=parent.reduce_only,
+            client_order_id=self._next_child_id(parent),
+        ))
+        try:
+            order = await asyncio.shield(place)
+        except asyncio.CancelledError:
+            # 下单请求已经发出：等它返回，再撤掉这笔子单
+            try:
+                parent._working = await place
+            except Exception:
+                pass
+            raise
+        parent._working = order
+        filled = order.filled_quantity or Decimal("0")
+        status = order.status
+        end = loop.time() + timeout
+        try:
+            while filled < quantity and status not in _FINAL_ORDER_STATUSES:
+                wait = end - loop.time()
+                if wait <= 0:
+                    break
+                await asyncio.sleep(min(self.poll_interval, wait))
+                filled, status = await self._order_state(parent, order, filled, status)
+        finally:
+            if filled < quantity and status not in _FINAL_ORDER_STATUSES:
+                # 超时或母单被取消：撤单后再查一次，拿到撤单前的最终成交量
+                await self._cancel_working(parent)
+                filled, status = await self._order_state(parent, order, filled, status)
+            parent._working = None
+            self._record_fill(parent, filled, price)
+
+    def _next_child_id(self, parent: ParentOrder) -> str:
+        """子单的 client_order_id（数字，GRVT/Nado 只接受整数 ID）"""
+        parent.child_count += 1
+        client_order_id = new_client_order_id()
+        parent.child_ids.append(client_order_id)
+        return client_order_id
+
+    async def _order_state(self, parent: ParentOrder, order, filled: Decimal, status: str) -> Tuple[Decimal, str]:
+        """查询子单的成交量和状态；get_order 不返回成交时按挂单和持仓推断，都查不到时沿用上一次的结果"""
+        if getattr(self.adapter, "reports_order_fills", False):
+            try:
+                current = await self._call(self.adapter.get_order, order_id=order.order_id, symbol=order.symbol)
+            except Exception as e:
+                logger.warning("查询子单失败: order_id=%s, 错误=%s", order.order_id, e)
+                return filled, status
+            if current is not None:
+                return max(filled, current.filled_quantity or Decimal("0")), current.status
+        return await self._inferred_state(parent, order, filled, status)
+
+    async def _inferred_state(self, parent: ParentOrder, order, filled: Decimal, status: str) -> Tuple[Decimal, str]:
+        """
+        按挂单和持仓推断子单成交：子单成交量 = 母单开始以来的持仓变化 - 之前子单的成交量；
+        子单不在挂单列表中时视为已结束
+        """
+        if parent._position_base is None:
+            return filled, status
+        try:
+            # 先查挂单再查持仓：子单在两次查询之间结束时，持仓已包含它的最终成交
+            open_orders = await self._call(self.adapter.get_open_orders, order.symbol)
+            position = await self._signed_position(order.symbol)
+        except Exception as e:
+            logger.warning("按持仓推断子单成交失败: order_id=%s, 错误=%s", order.order_id, e)
+            return filled, status
+        is_open = any(
+            o.order_id == order.order_id
+            or (order.client_order_id and o.client_order_id == order.client_order_id)
+            for o in open_orders
+        )
+        moved = position - parent._position_base
+        traded = (moved if parent.is_buy else -moved) - parent.filled_quantity
+        filled = min(order.quantity, max(filled, traded))
+        if is_open:
+            return filled, "partially_filled" if filled > 0 else "open"
+        return filled, "filled" if filled >= order.quantity else "cancelled"
+
+    async def _cancel_working(self, parent: ParentOrder) -> None:
+        order = parent._working
+        if order is None:
+            return
+        try:
+            await self._call(
+                self.adapter.cancel_order,
+                order_id=order.order_id, symbol=order.symbol, client_order_id=order.client_order_id,
+            )
+        except Exception as e:
+            logger.warning("撤销子单失败: order_id=%s, 错误=%s", order.order_id, e)
+
+    async def _sweep(self, parent: ParentOrder) -> None:
+        """剩余数量用市价单补齐"""
+        quantity = self._tradable(parent, parent.remaining)
+        bid, ask = await self._best_prices(parent.symbol)
+        reference = ask if parent.is_buy else bid
+        order = await self._call(
+            self.adapter.place_market_order,
+            symbol=parent.symbol,
+            side=parent.side,
+            quantity=quantity,
+            reduce_only=parent.reduce_only,
+            client_order_id=self._next_child_id(parent),
+        )
+        # 市价单的成交量大多不会在下单响应中返回：轮询到终态，只计入确认的成交量
+        loop = asyncio.get_running_loop()
+        end = loop.time() + self.sweep_timeout
+        filled = order.filled_quantity or Decimal("0")
+        status = order.status
+        while filled < quantity and status not in _FINAL_ORDER_STATUSES:
+            wait = end - loop.time()
+            if wait <= 0:
+                logger.warning("市价补齐单未确认成交: order_id=%s, 已确认=%s/%s", order.order_id, filled, quantity)
+                break
+            await asyncio.sleep(min(self.poll_interval, wait))
+            filled, status = await self._order_state(parent, order, filled, status)
+        self._record_fill(parent, filled, order.price or reference or Decimal("0"))
+
+    def _record_fill(self, parent: ParentOrder, filled: Decimal, price: Decimal) -> None:
+        filled = min(filled, parent.remaining)
+        if filled > 0:
+            parent.filled_quantity += filled
+            parent.filled_notional += filled * price
+
+    # ==================== 定价 ====================
+
+    async def _child_price(self, parent: ParentOrder, cross: bool) -> Decimal:
+        """己方最优价挂单；cross 为 True 时取对手方最优价。不超过 limit_price"""
+        bid, ask = await self._best_prices(parent.symbol)
+        if parent.is_buy:
+            price = (ask if cross else bid) or bid or ask
+        else:
+            price = (bid if cross else ask) or ask or bid
+        if price is None:
+            if parent.limit_price is None:
+                raise RuntimeError(f"{parent.symbol} 没有可用的盘口价格")
+            price = parent.limit_price
+        if parent.limit_price is not None:
+            price = min(price, parent.limit_price) if parent.is_buy else max(price, parent.limit_price)
+        tick = parent.price_tick
+        if tick > 0:
+            rounding = ROUND_FLOOR if parent.is_buy else ROUND_CEILING
+            price = (price / tick).to_integral_value(rounding) * tick
+        return price
+
+    async def _best_prices(self, symbol: str) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+        """(买一, 卖一)；get_orderbook 未实现时使用 get_ticker"""
+        if not self._use_ticker:
+            try:
+                book = await self._call(self.adapter.get_orderbook, symbol, depth=self.book_depth)
+                bids, asks = book.get("bids") or [], book.get("asks") or []
+                return (
+                    _decimal(bids[0][0]) if bids else None,
+                    _decimal(asks[0][0]) if asks else None,
+                )
+            except NotImplementedError:
+                self._use_ticker = True
+        ticker = await self._call(self.adapter.get_ticker, symbol)
+        return _decimal(ticker.get("bid_price")), _decimal(ticker.get("ask_price"))
+
+    async def _market_volume(self, parent: ParentOrder) -> Any:
+        value = parent.market_volume()
+        if inspect.isawaitable(value):
+            value = await value
+        return value
+
+    # ==================== 工具 ====================
+
+    async def _call(self, func: Callable, *args, **kwargs) -> Any:
+        """在适配器线程池中执行阻塞调用"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.adapter._get_executor(), functools.partial(func, *args, **kwargs)
+        )
+
+    @staticmethod
+    async def _sleep_until(deadline: float) -> None:
+        delay = deadline - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def close_position_twap(
+    adapter,
+    symbol: str,
+    duration: float = 60.0,
+    slices: int = 6,
+    **kwargs,
+) -> Optional[ParentOrder]:
+    """
+    用 TWAP 分批平仓（只减仓，结束时剩余数量市价补齐）
+
+    Args:
+        adapter: BasePerpAdapter 实例
+        symbol: 交易对符号
+        duration: 执行时长（秒）
+        slices: 份数
+        **kwargs: 其他 ParentOrder 参数
+
+    Returns:
+        Optional[ParentOrder]: 执行结果，没有持仓时返回 None
+    """
+    position = adapter.get_position(symbol)
+    if not position or position.size == Decimal("0"):
+        return None
+    side = "sell" if position.side in ["long", "buy"] else "buy"
+    kwargs.setdefault("finish_with_market", True)
+    parent = ParentOrder(
+        symbol, side, abs(position.size), TWAP,
+        duration=duration, slices=slices, reduce_only=True, **kwargs,
+    )
+    return ExecutionScheduler(adapter).run_sync(parent)
@@ -0,0 +1,487 @@
+"""
+Trigger Engine
+
+客户端条件单（止损 / 止盈）引擎，适用于不支持条件单的交易所（StandX、GRVT）：
+
+- 每个交易对两个堆：向上触发（价格 >= 触发价，如多单止盈、空单止损）的最小堆，
+  向下触发（价格 <= 触发价，如多单止损、空单止盈）的最大堆
+- 每个价格 tick 只比较两个堆顶：没有触发时 O(1)，每触发一个条件单 O(log n)
+- 撤销条件单只做标记（惰性删除），弹出堆顶时跳过
+- 触发后立即把只减仓订单提交到适配器线程池，不阻塞行情回调
+- 同一 oco_group 的条件单互斥：一个触发后其余自动撤销（止损 + 止盈括号单）
+
+价格来源可以是 WS 回调（on_price / on_ticker），也可以用 start_polling() 定时轮询 get_ticker。
+
+使用示例:
+    engine = TriggerEngine(adapter)
+    engine.add_bracket("BTC-USD", "long", Decimal("0.01"), stop_price=95000, take_profit_price=105000)
+    engine.start_polling(["BTC-USD"], interval=0.5)   # 或在 WS 回调中 engine.on_price(symbol, price)
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from adapters.base_adapter import new_client_order_id
+
+logger = logging.getLogger(__name__)
+
+ABOVE = "above"  # 价格 >= 触发价时触发
+BELOW = "below"  # 价格 <= 触发价时触发
+
+# 条件单状态
+ARMED = "armed"
+FIRED = "fired"
+SUBMITTED = "submitted"  # 订单已提交成功
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+Number = Union[Decimal, float, int, str]
+
+_trigger_ids = itertools.count(1)
+
+
+class Trigger:
+    """条件单：价格穿过 trigger_price 时提交只减仓订单"""
+
+    __slots__ = (
+        "trigger_id", "symbol", "side", "quantity", "trigger_price", "direction",
+        "order_type", "limit_price", "reduce_only", "oco_group", "status",
+        "fired_price", "fired_at", "client_order_id", "order", "error", "_key",
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        side: str,
+        quantity: Number,
+        trigger_price: Number,
+        direction: str,
+        order_type: str = "market",
+        limit_price: Optional[Number] = None,
+        reduce_only: bool = True,
+        oco_group: Optional[str] = None,
+        trigger_id: Optional[str] = None,
+    ):
+        """
+        Args:
+            symbol: 交易对符号
+            side: 触发后下单的方向，"buy" 或 "sell"
+            quantity: 下单数量
+            trigger_price: 触发价
+            direction: "above"（价格 >= 触发价）或 "below"（价格 <= 触发价）
+            order_type: 触发后的订单类型，"market" 或 "limit"
+            limit_price: 限价单价格（order_type 为 "limit" 时必填）
+            reduce_only: 是否只减仓
+            oco_group: 互斥组，组内任一条件单触发后撤销其余条件单
+            trigger_id: 条件单 ID（只在本地使用），默认自动生成；触发后订单的 client_order_id
+                是 new_client_order_id() 生成的数字 ID，用 TriggerEngine.trigger_for() 映射回条件单
+        """
+        if direction not in (ABOVE, BELOW):
+            raise ValueError(f"触发方向无效: {direction}")
+        if order_type == "limit" and limit_price is None:
+            raise ValueError("限价条件单必须指定 limit_price")
+        self.trigger_id = trigger_id or f"trg{next(_trigger_ids)}"
+        self.symbol = symbol
+        self.side = side
+        self.quantity = Decimal(str(quantity))
+        self.trigger_price = Decimal(str(trigger_price))
+        self.direction = direction
+        self.order_type = order_type
+        self.limit_price = Decimal(str(limit_price)) if limit_price is not None else None
+        self.reduce_only = reduce_only
+        self.oco_group = oco_group
+        self.status = ARMED
+        self.fired_price: Optional[float] = None
+        self.fired_at: Optional[float] = None
+        self.client_order_id: Optional[str] = None
+        self.order = None
+        self.error: Optional[str] = None
+        # 堆中的比较键（float，避免每个 tick 做 Decimal 比较）
+        self._key = float(self.trigger_price)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "trigger_id": self.trigger_id,
+            "symbol": self.symbol,
+            "side": self.side,
+            "quantity": str(self.quantity),
+            "trigger_price": str(self.trigger_price),
+            "direction": self.direction,
+            "order_type": self.order_type,
+            "limit_price": str(self.limit_price) if self.limit_price is not None else None,
+            "oco_group": self.oco_group,
+            "status": self.status,
+            "fired_price": self.fired_price,
+            "fired_at": self.fired_at,
+            "client_order_id": self.client_order_id,
+            "order_id": getattr(self.order, "order_id", None),
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        op = ">=" if self.direction == ABOVE else "<="
+        return (
+            f"<Trigger({self.trigger_id} {self.side} {self.quantity} {self.symbol} "
+            f"when price {op} {self.trigger_price}, {self.status})>"
+        )
+
+
+class _SymbolBook:
+    """单个交易对的待触发条件单"""
+
+    __slots__ = ("above", "below")
+
+    def __init__(self):
+        # (触发价, 序号, 条件单)；below 存负触发价实现最大堆
+        self.above: List[Tuple[float, int, Trigger]] = []
+        self.below: List[Tuple[float, int, Trigger]] = []
+
+
+class TriggerEngine:
+    """
+    在价格 tick 上评估条件单并通过适配器下单
+
+    on_price / on_ticker 可以在任意线程（WS 回调、轮询线程）中调用。
+    """
+
+    # 堆中已撤销的条目与已结束的条件单超过该数量（且超过总数一半）时清理
+    compact_threshold = 1024
+
+    def __init__(
+        self,
+        adapter,
+        price_field: str = "mark_price",
+        on_fire: Optional[Callable[[Trigger], None]] = None,
+    ):
+        """
+        Args:
+            adapter: BasePerpAdapter 实例
+            price_field: on_ticker / 轮询时使用的价格字段（不存在时依次回退 last_price、mid_price）
+            on_fire: 条件单下单完成（成功或失败）后的回调
+        """
+        self.adapter = adapter
+        self.price_field = price_field
+        self.on_fire = on_fire
+        self.triggers: Dict[str, Trigger] = {}
+        self._books: Dict[str, _SymbolBook] = {}
+        self._groups: Dict[str, List[Trigger]] = {}
+        # 触发后订单的 client_order_id -> 条件单
+        self._client_ids: Dict[str, Trigger] = {}
+        self._seq = itertools.count()
+        # 堆中已撤销（惰性删除）的条目数，过多时重建堆
+        self._stale = 0
+        # 已结束（已提交 / 下单失败）但仍在 triggers 中的条件单数
+        self._finished = 0
+        self._lock = threading.Lock()
+        self._poll_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # ==================== 条件单管理 ====================
+
+    def add(self, trigger: Trigger) -> Trigger:
+        """挂载条件单"""
+        with self._lock:
+            if trigger.trigger_id in self.triggers:
+                raise ValueError(f"条件单 ID 重复: {trigger.trigger_id}")
+            self.triggers[trigger.trigger_id] = trigger
+            book = self._books.get(trigger.symbol)
+            if book is None:
+                book = self._books[trigger.symbol] = _SymbolBook()
+            if trigger.direction == ABOVE:
+                heapq.heappush(book.above, (trigger._key, next(self._seq), trigger))
+            else:
+                heapq.heappush(book.below, (-trigger._key, next(self._seq), trigger))
+            if trigger.oco_group is not None:
+                self._groups.setdefault(trigger.oco_group, []).append(trigger)
+        return trigger
+
+    def add_stop(
+        self,
+        symbol: str,
+        position_side: str,
+        quantity: Number,
+        stop_price: Number,
+        **kwargs,
+    ) -> Trigger:
+        """
+        止损：多单价格跌破 stop_price 时卖出，空单涨破时买入
+
+        Args:
+            symbol: 交易对符号
+            position_side: 持仓方向，"long" 或 "short"
+            quantity: 平仓数量
+            stop_price: 止损触发价
+            **kwargs: 其他 Trigger 参数
+        """
+        is_long = position_side in ("long", "buy")
+        return self.add(Trigger(
+            symbol, "sell" if is_long else "buy", quantity, stop_price,
+            BELOW if is_long else ABOVE, **kwargs,
+        ))
+
+    def add_take_profit(
+        self,
+        symbol: str,
+        position_side: str,
+        quantity: Number,
+        take_profit_price: Number,
+        **kwargs,
+    ) -> Trigger:
+        """
+        止盈：多单价格涨到 take_profit_price 时卖出，空单跌到时买入
+
+        Args:
+            symbol: 交易对符号
+            position_side: 持仓方向，"long" 或 "short"
+            quantity: 平仓数量
+            take_profit_price: 止盈触发价
+            **kwargs: 其他 Trigger 参数
+        """
+        is_long = position_side in ("long", "buy")
+        return self.add(Trigger(
+            symbol, "sell" if is_long else "buy", quantity, take_profit_price,
+            ABOVE if is_long else BELOW, **kwargs,
+        ))
+
+    def add_bracket(
+        self,
+        symbol: str,
+        position_side: str,
+        quantity: Number,
+        stop_price: Number,
+        take_profit_price: Number,
+        **kwargs,
+    ) -> Tuple[Trigger, Trigger]:
+        """止损 + 止盈括号单（互斥，一个触发后撤销另一个）"""
+        group = kwargs.pop("oco_group", None) or f"oco{next(_trigger_ids)}"
+        stop = self.add_stop(symbol, position_side, quantity, stop_price, oco_group=group, **kwargs)
+        take_profit = self.add_take_profit(
+            symbol, position_side, quantity, take_profit_price, oco_group=group, **kwargs
+        )
+        return stop, take_profit
+
+    def add_position_bracket(
+        self,
+        position,
+        stop_price: Optional[Number] = None,
+        take_profit_price: Optional[Number] = None,
+    ) -> List[Trigger]:
+        """
+        按 adapters Position 挂止损 / 止盈（数量为整个持仓）
+
+        Args:
+            position: adapters.base_adapter.Position
+            stop_price: 止损触发价，None 为不设
+            take_profit_price: 止盈触发价，None 为不设
+        """
+        quantity = abs(position.size)
+        if stop_price is not None and take_profit_price is not None:
+            return list(self.add_bracket(
+                position.symbol, position.side, quantity, stop_price, take_profit_price
+            ))
+        if stop_price is not None:
+            return [self.add_stop(position.symbol, position.side, quantity, stop_price)]
+        if take_profit_price is not None:
+            return [self.add_take_profit(position.symbol, position.side, quantity, take_profit_price)]
+        return []
+
+    def cancel(self, trigger_id: str) -> bool:
+        """撤销条件单（惰性删除），返回是否撤销成功"""
+        with self._lock:
+            trigger = self.triggers.get(trigger_id)
+            if trigger is None or trigger.status != ARMED:
+                return False
+            self._retire(trigger, CANCELLED)
+            return True
+
+    def cancel_symbol(self, symbol: str) -> int:
+        """撤销交易对的所有待触发条件单，返回撤销数量"""
+        with self._lock:
+            armed = [t for t in self.triggers.values() if t.symbol == symbol and t.status == ARMED]
+            for trigger in armed:
+                self._retire(trigger, CANCELLED)
+            self._books.pop(symbol, None)
+            return len(armed)
+
+    def trigger_for(self, client_order_id: str) -> Optional[Trigger]:
+        """
+        按订单的 client_order_id 查找触发它的条件单（如成交回报、订单查询结果）
+
+        已结束的条件单会在清理时移除，之后查不到；需要长期保留时在 on_fire 回调中记录
+        """
+        return self._client_ids.get(str(client_order_id))
+
+    def armed(self, symbol: Optional[str] = None) -> List[Trigger]:
+        """待触发的条件单"""
+        with self._lock:
+            return [
+                t for t in self.triggers.values()
+                if t.status == ARMED and (symbol is None or t.symbol == symbol)
+            ]
+
+    # ==================== 价格输入 ====================
+
+    def on_price(self, symbol: str, price: Number) -> List[Trigger]:
+        """
+        处理一个价格 tick，触发所有满足条件的条件单
+
+        Args:
+            symbol: 交易对符号
+            price: 最新价格
+
+        Returns:
+            List[Trigger]: 本次触发的条件单（下单在后台进行）
+        """
+        book = self._books.get(symbol)
+        if book is None:
+            return []
+        value = float(price)
+        # 快速路径：两个堆顶都不满足时不加锁直接返回
+        above, below = book.above, book.below
+        if (not above or above[0][0] > value) and (not below or -below[0][0] < value):
+            return []
+
+        fired: List[Trigger] = []
+        with self._lock:
+            # 重新读取 book 的堆：_compact() 可能已经替换了列表
+            while book.above and book.above[0][0] <= value:
+                trigger = heapq.heappop(book.above)[2]
+                if trigger.status == ARMED:
+                    self._fire(trigger, value)
+                    fired.append(trigger)
+            while book.below and -book.below[0][0] >= value:
+                trigger = heapq.heappop(book.below)[2]
+                if trigger.status == ARMED:
+                    self._fire(trigger, value)
+                    fired.append(trigger)
+        for trigger in fired:
+            self._submit(trigger)
+        return fired
+
+    def on_ticker(self, ticker: Dict[str, Any], symbol: Optional[str] = None) -> List[Trigger]:
+        """处理 get_ticker 格式的行情（按 price_field 取价格）"""
+        price = self._ticker_price(ticker)
+        if price is None:
+            return []
+        return self.on_price(symbol or ticker.get("symbol"), price)
+
+    def start_polling(self, symbols: List[str], interval: float = 1.0) -> None:
+        """启动后台线程定时轮询 get_ticker（没有 WS 行情时使用）"""
+        if self._poll_thread is not None and self._poll_thread.is_alive():
+            return
+        self._stop.clear()
+        self._poll_thread = threading.Thread(
+            target=self._poll_loop, args=(list(symbols), interval), name="trigger-poller", daemon=True
+        )
+        self._poll_thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """停止轮询线程"""
+        self._stop.set()
+        if self._poll_thread is not None:
+            self._poll_thread.join(timeout)
+            self._poll_thread = None
+
+    # ==================== 内部实现 ====================
+
+    def _ticker_price(self, ticker: Dict[str, Any]) -> Optional[float]:
+        for field in (self.price_field, "last_price", "mid_price"):
+            value = ticker.get(field)
+            if value:
+                return float(value)
+        return None
+
+    def _poll_loop(self, symbols: List[str], interval: float) -> None:
+        next_run = time.monotonic()
+        while not self._stop.is_set():
+            for symbol in symbols:
+                if symbol not in self._books:
+                    continue
+                try:
+                    self.on_ticker(self.adapter.get_ticker(symbol), symbol=symbol)
+                except Exception as e:
+                    logger.warning("条件单行情轮询失败: %s, 错误=%s", symbol, e)
+            next_run += interval
+            self._stop.wait(max(0.0, next_run - time.monotonic()))
+
+    def _retire(self, trigger: Trigger, status: str) -> None:
+        """改变条件单状态（调用方持有锁）；堆中的条目在弹出时跳过"""
+        if status == CANCELLED:
+            self._stale += 1
+        trigger.status = status
+        if trigger.oco_group is not None:
+            for sibling in self._groups.pop(trigger.oco_group, []):
+                if sibling is not trigger and sibling.status == ARMED:
+                    sibling.status = CANCELLED
+                    self._stale += 1
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        garbage = self._stale + self._finished
+        if garbage > self.compact_threshold and garbage > len(self.triggers) // 2:
+            self._compact()
+
+    def _compact(self) -> None:
+        """移除堆中已撤销的条目，并清理已结束的条件单记录（调用方持有锁）"""
+        for book in self._books.values():
+            book.above = [e for e in book.above if e[2].status == ARMED]
+            book.below = [e for e in book.below if e[2].status == ARMED]
+            heapq.heapify(book.above)
+            heapq.heapify(book.below)
+        # 保留待触发和下单中（FIRED）的条件单
+        self.triggers = {
+            k: t for k, t in self.triggers.items() if t.status in (ARMED, FIRED)
+        }
+        self._client_ids = {k: t for k, t in self._client_ids.items() if t.status == FIRED}
+        self._stale = 0
+        self._finished = 0
+
+    def _fire(self, trigger: Trigger, price: float) -> None:
+        trigger.fired_price = price
+        trigger.fired_at = time.time()
+        # GRVT/Nado 只接受整数 client_order_id
+        trigger.client_order_id = new_client_order_id()
+        self._client_ids[trigger.client_order_id] = trigger
+        self._retire(trigger, FIRED)
+        logger.info("条件单触发: %r, 价格=%s", trigger, price)
+
+    def _submit(self, trigger: Trigger) -> None:
+        future = self.adapter._get_executor().submit(
+            self.adapter.place_order,
+            symbol=trigger.symbol,
+            side=trigger.side,
+            order_type=trigger.order_type,
+            quantity=trigger.quantity,
+            price=trigger.limit_price,
+            time_in_force="ioc" if trigger.order_type == "market" else "gtc",
+            reduce_only=trigger.reduce_only,
+            client_order_id=trigger.client_order_id,
+        )
+        future.add_done_callback(lambda f, t=trigger: self._on_order_done(t, f))
+
+    def _on_order_done(self, trigger: Trigger, future) -> None:
+        try:
+            order, error = future.result(), None
+        except Exception as e:
+            order, error = None, e
+        with self._lock:
+            trigger.order = order
+            if error is None:
+                trigger.status = SUBMITTED
+            else:
+                trigger.status = FAILED
+                trigger.error = str(error)
+            self._finished += 1
+            self._maybe_compact()
+        if error is not None:
+            logger.error("条件单下单失败: %r, 错误=%s", trigger, error)
+        if self.on_fire is not None:
+            try:
+                self.on_fire(trigger)
+            except Exception as e:
+                logger.warning("条件单回调异常: %r, 错误=%s", trigger, e)
@@ -0,0 +1,3 @@
+"""
+MoreLogin 浏览器环境自动化（依赖 playwright：pip install playwright && playwright install chromium）
+"""
@@ -0,0 +1,47 @@
+"""
+MoreLogin 本地 API
+
+MoreLogin 客户端必须已启动并登录（默认端口 40000）。
+文档: https://docs.morelogin.com/l/en/interface-documentation/browser-profile
+"""
+import logging
+from typing import Any, Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_BASE_URL = "http://localhost:40000"
+
+
+def normalize_url(url: str) -> str:
+    """标准化 URL 用于比较（去掉查询参数、锚点和结尾的 /）"""
+    return url.split('?')[0].split('#')[0].rstrip('/')
+
+
+class MoreLoginAPI:
+    """MoreLogin 本地 API 客户端"""
+
+    def __init__(self, base_url: str = DEFAULT_API_BASE_URL, timeout: float = 10):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _post(self, path: str, data: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        response = requests.post(f"{self.base_url}{path}", json=data, timeout=timeout or self.timeout)
+        return response.json()
+
+    def start(self, env_id: str) -> str:
+        """启动浏览器环境（已启动时直接返回），返回 CDP URL"""
+        data = self._post("/api/env/start", {"envId": env_id})
+        if data.get("code") != 0:
+            raise RuntimeError(f"启动环境失败: {env_id}, {data.get('msg', '')}")
+        return f"http://127.0.0.1:{data['data']['debugPort']}"
+
+    def stop(self, env_id: str, timeout: Optional[float] = None) -> bool:
+        """关闭浏览器环境"""
+        try:
+            data = self._post("/api/env/close", {"envId": env_id}, timeout)
+            return data.get("code") != -1
+        except Exception as e:
+            logger.warning("关闭环境失败: %s, 错误=%s", env_id, e)
+            return False
@@ -0,0 +1,228 @@
+"""
+MoreLogin CDP 连接池（sync Playwright）
+
+按 env_id 缓存浏览器、上下文和页面，下单等操作只剩 DOM 交互的耗时：
+- 每个环境只在首次使用时调用 /api/env/start 和 connect_over_cdp，之后复用连接和页面
+- 返回的 PooledPage 是页面代理，每次使用前做本地健康检查（页面未关闭、CDP 连接未断开），
+  并每隔 health_check_interval 秒执行一次 page.evaluate 探活
+- 页面或浏览器崩溃后自动重连：先用原 CDP URL 重新连接，失败再通过 MoreLogin API 重新启动环境，
+  调用方持有的 PooledPage 不需要替换
+
+使用示例:
+    with sync_playwright() as playwright:
+        pool = CdpPool(playwright)
+        page = pool.get_page(env_id, "https://app.nado.xyz/perpetuals?market=BTCUSDT0")
+        page.query_selector("...")      # 与 Page 用法相同
+        pool.close()
+"""
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from morelogin.api import DEFAULT_API_BASE_URL, MoreLoginAPI, normalize_url
+
+logger = logging.getLogger(__name__)
+
+
+class PooledConnection:
+    """一个环境的 CDP 连接"""
+
+    def __init__(self, env_id: str, url: str):
+        self.env_id = env_id
+        self.url = url
+        self.cdp_url: Optional[str] = None
+        self.browser: Any = None
+        self.context: Any = None
+        self.page: Any = None
+        self.connects = 0
+        self.last_check = 0.0
+
+    def is_alive(self) -> bool:
+        """本地状态检查（不产生 CDP 请求）"""
+        try:
+            return (
+                self.page is not None
+                and self.browser.is_connected()
+                and not self.page.is_closed()
+            )
+        except Exception:
+            return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "env_id": self.env_id,
+            "url": self.url,
+            "cdp_url": self.cdp_url,
+            "alive": self.is_alive(),
+            "connects": self.connects,
+        }
+
+
+class PooledPage:
+    """页面代理：属性访问转发到连接池中当前可用的页面"""
+
+    __slots__ = ("_pool", "_env_id")
+
+    def __init__(self, pool: "CdpPool", env_id: str):
+        self._pool = pool
+        self._env_id = env_id
+
+    @property
+    def env_id(self) -> str:
+        return self._env_id
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool.page(self._env_id), name)
+
+    def __repr__(self) -> str:
+        return f"PooledPage(env_id={self._env_id!r})"
+
+
+class CdpPool:
+    """按 env_id 复用 CDP 连接和页面"""
+
+    def __init__(
+        self,
+        playwright: Any,
+        api_base_url: str = DEFAULT_API_BASE_URL,
+        api_timeout: float = 10,
+        page_load_timeout: float = 120000,
+        wait_until: str = "domcontentloaded",
+        health_check_interval: float = 5.0,
+        close_other_pages: bool = False,
+    ):
+        """
+        Args:
+            playwright: sync Playwright 对象
+            api_base_url: MoreLogin 本地 API 地址
+            api_timeout: MoreLogin API 请求超时（秒）
+            page_load_timeout: 页面加载超时（毫秒）
+            wait_until: 页面加载等待策略
+            health_check_interval: page.evaluate 探活间隔（秒），0 为每次使用都探活
+            close_other_pages: 打开页面后是否关闭该环境中的其它页面
+        """
+        self.playwright = playwright
+        self.api = MoreLoginAPI(api_base_url, api_timeout)
+        self.page_load_timeout = page_load_timeout
+        self.wait_until = wait_until
+        self.health_check_interval = health_check_interval
+        self.close_other_pages = close_other_pages
+        self.connections: Dict[str, PooledConnection] = {}
+
+    def get_page(self, env_id: str, url: str) -> PooledPage:
+        """
+        获取环境中打开 url 的页面（首次调用时启动环境并连接）
+
+        Raises:
+            RuntimeError: 环境启动失败
+        """
+        conn = self.connections.get(env_id)
+        if conn is None:
+            conn = self.connections[env_id] = PooledConnection(env_id, url)
+        elif normalize_url(conn.url) != normalize_url(url):
+            conn.url = url
+            if conn.is_alive():
+                conn.page.goto(url, timeout=self.page_load_timeout, wait_until=self.wait_until)
+        self.page(env_id)
+        return PooledPage(self, env_id)
+
+    def page(self, env_id: str) -> Any:
+        """返回环境当前可用的 Page 对象，连接失效时重连"""
+        conn = self.connections[env_id]
+        if conn.is_alive():
+            if self._probe(conn):
+                return conn.page
+            # 页面无响应（如渲染进程崩溃）：关闭后重新打开
+            try:
+                conn.page.close()
+            except Exception:
+                pass
+        self._reconnect(conn)
+        return conn.page
+
+    def _probe(self, conn: PooledConnection) -> bool:
+        now = time.monotonic()
+        if now - conn.last_check < self.health_check_interval:
+            return True
+        try:
+            conn.page.evaluate("1")
+        except Exception as e:
+            logger.warning("环境页面无响应: %s, 错误=%s", conn.env_id, e)
+            return False
+        conn.last_check = now
+        return True
+
+    def _reconnect(self, conn: PooledConnection) -> None:
+        if conn.connects:
+            logger.warning("环境连接失效，重新连接: %s", conn.env_id)
+        if conn.browser is None or not self._is_connected(conn.browser):
+            conn.browser = None
+            if conn.cdp_url is not None:
+                # 浏览器可能仍在运行，只是 CDP 连接断开
+                try:
+                    conn.browser = self.playwright.chromium.connect_over_cdp(conn.cdp_url)
+                except Exception as e:
+                    logger.info("原 CDP 地址连接失败: %s, 错误=%s", conn.env_id, e)
+            if conn.browser is None:
+                conn.cdp_url = self.api.start(conn.env_id)
+                conn.browser = self.playwright.chromium.connect_over_cdp(conn.cdp_url)
+        conn.context, conn.page = self._find_or_open_page(conn.browser, conn.url)
+        conn.connects += 1
+        conn.last_check = time.monotonic()
+
+    @staticmethod
+    def _is_connected(browser: Any) -> bool:
+        try:
+            return browser.is_connected()
+        except Exception:
+            return False
+
+    def _find_or_open_page(self, browser: Any, url: str):
+        target = normalize_url(url)
+        found = None
+        for context in browser.contexts:
+            for page in context.pages:
+                try:
+                    if not page.is_closed() and target in normalize_url(page.url or ""):
+                        found = (context, page)
+                        break
+                except Exception:
+                    continue
+            if found:
+                break
+        if found is None:
+            context = browser.contexts[0] if browser.contexts else browser.new_context()
+            page = context.new_page()
+            page.goto(url, timeout=self.page_load_timeout, wait_until=self.wait_until)
+            found = (context, page)
+        elif found[1].url != url:
+            try:
+                found[1].goto(url, timeout=self.page_load_timeout, wait_until=self.wait_until)
+            except Exception as e:
+                logger.warning("导航到目标 URL 失败: %s, 错误=%s，继续使用当前页面", url, e)
+        if self.close_other_pages:
+            for page in list(found[0].pages):
+                if page != found[1]:
+                    try:
+                        page.close()
+                    except Exception:
+                        pass
+        return found
+
+    def close(self, stop_profiles: bool = False) -> None:
+        """
+        断开所有 CDP 连接（浏览器保持打开）
+
+        Args:
+            stop_profiles: 是否同时通过 MoreLogin API 关闭浏览器环境
+        """
+        for conn in self.connections.values():
+            if conn.browser is not None:
+                try:
+                    conn.browser.close()
+                except Exception:
+                    pass
+            if stop_profiles:
+                self.api.stop(conn.env_id)
+        self.connections = {}
@@ -7,18 +7,15 @@ import sys
 import os
 import yaml
 import argparse
-import requests
 from playwright.sync_api import sync_playwright
 
+# 添加项目根目录到 Python 路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from morelogin.cdp_pool import CdpPool
 
-def start(env_id):
-    """启动浏览器配置文件，返回 CDP URL"""
-    response = requests.post("http://localhost:40000/api/env/start", 
-                            json={"envId": env_id}).json()
-    if response.get("code") != 0:
-        print(f"启动失败: {response.get('msg', '')}")
-        return None
-    return f"http://127.0.0.1:{response['data']['debugPort']}"
+_cdp_pool = None
 
 
 def get_url(symbol, platform="grvt"):
@@ -32,52 +29,21 @@ def get_url(symbol, platform="grvt"):
     return urls.get(platform) or urls.get("grvt")
 
 
-def normalize_url(url):
-    """标准化URL用于比较"""
-    return url.split('?')[0].split('#')[0].rstrip('/')
+def get_pool(playwright):
+    """返回 CDP 连接池（按环境ID复用浏览器连接和页面，打开页面后关闭其他页面）"""
+    global _cdp_pool
+    if _cdp_pool is None or _cdp_pool.playwright is not playwright:
+        _cdp_pool = CdpPool(playwright, close_other_pages=True)
+    return _cdp_pool
 
 
 def open_page(playwright, env_id, url, platform_name=""):
     """
     打开指定环境并访问页面，返回页面对象
-    如果页面已经打开，会复用已打开的页面
-    关闭该环境中的其他所有页面
+    连接和页面由连接池复用，关闭该环境中的其他所有页面；浏览器崩溃后使用页面时会自动重连
     """
-    cdp_url = start(env_id)
-    if cdp_url is None:
-        return None
-    
     try:
-        browser = playwright.chromium.connect_over_cdp(cdp_url)
-        ctx = browser.contexts[0]
-        url_main = normalize_url(url)
-        target_page = None
-        
-        # 检查是否已有匹配的页面
-        for page in ctx.pages:
-            try:
-                if url_main in normalize_url(page.url):
-                    target_page = page
-                    if page.url != url:
-                        page.goto(url, timeout=120000, wait_until="domcontentloaded")
-                    break
-            except:
-                continue
-        
-        # 如果没有找到匹配的页面，创建新页面
-        if target_page is None:
-            target_page = ctx.new_page()
-            target_page.goto(url, timeout=120000, wait_until="domcontentloaded")
-        
-        # 关闭其他所有页面
-        for page in ctx.pages:
-            if page != target_page:
-                try:
-                    page.close()
-                except:
-                    pass
-        
-        return target_page
+        return get_pool(playwright).get_page(env_id, url)
     except Exception as e:
         print(f"打开页面失败 ({platform_name}): {e}")
         return None
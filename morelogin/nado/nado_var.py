@@ -12,25 +12,13 @@ import argparse
 import requests
 from playwright.sync_api import sync_playwright
 
+# 添加项目根目录到 Python 路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from morelogin.cdp_pool import CdpPool
 
-def start(envId, uniqueId):
-    """启动浏览器配置文件，返回 CDP URL"""
-    if envId and envId.strip():
-        data = {"envId": envId}
-    elif uniqueId:
-        data = {"uniqueId": uniqueId}
-    else:
-        print("错误: 必须设置 env_id 或 unique_id 之一")
-        return None
-    
-    response = requests.post("http://localhost:40000/api/env/start", json=data).json()
-    
-    if response["code"] != 0:
-        print(f"启动失败: {response.get('msg', '')}")
-        return None
-
-    port = response["data"]["debugPort"]
-    return "http://127.0.0.1:" + port
+_cdp_pool = None
 
 
 def get_url(symbol, platform="nado"):
@@ -44,10 +32,18 @@ def get_url(symbol, platform="nado"):
         raise ValueError(f"不支持的平台: {platform}")
 
 
+def get_pool(playwright):
+    """返回 CDP 连接池（按环境ID复用浏览器连接和页面）"""
+    global _cdp_pool
+    if _cdp_pool is None or _cdp_pool.playwright is not playwright:
+        _cdp_pool = CdpPool(playwright)
+    return _cdp_pool
+
+
 def open_page(playwright, env_id, url):
     """
     打开指定环境并访问页面，返回页面对象
-    如果页面已经打开，会复用已打开的页面
+    连接和页面由连接池复用，只在首次打开时启动环境；浏览器崩溃后使用页面时会自动重连
     
     Args:
         playwright: Playwright对象
@@ -55,46 +51,10 @@ def open_page(playwright, env_id, url):
         url: 目标URL
     
     Returns:
-        Page对象，如果失败返回None
+        Page对象（连接池页面代理），如果失败返回None
     """
-    cdp_url = start(env_id, None)
-    if cdp_url is None:
-        return None
-    
     try:
-        browser = playwright.chromium.connect_over_cdp(cdp_url)
-        ctx = browser.contexts[0]
-        
-        # 检查是否已经有打开的页面匹配目标URL
-        existing_pages = ctx.pages
-        for existing_page in existing_pages:
-            try:
-                current_url = existing_page.url
-                # 比较URL（忽略协议、查询参数等）
-                # 提取主要部分进行比较
-                url_main = url.split('?')[0].split('#')[0]
-                current_url_main = current_url.split('?')[0].split('#')[0]
-                
-                if url_main in current_url_main or current_url_main in url_main:
-                    print(f"  检测到已打开的页面: {current_url}")
-                    print(f"  复用现有页面，无需重新打开")
-                    # 如果当前URL不完全匹配，导航到目标URL
-                    if current_url != url:
-                        try:
-                            existing_page.goto(url, timeout=120000, wait_until="domcontentloaded")
-                        except Exception as nav_e:
-                            print(f"  导航到目标URL时出错: {nav_e}，继续使用当前页面")
-                    return existing_page
-            except Exception as check_e:
-                # 如果检查页面URL时出错，跳过这个页面
-                continue
-        
-        # 如果没有找到匹配的页面，创建新页面
-        print(f"  未找到匹配的已打开页面，创建新页面")
-        page = ctx.new_page()
-        # 增加超时时间到120秒，使用domcontentloaded等待策略（更快）
-        page.goto(url, timeout=120000, wait_until="domcontentloaded")
-        return page
+        return get_pool(playwright).get_page(env_id, url)
     except Exception as e:
         print(f"打开页面失败: {url}")
         print(f"错误信息: {e}")
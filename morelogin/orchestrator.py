@@ -0,0 +1,359 @@
+"""
+MoreLogin 多环境异步编排
+
+用一个事件循环（async Playwright）并发驱动多个 MoreLogin 浏览器环境：
+- 并发启动环境并连接 CDP，不再逐个启动 + 固定间隔等待
+- 每个环境一个任务队列：同一页面上的 DOM 操作按提交顺序串行执行，不同环境之间并行
+- 全局并发上限（同时执行任务的环境数）和每个任务的超时，超时 / 异常只影响该环境的该任务
+- 等待使用 asyncio.sleep，不阻塞其它环境
+- 执行任务前检查页面和 CDP 连接，浏览器崩溃后自动重连
+
+20 个环境执行一轮的耗时约等于单个环境的耗时（受 max_concurrency 和 MoreLogin 客户端本身限制）。
+
+使用示例:
+    async def place_market(profile, side, amount):
+        await profile.page.get_by_text("市价", exact=True).click()
+        ...
+        return True
+
+    async with ProfileOrchestrator(max_concurrency=20, task_timeout=30) as orch:
+        await orch.open(env_ids, "https://grvt.io/exchange/perpetual/BTC-USDT")
+        results = await orch.run_round(place_market, "buy", 0.001)   # env_id -> 返回值或异常
+        await orch.run(env_ids[0], place_market, "sell", 0.001)      # 单个环境
+
+命令行（并发打开 zcj.py 配置文件中的所有环境）:
+    python morelogin/orchestrator.py -c morelogin/grvt/config.yaml
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from morelogin.api import DEFAULT_API_BASE_URL, MoreLoginAPI, normalize_url
+
+logger = logging.getLogger(__name__)
+
+ProfileFunc = Callable[..., Awaitable[Any]]
+
+# 任务超时参数的默认值：使用 ProfileOrchestrator.task_timeout
+_DEFAULT_TIMEOUT: Any = object()
+
+
+class _ProfileTask:
+    """环境任务队列中的一个任务"""
+
+    __slots__ = ("func", "args", "kwargs", "timeout", "future")
+
+    def __init__(self, func: ProfileFunc, args: tuple, kwargs: dict, timeout: Optional[float],
+                 future: asyncio.Future):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.timeout = timeout
+        self.future = future
+
+
+class Profile:
+    """一个已连接的浏览器环境"""
+
+    def __init__(self, env_id: str, url: str, cdp_url: str, browser: Any, context: Any, page: Any):
+        self.env_id = env_id
+        self.url = url
+        self.cdp_url = cdp_url
+        self.browser = browser
+        self.context = context
+        self.page = page
+        self.tasks_done = 0
+        self.tasks_failed = 0
+        self.reconnects = 0
+        self._queue: "asyncio.Queue[_ProfileTask]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """队列中等待执行的任务数"""
+        return self._queue.qsize()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "env_id": self.env_id,
+            "cdp_url": self.cdp_url,
+            "url": getattr(self.page, "url", None),
+            "pending": self.pending,
+            "tasks_done": self.tasks_done,
+            "tasks_failed": self.tasks_failed,
+            "reconnects": self.reconnects,
+        }
+
+
+class ProfileOrchestrator:
+    """在一个事件循环中并发管理多个 MoreLogin 环境"""
+
+    def __init__(
+        self,
+        api_base_url: str = DEFAULT_API_BASE_URL,
+        api_timeout: float = 10,
+        max_concurrency: int = 32,
+        task_timeout: Optional[float] = 60.0,
+        page_load_timeout: float = 30000,
+        wait_until: str = "domcontentloaded",
+        playwright: Any = None,
+    ):
+        """
+        Args:
+            api_base_url: MoreLogin 本地 API 地址
+            api_timeout: MoreLogin API 请求超时（秒）
+            max_concurrency: 同时启动 / 同时执行任务的环境数上限
+            task_timeout: 默认任务超时（秒），None 为不超时
+            page_load_timeout: 页面加载超时（毫秒）
+            wait_until: 页面加载等待策略
+            playwright: 已启动的 async Playwright 对象（不传时在 start() 中启动）
+        """
+        self.api = MoreLoginAPI(api_base_url, api_timeout)
+        self.max_concurrency = max_concurrency
+        self.task_timeout = task_timeout
+        self.page_load_timeout = page_load_timeout
+        self.wait_until = wait_until
+        self.profiles: Dict[str, Profile] = {}
+        self._playwright = playwright
+        self._owns_playwright = playwright is None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    # ==================== 生命周期 ====================
+
+    async def start(self) -> "ProfileOrchestrator":
+        """启动 Playwright"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+        return self
+
+    async def close(self, stop_profiles: bool = False) -> None:
+        """
+        停止所有环境的任务队列并断开 CDP 连接（浏览器保持打开）
+
+        Args:
+            stop_profiles: 是否同时通过 MoreLogin API 关闭浏览器环境
+        """
+        profiles = list(self.profiles.values())
+        self.profiles = {}
+        await asyncio.gather(*(self._close_profile(p, stop_profiles) for p in profiles))
+        if self._owns_playwright and self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self) -> "ProfileOrchestrator":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    # ==================== 打开环境 ====================
+
+    async def open(self, env_ids: Iterable[str], url: str) -> Dict[str, Profile]:
+        """
+        并发启动多个环境并打开 url（已打开的页面会被复用）
+
+        Returns:
+            成功打开的环境（失败的环境记录日志后跳过）
+        """
+        env_ids = list(dict.fromkeys(env_ids))
+        results = await asyncio.gather(*(self.open_profile(e, url) for e in env_ids), return_exceptions=True)
+        opened = {}
+        for env_id, result in zip(env_ids, results):
+            if isinstance(result, BaseException):
+                logger.error("打开环境失败: %s, 错误=%s", env_id, result)
+            else:
+                opened[env_id] = result
+        return opened
+
+    async def open_profile(self, env_id: str, url: str) -> Profile:
+        """启动单个环境、连接 CDP 并打开 url"""
+        if env_id in self.profiles:
+            return self.profiles[env_id]
+        async with self._semaphore:
+            cdp_url = await asyncio.to_thread(self.api.start, env_id)
+            browser = await self._playwright.chromium.connect_over_cdp(cdp_url)
+            try:
+                context, page = await self._find_or_open_page(browser, url)
+            except BaseException:
+                await browser.close()
+                raise
+        profile = Profile(env_id, url, cdp_url, browser, context, page)
+        profile._worker = asyncio.create_task(self._work(profile), name=f"profile-{env_id}")
+        self.profiles[env_id] = profile
+        logger.info("环境已打开: %s, %s", env_id, page.url)
+        return profile
+
+    async def _find_or_open_page(self, browser: Any, url: str):
+        target = normalize_url(url)
+        for context in browser.contexts:
+            for page in context.pages:
+                if target in normalize_url(page.url or ""):
+                    return context, page
+        context = browser.contexts[0] if browser.contexts else await browser.new_context()
+        page = await context.new_page()
+        await page.goto(url, wait_until=self.wait_until, timeout=self.page_load_timeout)
+        return context, page
+
+    async def _ensure_connected(self, profile: Profile) -> None:
+        """页面关闭或 CDP 连接断开时重连（原 CDP 地址连接失败则重新启动环境）"""
+        try:
+            if profile.browser.is_connected() and not profile.page.is_closed():
+                return
+        except Exception:
+            pass
+        logger.warning("环境连接失效，重新连接: %s", profile.env_id)
+        browser = profile.browser
+        if not browser.is_connected():
+            try:
+                browser = await self._playwright.chromium.connect_over_cdp(profile.cdp_url)
+            except Exception:
+                profile.cdp_url = await asyncio.to_thread(self.api.start, profile.env_id)
+                browser = await self._playwright.chromium.connect_over_cdp(profile.cdp_url)
+        profile.context, profile.page = await self._find_or_open_page(browser, profile.url)
+        profile.browser = browser
+        profile.reconnects += 1
+
+    async def _close_profile(self, profile: Profile, stop_profile: bool) -> None:
+        if profile._worker is not None:
+            profile._worker.cancel()
+            await asyncio.gather(profile._worker, return_exceptions=True)
+        while not profile._queue.empty():
+            task = profile._queue.get_nowait()
+            if not task.future.done():
+                task.future.cancel()
+        try:
+            await profile.browser.close()
+        except Exception as e:
+            logger.debug("断开 CDP 连接失败: %s, 错误=%s", profile.env_id, e)
+        if stop_profile:
+            await asyncio.to_thread(self.api.stop, profile.env_id)
+
+    # ==================== 任务 ====================
+
+    def submit(self, env_id: str, func: ProfileFunc, *args, timeout: Optional[float] = _DEFAULT_TIMEOUT,
+               **kwargs) -> asyncio.Future:
+        """
+        把任务放入环境的任务队列，返回任务结果的 Future
+
+        Args:
+            env_id: 环境 ID
+            func: 协程函数，调用方式为 await func(profile, *args, **kwargs)
+            timeout: 任务超时（秒），默认使用 task_timeout，None 为不超时
+        """
+        profile = self.profiles.get(env_id)
+        if profile is None:
+            raise KeyError(f"环境未打开: {env_id}")
+        future = asyncio.get_running_loop().create_future()
+        timeout = self.task_timeout if timeout is _DEFAULT_TIMEOUT else timeout
+        profile._queue.put_nowait(_ProfileTask(func, args, kwargs, timeout, future))
+        return future
+
+    async def run(self, env_id: str, func: ProfileFunc, *args, timeout: Optional[float] = _DEFAULT_TIMEOUT, **kwargs) -> Any:
+        """在单个环境上执行任务并等待结果"""
+        return await self.submit(env_id, func, *args, timeout=timeout, **kwargs)
+
+    async def run_round(
+        self,
+        func: ProfileFunc,
+        *args,
+        env_ids: Optional[List[str]] = None,
+        timeout: Optional[float] = _DEFAULT_TIMEOUT,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        在多个环境上并行执行同一个任务
+
+        Returns:
+            env_id -> 返回值；失败或超时的环境对应异常对象
+        """
+        env_ids = list(self.profiles) if env_ids is None else env_ids
+        futures = [self.submit(e, func, *args, timeout=timeout, **kwargs) for e in env_ids]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        return dict(zip(env_ids, results))
+
+    async def _execute(self, profile: Profile, task: _ProfileTask) -> Any:
+        await self._ensure_connected(profile)
+        return await task.func(profile, *task.args, **task.kwargs)
+
+    async def _work(self, profile: Profile) -> None:
+        """环境的任务循环：按顺序执行队列中的任务"""
+        while True:
+            task = await profile._queue.get()
+            if task.future.done():
+                continue
+            async with self._semaphore:
+                started = time.monotonic()
+                try:
+                    result = await asyncio.wait_for(self._execute(profile, task), task.timeout)
+                except asyncio.CancelledError:
+                    if not task.future.done():
+                        task.future.cancel()
+                    raise
+                except asyncio.TimeoutError:
+                    profile.tasks_failed += 1
+                    logger.warning("环境任务超时: %s, %s, %.1fs", profile.env_id,
+                                   getattr(task.func, "__name__", task.func), task.timeout)
+                    if not task.future.done():
+                        task.future.set_exception(
+                            asyncio.TimeoutError(f"环境 {profile.env_id} 任务超时 ({task.timeout}s)")
+                        )
+                except Exception as e:
+                    profile.tasks_failed += 1
+                    logger.error("环境任务失败: %s, 错误=%s", profile.env_id, e)
+                    if not task.future.done():
+                        task.future.set_exception(e)
+                else:
+                    profile.tasks_done += 1
+                    if not task.future.done():
+                        task.future.set_result(result)
+                logger.debug("环境任务完成: %s, 耗时 %.3fs", profile.env_id, time.monotonic() - started)
+
+
+async def _main(config_file: str) -> None:
+    import yaml
+
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    env_ids = config.get("env_ids", [])
+    if isinstance(env_ids, str):
+        env_ids = [e.strip() for e in env_ids.split(",") if e.strip()]
+    pair = (config.get("trading_pair") or "").strip().upper()
+    url = f"https://grvt.io/exchange/perpetual/{pair}" if pair else (config.get("target_url") or "").strip()
+    if not env_ids or not url:
+        print("错误: 配置文件中缺少 env_ids 或 trading_pair / target_url")
+        return
+
+    api = config.get("api", {})
+    browser = config.get("browser", {})
+    start = time.monotonic()
+    async with ProfileOrchestrator(
+        api_base_url=api.get("base_url", DEFAULT_API_BASE_URL),
+        api_timeout=api.get("timeout", 10),
+        page_load_timeout=browser.get("page_load_timeout", 30000),
+        wait_until=browser.get("wait_until", "domcontentloaded"),
+    ) as orch:
+        opened = await orch.open(env_ids, url)
+        print(f"成功: {len(opened)}/{len(env_ids)}，耗时 {time.monotonic() - start:.1f}s")
+        print("按 Ctrl+C 退出")
+        await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='并发打开 MoreLogin 环境')
+    parser.add_argument('-c', '--config', type=str, required=True,
+                        help='配置文件路径（格式同 grvt/config.yaml）')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(_main(args.config))
+    except KeyboardInterrupt:
+        print("\n程序已退出")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
 """
 Risk Management Module
 风险控制模块
+
+IndicatorTool 依赖 pandas 和 TA-Lib，首次访问时才导入（risk.enable 为 false 时不加载）
 """
-from risk.indicators import IndicatorTool
 
 __all__ = ["IndicatorTool"]
+
+
+def __getattr__(name):
+    if name == "IndicatorTool":
+        from risk.indicators import IndicatorTool
+        return IndicatorTool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -14,8 +14,12 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(os.path.dirname(current_dir))
 sys.path.insert(0, project_root)
 
-from adapters import create_adapter
-from risk import IndicatorTool
+from adapters import create_adapter, OrderReplace, OrderRequest
+from utils.logger import setup_logging, get_logger
+from utils.order_journal import OrderJournal
+from utils.rate_limiter import RateLimiter
+
+logger = get_logger(__name__)
 
 # 全局配置变量
 EXCHANGE_CONFIG = None
@@ -23,6 +27,10 @@ SYMBOL = None
 GRID_CONFIG = None
 RISK_CONFIG = None
 CANCEL_STALE_ORDERS_CONFIG = None
+LOGGING_CONFIG = None
+JOURNAL_CONFIG = None
+RATE_LIMIT_CONFIG = None
+UNWIND_CONFIG = None
 
 
 def load_config(config_file="config.yaml"):
@@ -55,7 +63,7 @@ def convert_symbol_format(symbol, exchange_name):
     
     Args:
         symbol: 原始交易对，如 "BTC-USDT" 或 "BTC-USD"
-        exchange_name: 交易所名称，如 "standx" 或 "grvt"
+        exchange_name: 交易所名称，如 "standx"、"grvt" 或 "nado"
     
     Returns:
         转换后的交易对格式
@@ -67,6 +75,12 @@ def convert_symbol_format(symbol, exchange_name):
             base, quote = symbol.split("-", 1)
             return f"{base}_{quote}_Perp"
         return symbol
+    elif exchange_name.lower() == "nado":
+        # Nado 使用 BTC-PERP 格式
+        # 将 "BTC-USDT" 转换为 "BTC-PERP"
+        if "-" in symbol and not symbol.upper().endswith("-PERP"):
+            return f"{symbol.split('-', 1)[0]}-PERP"
+        return symbol
     else:
         # StandX 等其他交易所保持原格式
         return symbol
@@ -83,6 +97,7 @@ def convert_symbol_for_adx(symbol):
                - "BTC-USD" (StandX 格式)
                - "BTC-USDT" (通用格式)
                - "BTC_USDT_Perp" (GRVT 格式)
+               - "BTC-PERP" (Nado 格式)
     
     Returns:
         转换后的交易对格式，用于 ADX 指标计算
@@ -90,6 +105,9 @@ def convert_symbol_for_adx(symbol):
     if "_" in symbol and "_Perp" in symbol:
         # GRVT 格式: BTC_USDT_Perp -> BTC-USDT
         return symbol.replace("_Perp", "").replace("_", "-")
+    elif symbol.upper().endswith("-PERP"):
+        # Nado 格式: BTC-PERP -> BTC-USDT
+        return f"{symbol.split('-', 1)[0]}-USDT"
     else:
         # StandX 等其他格式保持原样
         return symbol
@@ -106,7 +124,7 @@ def initialize_config(config_file="config.yaml", active_exchange_override=None):
         config_file: 配置文件路径
         active_exchange_override: 通过命令行参数指定的交易所名称（必需）
     """
-    global EXCHANGE_CONFIG, SYMBOL, GRID_CONFIG, RISK_CONFIG, CANCEL_STALE_ORDERS_CONFIG
+    global EXCHANGE_CONFIG, SYMBOL, GRID_CONFIG, RISK_CONFIG, CANCEL_STALE_ORDERS_CONFIG, LOGGING_CONFIG, JOURNAL_CONFIG, RATE_LIMIT_CONFIG, UNWIND_CONFIG
     
     config = load_config(config_file)
     
@@ -135,6 +153,10 @@ def initialize_config(config_file="config.yaml", active_exchange_override=None):
     GRID_CONFIG = config['grid']
     RISK_CONFIG = config.get('risk', {})
     CANCEL_STALE_ORDERS_CONFIG = config.get('cancel_stale_orders', {})
+    LOGGING_CONFIG = config.get('logging', {})
+    JOURNAL_CONFIG = config.get('journal', {})
+    RATE_LIMIT_CONFIG = config.get('rate_limit', {})
+    UNWIND_CONFIG = config.get('unwind', {})
 
 
 def generate_grid_arrays(current_price, price_step, grid_count, price_spread):
@@ -229,7 +251,7 @@ def get_pending_orders_arrays(adapter, symbol):
         # 如果适配器未实现，返回空数组
         return [], [], {}, {}
     except Exception as e:
-        print(f"获取未成交订单失败: {e}")
+        logger.warning("获取未成交订单失败: %s", e)
         return [], [], {}, {}
 
 
@@ -264,10 +286,12 @@ def cancel_stale_order_ids(adapter, symbol, stale_seconds=5, cancel_probability=
         
         # 如果有需要取消的订单，执行批量撤单
         if stale_order_ids:
-            print(f"随机取消未成交时间>{stale_seconds}秒的订单: {stale_order_ids} (概率: {cancel_probability*100}%)")
+            logger.info(
+                "随机取消未成交时间>%s秒的订单: %s (概率: %s%%)",
+                stale_seconds, stale_order_ids, cancel_probability * 100
+            )
             try:
-                if hasattr(adapter, 'cancel_orders_by_ids'):
-                    adapter.cancel_orders_by_ids(order_id_list=stale_order_ids)
+                adapter.cancel_orders(order_ids=[str(i) for i in stale_order_ids], symbol=symbol)
             except:
                 pass
     except Exception:
@@ -299,19 +323,87 @@ def cancel_orders_by_prices(cancel_long, cancel_short, long_price_to_ids, short_
     if not all_order_ids:
         return
     
-    # 批量撤单
+    # 批量撤单（交易所支持时一次请求撤销全部，否则由适配器并发撤单）
     try:
-        if hasattr(adapter, 'cancel_orders_by_ids'):
-            adapter.cancel_orders_by_ids(order_id_list=all_order_ids)
+        results = adapter.cancel_orders(order_ids=[str(i) for i in all_order_ids])
+    except Exception as e:
+        logger.warning("批量撤单失败: %s", e)
+        return
+    for result in results:
+        if not result.success:
+            logger.warning("[撤单失败] 订单ID=%s, 错误=%s", result.order_id, result.error)
+
+
+def pair_replace_orders(cancel_prices, place_prices, price_to_ids):
+    """把同一方向的撤单价格和下单价格配对成改单
+    
+    只有挂单数量为 1 的撤单价格才参与配对（多笔挂单的价格仍走普通撤单）。
+    
+    Args:
+        cancel_prices: 需要撤单的价格列表（已排序）
+        place_prices: 需要下单的价格列表（已排序）
+        price_to_ids: 价格到订单ID列表的字典映射
+    
+    Returns:
+        (pairs, rest_cancel, rest_place):
+        - pairs: [(撤单价格, 订单ID, 下单价格), ...]
+        - rest_cancel: 未配对的撤单价格
+        - rest_place: 未配对的下单价格
+    """
+    single_cancel = [p for p in cancel_prices if len(price_to_ids.get(p, [])) == 1]
+    pair_count = min(len(single_cancel), len(place_prices))
+    pairs = [
+        (single_cancel[i], price_to_ids[single_cancel[i]][0], place_prices[i])
+        for i in range(pair_count)
+    ]
+    paired_cancel = set(single_cancel[:pair_count])
+    rest_cancel = [p for p in cancel_prices if p not in paired_cancel]
+    rest_place = place_prices[pair_count:]
+    return pairs, rest_cancel, rest_place
+
+
+def replace_orders_by_prices(long_pairs, short_pairs, adapter, symbol, quantity):
+    """执行改单（撤旧单 + 下新单），交易所支持时使用原子改单
+    
+    Args:
+        long_pairs: 做多改单配对 [(撤单价格, 订单ID, 下单价格), ...]
+        short_pairs: 做空改单配对
+        adapter: 适配器实例
+        symbol: 交易对符号
+        quantity: 订单数量
+    """
+    if not long_pairs and not short_pairs:
+        return
+    
+    quantity_decimal = Decimal(str(quantity))
+    sides = ["buy"] * len(long_pairs) + ["sell"] * len(short_pairs)
+    pairs = list(long_pairs) + list(short_pairs)
+    replaces = [
+        OrderReplace(
+            symbol=symbol,
+            side=side,
+            quantity=quantity_decimal,
+            price=Decimal(str(new_price)),
+            order_id=str(order_id),
+            time_in_force="gtc",
+            reduce_only=False,
+        )
+        for side, (_, order_id, new_price) in zip(sides, pairs)
+    ]
+    try:
+        orders = adapter.replace_orders(replaces)
+    except Exception as e:
+        logger.warning("批量改单失败: %s", e)
+        return
+    for side, (old_price, _, new_price), order in zip(sides, pairs, orders):
+        label = "多单" if side == "buy" else "空单"
+        if order is not None:
+            logger.info(
+                "[改单成功][%s] %s -> %s, 数量=%s, 订单ID=%s",
+                label, old_price, new_price, quantity_decimal, getattr(order, 'order_id', None)
+            )
         else:
-            # 如果适配器没有批量撤单方法，逐个撤单
-            for order_id in all_order_ids:
-                try:
-                    adapter.cancel_order(order_id=str(order_id))
-                except:
-                    pass
-    except:
-        pass
+            logger.warning("[改单失败][%s] %s -> %s, 数量=%s", label, old_price, new_price, quantity_decimal)
 
 
 def place_orders_by_prices(place_long, place_short, adapter, symbol, quantity):
@@ -328,38 +420,34 @@ def place_orders_by_prices(place_long, place_short, adapter, symbol, quantity):
         return
     
     quantity_decimal = Decimal(str(quantity))
-    
-    # 做多订单：buy
-    for price in place_long:
-        try:
-            order = adapter.place_order(
-                symbol=symbol,
-                side="buy",
-                order_type="limit",
-                quantity=quantity_decimal,
-                price=Decimal(str(price)),
-                time_in_force="gtc",
-                reduce_only=False
-            )
-            print(f"[下单成功][多单] 价格={price}, 数量={quantity_decimal}, 订单ID={getattr(order, 'order_id', None)}")
-        except Exception as e:
-            print(f"[下单失败][多单] 价格={price}, 数量={quantity_decimal}, 错误={e}")
-    
-    # 做空订单：sell
-    for price in place_short:
-        try:
-            order = adapter.place_order(
-                symbol=symbol,
-                side="sell",
-                order_type="limit",
-                quantity=quantity_decimal,
-                price=Decimal(str(price)),
-                time_in_force="gtc",
-                reduce_only=False
+    sides = ["buy"] * len(place_long) + ["sell"] * len(place_short)
+    prices = list(place_long) + list(place_short)
+    requests = [
+        OrderRequest(
+            symbol=symbol,
+            side=side,
+            quantity=quantity_decimal,
+            price=Decimal(str(price)),
+            order_type="limit",
+            time_in_force="gtc",
+            reduce_only=False,
+        )
+        for side, price in zip(sides, prices)
+    ]
+    try:
+        results = adapter.place_orders(requests)
+    except Exception as e:
+        logger.warning("批量下单失败: %s", e)
+        return
+    for side, price, result in zip(sides, prices, results):
+        label = "多单" if side == "buy" else "空单"
+        if result.success:
+            logger.info(
+                "[下单成功][%s] 价格=%s, 数量=%s, 订单ID=%s",
+                label, price, quantity_decimal, result.order_id
             )
-            print(f"[下单成功][空单] 价格={price}, 数量={quantity_decimal}, 订单ID={getattr(order, 'order_id', None)}")
-        except Exception as e:
-            print(f"[下单失败][空单] 价格={price}, 数量={quantity_decimal}, 错误={e}")
+        else:
+            logger.warning("[下单失败][%s] 价格=%s, 数量=%s, 错误=%s", label, price, quantity_decimal, result.error)
 
 
 def calculate_cancel_orders(target_long, target_short, current_long, current_short):
@@ -415,6 +503,9 @@ def calculate_place_orders(target_long, target_short, current_long, current_shor
 def close_position_if_exists(adapter, symbol):
     """检查持仓，如果有持仓则市价平仓
     
+    开启 unwind 配置且持仓数量达到 unwind.min_quantity 时，改为客户端 TWAP 分批平仓
+    （execution.close_position_twap），避免大额持仓一次市价单打穿盘口。
+    
     注意: StandX 适配器的持仓查询接口可能未实现，此功能可能无法使用
     
     Args:
@@ -426,13 +517,33 @@ def close_position_if_exists(adapter, symbol):
         # get_positions 返回列表，取第一个持仓
         position = positions[0] if positions else None
         if position and position.size != Decimal("0"):
-            print(f"检测到持仓: {position.size} {position.side}")
-            print("取消所有未成交订单...")
+            logger.info("检测到持仓: %s %s", position.size, position.side)
+            logger.info("取消所有未成交订单...")
             adapter.cancel_all_orders(symbol=symbol)
-            # 然后市价平仓
-            print("市价平仓中...")
+            unwind = UNWIND_CONFIG or {}
+            if unwind.get('enable', False) and abs(position.size) >= Decimal(str(unwind.get('min_quantity', 0))):
+                from execution import close_position_twap
+                from execution.scheduler import DONE
+                logger.info("TWAP 分批平仓中...")
+                try:
+                    parent = close_position_twap(
+                        adapter,
+                        symbol,
+                        duration=unwind.get('duration', 60),
+                        slices=unwind.get('slices', 6),
+                        catch_up=unwind.get('catch_up', 0.3),
+                    )
+                except Exception as e:
+                    logger.warning("TWAP 平仓失败，改为市价平仓: %s", e)
+                else:
+                    if parent is None or (parent.status == DONE and parent.remaining <= 0):
+                        logger.info("平仓完成: %s", parent.to_dict() if parent else None)
+                        return
+                    logger.warning("TWAP 平仓未完成，剩余仓位市价平仓: %s", parent.to_dict())
+            # 然后市价平仓（TWAP 未完成时按当前剩余持仓平仓）
+            logger.info("市价平仓中...")
             adapter.close_position(symbol, order_type="market")
-            print("平仓完成")
+            logger.info("平仓完成")
         # 如果 position 为 None，说明 StandX 适配器的持仓查询接口可能未实现
     except Exception as e:
         # 如果持仓查询失败，静默处理（StandX 可能没有持仓查询接口）
@@ -455,7 +566,7 @@ def calculate_dynamic_price_spread(adx, current_price, default_spread, adx_thres
     max_spread = current_price * 0.01  # 最大为价格的1%
     
     if adx is not None:
-        print(f"ADX(5m): {adx:.2f}")
+        logger.info("ADX(5m): %.2f", adx)
         # ADX <= threshold 时使用默认值
         if adx <= adx_threshold:
             price_spread = default_spread
@@ -466,10 +577,10 @@ def calculate_dynamic_price_spread(adx, current_price, default_spread, adx_thres
             ratio = (effective_adx - adx_threshold) / (adx_max - adx_threshold)  # ADX 25-60 映射到 0-1
             dynamic_spread = default_spread + ratio * (max_spread - default_spread)
             price_spread = int(min(dynamic_spread, max_spread))
-        print(f"动态 price_spread: {price_spread} (默认: {default_spread}, 最大: {int(max_spread)})")
+        logger.info("动态 price_spread: %s (默认: %s, 最大: %s)", price_spread, default_spread, int(max_spread))
         return price_spread
     else:
-        print(f"ADX(5m): 获取失败，使用默认 price_spread: {default_spread}")
+        logger.info("ADX(5m): 获取失败，使用默认 price_spread: %s", default_spread)
         return default_spread
 
 
@@ -481,12 +592,14 @@ def run_strategy_cycle(adapter):
     """
     price_info = adapter.get_ticker(SYMBOL)
     last_price = price_info.get('last_price') or price_info.get('mid_price') or price_info.get('mark_price')
-    print(f"{SYMBOL} 价格: {last_price:.2f}")
+    logger.info("%s 价格: %.2f", SYMBOL, last_price)
 
     # 获取 ADX 指标并动态调整 price_spread
     default_spread = GRID_CONFIG['price_spread']
     
     if RISK_CONFIG.get('enable', False):
+        # 只在开启风控时导入（依赖 pandas 和 TA-Lib）
+        from risk import IndicatorTool
         indicator_tool = IndicatorTool()
         adx_symbol = convert_symbol_for_adx(SYMBOL)
         adx = indicator_tool.get_adx(adx_symbol, "5m", period=14)
@@ -502,22 +615,36 @@ def run_strategy_cycle(adapter):
         GRID_CONFIG['grid_count'],
         price_spread
     )
-    print(f"做多数组: {long_grid}")
-    print(f"做空数组: {short_grid}")
+    logger.debug("做多数组: %s", long_grid)
+    logger.debug("做空数组: %s", short_grid)
     
     # 获取未成交订单数组和价格到订单ID的映射
     long_pending, short_pending, long_price_to_ids, short_price_to_ids = get_pending_orders_arrays(adapter, SYMBOL)
-    print(f"当前做多数组: {long_pending}")
-    print(f"当前做空数组: {short_pending}")
+    logger.debug("当前做多数组: %s", long_pending)
+    logger.debug("当前做空数组: %s", short_pending)
     
     # 计算需要撤单的数组
     cancel_long, cancel_short = calculate_cancel_orders(
         long_grid, short_grid, long_pending, short_pending
     )
-    print(f"撤单做多数组: {cancel_long}")
-    print(f"撤单做空数组: {cancel_short}")
+    logger.debug("撤单做多数组: %s", cancel_long)
+    logger.debug("撤单做空数组: %s", cancel_short)
     
-    # 执行撤单
+    # 计算需要下单的数组
+    place_long, place_short = calculate_place_orders(
+        long_grid, short_grid, long_pending, short_pending
+    )
+    logger.debug("下单做多数组: %s", place_long)
+    logger.debug("下单做空数组: %s", place_short)
+    
+    # 撤单和下单按方向配对成改单：请求数减半，且该档位没有挂单的时间窗口更短
+    long_pairs, cancel_long, place_long = pair_replace_orders(cancel_long, place_long, long_price_to_ids)
+    short_pairs, cancel_short, place_short = pair_replace_orders(cancel_short, place_short, short_price_to_ids)
+    replace_orders_by_prices(
+        long_pairs, short_pairs, adapter, SYMBOL, GRID_CONFIG.get('order_quantity', 0.001)
+    )
+    
+    # 执行剩余撤单
     cancel_orders_by_prices(
         cancel_long, cancel_short, long_price_to_ids, short_price_to_ids, adapter
     )
@@ -528,14 +655,7 @@ def run_strategy_cycle(adapter):
         cancel_probability = CANCEL_STALE_ORDERS_CONFIG.get('cancel_probability', 0.5)
         cancel_stale_order_ids(adapter, SYMBOL, stale_seconds, cancel_probability)
     
-    # 计算需要下单的数组
-    place_long, place_short = calculate_place_orders(
-        long_grid, short_grid, long_pending, short_pending
-    )
-    print(f"下单做多数组: {place_long}")
-    print(f"下单做空数组: {place_short}")
-    
-    # 执行下单
+    # 执行剩余下单
     place_orders_by_prices(
         place_long, place_short, adapter, SYMBOL, GRID_CONFIG.get('order_quantity', 0.001)
     )
@@ -562,8 +682,6 @@ def main():
     
     # 加载配置文件
     try:
-        print(f"加载配置文件: {args.config}")
-        print(f"使用交易所: {args.exchange}")
         initialize_config(args.config, active_exchange_override=args.exchange)
     except FileNotFoundError as e:
         print(f"错误: {e}")
@@ -572,30 +690,47 @@ def main():
         print(f"加载配置文件失败: {e}")
         sys.exit(1)
     
+    # 日志在后台线程输出，不阻塞下单路径
+    setup_logging(**LOGGING_CONFIG)
+    logger.info("加载配置文件: %s", args.config)
+    logger.info("使用交易所: %s", args.exchange)
+    
     try:
         adapter = create_adapter(EXCHANGE_CONFIG)
         adapter.connect()
         
+        # 订单流水：下单/撤单事件只入内存缓冲区，后台线程批量写盘
+        if JOURNAL_CONFIG.get('enable', False):
+            journal_options = {k: v for k, v in JOURNAL_CONFIG.items() if k != 'enable'}
+            journal_options.setdefault('directory', 'logs/journal')
+            adapter.attach_journal(OrderJournal(**journal_options))
+        
+        # 限频：撤单优先于下单；多个实例共用 API Key 时设置相同的 shared_memory_name 共享令牌
+        if RATE_LIMIT_CONFIG.get('enable', False):
+            adapter.attach_rate_limiter(
+                RateLimiter.from_config(RATE_LIMIT_CONFIG, EXCHANGE_CONFIG.get('exchange_name', args.exchange))
+            )
+        
         sleep_interval = GRID_CONFIG.get('sleep_interval', 60)
         
-        print("策略开始运行，按 Ctrl+C 停止...")
-        print(f"休眠间隔: {sleep_interval} 秒\n")
+        logger.info("策略开始运行，按 Ctrl+C 停止...")
+        logger.info("休眠间隔: %s 秒", sleep_interval)
         
         while True:
             try:
                 run_strategy_cycle(adapter)
-                print(f"\n等待 {sleep_interval} 秒后继续...\n")
+                logger.debug("等待 %s 秒后继续...", sleep_interval)
                 time.sleep(sleep_interval)
             except KeyboardInterrupt:
-                print("\n\n策略已停止")
+                logger.info("策略已停止")
                 break
             except Exception as e:
-                print(f"策略循环错误: {e}")
-                print(f"等待 {sleep_interval} 秒后重试...\n")
+                logger.error("策略循环错误: %s", e)
+                logger.info("等待 %s 秒后重试...", sleep_interval)
                 time.sleep(sleep_interval)
         
     except Exception as e:
-        print(f"错误: {e}")
+        logger.error("错误: %s", e)
         return None
 
 
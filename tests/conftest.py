@@ -0,0 +1,148 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from adapters import grvt_adapter, nado_adapter, standx_adapter
+from adapters.grvt_adapter import GrvtAdapter
+from adapters.nado_adapter import NadoAdapter
+from adapters.standx_adapter import StandXAdapter
+from pysdk.grvt_ccxt_utils import get_grvt_order
+
+X18 = 10**18
+
+
+def nado_market(product_id: int, symbol: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        product_id=product_id,
+        symbol=symbol,
+        price_increment_x18=str(X18 // 10),
+        size_increment=str(X18 // 1000),
+        min_size=str(X18 // 1000),
+    )
+
+
+@pytest.fixture
+def private_key() -> str:
+    return "0x45917429615b8a68cd372c96f63092f3d672a0bc60202b188670354b89c43ae3"
+
+
+@pytest.fixture
+def nado_client(private_key: str) -> MagicMock:
+    client = MagicMock()
+    client.context.signer.address = "0x70997970C51812dc3A010C7d01b50e0d17dc79C8"
+    engine = client.context.engine_client
+    engine.get_symbols.return_value = SimpleNamespace(
+        symbols={
+            "BTC-PERP": nado_market(2, "BTC-PERP"),
+            "ETH-PERP": nado_market(4, "ETH-PERP"),
+        }
+    )
+    digests = iter(range(1, 1000))
+    engine.get_order_digest.side_effect = lambda order, product_id: "0x%064x" % next(
+        digests
+    )
+    return client
+
+
+@pytest.fixture
+def nado(nado_client: MagicMock, private_key: str) -> NadoAdapter:
+    with patch.object(nado_adapter, "create_nado_client", return_value=nado_client):
+        return NadoAdapter({"exchange_name": "nado", "private_key": private_key})
+
+
+class FakeGrvtClient:
+    """GrvtCcxt stand-in: builds orders with the real SDK payload builder.
+
+    When fill_ratio is set, orders fill by that ratio on their first fetch_order.
+    """
+
+    def __init__(self):
+        self.orders = {}
+        self.params = []
+        self.fill_ratio = None
+
+    def create_limit_order(self, symbol, side, amount, price, params={}):
+        return self.create_order(symbol, "limit", side, amount, price, params)
+
+    def create_order(self, symbol, order_type, side, amount, price=None, params={}):
+        self.params.append(dict(params))
+        order = get_grvt_order(
+            "1", symbol, order_type, side, amount, price or 0, params=params
+        )
+        client_order_id = order.metadata.client_order_id
+        self.orders[client_order_id] = {
+            "order_id": "0x%x" % len(self.orders),
+            "is_market": order.is_market,
+            "reduce_only": order.reduce_only,
+            "legs": [
+                {
+                    "instrument": symbol,
+                    "size": str(amount),
+                    "limit_price": str(price) if price else None,
+                    "is_buying_asset": side == "buy",
+                }
+            ],
+            "metadata": {"client_order_id": client_order_id},
+            "state": {"status": "PENDING", "traded_size": ["0"]},
+        }
+        return self.orders[client_order_id]
+
+    def fill(self, client_order_id, ratio=Decimal("1")):
+        order = self.orders[client_order_id]
+        size = Decimal(order["legs"][0]["size"])
+        order["state"] = {
+            "status": "FILLED" if ratio >= 1 else "CANCELLED",
+            "traded_size": [str(size * ratio)],
+            "update_time": "1700000000000000000",
+        }
+
+    def fetch_order(self, id=None, params={}):
+        order = self.orders.get(str(params.get("client_order_id")))
+        if not order:
+            return {}
+        if self.fill_ratio is not None and order["state"]["status"] == "PENDING":
+            self.fill(order["metadata"]["client_order_id"], self.fill_ratio)
+        return {"result": order}
+
+    def cancel_order(self, id=None, symbol=None, params={}):
+        return True
+
+    def fetch_ticker(self, symbol):
+        return {"instrument": symbol, "best_bid_price": "100", "best_ask_price": "101"}
+
+    def fetch_positions(self, symbols=[]):
+        return []
+
+
+@pytest.fixture
+def grvt_client() -> FakeGrvtClient:
+    return FakeGrvtClient()
+
+
+@pytest.fixture
+def grvt(grvt_client: FakeGrvtClient) -> GrvtAdapter:
+    with patch.object(grvt_adapter, "GrvtCcxt", return_value=grvt_client):
+        return GrvtAdapter({"exchange_name": "grvt", "env": "testnet"})
+
+
+@pytest.fixture
+def standx_http() -> MagicMock:
+    http = MagicMock()
+    http.place_order.side_effect = lambda **kwargs: {
+        "code": 0, "request_id": "req-%d" % http.place_order.call_count
+    }
+    return http
+
+
+@pytest.fixture
+def standx(standx_http: MagicMock, private_key: str, tmp_path) -> StandXAdapter:
+    with patch.object(standx_adapter, "StandXPerpHTTP", return_value=standx_http):
+        return StandXAdapter(
+            {
+                "exchange_name": "standx",
+                "private_key": private_key,
+                "credential_cache_dir": str(tmp_path / "credentials"),
+            }
+        )
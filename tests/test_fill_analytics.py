@@ -0,0 +1,129 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import concat_fills, summarize, with_positions
+from analytics.metrics import _average_cost, _fifo
+
+T0 = pd.Timestamp("2024-01-01", tz="UTC")
+
+
+def fills(*rows) -> pd.DataFrame:
+    """rows: (venue, account, symbol, minute, qty, price, fee, is_maker)"""
+    columns = ["venue", "account", "symbol", "minute", "qty", "price", "fee", "is_maker"]
+    frame = pd.DataFrame(rows, columns=columns)
+    frame["time"] = T0 + pd.to_timedelta(frame.pop("minute"), unit="min")
+    frame["trade_id"] = [str(i) for i in range(len(frame))]
+    frame["order_id"] = frame["trade_id"]
+    return concat_fills([frame])
+
+
+def btc(*trades) -> pd.DataFrame:
+    """trades: (qty, price) of one position, one minute apart"""
+    return fills(
+        *[("grvt", "a", "BTC", i, qty, price, 0.0, True) for i, (qty, price) in enumerate(trades)]
+    )
+
+
+def reference_fifo(qty, price) -> list:
+    """lot by lot FIFO to check the vectorized one against"""
+    lots: deque = deque()
+    realized = []
+    for q, p in zip(qty, price):
+        pnl = 0.0
+        while q and lots and (lots[0][0] > 0) != (q > 0):
+            lot_qty, lot_price = lots[0]
+            closed = min(abs(q), abs(lot_qty))
+            pnl += closed * (p - lot_price) * (1 if lot_qty > 0 else -1)
+            lot_qty -= closed * np.sign(lot_qty)
+            q -= closed * np.sign(q)
+            if lot_qty:
+                lots[0] = (lot_qty, lot_price)
+            else:
+                lots.popleft()
+        if q:
+            lots.append((q, p))
+        realized.append(pnl)
+    return realized
+
+
+def test_position_flip_realizes_the_closed_part_only():
+    frame = btc((1, 100), (1, 110), (-3, 120), (1, 100))
+    for method in ("fifo", "avg"):
+        out = with_positions(frame, method=method)
+        assert out["position"].tolist() == [1, 2, -1, 0]
+        # the flip closes 2 long at 100/110 and opens 1 short at 120
+        assert out["realized_pnl"].tolist() == pytest.approx([0, 0, 30, 20])
+
+
+def test_partial_closes_differ_between_fifo_and_average_cost():
+    frame = btc((1, 100), (1, 200), (-1, 150), (-1, 150))
+    fifo = with_positions(frame, method="fifo")
+    avg = with_positions(frame, method="avg")
+    assert fifo["realized_pnl"].tolist() == pytest.approx([0, 0, 50, -50])
+    assert avg["realized_pnl"].tolist() == pytest.approx([0, 0, 0, 0])
+    assert fifo["position"].tolist() == [1, 2, 1, 0]
+
+
+def test_fifo_matches_lot_by_lot_reference():
+    rng = np.random.default_rng(7)
+    qty = rng.choice([-3.0, -2.0, -1.0, 1.0, 2.0, 3.0], size=200)
+    price = rng.uniform(90, 110, size=200).round(2)
+    assert _fifo(qty, price) == pytest.approx(reference_fifo(qty, price))
+    # a round trip realizes the same total whatever the method
+    closing_qty = np.append(qty, -qty.sum())
+    closing_price = np.append(price, 100.0)
+    assert _fifo(closing_qty, closing_price).sum() == pytest.approx(
+        _average_cost(closing_qty, closing_price).sum()
+    )
+
+
+def test_positions_are_kept_per_venue_account_and_symbol():
+    frame = fills(
+        ("grvt", "a", "BTC", 0, 1, 100, 0.1, True),
+        ("grvt", "b", "BTC", 1, -1, 105, 0.1, False),
+        ("nado", "a", "ETH", 2, 2, 10, 0.02, True),
+        ("grvt", "a", "BTC", 3, -1, 110, 0.1, True),
+        ("grvt", "b", "BTC", 4, 1, 100, 0.1, False),
+        ("nado", "a", "ETH", 5, -1, 12, -0.01, True),
+    )
+    out = with_positions(frame)
+    assert out["realized_pnl"].tolist() == pytest.approx([0, 0, 0, 10, 5, 2])
+
+    summary = summarize(out)
+    assert summary.loc[("grvt", "a", "BTC"), "realized_pnl"] == pytest.approx(10)
+    assert summary.loc[("grvt", "b", "BTC"), "realized_pnl"] == pytest.approx(5)
+    assert summary.loc[("nado", "a", "ETH"), "position"] == 1
+    assert summary.loc[("nado", "a", "ETH"), "net_pnl"] == pytest.approx(2 - 0.01)
+
+    by_venue = summarize(out, by=("venue",))
+    assert by_venue.loc["grvt", "fills"] == 4
+    assert by_venue.loc["grvt", "net_pnl"] == pytest.approx(15 - 0.4)
+    assert by_venue.loc["nado", "volume"] == 3
+
+
+def test_maker_ratio_ignores_fills_with_unknown_maker_flag():
+    frame = fills(
+        ("standx", "a", "BTC", 0, 1, 100, 0.0, True),
+        ("standx", "a", "BTC", 1, -1, 100, 0.0, None),
+        ("standx", "a", "BTC", 2, 1, 100, 0.0, False),
+        ("standx", "a", "ETH", 3, 1, 10, 0.0, None),
+    )
+    summary = summarize(frame)
+    btc_row = summary.loc[("standx", "a", "BTC")]
+    assert btc_row["notional"] == pytest.approx(300)
+    assert btc_row["maker_notional"] == pytest.approx(100)
+    assert btc_row["maker_ratio"] == pytest.approx(0.5)
+    assert np.isnan(summary.loc[("standx", "a", "ETH"), "maker_ratio"])
+
+
+def test_summary_per_period():
+    frame = fills(
+        ("grvt", "a", "BTC", 0, 1, 100, 0.0, True),
+        ("grvt", "a", "BTC", 24 * 60, -1, 110, 0.0, True),
+    )
+    daily = summarize(frame, by=("venue",), freq="1D")
+    assert daily["realized_pnl"].tolist() == pytest.approx([0, 10])
+    assert daily["position"].tolist() == [1, 0]
@@ -0,0 +1,28 @@
+import time
+
+from adapters import grvt_adapter
+from adapters.grvt_adapter import GrvtAdapter
+from utils.credential_cache import CredentialCache
+
+
+def test_cached_cookie_reused_once_then_logged_in_again(grvt: GrvtAdapter, tmp_path, monkeypatch):
+    logins = []
+
+    def get_cookie_with_expiration(auth_path, api_key):
+        logins.append(api_key)
+        return {
+            "gravity": f"cookie-{len(logins)}",
+            "expires": time.time() + 3600,
+            "X-Grvt-Account-Id": "acc",
+        }
+
+    monkeypatch.setattr(grvt_adapter, "get_cookie_with_expiration", get_cookie_with_expiration)
+    cache = CredentialCache(str(tmp_path))
+    manager = grvt._create_auth_manager("key-relogin", cache)
+    try:
+        assert manager._login_fn()["gravity"] == "cookie-1"
+        # the manager asks again for a cookie it already used: the exchange rejected it
+        assert manager._login_fn()["gravity"] == "cookie-2"
+        assert logins == ["key-relogin", "key-relogin"]
+    finally:
+        manager.stop()
@@ -0,0 +1,53 @@
+import asyncio
+from decimal import Decimal
+
+from adapters.grvt_adapter import GrvtAdapter
+from adapters.nado_adapter import NadoAdapter
+from execution.hedger import DeltaHedger, HedgeAsset
+
+from tests.conftest import FakeGrvtClient
+
+
+def test_hedge_order_has_numeric_client_id(
+    nado: NadoAdapter, grvt: GrvtAdapter, grvt_client: FakeGrvtClient
+):
+    hedger = DeltaHedger(
+        {"nado": nado, "grvt": grvt},
+        [
+            HedgeAsset(
+                "BTC",
+                {"nado": "BTC-PERP", "grvt": "BTC_USDT_Perp"},
+                hedge_venue="grvt",
+                quantity_step="0.001",
+            )
+        ],
+        poll_interval=0,
+    )
+    hedger.on_position("nado", "BTC-PERP", 0)
+    hedger.on_position("grvt", "BTC_USDT_Perp", 0)
+
+    async def scenario():
+        hedged = asyncio.Event()
+        hedger.on_hedge = lambda record: hedged.set()
+        task = asyncio.create_task(hedger.run())
+        await asyncio.sleep(0)
+        hedger.on_fill("nado", "BTC-PERP", "0.5")
+        await asyncio.wait_for(hedged.wait(), 5)
+        record = hedger.history[-1]
+        hedger.on_fill(
+            "grvt", "BTC_USDT_Perp", "-0.5", price="100",
+            client_order_id=record.client_order_id,
+        )
+        hedger.stop()
+        await task
+        return record
+
+    record = asyncio.run(scenario())
+
+    assert record.error is None
+    (params,) = grvt_client.params
+    assert params["client_order_id"] == record.client_order_id
+    assert 2**63 <= int(record.client_order_id) < 2**64
+    assert hedger.record_for(record.order_id) is record
+    assert record.filled_quantity == Decimal("0.5")
+    assert hedger.net_delta("BTC") == 0
@@ -0,0 +1,115 @@
+import glob
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from utils.history_sync import NS_PER_SECOND, GrvtHistorySync
+
+DAY1 = int(datetime(2024, 1, 1, 23, 58, tzinfo=timezone.utc).timestamp())
+DAY2 = int(datetime(2024, 1, 2, 0, 1, tzinfo=timezone.utc).timestamp())
+
+
+def trade(seconds: int, instrument: str = "BTC_USDT_Perp") -> dict:
+    return {
+        "event_time": str(seconds * NS_PER_SECOND),
+        "instrument": instrument,
+        "is_buyer": True,
+        "size": "1",
+        "price": "100",
+        "trade_id": str(seconds),
+    }
+
+
+class FakeHistoryClient:
+    """fetch_my_trades of GrvtCcxt: newest first, paged by an offset cursor"""
+
+    def __init__(self, trades):
+        self.trades = trades
+        self.calls = []
+        self.fail_on_cursor = None
+        self.stuck_cursor = None
+
+    def fetch_my_trades(self, since=None, limit=None, params={}):
+        cursor = params.get("cursor")
+        self.calls.append((since, cursor))
+        if cursor is not None and cursor == self.fail_on_cursor:
+            raise ConnectionError("connection reset")
+        if self.stuck_cursor is not None:
+            # the server keeps answering with the same cursor
+            offset = limit if cursor == self.stuck_cursor else 0
+            return {"result": self.trades[offset : offset + limit], "next": self.stuck_cursor}
+        newest_first = sorted(
+            (t for t in self.trades if since is None or int(t["event_time"]) >= since),
+            key=lambda t: -int(t["event_time"]),
+        )
+        offset = int(cursor or 0)
+        page = newest_first[offset : offset + limit]
+        more = offset + limit < len(newest_first)
+        return {"result": page, "next": str(offset + limit) if more else None}
+
+
+def files(directory: str, pattern: str) -> list:
+    return sorted(
+        os.path.relpath(p, directory)
+        for p in glob.glob(os.path.join(directory, "fills", "*", pattern))
+    )
+
+
+def test_sync_partitions_by_day_and_resumes_after_watermark(tmp_path):
+    client = FakeHistoryClient(
+        [trade(DAY1), trade(DAY1 + 30, "ETH_USDT_Perp"), trade(DAY2), trade(DAY2 + 1)]
+    )
+    sync = GrvtHistorySync(client, str(tmp_path), page_size=3, part_rows=2)
+
+    assert sync.sync("fills") == 4
+    assert sync.watermark("fills") == (DAY2 + 1) * NS_PER_SECOND
+    assert [os.path.dirname(p) for p in files(str(tmp_path), "part-*.csv")] == [
+        "fills/2024-01-01",
+        "fills/2024-01-01",
+        "fills/2024-01-02",
+    ]
+    assert files(str(tmp_path), "*.tmp") == []
+
+    client.trades.append(trade(DAY2 + 60))
+    client.calls.clear()
+    assert sync.sync("fills") == 1
+    assert client.calls == [((DAY2 + 1) * NS_PER_SECOND + 1, None)]
+    assert sync.sync("fills") == 0
+
+    # partitions outside the range are not read
+    day2 = sync.query("fills", start=DAY2, columns=["trade_id"])
+    assert [row["trade_id"] for row in day2] == [str(DAY2), str(DAY2 + 1), str(DAY2 + 60)]
+    eth = sync.fills(symbol="ETH_USDT_Perp")
+    assert [(row["trade_id"], row["is_buyer"], row["size"]) for row in eth] == [
+        (str(DAY1 + 30), True, 1.0)
+    ]
+
+
+def test_interrupted_sync_commits_nothing(tmp_path):
+    client = FakeHistoryClient([trade(DAY1 + i) for i in range(5)])
+    sync = GrvtHistorySync(client, str(tmp_path), page_size=2, part_rows=1)
+    client.fail_on_cursor = "4"
+
+    with pytest.raises(ConnectionError):
+        sync.sync("fills")
+    assert files(str(tmp_path), "*") == []
+    assert sync.watermark("fills") is None
+
+    # a temp file left by a crashed process is discarded on the next run
+    leftover = tmp_path / "fills" / "2024-01-01" / "part-crashed-00000.csv.tmp"
+    leftover.parent.mkdir(parents=True, exist_ok=True)
+    leftover.write_text("event_time\n1\n")
+    client.fail_on_cursor = None
+    assert sync.sync("fills") == 5
+    assert files(str(tmp_path), "*.tmp") == []
+    assert len(sync.fills()) == 5
+
+
+def test_repeated_cursor_ends_the_sync(tmp_path):
+    client = FakeHistoryClient([trade(DAY1), trade(DAY1 + 1)])
+    client.stuck_cursor = "same"
+    sync = GrvtHistorySync(client, str(tmp_path), page_size=1)
+
+    assert sync.sync("fills") == 2
+    assert [cursor for _, cursor in client.calls] == [None, "same"]
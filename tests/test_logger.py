@@ -0,0 +1,27 @@
+import logging
+import queue
+import time
+
+from utils.logger import _QueueListener
+
+
+class AlwaysFullQueue(queue.Queue):
+    """a queue some producer refills as soon as it is drained"""
+
+    def put(self, item, block=True, timeout=None):
+        raise queue.Full
+
+    def put_nowait(self, item):
+        raise queue.Full
+
+
+def test_stop_returns_when_sentinel_cannot_be_queued():
+    listener = _QueueListener(AlwaysFullQueue(), logging.NullHandler())
+    listener.stop_timeout = 0.1
+    listener.start()
+
+    started = time.monotonic()
+    listener.stop()
+
+    assert time.monotonic() - started < 2
+    assert listener._thread is None
@@ -0,0 +1,266 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from adapters.base_adapter import OrderReplace
+from adapters.nado_adapter import NadoAdapter, digest_to_order_id
+from nado_protocol.engine_client.types.execute import (
+    CancelAndPlaceParams,
+    CancelOrdersParams,
+)
+from nado_protocol.indexer_client.types.query import IndexerLinkedSignerRateLimitData
+from nado_protocol.utils.exceptions import QueryFailedException
+from utils.rate_limiter import RateLimiter
+
+from tests.conftest import X18
+
+
+def open_order(digest: str, amount: int, unfilled: int, price: int = 100):
+    return SimpleNamespace(
+        digest=digest,
+        amount=str(amount),
+        unfilled_amount=str(unfilled),
+        price_x18=str(price * X18),
+        placed_at=1700000000,
+    )
+
+
+def cancelled(*digests: str):
+    return SimpleNamespace(
+        data=SimpleNamespace(
+            cancelled_orders=[SimpleNamespace(digest=d) for d in digests]
+        )
+    )
+
+
+def place(nado: NadoAdapter, symbol: str, side: str = "buy", **kwargs):
+    return nado.place_order(
+        symbol, side, "limit", Decimal("0.5"), Decimal("100"), **kwargs
+    )
+
+
+def test_cancel_orders_batches_into_one_request(nado: NadoAdapter):
+    btc = place(nado, "BTC-PERP", client_order_id="11")
+    eth = place(nado, "ETH-PERP", side="sell")
+    engine = nado.engine
+    engine.cancel_orders.return_value = cancelled(
+        nado._client_digests["11"],
+    )
+
+    results = nado.cancel_orders(
+        order_ids=[eth.order_id, "not-a-digest"], client_order_ids=["11"]
+    )
+
+    engine.cancel_orders.assert_called_once()
+    params: CancelOrdersParams = engine.cancel_orders.call_args[0][0]
+    assert params.productIds == [4, 2]
+    assert len(params.digests) == 2
+    assert [r.success for r in results] == [False, False, True]
+    assert results[0].error == "订单不存在或已成交"
+    assert "无效的订单ID" in results[1].error
+    assert results[2].order_id == btc.order_id
+    assert results[2].client_order_id == "11"
+    # the request succeeded, so neither order is kept in the local index
+    assert nado._order_products == {}
+    assert nado._client_digests == {}
+
+
+def test_cancel_orders_request_failure(nado: NadoAdapter):
+    order = place(nado, "BTC-PERP")
+    nado.engine.cancel_orders.side_effect = Exception("engine down")
+
+    results = nado.cancel_orders(order_ids=[order.order_id])
+
+    assert not results[0].success
+    assert results[0].error == "engine down"
+    assert len(nado._order_products) == 1
+
+
+def test_replace_orders_uses_cancel_and_place(nado: NadoAdapter):
+    old = place(nado, "BTC-PERP", client_order_id="21")
+
+    new = nado.replace_orders(
+        [
+            OrderReplace(
+                symbol="BTC-PERP",
+                side="buy",
+                quantity=Decimal("0.5"),
+                price=Decimal("101"),
+                order_id=old.order_id,
+                new_client_order_id="22",
+            )
+        ]
+    )[0]
+
+    engine = nado.engine
+    engine.cancel_and_place.assert_called_once()
+    engine.cancel_orders.assert_not_called()
+    params: CancelAndPlaceParams = engine.cancel_and_place.call_args[0][0]
+    assert params.cancel_orders.productIds == [2]
+    assert params.cancel_orders.digests[0].hex() == "%064x" % int(old.order_id)
+    assert params.place_order.id == 22
+    assert params.place_order.product_id == 2
+    assert new.price == Decimal("101")
+    assert new.client_order_id == "22"
+    assert "21" not in nado._client_digests
+    assert nado._client_digests["22"] == params.place_order.digest
+
+
+def test_replace_orders_failure_returns_none(nado: NadoAdapter):
+    old = place(nado, "BTC-PERP")
+    nado.engine.cancel_and_place.side_effect = Exception("order filled")
+
+    results = nado.replace_orders(
+        [
+            OrderReplace(
+                symbol="BTC-PERP",
+                side="buy",
+                quantity=Decimal("0.5"),
+                price=Decimal("101"),
+                order_id=old.order_id,
+            )
+        ]
+    )
+
+    assert results == [None]
+    assert old.order_id in [digest_to_order_id(d) for d in nado._order_products]
+
+
+def test_get_open_orders_queries_all_products_at_once(nado: NadoAdapter):
+    stale = place(nado, "ETH-PERP")
+    btc_digest = "0x" + "aa" * 32
+    nado.engine.get_subaccount_multi_products_open_orders.return_value = (
+        SimpleNamespace(
+            product_orders=[
+                SimpleNamespace(
+                    product_id=2,
+                    orders=[open_order(btc_digest, X18, X18 // 4)],
+                ),
+                SimpleNamespace(product_id=4, orders=[]),
+            ]
+        )
+    )
+
+    orders = nado.get_open_orders()
+
+    nado.engine.get_subaccount_multi_products_open_orders.assert_called_once_with(
+        [2, 4], nado.sender
+    )
+    assert len(orders) == 1
+    assert orders[0].symbol == "BTC-PERP"
+    assert orders[0].side == "buy"
+    assert orders[0].filled_quantity == Decimal("0.75")
+    assert orders[0].status == "partially_filled"
+    assert nado._order_products == {btc_digest: 2}
+    assert stale.order_id not in [digest_to_order_id(d) for d in nado._order_products]
+
+
+def test_get_open_orders_single_symbol(nado: NadoAdapter):
+    nado.engine.get_subaccount_multi_products_open_orders.return_value = (
+        SimpleNamespace(product_orders=[SimpleNamespace(product_id=4, orders=[])])
+    )
+
+    assert nado.get_open_orders("ETH-PERP") == []
+    nado.engine.get_subaccount_multi_products_open_orders.assert_called_once_with(
+        [4], nado.sender
+    )
+
+
+def test_get_order_open(nado: NadoAdapter):
+    order = place(nado, "BTC-PERP")
+    digest = next(iter(nado._order_products))
+    nado.engine.get_order.return_value = open_order(digest, X18 // 2, X18 // 2)
+
+    result = nado.get_order(order.order_id)
+
+    assert result.status == "open"
+    assert result.filled_quantity == 0
+    nado.client.context.indexer_client.get_historical_orders_by_digest.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "base_filled, status, filled",
+    [
+        (X18 // 2, "filled", Decimal("0.5")),
+        (X18 // 5, "cancelled", Decimal("0.2")),
+        (0, "cancelled", Decimal("0")),
+    ],
+)
+def test_get_order_no_longer_open(nado: NadoAdapter, base_filled, status, filled):
+    order = place(nado, "BTC-PERP", side="sell", client_order_id="31")
+    digest = next(iter(nado._order_products))
+    nado.engine.get_order.side_effect = QueryFailedException("order not found")
+    indexer = nado.client.context.indexer_client
+    indexer.get_historical_orders_by_digest.return_value = SimpleNamespace(
+        orders=[
+            SimpleNamespace(
+                digest=digest,
+                product_id=2,
+                amount=str(-X18 // 2),
+                price_x18=str(100 * X18),
+                base_filled=str(-base_filled),
+                quote_filled=str(base_filled * 100),
+            )
+        ]
+    )
+
+    result = nado.get_order(order.order_id)
+
+    indexer.get_historical_orders_by_digest.assert_called_once_with([digest])
+    assert result.status == status
+    assert result.filled_quantity == filled
+    assert result.side == "sell"
+    assert result.client_order_id == "31"
+
+
+def test_get_order_unknown_to_indexer(nado: NadoAdapter):
+    order = place(nado, "BTC-PERP")
+    nado.engine.get_order.side_effect = QueryFailedException("order not found")
+    indexer = nado.client.context.indexer_client
+    indexer.get_historical_orders_by_digest.return_value = SimpleNamespace(orders=[])
+
+    assert nado.get_order(order.order_id) is None
+
+
+def test_get_order_request_failure_raises(nado: NadoAdapter):
+    order = place(nado, "BTC-PERP")
+    nado.engine.get_order.side_effect = ConnectionError("timeout")
+
+    with pytest.raises(Exception, match="Nado 查询订单失败"):
+        nado.get_order(order.order_id)
+
+
+@pytest.mark.parametrize(
+    "config, bucket",
+    [
+        ({}, "order"),
+        ({"total_per_second": 50}, "total"),
+    ],
+)
+def test_rate_limiter_seeded_from_linked_signer_limits(nado: NadoAdapter, config, bucket):
+    indexer = nado.client.context.indexer_client
+    indexer.get_linked_signer_rate_limits.return_value = IndexerLinkedSignerRateLimitData(
+        remaining_tx="30", total_tx_limit="600", wait_time=0, signer="0x00"
+    )
+    nado.linked_signer_window = 60
+    limiter = RateLimiter.from_config(config, "nado")
+
+    nado.attach_rate_limiter(limiter)
+
+    indexer.get_linked_signer_rate_limits.assert_called_once_with(nado.sender)
+    assert limiter.rates[bucket] == 10
+    assert limiter.capacities[bucket] == 600
+    assert limiter.snapshot()[bucket]["tokens"] == pytest.approx(30, abs=1)
+
+
+def test_rate_limiter_kept_when_linked_signer_query_fails(nado: NadoAdapter):
+    indexer = nado.client.context.indexer_client
+    indexer.get_linked_signer_rate_limits.side_effect = Exception("indexer down")
+    nado.linked_signer_window = 60
+    limiter = RateLimiter.from_config({}, "nado")
+
+    nado.attach_rate_limiter(limiter)
+
+    assert nado.rate_limiter is limiter
+    assert limiter.capacities["order"] == 10
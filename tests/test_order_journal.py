@@ -0,0 +1,147 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from adapters.grvt_adapter import GrvtAdapter
+from adapters.nado_adapter import NadoAdapter
+from nado_protocol.utils.exceptions import QueryFailedException
+from utils.order_journal import OrderJournal, read_journal
+
+from tests.conftest import X18, FakeGrvtClient
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = OrderJournal(str(tmp_path), flush_interval=60)
+    yield journal
+    journal.close()
+
+
+def fills(journal: OrderJournal) -> list:
+    journal.flush()
+    return [
+        (row["order_id"], row["quantity"], row["price"])
+        for row in read_journal(journal.directory, events=["fill"])
+    ]
+
+
+def test_active_parquet_file_is_read_after_roll(tmp_path):
+    pytest.importorskip("pyarrow")
+    journal = OrderJournal(str(tmp_path), fmt="parquet", flush_interval=60)
+    journal.record("place", symbol="BTC-PERP", order_id="1")
+    journal.flush()
+
+    # the file being written has no footer yet
+    assert read_journal(str(tmp_path)) == []
+
+    journal.roll()
+    journal.record("cancel", symbol="BTC-PERP", order_id="1")
+    journal.flush()
+
+    assert [row["event"] for row in read_journal(str(tmp_path))] == ["place"]
+    journal.close()
+    assert [row["event"] for row in read_journal(str(tmp_path))] == ["place", "cancel"]
+
+
+def test_nado_fills_journaled_from_open_orders_and_indexer(
+    nado: NadoAdapter, journal: OrderJournal
+):
+    nado.attach_journal(journal)
+    order = nado.place_order("BTC-PERP", "buy", "limit", Decimal("0.5"), Decimal("100"))
+    (digest,) = nado._order_products
+    engine = nado.engine
+    engine.get_subaccount_multi_products_open_orders.return_value = SimpleNamespace(
+        product_orders=[
+            SimpleNamespace(
+                product_id=2,
+                orders=[
+                    SimpleNamespace(
+                        digest=digest,
+                        amount=str(X18 // 2),
+                        unfilled_amount=str(3 * X18 // 10),
+                        price_x18=str(100 * X18),
+                        placed_at=1700000000,
+                    )
+                ],
+            )
+        ]
+    )
+    nado.get_open_orders("BTC-PERP")
+    nado.get_open_orders("BTC-PERP")
+
+    assert fills(journal) == [(order.order_id, 0.2, 100.0)]
+
+    # the order leaves the book fully filled at an average price of 100.6
+    engine.get_subaccount_multi_products_open_orders.return_value = SimpleNamespace(
+        product_orders=[SimpleNamespace(product_id=2, orders=[])]
+    )
+    indexer = nado.client.context.indexer_client
+    indexer.get_historical_orders_by_digest.return_value = SimpleNamespace(
+        orders=[
+            SimpleNamespace(
+                digest=digest,
+                product_id=2,
+                amount=str(X18 // 2),
+                price_x18=str(100 * X18),
+                base_filled=str(X18 // 2),
+                quote_filled=str(503 * X18 // 10),
+            )
+        ]
+    )
+    engine.get_order.side_effect = QueryFailedException("order not found")
+    nado.get_open_orders("BTC-PERP")
+    nado.get_open_orders()
+    nado.get_order(order_id=order.order_id)
+
+    indexer.get_historical_orders_by_digest.assert_called_with([digest])
+    assert fills(journal) == [
+        (order.order_id, 0.2, 100.0),
+        (order.order_id, pytest.approx(0.3), pytest.approx(101.0)),
+    ]
+
+
+def test_grvt_fills_journaled_once_per_increment(
+    grvt: GrvtAdapter, grvt_client: FakeGrvtClient, journal: OrderJournal
+):
+    grvt.attach_journal(journal)
+    order = grvt.place_order("BTC_USDT_Perp", "buy", "limit", Decimal("1"), Decimal("100"))
+    state = grvt_client.orders[order.order_id]["state"]
+
+    state.update(status="OPEN", traded_size=["0.4"], avg_fill_price=["99"])
+    grvt.get_order(order_id=order.order_id)
+    grvt.get_order(order_id=order.order_id)
+    state.update(status="FILLED", traded_size=["1"], avg_fill_price=["99.6"])
+    grvt.get_order(order_id=order.order_id)
+    grvt.get_order(order_id=order.order_id)
+
+    assert fills(journal) == [
+        (order.order_id, 0.4, 99.0),
+        (order.order_id, pytest.approx(0.6), pytest.approx(100.0)),
+    ]
+
+
+def test_failed_write_keeps_rows_for_the_next_flush(journal: OrderJournal, monkeypatch):
+    journal.record("place", symbol="BTC-PERP", order_id="1")
+    journal.record("cancel", symbol="BTC-PERP", order_id="1")
+
+    def disk_full(rows):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(journal, "_write_csv", disk_full)
+    with pytest.raises(OSError):
+        journal.flush()
+    monkeypatch.undo()
+
+    assert journal.flush() == 2
+    assert [row["event"] for row in read_journal(journal.directory)] == ["place", "cancel"]
+
+
+def test_buffer_is_bounded(tmp_path):
+    journal = OrderJournal(str(tmp_path), flush_interval=60, flush_size=100, max_buffer=3)
+    for order_id in range(5):
+        journal.record("place", order_id=str(order_id))
+
+    assert journal.dropped == 2
+    journal.close()
+    assert [row["order_id"] for row in read_journal(str(tmp_path))] == ["0", "1", "2"]
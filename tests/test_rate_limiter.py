@@ -0,0 +1,80 @@
+import asyncio
+import os
+import threading
+import time
+from multiprocessing import shared_memory
+
+import pytest
+
+from utils.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def shm_name() -> str:
+    return "test_rate_limiter_%d_%d" % (os.getpid(), time.monotonic_ns())
+
+
+def test_shared_limiters_share_tokens_and_limits(shm_name: str):
+    first = RateLimiter({"order": (1, 2)}, shared_memory_name=shm_name)
+    # a second process joining with another configuration uses the shared limits
+    second = RateLimiter({"order": (50, 50)}, shared_memory_name=shm_name)
+
+    assert second.capacities == {"order": 2}
+    assert first.try_acquire("order") and second.try_acquire("order")
+    assert not first.try_acquire("order")
+
+    second.update_bucket("order", rate=100, capacity=10, tokens=10)
+
+    assert first.rates == {"order": 100} and first.capacities == {"order": 10}
+    assert first.try_acquire("order")
+    first.close()
+    second.close()
+
+
+def test_last_close_unlinks_shared_memory(shm_name: str):
+    first = RateLimiter({"order": (1, 1)}, shared_memory_name=shm_name)
+    second = RateLimiter({"order": (1, 1)}, shared_memory_name=shm_name)
+
+    first.close()
+    shared_memory.SharedMemory(name=shm_name).close()  # still in use by second
+    second.close()
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=shm_name)
+
+
+def test_cancel_is_served_before_a_waiting_order():
+    limiter = RateLimiter({"total": (20, 1)}, routes={"order": ["total"], "cancel": ["total"]})
+    assert limiter.try_acquire("order")
+    served = []
+
+    def take(category, delay):
+        time.sleep(delay)
+        limiter.acquire(category)
+        served.append(category)
+
+    threads = [
+        threading.Thread(target=take, args=("order", 0)),
+        threading.Thread(target=take, args=("cancel", 0.01)),
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+    assert served == ["cancel", "order"]
+
+
+def test_async_waiter_wakes_when_the_blocking_request_leaves():
+    limiter = RateLimiter({"total": (1000, 1)}, routes={"order": ["total"], "cancel": ["total"]})
+
+    async def scenario():
+        limiter._enter("cancel", None)  # a cancel queued ahead
+        ticket = limiter._waiters[0]
+        task = asyncio.create_task(limiter.acquire_async("order", timeout=5))
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        limiter._leave(ticket)
+        return await asyncio.wait_for(task, 1)
+
+    assert asyncio.run(scenario())
@@ -0,0 +1,183 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from adapters.base_adapter import Position
+from adapters.grvt_adapter import GrvtAdapter
+from adapters.nado_adapter import NadoAdapter
+from execution.scheduler import DONE, FAILED, ExecutionScheduler, ParentOrder
+from nado_protocol.utils.exceptions import QueryFailedException
+
+from tests.conftest import X18, FakeGrvtClient
+
+
+def scheduler(adapter) -> ExecutionScheduler:
+    return ExecutionScheduler(adapter, poll_interval=0.01, sweep_timeout=0.1)
+
+
+def twap(symbol: str, quantity: str, **kwargs) -> ParentOrder:
+    kwargs.setdefault("duration", 0.2)
+    kwargs.setdefault("slices", 1)
+    return ParentOrder(symbol, "buy", quantity, "twap", **kwargs)
+
+
+def long_position(symbol: str, size: str) -> Position:
+    return Position(symbol, Decimal(size), "long", Decimal("100"), Decimal("100"), Decimal("0"))
+
+
+@pytest.fixture
+def nado_book(nado: NadoAdapter) -> NadoAdapter:
+    engine = nado.engine
+    engine.get_market_liquidity.return_value = SimpleNamespace(
+        bids=[[str(100 * X18), str(X18)]], asks=[[str(101 * X18), str(X18)]]
+    )
+    engine.get_market_price.return_value = SimpleNamespace(
+        bid_x18=str(100 * X18), ask_x18=str(101 * X18)
+    )
+    engine.get_subaccount_multi_products_open_orders.return_value = SimpleNamespace(
+        product_orders=[]
+    )
+    nado.get_position = MagicMock(return_value=None)
+    return nado
+
+
+def placed_orders(nado: NadoAdapter) -> dict:
+    """digest -> PlaceOrderParams of every order sent to the engine"""
+    return {
+        call.args[0].digest: call.args[0] for call in nado.engine.place_order.call_args_list
+    }
+
+
+def indexer_orders(nado: NadoAdapter, base_filled):
+    """indexer stub: every placed order reports base_filled(amount) as filled"""
+
+    def get_historical_orders_by_digest(digests):
+        placed = placed_orders(nado)
+        return SimpleNamespace(
+            orders=[
+                SimpleNamespace(
+                    digest=digest,
+                    product_id=placed[digest].product_id,
+                    amount=str(placed[digest].order.amount),
+                    price_x18=str(placed[digest].order.priceX18),
+                    base_filled=str(base_filled(int(placed[digest].order.amount))),
+                    quote_filled=str(
+                        base_filled(int(placed[digest].order.amount))
+                        * int(placed[digest].order.priceX18)
+                        // X18
+                    ),
+                )
+                for digest in digests
+                if digest in placed
+            ]
+        )
+
+    return get_historical_orders_by_digest
+
+
+def test_nado_child_fill_reported_by_get_order(nado_book: NadoAdapter):
+    nado = nado_book
+    nado.engine.get_order.side_effect = QueryFailedException("order not found")
+    indexer = nado.client.context.indexer_client
+    indexer.get_historical_orders_by_digest.side_effect = indexer_orders(
+        nado, lambda amount: amount
+    )
+
+    parent = scheduler(nado).run_sync(twap("BTC-PERP", "0.5"))
+
+    assert parent.status == DONE
+    assert parent.filled_quantity == Decimal("0.5")
+    assert parent.child_count == 1
+    (params,) = placed_orders(nado).values()
+    assert params.id == int(parent.child_ids[0])
+
+
+def test_grvt_child_ids_are_numeric(grvt: GrvtAdapter, grvt_client: FakeGrvtClient):
+    grvt_client.fill_ratio = Decimal("1")
+
+    parent = scheduler(grvt).run_sync(twap("BTC_USDT_Perp", "0.5", slices=2, duration=0.1))
+
+    assert parent.status == DONE
+    assert parent.filled_quantity == Decimal("0.5")
+    assert [p["client_order_id"] for p in grvt_client.params] == parent.child_ids
+    for client_order_id in parent.child_ids:
+        assert 2**63 <= int(client_order_id) < 2**64
+
+
+def test_grvt_partial_fill_is_not_replaced_as_full(
+    grvt: GrvtAdapter, grvt_client: FakeGrvtClient
+):
+    grvt_client.fill_ratio = Decimal("0.4")
+
+    parent = scheduler(grvt).run_sync(twap("BTC_USDT_Perp", "1", quantity_step="0.1"))
+
+    # every child fills 40% and is cancelled; the next child covers the rest
+    assert parent.status == DONE
+    filled = [Decimal(o["state"]["traded_size"][0]) for o in grvt_client.orders.values()]
+    assert parent.filled_quantity == sum(filled) <= Decimal("1")
+    assert len(set(parent.child_ids)) == parent.child_count
+
+
+def test_fills_inferred_from_positions_when_get_order_has_none(nado_book: NadoAdapter):
+    nado = nado_book
+    nado.engine.get_order.side_effect = QueryFailedException("order not found")
+    indexer = nado.client.context.indexer_client
+    indexer.get_historical_orders_by_digest.return_value = SimpleNamespace(orders=[])
+    # flat at the start, long 0.5 once the child is gone from the book
+    nado.get_position = MagicMock(
+        side_effect=[None] + [long_position("BTC-PERP", "0.5")] * 10
+    )
+
+    parent = scheduler(nado).run_sync(twap("BTC-PERP", "0.5"))
+
+    assert parent.status == DONE
+    assert parent.filled_quantity == Decimal("0.5")
+    assert parent.child_count == 1
+
+
+def test_refuses_to_start_when_fills_are_unobservable(nado_book: NadoAdapter):
+    nado = nado_book
+    nado.reports_order_fills = False
+    nado.get_position = MagicMock(side_effect=NotImplementedError("no positions"))
+
+    parent = scheduler(nado).run_sync(twap("BTC-PERP", "0.5"))
+
+    assert parent.status == FAILED
+    assert "无法确认子单成交" in parent.error
+    nado.engine.place_order.assert_not_called()
+
+
+def test_sweep_counts_only_confirmed_fills(nado_book: NadoAdapter):
+    nado = nado_book
+    # resting children stay open and unfilled; the market sweep is cancelled unfilled
+    resting = {}
+
+    def get_order(product_id, digest):
+        params = placed_orders(nado)[digest]
+        if digest in resting or params.order.priceX18 == 100 * X18:
+            resting[digest] = params
+            amount = int(params.order.amount)
+            return SimpleNamespace(
+                digest=digest,
+                amount=str(amount),
+                unfilled_amount=str(amount),
+                price_x18=str(params.order.priceX18),
+                placed_at=1700000000,
+            )
+        raise QueryFailedException("order not found")
+
+    nado.engine.get_order.side_effect = get_order
+    indexer = nado.client.context.indexer_client
+    indexer.get_historical_orders_by_digest.side_effect = indexer_orders(
+        nado, lambda amount: 0
+    )
+
+    parent = scheduler(nado).run_sync(
+        twap("BTC-PERP", "0.5", duration=0.05, catch_up=0, finish_with_market=True)
+    )
+
+    assert parent.status == FAILED
+    assert parent.filled_quantity == 0
+    assert parent.child_count == 2
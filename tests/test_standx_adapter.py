@@ -0,0 +1,85 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from adapters import standx_adapter
+from adapters.base_adapter import OrderRequest
+from adapters.standx_adapter import StandXAdapter
+
+
+def test_cancel_orders_maps_request_ids_to_client_ids(
+    standx: StandXAdapter, standx_http: MagicMock
+):
+    standx.token = "token"
+    placed = standx.place_orders(
+        [
+            OrderRequest("BTC-USD", "buy", Decimal("0.1"), Decimal("100")),
+            OrderRequest("BTC-USD", "sell", Decimal("0.1"), Decimal("110")),
+        ]
+    )
+    request_ids = [r.order.order_id for r in placed]
+    expected = dict(standx._request_client_ids)
+    assert sorted(expected) == sorted(request_ids)
+
+    results = standx.cancel_orders(order_ids=request_ids + ["42", "bad"], client_order_ids=["7"])
+
+    standx_http.cancel_orders.assert_called_once()
+    kwargs = standx_http.cancel_orders.call_args.kwargs
+    assert kwargs["order_id_list"] == [42]
+    assert kwargs["cl_ord_id_list"] == [expected[i] for i in request_ids] + ["7"]
+    assert [r.success for r in results] == [True, True, True, False, True]
+    assert [r.client_order_id for r in results[:2]] == [expected[i] for i in request_ids]
+    assert results[2].order_id == "42"
+    assert results[4].client_order_id == "7"
+
+
+def wallet_login(monkeypatch, tokens: list) -> MagicMock:
+    authenticate = MagicMock(
+        side_effect=lambda **kwargs: SimpleNamespace(token=tokens.pop(0))
+    )
+    monkeypatch.setattr(standx_adapter.StandXAuth, "authenticate", authenticate)
+    return authenticate
+
+
+def restart(standx: StandXAdapter, standx_http: MagicMock) -> StandXAdapter:
+    with patch.object(standx_adapter, "StandXPerpHTTP", return_value=standx_http):
+        return StandXAdapter(dict(standx.config))
+
+
+def test_rejected_cached_token_is_dropped_and_logged_in_again(
+    standx: StandXAdapter, standx_http: MagicMock, private_key: str, monkeypatch
+):
+    wallet_login(monkeypatch, ["token-1"])
+    standx.connect()
+    assert standx.token == "token-1"
+
+    # restart: the cached token was revoked on the exchange side
+    restarted = restart(standx, standx_http)
+    authenticate = wallet_login(monkeypatch, ["token-2"])
+    standx_http.query_balance.side_effect = ValueError("HTTP 401: unauthorized")
+
+    restarted.connect()
+
+    assert restarted.token == "token-2"
+    authenticate.assert_called_once()
+    standx_http.query_balance.assert_called_once_with("token-1")
+    cached = restarted.credential_cache.get(
+        "standx", f"{restarted.chain}:{restarted.wallet_address}", private_key
+    )
+    assert cached["token"] == "token-2"
+
+
+def test_cached_token_kept_on_network_error(
+    standx: StandXAdapter, standx_http: MagicMock, monkeypatch
+):
+    wallet_login(monkeypatch, ["token-1"])
+    standx.connect()
+
+    restarted = restart(standx, standx_http)
+    authenticate = wallet_login(monkeypatch, [])
+    standx_http.query_balance.side_effect = ConnectionError("timeout")
+
+    restarted.connect()
+
+    assert restarted.token == "token-1"
+    authenticate.assert_not_called()
@@ -0,0 +1,142 @@
+import threading
+from concurrent.futures import Future
+from decimal import Decimal
+from types import SimpleNamespace
+
+from adapters.grvt_adapter import GrvtAdapter
+from adapters.nado_adapter import NadoAdapter
+from execution.triggers import ABOVE, BELOW, CANCELLED, SUBMITTED, Trigger, TriggerEngine
+
+from tests.conftest import X18, FakeGrvtClient
+
+
+def fire_and_wait(engine: TriggerEngine, symbol: str, price) -> list:
+    done = threading.Event()
+    engine.on_fire = lambda trigger: done.set()
+    fired = engine.on_price(symbol, price)
+    assert done.wait(5)
+    return fired
+
+
+def test_grvt_trigger_order_has_numeric_client_id(
+    grvt: GrvtAdapter, grvt_client: FakeGrvtClient
+):
+    engine = TriggerEngine(grvt)
+    stop, take_profit = engine.add_bracket(
+        "BTC_USDT_Perp", "long", "0.5", stop_price=95, take_profit_price=105
+    )
+
+    (fired,) = fire_and_wait(engine, "BTC_USDT_Perp", 94)
+
+    assert fired is stop
+    assert stop.status == SUBMITTED
+    assert take_profit.status == CANCELLED
+    (params,) = grvt_client.params
+    assert params["client_order_id"] == stop.client_order_id
+    assert 2**63 <= int(stop.client_order_id) < 2**64
+    assert engine.trigger_for(stop.order.client_order_id) is stop
+
+
+def test_nado_trigger_order_id_is_int(nado: NadoAdapter):
+    nado.engine.get_market_price.return_value = SimpleNamespace(
+        bid_x18=str(100 * X18), ask_x18=str(101 * X18)
+    )
+    engine = TriggerEngine(nado)
+    trigger = engine.add_take_profit("BTC-PERP", "short", Decimal("0.5"), 100)
+
+    fire_and_wait(engine, "BTC-PERP", 99)
+
+    assert trigger.status == SUBMITTED
+    params = nado.engine.place_order.call_args[0][0]
+    assert isinstance(params.id, int)
+    assert engine.trigger_for(str(params.id)) is trigger
+
+
+class InlineAdapter:
+    """places orders synchronously so fired triggers finish before on_price returns"""
+
+    def __init__(self):
+        self.orders = []
+
+    def _get_executor(self):
+        return self
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+    def place_order(self, **kwargs):
+        self.orders.append(kwargs)
+        return SimpleNamespace(order_id=str(len(self.orders)), **kwargs)
+
+
+def prices(triggers: list) -> list:
+    return [int(t.trigger_price) for t in triggers]
+
+
+def test_triggers_fire_in_price_order():
+    engine = TriggerEngine(InlineAdapter())
+    for price in (105, 103, 110):
+        engine.add(Trigger("BTC", "sell", 1, price, ABOVE))
+    for price in (95, 97, 90):
+        engine.add(Trigger("BTC", "buy", 1, price, BELOW))
+
+    assert engine.on_price("BTC", 100) == []
+    assert prices(engine.on_price("BTC", 104)) == [103]
+    assert prices(engine.on_price("BTC", 111)) == [105, 110]
+    assert prices(engine.on_price("BTC", 96)) == [97]
+    assert prices(engine.on_price("BTC", 89)) == [95, 90]
+    assert engine.on_price("ETH", 1) == []
+    assert engine.armed() == []
+
+
+def test_cancelled_trigger_is_skipped_when_its_entry_is_popped():
+    engine = TriggerEngine(InlineAdapter())
+    stop = engine.add_stop("BTC", "long", 1, 95)
+    later = engine.add_stop("BTC", "long", 1, 90)
+
+    assert engine.cancel(stop.trigger_id)
+    assert not engine.cancel(stop.trigger_id)
+    # the entry stays in the heap until a tick reaches it
+    assert len(engine._books["BTC"].below) == 2
+    assert engine.on_price("BTC", 93) == []
+    assert len(engine._books["BTC"].below) == 1
+    assert engine.on_price("BTC", 90) == [later]
+    assert stop.status == CANCELLED
+
+
+def test_oco_siblings_are_cancelled():
+    adapter = InlineAdapter()
+    engine = TriggerEngine(adapter)
+    stop, take_profit = engine.add_bracket("BTC", "short", 1, stop_price=105, take_profit_price=95)
+
+    assert engine.on_price("BTC", 94) == [take_profit]
+    assert stop.status == CANCELLED
+    assert engine.on_price("BTC", 110) == []
+    assert [order["side"] for order in adapter.orders] == ["buy"]
+
+    # cancelling one side of a bracket cancels the other side too
+    stop, take_profit = engine.add_bracket("BTC", "long", 1, stop_price=95, take_profit_price=105)
+    assert engine.cancel(take_profit.trigger_id)
+    assert stop.status == CANCELLED
+    assert engine.armed() == []
+
+
+def test_compact_drops_cancelled_entries_and_finished_triggers():
+    engine = TriggerEngine(InlineAdapter())
+    engine.compact_threshold = 2
+    triggers = [engine.add(Trigger("BTC", "sell", 1, price, ABOVE)) for price in range(1, 13)]
+
+    for trigger in triggers[:7]:
+        engine.cancel(trigger.trigger_id)
+    assert len(engine._books["BTC"].above) == 5
+    assert set(engine.triggers) == {t.trigger_id for t in triggers[7:]}
+
+    # compaction runs while the order of the last fired trigger is still in flight
+    fired = engine.on_price("BTC", 11)
+    assert fired == triggers[7:11] and all(t.status == SUBMITTED for t in fired)
+    assert set(engine.triggers) == {triggers[10].trigger_id, triggers[11].trigger_id}
+    assert list(engine._client_ids.values()) == [triggers[10]]
+    assert engine.trigger_for(triggers[7].client_order_id) is None
+    assert engine.armed() == [triggers[11]]
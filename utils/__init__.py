@@ -0,0 +1,32 @@
+"""
+Common Utilities
+通用工具模块
+"""
+from utils.credential_cache import CredentialCache
+from utils.file_lock import FileLock
+from utils.history_sync import GrvtHistorySync
+from utils.logger import (
+    JsonFormatter,
+    SamplingFilter,
+    get_logger,
+    lazy,
+    setup_logging,
+    shutdown_logging,
+)
+from utils.order_journal import OrderJournal, read_journal
+from utils.rate_limiter import RateLimiter
+
+__all__ = [
+    "CredentialCache",
+    "FileLock",
+    "GrvtHistorySync",
+    "JsonFormatter",
+    "SamplingFilter",
+    "get_logger",
+    "lazy",
+    "OrderJournal",
+    "RateLimiter",
+    "read_journal",
+    "setup_logging",
+    "shutdown_logging",
+]
@@ -0,0 +1,207 @@
+"""
+Credential Cache
+
+加密的本地登录凭证缓存（StandX token、GRVT cookie 等）：
+- 按（命名空间, 账户）存储，每个账户一个文件
+- 文件用账户自己的密钥（私钥 / API Key）派生出的密钥加密（Fernet），没有密钥的人无法读取
+- 记录过期时间，剩余有效期不足时视为无效
+- 同一台机器上的多个进程通过文件锁互斥：同一时刻只有一个进程登录，其他进程直接读取它写入的结果
+
+使用示例:
+    from utils.credential_cache import CredentialCache
+
+    cache = CredentialCache()
+    token = cache.get_or_create(
+        "standx", wallet_address, secret=private_key,
+        create=login, min_ttl=3600,
+    )
+"""
+import base64
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.file_lock import FileLock
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".dd_strategy", "credentials")
+
+CACHE_VERSION = 1
+
+
+def _require_fernet():
+    try:
+        from cryptography.fernet import Fernet, InvalidToken
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+    except ImportError:
+        raise ImportError("凭证缓存需要安装 cryptography: pip install cryptography")
+    return Fernet, InvalidToken, hashes, HKDF
+
+
+class CredentialCache:
+    """加密、带过期时间、可跨进程共享的凭证缓存"""
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Args:
+            directory: 缓存目录，默认 ~/.dd_strategy/credentials
+        """
+        self.directory = directory or DEFAULT_CACHE_DIR
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        self._locks: Dict[str, FileLock] = {}
+
+    # ==================== 内部工具 ====================
+
+    def _entry_name(self, namespace: str, account: str) -> str:
+        digest = hashlib.sha256(f"{namespace}:{account}".encode("utf-8")).hexdigest()[:32]
+        return f"{namespace}_{digest}"
+
+    def _paths(self, namespace: str, account: str) -> Tuple[str, str]:
+        name = self._entry_name(namespace, account)
+        return (
+            os.path.join(self.directory, f"{name}.cred"),
+            os.path.join(self.directory, f"{name}.lock"),
+        )
+
+    def _lock(self, lock_path: str) -> FileLock:
+        lock = self._locks.get(lock_path)
+        if lock is None:
+            lock = self._locks[lock_path] = FileLock(lock_path)
+        return lock
+
+    @staticmethod
+    def _cipher(namespace: str, secret: str):
+        Fernet, _, hashes, HKDF = _require_fernet()
+        key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=f"dd-strategy-credential-cache:{namespace}".encode("utf-8"),
+        ).derive(secret.encode("utf-8"))
+        return Fernet(base64.urlsafe_b64encode(key))
+
+    def _read(self, path: str, namespace: str, secret: str) -> Optional[Dict[str, Any]]:
+        _, InvalidToken, _, _ = _require_fernet()
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            entry = json.loads(self._cipher(namespace, secret).decrypt(data))
+        except (InvalidToken, ValueError):
+            # 密钥变更或文件损坏，当作没有缓存
+            return None
+        if entry.get("version") != CACHE_VERSION:
+            return None
+        return entry
+
+    def _write(self, path: str, namespace: str, secret: str, entry: Dict[str, Any]) -> None:
+        data = self._cipher(namespace, secret).encrypt(json.dumps(entry).encode("utf-8"))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # 原子替换：其他进程要么读到旧文件，要么读到完整的新文件
+        os.replace(tmp_path, path)
+
+    # ==================== 公共接口 ====================
+
+    def get(
+        self,
+        namespace: str,
+        account: str,
+        secret: str,
+        min_ttl: float = 0.0,
+    ) -> Optional[Any]:
+        """
+        读取缓存的凭证
+
+        Args:
+            namespace: 命名空间，如 "standx"、"grvt"
+            account: 账户标识（钱包地址、API Key 等）
+            secret: 用于派生加密密钥的账户密钥
+            min_ttl: 剩余有效期少于该秒数时视为无效
+
+        Returns:
+            缓存的凭证（写入时的 value），不存在或已过期返回 None
+        """
+        path, _ = self._paths(namespace, account)
+        entry = self._read(path, namespace, secret)
+        if entry is None:
+            return None
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and float(expires_at) - time.time() <= min_ttl:
+            return None
+        return entry.get("value")
+
+    def put(
+        self,
+        namespace: str,
+        account: str,
+        secret: str,
+        value: Any,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """
+        写入凭证
+
+        Args:
+            namespace: 命名空间
+            account: 账户标识
+            secret: 用于派生加密密钥的账户密钥
+            value: 凭证内容（需要能被 JSON 序列化）
+            expires_at: 过期时间戳（秒），None 表示不过期
+        """
+        path, lock_path = self._paths(namespace, account)
+        entry = {"version": CACHE_VERSION, "value": value, "expires_at": expires_at, "created_at": time.time()}
+        with self._lock(lock_path):
+            self._write(path, namespace, secret, entry)
+
+    def get_or_create(
+        self,
+        namespace: str,
+        account: str,
+        secret: str,
+        create: Callable[[], Tuple[Any, Optional[float]]],
+        min_ttl: float = 0.0,
+    ) -> Any:
+        """
+        读取有效的缓存凭证，没有时调用 create() 登录并写入缓存
+
+        持有文件锁期间执行 create()，多个进程同时启动时只有一个进程真正登录。
+
+        Args:
+            namespace: 命名空间
+            account: 账户标识
+            secret: 用于派生加密密钥的账户密钥
+            create: 登录函数，返回 (凭证, 过期时间戳)
+            min_ttl: 剩余有效期少于该秒数时重新登录
+
+        Returns:
+            凭证
+        """
+        path, lock_path = self._paths(namespace, account)
+        value = self.get(namespace, account, secret, min_ttl)
+        if value is not None:
+            return value
+        with self._lock(lock_path):
+            # 等锁期间其他进程可能已经登录
+            value = self.get(namespace, account, secret, min_ttl)
+            if value is not None:
+                return value
+            value, expires_at = create()
+            entry = {"version": CACHE_VERSION, "value": value, "expires_at": expires_at, "created_at": time.time()}
+            self._write(path, namespace, secret, entry)
+            return value
+
+    def invalidate(self, namespace: str, account: str) -> None:
+        """删除缓存（例如交易所拒绝了缓存的 token）"""
+        path, lock_path = self._paths(namespace, account)
+        with self._lock(lock_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,68 @@
+"""
+File Lock
+
+跨进程文件锁（同一台机器上的多个策略进程之间互斥），同一进程内的线程也互斥。
+POSIX 使用 fcntl.flock，Windows 使用 msvcrt.locking。
+
+使用示例:
+    from utils.file_lock import FileLock
+
+    with FileLock("/tmp/standx.lock"):
+        ...
+"""
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """基于锁文件的跨进程互斥锁（可重复进入 with 块，但不可重入）"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 锁文件路径（不存在时自动创建）
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._thread_lock = threading.Lock()
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def release(self) -> None:
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.release()
+        return False
+
+    def close(self) -> None:
+        os.close(self._fd)
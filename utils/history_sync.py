@@ -0,0 +1,458 @@
+"""
+History Sync
+
+把 GRVT 的成交 / 订单 / 账户历史增量同步到本地列式存储：
+- 沿 `next` cursor 翻页，后台线程预取下一页，同时处理当前页（内存中最多两页 + 一个待写 part）
+- 按天（UTC）分区写入 CSV 或 Parquet（需要 pyarrow），每个分区一个或多个 part 文件
+- 同步过程中写临时文件，整轮同步完成后才改名提交并推进 watermark，
+  中断的同步不会留下半截数据，下次从旧 watermark 重新拉取
+- 重新运行时只拉取 watermark 之后的新数据（start_time = watermark + 1ns）
+- query() 按 symbol 和时间范围读取，只打开相关日期的分区
+
+使用示例:
+    from utils.history_sync import GrvtHistorySync
+
+    sync = GrvtHistorySync(grvt_client, "data/grvt_history", fmt="parquet")
+    sync.sync("fills")
+    fills = sync.query("fills", symbol="BTC_USDT_Perp", start=time.time() - 86400)
+"""
+import csv
+import glob
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from utils.file_lock import FileLock
+from utils.order_journal import _require_pyarrow
+
+NS_PER_SECOND = 1_000_000_000
+
+# 各数据流的列：(列名, 类型)，类型为 "int" / "float" / "bool" / "str"
+FILL_COLUMNS = [
+    ("event_time", "int"),
+    ("sub_account_id", "str"),
+    ("instrument", "str"),
+    ("is_buyer", "bool"),
+    ("is_taker", "bool"),
+    ("size", "float"),
+    ("price", "float"),
+    ("mark_price", "float"),
+    ("index_price", "float"),
+    ("realized_pnl", "float"),
+    ("fee", "float"),
+    ("fee_rate", "float"),
+    ("trade_id", "str"),
+    ("order_id", "str"),
+    ("client_order_id", "str"),
+    ("venue", "str"),
+]
+
+ORDER_COLUMNS = [
+    ("event_time", "int"),  # 订单最后更新时间 state.update_time
+    ("create_time", "int"),
+    ("sub_account_id", "str"),
+    ("instrument", "str"),
+    ("order_id", "str"),
+    ("client_order_id", "str"),
+    ("is_buying_asset", "bool"),
+    ("size", "float"),
+    ("limit_price", "float"),
+    ("time_in_force", "str"),
+    ("post_only", "bool"),
+    ("reduce_only", "bool"),
+    ("status", "str"),
+    ("reject_reason", "str"),
+    ("traded_size", "float"),
+    ("avg_fill_price", "float"),
+]
+
+ACCOUNT_COLUMNS = [
+    ("event_time", "int"),
+    ("sub_account_id", "str"),
+    ("instrument", "str"),  # 账户快照没有交易对，始终为空
+    ("total_equity", "float"),
+    ("unrealized_pnl", "float"),
+    ("initial_margin", "float"),
+    ("maintenance_margin", "float"),
+    ("available_balance", "float"),
+    ("positions", "str"),  # JSON
+]
+
+
+def _first(values: Any) -> Any:
+    return values[0] if isinstance(values, list) and values else None
+
+
+def _fill_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {name: raw.get(name) for name, _ in FILL_COLUMNS}
+
+
+def _order_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    leg = _first(raw.get("legs")) or {}
+    metadata = raw.get("metadata") or {}
+    state = raw.get("state") or {}
+    return {
+        "event_time": state.get("update_time") or metadata.get("create_time"),
+        "create_time": metadata.get("create_time"),
+        "sub_account_id": raw.get("sub_account_id"),
+        "instrument": leg.get("instrument"),
+        "order_id": raw.get("order_id"),
+        "client_order_id": metadata.get("client_order_id"),
+        "is_buying_asset": leg.get("is_buying_asset"),
+        "size": leg.get("size"),
+        "limit_price": leg.get("limit_price"),
+        "time_in_force": raw.get("time_in_force"),
+        "post_only": raw.get("post_only"),
+        "reduce_only": raw.get("reduce_only"),
+        "status": state.get("status"),
+        "reject_reason": state.get("reject_reason"),
+        "traded_size": _first(state.get("traded_size")),
+        "avg_fill_price": _first(state.get("avg_fill_price")),
+    }
+
+
+def _account_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    row = {name: raw.get(name) for name, _ in ACCOUNT_COLUMNS}
+    row["instrument"] = None
+    row["positions"] = json.dumps(raw.get("positions") or [], separators=(",", ":"))
+    return row
+
+
+def _fetch_fills(client: Any, since: Optional[int], cursor: Optional[str], limit: int) -> dict:
+    params = {"cursor": cursor} if cursor else {}
+    return client.fetch_my_trades(since=since, limit=limit, params=params)
+
+
+def _fetch_orders(client: Any, since: Optional[int], cursor: Optional[str], limit: int) -> dict:
+    params: Dict[str, Any] = {"limit": limit}
+    if cursor:
+        params["cursor"] = cursor
+    elif since:
+        params["start_time"] = since
+    return client.fetch_order_history(params=params)
+
+
+def _fetch_account(client: Any, since: Optional[int], cursor: Optional[str], limit: int) -> dict:
+    params: Dict[str, Any] = {}
+    if cursor:
+        params["cursor"] = cursor
+    elif since:
+        params["start_time"] = since
+    return client.fetch_account_history(params=params, limit=limit)
+
+
+class _StreamSpec:
+    __slots__ = ("columns", "types", "to_row", "fetch")
+
+    def __init__(self, columns, to_row, fetch):
+        self.columns = [name for name, _ in columns]
+        self.types = dict(columns)
+        self.to_row = to_row
+        self.fetch = fetch
+
+
+STREAMS: Dict[str, _StreamSpec] = {
+    "fills": _StreamSpec(FILL_COLUMNS, _fill_row, _fetch_fills),
+    "orders": _StreamSpec(ORDER_COLUMNS, _order_row, _fetch_orders),
+    "account": _StreamSpec(ACCOUNT_COLUMNS, _account_row, _fetch_account),
+}
+
+SUPPORTED_FORMATS = ("csv", "parquet")
+
+
+def _convert(value: Any, kind: str) -> Any:
+    if value is None or value == "":
+        return None
+    if kind == "int":
+        return int(value)
+    if kind == "float":
+        return float(value)
+    if kind == "bool":
+        return value if isinstance(value, bool) else str(value).lower() == "true"
+    return str(value)
+
+
+def _day(ns: int) -> str:
+    return datetime.fromtimestamp(ns / NS_PER_SECOND, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+class GrvtHistorySync:
+    """GRVT 历史数据增量同步 + 本地按天分区的列式存储"""
+
+    def __init__(
+        self,
+        client: Any,
+        directory: str,
+        fmt: str = "csv",
+        page_size: int = 1000,
+        part_rows: int = 100_000,
+        start_time: Optional[float] = None,
+        compression: str = "zstd",
+    ):
+        """
+        Args:
+            client: GrvtCcxt 实例（需要已登录，提供 fetch_my_trades/fetch_order_history/fetch_account_history）
+            directory: 存储根目录，每个数据流一个子目录
+            fmt: 文件格式，"csv" 或 "parquet"
+            page_size: 每页条数（GRVT 最大 1000）
+            part_rows: 每个 part 文件最多的行数（也是待写缓冲区的上限）
+            start_time: 首次同步的起始时间（秒），None 表示拉取全部保留的历史
+            compression: Parquet 压缩算法
+        """
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"不支持的存储格式: {fmt}. 支持的格式: {', '.join(SUPPORTED_FORMATS)}")
+        if fmt == "parquet":
+            _require_pyarrow()
+        self.client = client
+        self.directory = directory
+        self.fmt = fmt
+        self.page_size = int(page_size)
+        self.part_rows = max(1, int(part_rows))
+        self.start_time_ns = int(start_time * NS_PER_SECOND) if start_time else None
+        self.compression = compression
+        os.makedirs(directory, exist_ok=True)
+
+    # ==================== 同步 ====================
+
+    def sync(self, stream: str = "fills") -> int:
+        """
+        把 watermark 之后的新数据同步到本地
+
+        Args:
+            stream: "fills"、"orders" 或 "account"
+
+        Returns:
+            int: 新写入的行数
+        """
+        spec = self._spec(stream)
+        stream_dir = os.path.join(self.directory, stream)
+        os.makedirs(stream_dir, exist_ok=True)
+        lock = FileLock(os.path.join(stream_dir, ".lock"))
+        try:
+            with lock:
+                return self._sync_locked(stream, spec, stream_dir)
+        finally:
+            lock.close()
+
+    def _sync_locked(self, stream: str, spec: "_StreamSpec", stream_dir: str) -> int:
+        self._discard_uncommitted(stream_dir)
+        watermark = self.watermark(stream)
+        since = watermark + 1 if watermark is not None else self.start_time_ns
+        run_id = f"{time.time_ns()}-{os.getpid()}"
+        pending: List[str] = []
+        buffer: List[Dict[str, Any]] = []
+        newest = watermark
+        written = 0
+        try:
+            for page in self._pages(spec, since):
+                for raw in page:
+                    row = self._normalize(spec, spec.to_row(raw))
+                    ts = row.get("event_time")
+                    if ts is None or (watermark is not None and ts <= watermark):
+                        continue
+                    buffer.append(row)
+                    if newest is None or ts > newest:
+                        newest = ts
+                if len(buffer) >= self.part_rows:
+                    written += self._write_parts(stream_dir, spec, buffer, run_id, pending)
+                    buffer = []
+            written += self._write_parts(stream_dir, spec, buffer, run_id, pending)
+        except BaseException:
+            for path in pending:
+                _remove(path)
+            raise
+        # 提交：先改名 part 文件，再推进 watermark
+        for path in pending:
+            os.replace(path, path[: -len(".tmp")])
+        if newest is not None and newest != watermark:
+            self._save_watermark(stream_dir, newest)
+        return written
+
+    def sync_all(self) -> Dict[str, int]:
+        """依次同步所有数据流，返回每个数据流新写入的行数"""
+        return {stream: self.sync(stream) for stream in STREAMS}
+
+    def watermark(self, stream: str) -> Optional[int]:
+        """已同步的最新 event_time（纳秒），尚未同步过时为 None"""
+        path = os.path.join(self.directory, stream, "_watermark.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return int(json.load(f)["event_time"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _pages(self, spec: _StreamSpec, since: Optional[int]) -> Iterator[List[dict]]:
+        """沿 cursor 翻页（从新到旧），请求下一页与处理当前页并行"""
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="grvt-history") as executor:
+            future = executor.submit(spec.fetch, self.client, since, None, self.page_size)
+            seen_cursors = set()
+            while True:
+                response = future.result() or {}
+                result = response.get("result") or []
+                cursor = response.get("next")
+                more = bool(result) and bool(cursor) and cursor not in seen_cursors
+                if more:
+                    seen_cursors.add(cursor)
+                    future = executor.submit(spec.fetch, self.client, since, cursor, self.page_size)
+                yield result
+                if not more:
+                    return
+
+    # ==================== 查询 ====================
+
+    def query(
+        self,
+        stream: str = "fills",
+        symbol: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        columns: Optional[List[str]] = None,
+        as_dataframe: bool = False,
+    ):
+        """
+        读取本地数据（不访问网络）
+
+        Args:
+            stream: "fills"、"orders" 或 "account"
+            symbol: 只返回该交易对（instrument）
+            start: 起始时间戳（秒，包含）
+            end: 结束时间戳（秒，不包含）
+            columns: 只返回这些列（Parquet 只读取这些列）
+            as_dataframe: 为 True 时返回 pandas.DataFrame
+
+        Returns:
+            List[Dict[str, Any]] 或 pandas.DataFrame，按 event_time 升序
+        """
+        spec = self._spec(stream)
+        start_ns = int(start * NS_PER_SECOND) if start is not None else None
+        end_ns = int(end * NS_PER_SECOND) if end is not None else None
+        out_columns = columns or spec.columns
+        read_columns = list(dict.fromkeys(list(out_columns) + ["event_time", "instrument"]))
+
+        rows: List[Dict[str, Any]] = []
+        for path in self._partition_files(stream, start_ns, end_ns):
+            for row in self._read_file(spec, path, read_columns):
+                ts = row.get("event_time")
+                if start_ns is not None and (ts is None or ts < start_ns):
+                    continue
+                if end_ns is not None and (ts is None or ts >= end_ns):
+                    continue
+                if symbol is not None and row.get("instrument") != symbol:
+                    continue
+                rows.append({c: row.get(c) for c in out_columns})
+        if "event_time" in out_columns:
+            rows.sort(key=lambda r: r.get("event_time") or 0)
+        if as_dataframe:
+            import pandas as pd
+
+            return pd.DataFrame(rows, columns=out_columns)
+        return rows
+
+    def fills(
+        self,
+        symbol: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        as_dataframe: bool = False,
+    ):
+        """按交易对和时间范围读取本地成交，参数同 query()"""
+        return self.query("fills", symbol=symbol, start=start, end=end, as_dataframe=as_dataframe)
+
+    def _partition_files(
+        self, stream: str, start_ns: Optional[int], end_ns: Optional[int]
+    ) -> List[str]:
+        stream_dir = os.path.join(self.directory, stream)
+        first_day = _day(start_ns) if start_ns is not None else None
+        # end 不包含：end 恰好为 0 点时最后一天不需要读取
+        last_day = _day(end_ns - 1) if end_ns is not None else None
+        paths = []
+        for day_dir in sorted(glob.glob(os.path.join(stream_dir, "????-??-??"))):
+            day = os.path.basename(day_dir)
+            if first_day is not None and day < first_day:
+                continue
+            if last_day is not None and day > last_day:
+                continue
+            paths.extend(sorted(glob.glob(os.path.join(day_dir, "part-*.csv"))))
+            paths.extend(sorted(glob.glob(os.path.join(day_dir, "part-*.parquet"))))
+        return paths
+
+    def _read_file(self, spec: _StreamSpec, path: str, columns: List[str]) -> Iterator[Dict[str, Any]]:
+        if path.endswith(".csv"):
+            with open(path, "r", newline="", encoding="utf-8") as f:
+                for raw in csv.DictReader(f):
+                    yield {c: _convert(raw.get(c), spec.types[c]) for c in columns}
+            return
+        _, pq = _require_pyarrow()
+        available = set(pq.read_schema(path).names)
+        table = pq.read_table(path, columns=[c for c in columns if c in available])
+        yield from table.to_pylist()
+
+    # ==================== 写入 ====================
+
+    def _write_parts(
+        self,
+        stream_dir: str,
+        spec: _StreamSpec,
+        rows: List[Dict[str, Any]],
+        run_id: str,
+        pending: List[str],
+    ) -> int:
+        by_day: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_day.setdefault(_day(row["event_time"]), []).append(row)
+        for day, day_rows in by_day.items():
+            day_dir = os.path.join(stream_dir, day)
+            os.makedirs(day_dir, exist_ok=True)
+            day_rows.sort(key=lambda r: r["event_time"])
+            ext = "csv" if self.fmt == "csv" else "parquet"
+            path = os.path.join(day_dir, f"part-{run_id}-{len(pending):05d}.{ext}.tmp")
+            pending.append(path)
+            if self.fmt == "csv":
+                with open(path, "w", newline="", encoding="utf-8") as f:
+                    writer = csv.DictWriter(f, fieldnames=spec.columns)
+                    writer.writeheader()
+                    writer.writerows(day_rows)
+            else:
+                self._write_parquet(path, spec, day_rows)
+        return len(rows)
+
+    def _write_parquet(self, path: str, spec: _StreamSpec, rows: List[Dict[str, Any]]) -> None:
+        pa, pq = _require_pyarrow()
+        types = {"int": pa.int64(), "float": pa.float64(), "bool": pa.bool_(), "str": pa.string()}
+        schema = pa.schema([(c, types[spec.types[c]]) for c in spec.columns])
+        table = pa.Table.from_pylist(rows, schema=schema)
+        pq.write_table(table, path, compression=self.compression)
+
+    def _save_watermark(self, stream_dir: str, event_time: int) -> None:
+        path = os.path.join(stream_dir, "_watermark.json")
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"event_time": str(event_time), "updated_at": time.time()}, f)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _discard_uncommitted(stream_dir: str) -> None:
+        """删除上次中断的同步留下的临时文件"""
+        for path in glob.glob(os.path.join(stream_dir, "????-??-??", "*.tmp")):
+            _remove(path)
+
+    @staticmethod
+    def _normalize(spec: _StreamSpec, row: Dict[str, Any]) -> Dict[str, Any]:
+        return {c: _convert(row.get(c), spec.types[c]) for c in spec.columns}
+
+    @staticmethod
+    def _spec(stream: str) -> _StreamSpec:
+        spec = STREAMS.get(stream)
+        if spec is None:
+            raise ValueError(f"不支持的数据流: {stream}. 支持的数据流: {', '.join(STREAMS)}")
+        return spec
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,299 @@
+"""
+Logging Utilities
+
+非阻塞日志工具：
+- 日志记录在调用线程中只合并消息参数并入队，格式化和写文件/stdout 在后台线程完成
+- 支持惰性求值（logger 使用 %s 参数 + lazy 包装器，日志级别未开启时不求值）
+- 支持高频事件采样（每 N 条 / 每 T 秒最多一条）
+- 支持 JSON 结构化输出（extra 字段会展开到 JSON 中）
+
+使用示例:
+    from utils.logger import setup_logging, get_logger, lazy
+
+    setup_logging(level="INFO", log_file="logs/grid.log", json_format=True)
+    logger = get_logger(__name__)
+    logger.info("下单成功 价格=%s 订单ID=%s", price, order_id)
+    logger.debug("网格: %s", lazy(lambda: ",".join(map(str, grid))))
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# LogRecord 自带的属性，JSON 输出时不作为 extra 字段
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None)).keys()) | {
+    "message",
+    "asctime",
+}
+
+DEFAULT_FORMAT = "%(asctime)s.%(msecs)03d | %(levelname)s | %(name)s | %(message)s"
+DEFAULT_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["NonBlockingQueueHandler"] = None
+_setup_lock = threading.Lock()
+
+
+class lazy:
+    """
+    惰性求值包装器
+
+    作为日志参数传入，只有在日志级别开启且未被采样丢弃时才会调用函数（在调用线程中执行）。
+    """
+
+    __slots__ = ("_fn", "_args")
+
+    def __init__(self, fn: Callable[..., Any], *args: Any):
+        self._fn = fn
+        self._args = args
+
+    def __str__(self) -> str:
+        return str(self._fn(*self._args))
+
+    __repr__ = __str__
+
+
+class JsonFormatter(logging.Formatter):
+    """JSON 结构化日志格式，每条记录一行，extra 字段会合并到顶层"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    高频日志采样过滤器
+
+    按消息模板（record.msg）分组，每组每 every 条保留一条，且两条之间至少间隔 interval 秒。
+    只对 max_level 及以下级别生效，WARNING 以上的日志默认永不丢弃。
+    """
+
+    def __init__(
+        self,
+        every: int = 1,
+        interval: float = 0.0,
+        max_level: int = logging.INFO,
+    ):
+        super().__init__()
+        self.every = max(1, int(every))
+        self.interval = max(0.0, float(interval))
+        self.max_level = max_level
+        self._counters: Dict[Any, int] = {}
+        self._last_emit: Dict[Any, float] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            count = self._counters.get(key, 0)
+            self._counters[key] = count + 1
+            if count % self.every != 0:
+                return False
+            if self.interval:
+                now = time.monotonic()
+                last = self._last_emit.get(key)
+                if last is not None and now - last < self.interval:
+                    return False
+                self._last_emit[key] = now
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    非阻塞队列 Handler
+
+    prepare() 在调用线程中合并 msg % args（参数可能是之后会被修改的可变对象），
+    时间格式和输出格式化在后台 QueueListener 线程完成；队列满时直接丢弃并计数，保证调用方永不阻塞。
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        record = copy.copy(record)
+        record.message = message
+        record.msg = message
+        record.args = None
+        # 异常堆栈引用调用栈帧，这里先转成文本；异常路径不在热路径上
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """停止时队列已满也能退出的 QueueListener"""
+
+    # stop() 等待后台线程退出的最长时间（秒）
+    stop_timeout = 5.0
+
+    def stop(self) -> None:
+        """
+        停止后台线程
+
+        结束标记没能放入队列（其他线程不停写满队列）时后台线程不会退出，
+        最多等待 stop_timeout 秒，不让进程退出时卡住（后台线程是 daemon 线程）
+        """
+        if self._thread:
+            self.enqueue_sentinel()
+            self._thread.join(self.stop_timeout)
+            self._thread = None
+
+    def enqueue_sentinel(self) -> None:
+        try:
+            self.queue.put(self._sentinel, timeout=1.0)
+            return
+        except queue.Full:
+            pass
+        # 后台线程无法及时腾出空间：丢弃剩余日志，保证停止时不阻塞也不抛出 queue.Full
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            self.queue.put_nowait(self._sentinel)
+        except queue.Full:
+            pass
+
+
+def _build_formatter(json_format: bool) -> logging.Formatter:
+    if json_format:
+        return JsonFormatter()
+    return logging.Formatter(DEFAULT_FORMAT, datefmt=DEFAULT_DATEFMT)
+
+
+def setup_logging(
+    level: str = "INFO",
+    log_file: Optional[str] = None,
+    json_format: bool = False,
+    stdout: bool = True,
+    queue_size: int = 10000,
+    max_bytes: int = 50 * 1024 * 1024,
+    backup_count: int = 5,
+    sample_every: int = 1,
+    sample_interval: float = 0.0,
+) -> logging.handlers.QueueListener:
+    """
+    配置全局非阻塞日志
+
+    root logger 只挂一个 NonBlockingQueueHandler，真正的输出（stdout / 文件）在后台线程执行。
+    重复调用会先停止上一次的后台线程，再按新参数重新配置。
+
+    Args:
+        level: 日志级别，如 "DEBUG"/"INFO"
+        log_file: 日志文件路径（按大小轮转），为 None 时不写文件
+        json_format: 是否输出 JSON 结构化日志
+        stdout: 是否输出到标准输出
+        queue_size: 日志队列长度，队列满时丢弃新日志而不是阻塞
+        max_bytes: 单个日志文件最大字节数
+        backup_count: 轮转保留的文件数
+        sample_every: 低级别（INFO 及以下）日志每 N 条保留一条
+        sample_interval: 低级别日志同一模板最小输出间隔（秒）
+
+    Returns:
+        logging.handlers.QueueListener: 后台监听器（进程退出时自动停止并刷新）
+    """
+    global _listener, _queue_handler
+
+    with _setup_lock:
+        root = logging.getLogger()
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        if _queue_handler is not None:
+            root.removeHandler(_queue_handler)
+            _queue_handler = None
+
+        formatter = _build_formatter(json_format)
+        handlers: List[logging.Handler] = []
+        if stdout:
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(formatter)
+            handlers.append(stream_handler)
+        if log_file:
+            log_dir = os.path.dirname(os.path.abspath(log_file))
+            os.makedirs(log_dir, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file,
+                maxBytes=max_bytes,
+                backupCount=backup_count,
+                encoding="utf-8",
+            )
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+        _queue_handler = NonBlockingQueueHandler(log_queue)
+        if sample_every > 1 or sample_interval > 0:
+            _queue_handler.addFilter(
+                SamplingFilter(every=sample_every, interval=sample_interval)
+            )
+
+        # 移除之前 basicConfig 等挂在 root 上的同步 handler，避免重复输出
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_queue_handler)
+        root.setLevel(logging.getLevelName(str(level).upper()))
+
+        _listener = _QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        _listener.start()
+        return _listener
+
+
+def shutdown_logging() -> None:
+    """停止后台日志线程并刷新剩余日志"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            try:
+                _listener.stop()
+            except queue.Full:
+                pass
+            _listener = None
+
+
+def get_dropped_count() -> int:
+    """返回因队列已满被丢弃的日志条数"""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+def get_logger(name: str) -> logging.Logger:
+    """获取 logger（与 logging.getLogger 相同，统一入口便于后续扩展）"""
+    return logging.getLogger(name)
+
+
+atexit.register(shutdown_logging)
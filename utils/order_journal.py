@@ -0,0 +1,377 @@
+"""
+Order Journal
+
+只追加的订单/成交流水：
+- record() 只把事件放入内存缓冲区，不做任何 IO，可以在下单路径上直接调用
+- 后台线程按条数（flush_size）或时间（flush_interval）批量写盘
+- 按天或文件大小轮转
+- 支持 CSV 和 Parquet（列式压缩，需要 pyarrow）两种格式
+- read_journal() 读取流水用于分析
+
+使用示例:
+    from utils.order_journal import OrderJournal, read_journal
+
+    journal = OrderJournal("logs/journal", fmt="parquet")
+    journal.record("place", exchange="standx", symbol="BTC-USD", side="buy", price=90000, quantity=0.001)
+    journal.close()
+
+    rows = read_journal("logs/journal", start=time.time() - 86400)
+"""
+import atexit
+import csv
+import glob
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+# 流水字段（CSV 表头 / Parquet schema 的列顺序）
+JOURNAL_FIELDS = [
+    "ts",
+    "event",
+    "exchange",
+    "symbol",
+    "side",
+    "price",
+    "quantity",
+    "order_id",
+    "client_order_id",
+    "status",
+    "error",
+    "notes",
+]
+_FLOAT_FIELDS = {"ts", "price", "quantity"}
+
+SUPPORTED_FORMATS = ("csv", "parquet")
+
+logger = logging.getLogger(__name__)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet 格式需要安装 pyarrow: pip install pyarrow")
+    return pyarrow, pyarrow.parquet
+
+
+def _normalize(event: Dict[str, Any]) -> Dict[str, Any]:
+    """把事件转换为固定 schema：数值列为 float，其余为 str（缺失为 None）"""
+    row: Dict[str, Any] = {}
+    for field in JOURNAL_FIELDS:
+        value = event.get(field)
+        if value is None or value == "":
+            row[field] = None
+        elif field in _FLOAT_FIELDS:
+            row[field] = float(value)
+        else:
+            row[field] = str(value)
+    return row
+
+
+class OrderJournal:
+    """批量写盘、自动轮转的订单流水"""
+
+    def __init__(
+        self,
+        directory: str,
+        fmt: str = "csv",
+        prefix: str = "orders",
+        flush_size: int = 500,
+        flush_interval: float = 1.0,
+        rotate: str = "day",
+        max_bytes: int = 64 * 1024 * 1024,
+        compression: str = "zstd",
+        exchange: Optional[str] = None,
+        max_buffer: int = 100_000,
+    ):
+        """
+        Args:
+            directory: 流水文件目录
+            fmt: 文件格式，"csv" 或 "parquet"
+            prefix: 文件名前缀
+            flush_size: 缓冲区达到该条数时立即写盘
+            flush_interval: 最长写盘间隔（秒）
+            rotate: 轮转方式，"day"（按天 + 按大小）或 "size"（仅按大小）
+            max_bytes: 单个文件最大字节数，超过后轮转
+            compression: Parquet 压缩算法
+            exchange: 默认交易所名称（record 未指定 exchange 时使用）
+            max_buffer: 缓冲区最大条数；写盘持续失败时超出部分的新事件被丢弃并计入 dropped
+        """
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"不支持的流水格式: {fmt}. 支持的格式: {', '.join(SUPPORTED_FORMATS)}")
+        if rotate not in ("day", "size"):
+            raise ValueError(f"不支持的轮转方式: {rotate}")
+        if fmt == "parquet":
+            _require_pyarrow()
+
+        self.directory = directory
+        self.fmt = fmt
+        self.prefix = prefix
+        self.flush_size = max(1, int(flush_size))
+        self.flush_interval = float(flush_interval)
+        self.rotate = rotate
+        self.max_bytes = int(max_bytes)
+        self.compression = compression
+        self.exchange = exchange
+        self.max_buffer = max(1, int(max_buffer))
+        self.dropped = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._io_lock = threading.Lock()
+
+        self._current_path: Optional[str] = None
+        self._current_day: Optional[str] = None
+        self._seq = 0
+        self._csv_file = None
+        self._csv_writer = None
+        self._parquet_writer = None
+        self._parquet_schema = None
+
+        self._thread = threading.Thread(target=self._run, name="order-journal", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ==================== 写入接口（热路径） ====================
+
+    def record(self, event: str, **fields: Any) -> None:
+        """
+        记录一条事件（只入缓冲区，不做 IO）
+
+        Args:
+            event: 事件类型，如 "place"/"cancel"/"cancel_all"/"fill"/"place_failed"
+            **fields: 其余字段，见 JOURNAL_FIELDS
+        """
+        fields["event"] = event
+        if "ts" not in fields:
+            fields["ts"] = time.time()
+        if "exchange" not in fields and self.exchange:
+            fields["exchange"] = self.exchange
+        if len(self._buffer) >= self.max_buffer:
+            # 磁盘卡住时不无限占用内存
+            self.dropped += 1
+            return
+        self._buffer.append(fields)
+        if len(self._buffer) >= self.flush_size:
+            self._wake.set()
+
+    def record_fill(
+        self,
+        symbol: str,
+        side: str,
+        price: Any,
+        quantity: Any,
+        order_id: Optional[str] = None,
+        **fields: Any,
+    ) -> None:
+        """记录一条成交"""
+        self.record(
+            "fill",
+            symbol=symbol,
+            side=side,
+            price=price,
+            quantity=quantity,
+            order_id=order_id,
+            **fields,
+        )
+
+    # ==================== 后台写盘 ====================
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # 写盘失败不能影响交易主流程
+                logger.warning("写入订单流水失败: %s", e)
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        rows = []
+        while True:
+            try:
+                rows.append(_normalize(self._buffer.popleft()))
+            except IndexError:
+                break
+        return rows
+
+    def flush(self) -> int:
+        """
+        把缓冲区中的事件写盘；写盘失败时事件放回缓冲区，下次重试
+
+        Returns:
+            int: 写入的条数
+        """
+        with self._io_lock:
+            rows = self._drain()
+            if not rows:
+                return 0
+            try:
+                self._maybe_rotate()
+                if self.fmt == "csv":
+                    self._write_csv(rows)
+                else:
+                    self._write_parquet(rows)
+            except Exception:
+                self._buffer.extendleft(reversed(rows))
+                raise
+            return len(rows)
+
+    def _file_path(self, day: str, seq: int) -> str:
+        ext = "csv" if self.fmt == "csv" else "parquet"
+        return os.path.join(self.directory, f"{self.prefix}_{day}_{seq:03d}.{ext}")
+
+    def _maybe_rotate(self) -> None:
+        day = datetime.now().strftime("%Y-%m-%d") if self.rotate == "day" else "all"
+        if self._current_path is None or day != self._current_day:
+            self._close_writers()
+            self._current_day = day
+            self._seq = self._next_seq(day)
+            self._current_path = self._file_path(day, self._seq)
+            return
+        if os.path.exists(self._current_path) and os.path.getsize(self._current_path) >= self.max_bytes:
+            self._close_writers()
+            self._seq += 1
+            self._current_path = self._file_path(day, self._seq)
+
+    def _next_seq(self, day: str) -> int:
+        # 进程重启后不覆盖已有文件：Parquet 从新文件开始，CSV 可以接着最后一个文件追加
+        existing = sorted(glob.glob(self._file_path(day, 0).replace("_000.", "_*.")))
+        if not existing:
+            return 0
+        last = int(existing[-1].rsplit("_", 1)[1].split(".")[0])
+        return last if self.fmt == "csv" else last + 1
+
+    def _write_csv(self, rows: List[Dict[str, Any]]) -> None:
+        if self._csv_file is None:
+            is_new = not os.path.exists(self._current_path) or os.path.getsize(self._current_path) == 0
+            self._csv_file = open(self._current_path, "a", newline="", encoding="utf-8")
+            self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=JOURNAL_FIELDS)
+            if is_new:
+                self._csv_writer.writeheader()
+        self._csv_writer.writerows(rows)
+        self._csv_file.flush()
+
+    def _write_parquet(self, rows: List[Dict[str, Any]]) -> None:
+        pa, pq = _require_pyarrow()
+        if self._parquet_schema is None:
+            self._parquet_schema = pa.schema(
+                [(f, pa.float64() if f in _FLOAT_FIELDS else pa.string()) for f in JOURNAL_FIELDS]
+            )
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(
+                self._current_path, self._parquet_schema, compression=self.compression
+            )
+        table = pa.Table.from_pylist(rows, schema=self._parquet_schema)
+        self._parquet_writer.write_table(table)
+
+    def _close_writers(self) -> None:
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def roll(self) -> None:
+        """写盘并关闭当前文件（Parquet 文件关闭后才能被读取），下次写入使用新文件"""
+        self.flush()
+        with self._io_lock:
+            self._close_writers()
+            if self._current_day is not None:
+                self._seq += 1
+                self._current_path = self._file_path(self._current_day, self._seq)
+
+    def close(self) -> None:
+        """停止后台线程，写入剩余事件并关闭文件"""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning("写入订单流水失败，%d 条事件未写入: %s", len(self._buffer), e)
+        with self._io_lock:
+            self._close_writers()
+
+
+def _iter_csv(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield _normalize(row)
+
+
+def _iter_parquet(path: str) -> Iterator[Dict[str, Any]]:
+    _, pq = _require_pyarrow()
+    try:
+        table = pq.read_table(path)
+    except Exception:
+        # 正在写入的 Parquet 文件还没有 footer，跳过
+        return
+    yield from table.to_pylist()
+
+
+def read_journal(
+    directory: str,
+    prefix: str = "orders",
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    events: Optional[List[str]] = None,
+    symbol: Optional[str] = None,
+    as_dataframe: bool = False,
+):
+    """
+    读取订单流水（CSV 和 Parquet 文件都会读取）
+
+    注意：Parquet 文件在关闭时才写入 footer，正在写入的文件（即使已经 flush）会被跳过；
+    需要读到最新事件时，先对写入方调用 OrderJournal.roll() 或 close()。CSV 文件 flush 后即可读取。
+
+    Args:
+        directory: 流水文件目录
+        prefix: 文件名前缀
+        start: 起始时间戳（秒，包含）
+        end: 结束时间戳（秒，不包含）
+        events: 只返回这些事件类型
+        symbol: 只返回该交易对
+        as_dataframe: 为 True 时返回 pandas.DataFrame
+
+    Returns:
+        List[Dict[str, Any]] 或 pandas.DataFrame
+    """
+    paths = sorted(
+        glob.glob(os.path.join(directory, f"{prefix}_*.csv"))
+        + glob.glob(os.path.join(directory, f"{prefix}_*.parquet"))
+    )
+    event_set = set(events) if events else None
+    rows: List[Dict[str, Any]] = []
+    for path in paths:
+        reader = _iter_csv(path) if path.endswith(".csv") else _iter_parquet(path)
+        for row in reader:
+            ts = row.get("ts")
+            if start is not None and (ts is None or ts < start):
+                continue
+            if end is not None and (ts is None or ts >= end):
+                continue
+            if event_set is not None and row.get("event") not in event_set:
+                continue
+            if symbol is not None and row.get("symbol") != symbol:
+                continue
+            rows.append(row)
+    rows.sort(key=lambda r: r.get("ts") or 0.0)
+    if as_dataframe:
+        import pandas as pd
+
+        return pd.DataFrame(rows, columns=JOURNAL_FIELDS)
+    return rows
@@ -0,0 +1,531 @@
+"""
+Rate Limiter
+
+进程级（可选跨进程）令牌桶限频器：
+- 下单 / 撤单 / 查询使用独立的令牌桶，可再叠加一个共享的总桶（如交易所按 API Key 统计的总请求数）
+- 带优先级：共享同一个桶时，撤单优先于下单，下单优先于查询；同优先级按先来后到
+- 线程和 asyncio 协程都可以使用（acquire / acquire_async）
+- 可选通过共享内存在多个进程之间共享令牌和桶参数（多个网格实例使用同一个 API Key 时）；
+  优先级排队只在进程内生效，不同进程之间按各自获取令牌的先后竞争
+- 令牌桶参数可以从交易所公布的限制或查询接口（如 Nado 的 linked signer 限额）初始化
+
+使用示例:
+    from utils.rate_limiter import RateLimiter
+
+    limiter = RateLimiter.from_config({"orders_per_second": 10, "cancels_per_second": 20})
+    adapter.attach_rate_limiter(limiter)
+
+    limiter.acquire("cancel")              # 线程中阻塞等待
+    await limiter.acquire_async("order")   # 协程中等待
+"""
+import atexit
+import heapq
+import itertools
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.file_lock import FileLock
+
+ORDER = "order"
+CANCEL = "cancel"
+QUERY = "query"
+TOTAL = "total"
+
+# 数值越小优先级越高
+DEFAULT_PRIORITIES = {
+    CANCEL: 0,
+    ORDER: 1,
+    QUERY: 2,
+}
+
+# 各交易所的默认限额（保守值，单位：次/秒）。交易所公布或查询到的限额不同时，
+# 请在配置文件的 rate_limit 中覆盖，或使用 limits_from_nado_linked_signer() 初始化
+# （Nado 适配器配置 linked_signer_window 后挂载限频器时自动初始化）。
+EXCHANGE_DEFAULT_LIMITS: Dict[str, Dict[str, float]] = {
+    "standx": {"orders_per_second": 10, "cancels_per_second": 10, "queries_per_second": 10},
+    "grvt": {"orders_per_second": 10, "cancels_per_second": 20, "queries_per_second": 20},
+    "nado": {"orders_per_second": 10, "cancels_per_second": 20, "queries_per_second": 20},
+}
+
+_STATE_STRUCT = struct.Struct("dddd")  # tokens, last_refill_ts, rate, capacity
+_HEADER_STRUCT = struct.Struct("q")  # 使用共享内存的限频器数量
+
+
+class _LocalState:
+    """进程内的令牌桶状态"""
+
+    def __init__(self, buckets: Dict[str, Tuple[float, float]]):
+        now = time.time()
+        self._data = {
+            name: [float(capacity), now, float(rate), float(capacity)]
+            for name, (rate, capacity) in buckets.items()
+        }
+        self._lock = threading.Lock()
+
+    def lock(self) -> threading.Lock:
+        return self._lock
+
+    def get(self, name: str) -> Tuple[float, float]:
+        tokens, ts, _, _ = self._data[name]
+        return tokens, ts
+
+    def set(self, name: str, tokens: float, ts: float) -> None:
+        self._data[name][:2] = [tokens, ts]
+
+    def limits(self, name: str) -> Tuple[float, float]:
+        _, _, rate, capacity = self._data[name]
+        return rate, capacity
+
+    def set_limits(self, name: str, rate: float, capacity: float) -> None:
+        self._data[name][2:] = [rate, capacity]
+
+    def close(self, unlink: bool = False) -> None:
+        pass
+
+
+class _SharedState:
+    """
+    共享内存中的令牌桶状态（跨进程）
+
+    头部 8 字节为使用该共享内存的限频器数量，之后每个桶占 32 字节（剩余令牌数、上次补充时间、
+    每秒补充令牌数、桶容量），由文件锁保护。第一个创建共享内存的进程按自己的配置初始化，
+    之后加入的进程使用共享内存中的桶参数；update_bucket() 修改的参数对所有进程生效。
+    最后一个限频器 close()（或进程正常退出）时删除共享内存；进程被强制杀死时计数不会减少，
+    需要手动调用 close(unlink=True)。
+    """
+
+    def __init__(self, shm_name: str, buckets: Dict[str, Tuple[float, float]]):
+        from multiprocessing import shared_memory
+
+        self._names = list(buckets)
+        self._index = {name: i for i, name in enumerate(self._names)}
+        self._lock = FileLock(os.path.join(tempfile.gettempdir(), f"{shm_name}.lock"))
+        self._closed = False
+        size = _HEADER_STRUCT.size + _STATE_STRUCT.size * len(self._names)
+        with self._lock:
+            try:
+                self._shm = shared_memory.SharedMemory(name=shm_name, create=True, size=size)
+                now = time.time()
+                for name, (rate, capacity) in buckets.items():
+                    self._write(name, float(capacity), now, float(rate), float(capacity))
+                users = 0
+            except FileExistsError:
+                self._shm = shared_memory.SharedMemory(name=shm_name)
+                if self._shm.size < size:
+                    raise ValueError(f"共享内存 {shm_name} 的桶配置与当前配置不一致")
+                (users,) = _HEADER_STRUCT.unpack_from(self._shm.buf, 0)
+            _HEADER_STRUCT.pack_into(self._shm.buf, 0, users + 1)
+        # 共享内存的生命周期由使用计数决定：不让 resource_tracker 在本进程退出时删除它
+        try:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        except Exception:
+            pass
+        atexit.register(self.close)
+
+    def lock(self) -> FileLock:
+        return self._lock
+
+    def _offset(self, name: str) -> int:
+        return _HEADER_STRUCT.size + self._index[name] * _STATE_STRUCT.size
+
+    def _write(self, name: str, tokens: float, ts: float, rate: float, capacity: float) -> None:
+        _STATE_STRUCT.pack_into(self._shm.buf, self._offset(name), tokens, ts, rate, capacity)
+
+    def _read(self, name: str) -> Tuple[float, float, float, float]:
+        return _STATE_STRUCT.unpack_from(self._shm.buf, self._offset(name))
+
+    def get(self, name: str) -> Tuple[float, float]:
+        tokens, ts, _, _ = self._read(name)
+        return tokens, ts
+
+    def set(self, name: str, tokens: float, ts: float) -> None:
+        _, _, rate, capacity = self._read(name)
+        self._write(name, tokens, ts, rate, capacity)
+
+    def limits(self, name: str) -> Tuple[float, float]:
+        _, _, rate, capacity = self._read(name)
+        return rate, capacity
+
+    def set_limits(self, name: str, rate: float, capacity: float) -> None:
+        tokens, ts, _, _ = self._read(name)
+        self._write(name, tokens, ts, rate, capacity)
+
+    def close(self, unlink: bool = False) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        with self._lock:
+            (users,) = _HEADER_STRUCT.unpack_from(self._shm.buf, 0)
+            users = max(0, users - 1)
+            _HEADER_STRUCT.pack_into(self._shm.buf, 0, users)
+            if users == 0 or unlink:
+                try:
+                    from multiprocessing import resource_tracker
+
+                    # 与 __init__ 中的 unregister 配对，unlink() 会再 unregister 一次
+                    resource_tracker.register(self._shm._name, "shared_memory")
+                except Exception:
+                    pass
+                self._shm.unlink()
+            self._shm.close()
+        self._lock.close()
+
+
+class RateLimiter:
+    """
+    带优先级的多令牌桶限频器
+
+    优先级只在同一个限频器实例（进程）内生效：共享内存模式下，
+    其他进程中排队的请求不会让出令牌给本进程的撤单
+    """
+
+    def __init__(
+        self,
+        buckets: Dict[str, Tuple[float, float]],
+        routes: Optional[Dict[str, List[str]]] = None,
+        priorities: Optional[Dict[str, int]] = None,
+        shared_memory_name: Optional[str] = None,
+    ):
+        """
+        Args:
+            buckets: 桶名 -> (每秒补充的令牌数, 桶容量)
+            routes: 请求类别 -> 需要扣减的桶列表，默认每个类别扣减同名桶，存在 "total" 桶时同时扣减
+            priorities: 请求类别 -> 优先级（数值越小越优先），默认撤单 > 下单 > 查询
+            shared_memory_name: 共享内存名称；设置后令牌和桶参数在使用相同名称的进程之间共享
+                （已存在时使用共享内存中的桶参数）
+        """
+        if not buckets:
+            raise ValueError("至少需要一个令牌桶")
+        self._names = list(buckets)
+        if routes is None:
+            routes = {}
+            for name in buckets:
+                if name != TOTAL:
+                    routes[name] = [name] + ([TOTAL] if TOTAL in buckets else [])
+        self.routes = routes
+        self.priorities = dict(DEFAULT_PRIORITIES)
+        if priorities:
+            self.priorities.update(priorities)
+
+        if shared_memory_name:
+            self._state = _SharedState(shared_memory_name, buckets)
+        else:
+            self._state = _LocalState(buckets)
+
+        # 等待队列：(优先级, 序号, 需要的桶)
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[int, int, Tuple[str, ...]]] = []
+        self._seq = itertools.count()
+        # 被更高优先级请求挡住的协程：(事件循环, asyncio.Event)，有请求离开队列时唤醒
+        self._async_wakers: List[Tuple[Any, Any]] = []
+
+    @property
+    def rates(self) -> Dict[str, float]:
+        """桶名 -> 每秒补充的令牌数（共享内存模式下为所有进程共用的值）"""
+        return {name: self._state.limits(name)[0] for name in self._names}
+
+    @property
+    def capacities(self) -> Dict[str, float]:
+        """桶名 -> 桶容量"""
+        return {name: self._state.limits(name)[1] for name in self._names}
+
+    # ==================== 构造 ====================
+
+    @classmethod
+    def from_limits(
+        cls,
+        orders_per_second: Optional[float] = None,
+        cancels_per_second: Optional[float] = None,
+        queries_per_second: Optional[float] = None,
+        total_per_second: Optional[float] = None,
+        burst_seconds: float = 1.0,
+        shared_memory_name: Optional[str] = None,
+    ) -> "RateLimiter":
+        """
+        按每秒限额创建限频器，桶容量 = 每秒限额 * burst_seconds
+
+        Args:
+            orders_per_second: 下单限额
+            cancels_per_second: 撤单限额
+            queries_per_second: 查询限额
+            total_per_second: 总请求限额（所有类别共享）
+            burst_seconds: 允许突发的秒数
+            shared_memory_name: 跨进程共享内存名称
+        """
+        buckets: Dict[str, Tuple[float, float]] = {}
+        for name, rate in (
+            (ORDER, orders_per_second),
+            (CANCEL, cancels_per_second),
+            (QUERY, queries_per_second),
+            (TOTAL, total_per_second),
+        ):
+            if rate:
+                buckets[name] = (float(rate), max(1.0, float(rate) * burst_seconds))
+        return cls(buckets, shared_memory_name=shared_memory_name)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], exchange_name: Optional[str] = None) -> "RateLimiter":
+        """
+        从配置创建限频器，未配置的项使用 EXCHANGE_DEFAULT_LIMITS 中该交易所的默认值
+
+        Args:
+            config: rate_limit 配置，键同 from_limits 的参数
+            exchange_name: 交易所名称
+        """
+        params: Dict[str, Any] = dict(EXCHANGE_DEFAULT_LIMITS.get(exchange_name or "", {}))
+        params.update({k: v for k, v in (config or {}).items() if k != "enable" and v is not None})
+        return cls.from_limits(**params)
+
+    # ==================== 获取令牌 ====================
+
+    def _route(self, category: str) -> Tuple[str, ...]:
+        names = self.routes.get(category)
+        if names is None:
+            # 未知类别只受总桶限制
+            names = [TOTAL] if TOTAL in self._names else []
+        return tuple(names)
+
+    def _blocked(self, ticket: Tuple[int, int, Tuple[str, ...]]) -> bool:
+        """是否有更高优先级（或同优先级更早）的等待者使用了相同的桶"""
+        names = set(ticket[2])
+        for other in self._waiters:
+            if other[:2] < ticket[:2] and names.intersection(other[2]):
+                return True
+        return False
+
+    def _try_take(self, names: Tuple[str, ...], weight: float) -> float:
+        """尝试扣减令牌，成功返回 0，否则返回预计需要等待的秒数（不扣减）"""
+        with self._state.lock():
+            now = time.time()
+            levels = {}
+            wait = 0.0
+            for name in names:
+                tokens, ts = self._state.get(name)
+                rate, capacity = self._state.limits(name)
+                tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+                # ts 在未来表示交易所要求等待到该时间后才补充令牌
+                levels[name] = (tokens, max(ts, now))
+                if tokens < weight:
+                    wait = max(wait, max(0.0, ts - now) + (weight - tokens) / rate)
+            if wait > 0:
+                return wait
+            for name, (tokens, ts) in levels.items():
+                self._state.set(name, tokens - weight, ts)
+            return 0.0
+
+    def _enter(self, category: str, priority: Optional[int]) -> Tuple[int, int, Tuple[str, ...]]:
+        prio = self.priorities.get(category, max(self.priorities.values()) + 1) if priority is None else priority
+        ticket = (prio, next(self._seq), self._route(category))
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _leave(self, ticket: Tuple[int, int, Tuple[str, ...]]) -> None:
+        with self._cond:
+            self._waiters.remove(ticket)
+            heapq.heapify(self._waiters)
+        self._wake_all()
+
+    def _wake_all(self) -> None:
+        """唤醒所有等待者重新检查（有请求离开队列或桶参数变化时）"""
+        with self._cond:
+            self._cond.notify_all()
+            wakers, self._async_wakers = self._async_wakers, []
+        for loop, event in wakers:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # 事件循环已关闭
+
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        return None if deadline is None else deadline - time.monotonic()
+
+    def acquire(
+        self,
+        category: str,
+        weight: float = 1.0,
+        timeout: Optional[float] = None,
+        priority: Optional[int] = None,
+    ) -> bool:
+        """
+        获取令牌（阻塞当前线程）
+
+        Args:
+            category: 请求类别，"order"/"cancel"/"query"
+            weight: 本次请求消耗的令牌数
+            timeout: 最长等待秒数，None 表示一直等待
+            priority: 覆盖默认优先级
+
+        Returns:
+            bool: 是否获得令牌（超时返回 False）
+        """
+        ticket = self._enter(category, priority)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                with self._cond:
+                    # 被更高优先级的请求挡住：等它离开队列时被唤醒，不轮询
+                    while self._blocked(ticket):
+                        remaining = self._remaining(deadline)
+                        if remaining is not None and remaining <= 0:
+                            return False
+                        self._cond.wait(remaining)
+                wait = self._try_take(ticket[2], weight)
+                if wait <= 0:
+                    return True
+                remaining = self._remaining(deadline)
+                if remaining is not None:
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                with self._cond:
+                    self._cond.wait(wait)
+        finally:
+            self._leave(ticket)
+
+    async def acquire_async(
+        self,
+        category: str,
+        weight: float = 1.0,
+        timeout: Optional[float] = None,
+        priority: Optional[int] = None,
+    ) -> bool:
+        """
+        获取令牌（协程版本，等待期间不阻塞事件循环）
+
+        参数和返回值同 acquire()
+        """
+        import asyncio
+
+        ticket = self._enter(category, priority)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                with self._cond:
+                    blocked = self._blocked(ticket)
+                    if blocked:
+                        event = asyncio.Event()
+                        self._async_wakers.append((asyncio.get_running_loop(), event))
+                if blocked:
+                    remaining = self._remaining(deadline)
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    try:
+                        await asyncio.wait_for(event.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        return False
+                    continue
+                wait = self._try_take(ticket[2], weight)
+                if wait <= 0:
+                    return True
+                remaining = self._remaining(deadline)
+                if remaining is not None:
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                await asyncio.sleep(wait)
+        finally:
+            self._leave(ticket)
+
+    def try_acquire(self, category: str, weight: float = 1.0) -> bool:
+        """不等待，立即尝试获取令牌（有更高优先级的请求在排队时返回 False）"""
+        ticket = self._enter(category, None)
+        try:
+            with self._cond:
+                if self._blocked(ticket):
+                    return False
+            return self._try_take(ticket[2], weight) <= 0
+        finally:
+            self._leave(ticket)
+
+    # ==================== 与交易所限额同步 ====================
+
+    def update_bucket(
+        self,
+        name: str,
+        rate: Optional[float] = None,
+        capacity: Optional[float] = None,
+        tokens: Optional[float] = None,
+        available_in: float = 0.0,
+    ) -> None:
+        """
+        根据交易所返回的限额调整桶
+
+        Args:
+            name: 桶名
+            rate: 新的每秒补充令牌数
+            capacity: 新的桶容量
+            tokens: 当前剩余令牌数（交易所返回的 remaining）
+            available_in: 多少秒后才开始补充令牌（交易所返回的 wait_time）
+        """
+        if name not in self._names:
+            raise KeyError(f"未知的令牌桶: {name}")
+        with self._state.lock():
+            current_rate, current_capacity = self._state.limits(name)
+            if rate is not None:
+                current_rate = max(float(rate), 1e-9)
+            if capacity is not None:
+                current_capacity = float(capacity)
+            self._state.set_limits(name, current_rate, current_capacity)
+            current, ts = self._state.get(name)
+            if tokens is not None:
+                current = float(tokens)
+                ts = time.time() + max(0.0, float(available_in))
+            self._state.set(name, min(current, current_capacity), ts)
+        self._wake_all()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """返回各桶当前状态（用于监控）"""
+        result = {}
+        with self._state.lock():
+            now = time.time()
+            for name in self._names:
+                tokens, ts = self._state.get(name)
+                rate, capacity = self._state.limits(name)
+                result[name] = {
+                    "tokens": min(capacity, tokens + max(0.0, now - ts) * rate),
+                    "rate": rate,
+                    "capacity": capacity,
+                }
+        return result
+
+    def close(self, unlink: bool = False) -> None:
+        """
+        释放共享内存：最后一个使用者关闭时删除共享内存块（进程正常退出时自动关闭）
+
+        Args:
+            unlink: 为 True 时无论是否还有其他使用者都删除（清理被强制杀死的进程留下的共享内存）
+        """
+        self._state.close(unlink=unlink)
+
+
+def limits_from_nado_linked_signer(data: Any, window_seconds: float) -> Dict[str, float]:
+    """
+    把 Nado 的 linked signer 限额（IndexerQueryClient.get_linked_signer_rate_limits 的返回值）
+    转换为 RateLimiter.update_bucket() 的参数
+
+    Nado 按 linked signer 统计交易（下单、撤单等）次数：total_tx_limit 为窗口内总额，
+    remaining_tx 为剩余次数，wait_time 为需要等待的秒数。
+
+    Args:
+        data: IndexerLinkedSignerRateLimitData
+        window_seconds: total_tx_limit 对应的统计窗口（秒）
+
+    Returns:
+        Dict[str, float]: rate / capacity / tokens / available_in
+    """
+    total = float(data.total_tx_limit)
+    return {
+        "rate": total / float(window_seconds),
+        "capacity": total,
+        "tokens": float(data.remaining_tx),
+        "available_in": float(data.wait_time or 0),
+    }